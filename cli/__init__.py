@@ -11,6 +11,7 @@ import typing
 from kiso._version import __version__
 
 from cli._http import _handle_http_error
+from cli._status_stream import StatusStream
 from cli.render import (
     CLEAR_LINE,
     _format_resources,
@@ -718,7 +719,10 @@ def _msg_cmd(args: argparse.Namespace) -> None:
         if message_id is None:
             die("server response missing message_id")
 
-        _poll_status(ctx.client, ctx.session, message_id, 0, quiet, False, ctx.caps, ctx.bot_name, user=ctx.user)
+        _poll_status(
+            ctx.client, ctx.session, message_id, 0, quiet, False, ctx.caps, ctx.bot_name,
+            user=ctx.user, stream=True,
+        )
     except KeyboardInterrupt:
         try:
             ctx.client.post(f"/sessions/{ctx.session}/cancel")
@@ -797,6 +801,7 @@ def _chat(args: argparse.Namespace) -> None:
                 last_task_id = _poll_status(
                     ctx.client, ctx.session, message_id, last_task_id,
                     args.quiet, _verbose_mode, ctx.caps, ctx.bot_name, user=ctx.user,
+                    stream=True,
                 )
             except KeyboardInterrupt:
                 print(f"\n{render_cancel_start(ctx.caps)}")
@@ -1263,6 +1268,7 @@ def _poll_status(
     bot_name: str = "Bot",
     _at_col0: bool = True,
     user: str = "",
+    stream: bool = False,
 ) -> int:
     """Poll ``/status`` and render task progress to the terminal.
 
@@ -1280,28 +1286,57 @@ def _poll_status(
             text without a trailing newline (e.g. an inline prompt) so the
             spinner always opens on a fresh line instead of overwriting it.
         user: user forwarded as the ``user`` query param to ``/status``.
+        stream: subscribe to ``/status/{session}/stream`` and render from
+            the pushed state; falls back to polling whenever the stream
+            is unavailable.
     """
 
     state = _PollRenderState(seen={}, max_task_id=base_task_id, at_col0=_at_col0, verbose_shown={})
+    frames = spinner_frames(caps)
+    params = {"after": base_task_id, "verbose": str(verbose).lower(), "user": user}
+    status_stream = StatusStream(client, session, params).start() if stream else None
+    try:
+        return _poll_status_loop(
+            client, session, message_id, quiet, verbose, caps, bot_name,
+            state, params, frames, status_stream,
+        )
+    finally:
+        if status_stream is not None:
+            status_stream.close()
+
+
+def _poll_status_loop(
+    client: "httpx.Client",
+    session: str,
+    message_id: int,
+    quiet: bool,
+    verbose: bool,
+    caps: "TermCaps",  # noqa: F821
+    bot_name: str,
+    state: _PollRenderState,
+    params: dict,
+    frames,
+    status_stream: "StatusStream | None",
+) -> int:
     counter = 0
     no_plan_since_worker_stopped = 0
     failed_stable_polls = 0
-    frames = spinner_frames(caps)
 
     while True:
         if counter % _POLL_EVERY == 0:
-            try:
-                resp = client.get(
-                    f"/status/{session}",
-                    params={"after": base_task_id, "verbose": str(verbose).lower(), "user": user},
-                )
-                resp.raise_for_status()
-            except Exception:
-                time.sleep(0.08)
-                counter += 1
-                continue
+            data = None
+            if status_stream is not None and status_stream.alive:
+                data = status_stream.snapshot()
+            if data is None:
+                try:
+                    resp = client.get(f"/status/{session}", params=params)
+                    resp.raise_for_status()
+                except Exception:
+                    time.sleep(0.08)
+                    counter += 1
+                    continue
+                data = resp.json()
 
-            data = resp.json()
             plan = data.get("plan")
             worker_running = data.get("worker_running", False)
             tasks = _render_plan_status(data, message_id, quiet, verbose, caps, bot_name, state)
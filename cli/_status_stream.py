@@ -0,0 +1,118 @@
+"""Background subscriber for ``GET /status/{session}/stream``.
+
+Keeps a merged copy of the ``/status`` payload up to date from the
+server's SSE deltas, so ``_poll_status`` can render from memory instead
+of re-fetching ``/status`` every 160 ms. When the stream cannot be
+opened (older server, proxy stripping SSE) or drops, :attr:`alive`
+turns False and the caller falls back to polling.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+
+
+class StatusStream:
+    """SSE reader thread that folds status events into one snapshot."""
+
+    def __init__(self, client, session: str, params: dict) -> None:
+        self._client = client
+        self._session = session
+        self._params = params
+        self._lock = threading.Lock()
+        self._state: dict | None = None
+        self._alive = True
+        self._closed = False
+        self._resp = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"kiso-status-{session}", daemon=True,
+        )
+
+    def start(self) -> "StatusStream":
+        self._thread.start()
+        return self
+
+    @property
+    def alive(self) -> bool:
+        return self._alive
+
+    def snapshot(self) -> dict | None:
+        """Return the latest merged status payload, or None if not ready."""
+        with self._lock:
+            if self._state is None:
+                return None
+            data = dict(self._state)
+            data["tasks"] = list(self._state.get("tasks") or [])
+            return data
+
+    def close(self) -> None:
+        self._closed = True
+        resp = self._resp
+        if resp is not None:
+            try:
+                resp.close()
+            except Exception:
+                pass
+
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            with self._client.stream(
+                "GET", f"/status/{self._session}/stream",
+                params=self._params, timeout=None,
+            ) as resp:
+                if resp.status_code != 200:
+                    return
+                self._resp = resp
+                event = ""
+                data_lines: list[str] = []
+                for line in resp.iter_lines():
+                    if self._closed:
+                        return
+                    if not line:
+                        if event and data_lines:
+                            self._apply(event, json.loads("\n".join(data_lines)))
+                        event, data_lines = "", []
+                    elif line.startswith("event:"):
+                        event = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data_lines.append(line[5:].lstrip())
+        except Exception:
+            pass
+        finally:
+            self._alive = False
+
+    def _apply(self, event: str, data: dict) -> None:
+        with self._lock:
+            if event == "snapshot":
+                self._state = data
+                return
+            state = self._state
+            if state is None:
+                return
+            if event == "tasks":
+                by_id = {t["id"]: t for t in state.get("tasks") or []}
+                for task in data.get("tasks") or []:
+                    by_id[task["id"]] = task
+                state["tasks"] = [by_id[k] for k in sorted(by_id)]
+            elif event == "plan":
+                state["plan"] = data.get("plan")
+            elif event == "worker":
+                state.update(data)
+            elif event == "inflight":
+                state["inflight_call"] = data.get("inflight_call")
+            elif event == "partial":
+                inflight = state.get("inflight_call")
+                if inflight is not None:
+                    inflight = dict(inflight)
+                    if data.get("text"):
+                        inflight["partial_content"] = (
+                            inflight.get("partial_content") or ""
+                        ) + data["text"]
+                    if data.get("reasoning"):
+                        inflight["partial_reasoning"] = (
+                            inflight.get("partial_reasoning") or ""
+                        ) + data["reasoning"]
+                    state["inflight_call"] = inflight
@@ -8,18 +8,22 @@ import sys
 from pathlib import Path
 
 from kiso.config import KISO_DIR
+from kiso.store.usage import ensure_usage_table
 from cli._admin import require_admin
 
 DB_PATH = KISO_DIR / "store.db"
 
 # Tables that contain per-session data with a `session` column
-_SESSION_TABLES = ("messages", "plans", "tasks", "facts", "learnings")
+_SESSION_TABLES = ("messages", "plans", "tasks", "llm_calls", "llm_usage", "facts", "learnings")
 
 # The pending table uses `scope` instead of `session`
 _SESSION_SCOPE_TABLE = "pending"
 
-# All 7 user-data tables
-_ALL_TABLES = ("sessions", "messages", "plans", "tasks", "facts", "learnings", "pending")
+# All 9 user-data tables
+_ALL_TABLES = (
+    "sessions", "messages", "plans", "tasks", "llm_calls", "llm_usage", "facts", "learnings",
+    "pending",
+)
 
 # Knowledge-only tables
 _KNOWLEDGE_TABLES = ("facts", "learnings", "pending")
@@ -41,6 +45,8 @@ def _open_db() -> sqlite3.Connection:
     """Open the store.db with WAL mode."""
     conn = sqlite3.connect(str(DB_PATH))
     conn.execute("PRAGMA journal_mode=WAL")
+    # llm_usage is created by the audit writer on its first row.
+    ensure_usage_table(conn)
     return conn
 
 
@@ -101,7 +107,7 @@ def _reset_knowledge(args) -> None:
 
 
 def _reset_all(args) -> None:
-    """Reset all data: all DB tables + sessions/ + audit/ + .chat_history."""
+    """Reset all data: all DB tables + sessions/ + audit/ + .chat_history + LLM cache."""
     if not _confirm("Reset ALL data? All sessions, knowledge, audit, and history will be deleted.", args.yes):
         print("Aborted.")
         return
@@ -121,9 +127,10 @@ def _reset_all(args) -> None:
         if d.exists():
             shutil.rmtree(d)
 
-    chat_history = KISO_DIR / ".chat_history"
-    if chat_history.exists():
-        chat_history.unlink()
+    for filename in (".chat_history", "llm_cache.db"):
+        f = KISO_DIR / filename
+        if f.exists():
+            f.unlink()
 
     print("All data reset.")
 
@@ -148,7 +155,7 @@ def _reset_factory(args) -> None:
             shutil.rmtree(d)
 
     # Delete individual files
-    for filename in (".chat_history", "server.log", ".last_image_id"):
+    for filename in (".chat_history", "server.log", ".last_image_id", "llm_cache.db"):
         f = KISO_DIR / filename
         if f.exists():
             f.unlink()
@@ -63,6 +63,7 @@ def print_stats(data: dict, *, costs_only: bool = False) -> None:
 
     costs = [estimate_cost(r) for r in rows]
     show_cost = any(c is not None for c in costs)
+    show_cached = any(r.get("cached_tokens") for r in rows)
 
     if costs_only:
         # Cost-focused view: drop token columns, keep key + calls + cost.
@@ -96,22 +97,31 @@ def print_stats(data: dict, *, costs_only: bool = False) -> None:
     calls_w = max(max(len(str(r["calls"])) for r in rows), 5)
     in_w = max(max(len(_fmt_k(r["input_tokens"])) for r in rows), 7)
     out_w = max(max(len(_fmt_k(r["output_tokens"])) for r in rows), 7)
+    cached_w = max(max(len(_fmt_k(r.get("cached_tokens", 0))) for r in rows), 7)
 
+    cached_header = f"  {'cached':>{cached_w}}" if show_cached else ""
     cost_header = "  est. cost" if show_cost else ""
-    sep_len = key_w + 2 + calls_w + 2 + in_w + 2 + out_w + (12 if show_cost else 0)
+    sep_len = (
+        key_w + 2 + calls_w + 2 + in_w + 2 + out_w
+        + (cached_w + 2 if show_cached else 0) + (12 if show_cost else 0)
+    )
 
     print()
-    print(f"  {by:<{key_w}}  {'calls':>{calls_w}}  {'input':>{in_w}}  {'output':>{out_w}}{cost_header}")
+    print(
+        f"  {by:<{key_w}}  {'calls':>{calls_w}}  {'input':>{in_w}}  {'output':>{out_w}}"
+        f"{cached_header}{cost_header}"
+    )
     print("  " + "─" * sep_len)
 
     for r, cost in zip(rows, costs):
+        cached_str = f"  {_fmt_k(r.get('cached_tokens', 0)):>{cached_w}}" if show_cached else ""
         cost_str = f"  {_fmt_cost(cost):>10}" if show_cost else ""
         print(
             f"  {r['key']:<{key_w}}"
             f"  {r['calls']:>{calls_w}}"
             f"  {_fmt_k(r['input_tokens']):>{in_w}}"
             f"  {_fmt_k(r['output_tokens']):>{out_w}}"
-            f"{cost_str}"
+            f"{cached_str}{cost_str}"
         )
 
     print("  " + "─" * sep_len)
@@ -119,6 +129,9 @@ def print_stats(data: dict, *, costs_only: bool = False) -> None:
     total_calls = total.get("calls", 0)
     total_in = total.get("input_tokens", 0)
     total_out = total.get("output_tokens", 0)
+    total_cached_str = (
+        f"  {_fmt_k(total.get('cached_tokens', 0)):>{cached_w}}" if show_cached else ""
+    )
     if show_cost:
         known_costs = [c for c in costs if c is not None]
         total_cost2: float | None = sum(known_costs) if known_costs else None
@@ -131,7 +144,7 @@ def print_stats(data: dict, *, costs_only: bool = False) -> None:
         f"  {total_calls:>{calls_w}}"
         f"  {_fmt_k(total_in):>{in_w}}"
         f"  {_fmt_k(total_out):>{out_w}}"
-        f"{total_cost_str}"
+        f"{total_cached_str}{total_cost_str}"
     )
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from datetime import datetime as _dt, timedelta, timezone as _tz
 
@@ -10,6 +11,7 @@ from fastapi.exceptions import HTTPException
 from pydantic import BaseModel
 
 import kiso.main as main_mod
+from kiso import audit
 
 router = APIRouter()
 
@@ -32,6 +34,13 @@ async def list_cron(
     return {"jobs": jobs}
 
 
+async def _refresh_cron(request: Request, job_id: int) -> None:
+    """Tell the running cron scheduler that *job_id* changed."""
+    scheduler = request.app.state.cron_scheduler
+    if scheduler is not None:
+        await scheduler.refresh(job_id)
+
+
 @router.post("/cron", status_code=201)
 async def create_cron(
     body: CronRequest,
@@ -55,6 +64,7 @@ async def create_cron(
     cron = croniter(body.schedule, now)
     next_run = cron.get_next(datetime).isoformat()
     job_id = await create_cron_job(db, body.session, body.schedule, body.prompt, "admin", next_run)
+    await _refresh_cron(request, job_id)
     return {"id": job_id, "session": body.session, "schedule": body.schedule, "next_run": next_run}
 
 
@@ -71,6 +81,7 @@ async def delete_cron(
     deleted = await delete_cron_job(request.app.state.db, job_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Cron job not found")
+    await _refresh_cron(request, job_id)
     return {"deleted": True, "id": job_id}
 
 
@@ -90,6 +101,7 @@ async def update_cron(
     updated = await update_cron_enabled(request.app.state.db, job_id, enabled)
     if not updated:
         raise HTTPException(status_code=404, detail="Cron job not found")
+    await _refresh_cron(request, job_id)
     return {"id": job_id, "enabled": enabled}
 
 
@@ -107,6 +119,7 @@ async def get_stats(
         raise HTTPException(status_code=400, detail="by must be model, session, or role")
 
     since_dt = _dt.now(_tz.utc) - timedelta(days=since)
+    await asyncio.to_thread(audit.flush)  # include entries still queued
     entries = main_mod.read_audit_entries(main_mod.KISO_DIR / "audit", since=since_dt)
     if session:
         entries = [entry for entry in entries if entry.get("session") == session]
@@ -117,6 +130,7 @@ async def get_stats(
         "errors": sum(row["errors"] for row in rows),
         "input_tokens": sum(row["input_tokens"] for row in rows),
         "output_tokens": sum(row["output_tokens"] for row in rows),
+        "cached_tokens": sum(row["cached_tokens"] for row in rows),
     }
     return {
         "by": by,
@@ -127,6 +141,56 @@ async def get_stats(
     }
 
 
+@router.get("/admin/mcp/pool")
+async def get_mcp_pool(
+    request: Request,
+    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
+    user: str = Query(...),
+):
+    await main_mod._require_admin_with_ratelimit(request, auth, user)
+    manager = main_mod._mcp_manager
+    if manager is None:
+        return {"enabled": False}
+    return {"enabled": True, **manager.pool_stats()}
+
+
+@router.get("/admin/llm/scheduler")
+async def get_llm_scheduler(
+    request: Request,
+    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
+    user: str = Query(...),
+):
+    from kiso.llm_scheduler import scheduler
+
+    await main_mod._require_admin_with_ratelimit(request, auth, user)
+    return scheduler.stats()
+
+
+@router.get("/admin/cron")
+async def get_cron_scheduler(
+    request: Request,
+    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
+    user: str = Query(...),
+):
+    await main_mod._require_admin_with_ratelimit(request, auth, user)
+    scheduler = request.app.state.cron_scheduler
+    if scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **scheduler.stats()}
+
+
+@router.get("/admin/db/pool")
+async def get_db_pool(
+    request: Request,
+    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
+    user: str = Query(...),
+):
+    from kiso.store import db_stats
+
+    await main_mod._require_admin_with_ratelimit(request, auth, user)
+    return db_stats(request.app.state.db)
+
+
 @router.post("/admin/reload-config")
 async def post_reload_config(
     request: Request,
@@ -135,9 +199,8 @@ async def post_reload_config(
 ):
     await main_mod._require_admin_with_ratelimit(request, auth, user)
     try:
-        new_config = main_mod.reload_config()
-        request.app.state.config = new_config
-        main_mod.invalidate_prompt_cache()
+        # Listeners swap app.state.config and drop derived caches.
+        main_mod.config_service.reload()
         return {"reloaded": True}
     except main_mod.ConfigError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -7,6 +7,7 @@ from fastapi.exceptions import HTTPException
 from pydantic import BaseModel
 
 import kiso.main as main_mod
+from kiso.store import commit
 
 router = APIRouter()
 
@@ -58,7 +59,7 @@ async def delete_safety_rule(
         raise HTTPException(status_code=403, detail="Admin access required")
     db = request.app.state.db
     cur = await db.execute("DELETE FROM facts WHERE id = ? AND category = 'safety'", (rule_id,))
-    await db.commit()
+    await commit(db)
     if cur.rowcount == 0:
         raise HTTPException(status_code=404, detail="Safety rule not found")
     return {"deleted": True, "id": rule_id}
@@ -146,5 +147,5 @@ async def delete_knowledge(
             detail=f"Fact {fact_id} is category '{row['category']}', expected '{expected_category}'",
         )
     await db.execute("DELETE FROM facts WHERE id = ?", (fact_id,))
-    await db.commit()
+    await commit(db)
     return {"deleted": True, "id": fact_id}
@@ -8,12 +8,20 @@ import json
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.exceptions import HTTPException
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
 import kiso.main as main_mod
+from kiso.worker.output_capture import get_live_exec, get_live_execs
 
 router = APIRouter()
 
+# Seconds of silence before the status stream sends an SSE comment so
+# proxies keep the connection open; also bounds how stale a stream can
+# get for rows the event bus cannot route (see kiso.events).
+_STREAM_KEEPALIVE_S = 15.0
+# Window for coalescing a burst of events into one DB re-read.
+_STREAM_COALESCE_S = 0.02
+
 
 class SessionRequest(BaseModel):
     session: str
@@ -179,15 +187,7 @@ async def post_msg(
     return {"queued": False, "session": body.session, "untrusted": True, "message_id": msg_id}
 
 
-@router.get("/status/{session}")
-async def get_status(
-    session: str,
-    request: Request,
-    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
-    user: str = Query(...),
-    after: int = Query(0),
-    verbose: bool = Query(False),
-):
+async def _authorize_status(request: Request, auth, session: str, user: str) -> None:
     db = request.app.state.db
     config = request.app.state.config
     resolved = main_mod.resolve_user(config, user, auth.token_name)
@@ -197,45 +197,190 @@ async def get_status(
     if not is_admin:
         await main_mod._require_project_role(db, session, resolved.username, min_role="viewer")
 
-    tasks = await main_mod.get_tasks_for_session(db, session, after=after)
-    plan = await main_mod.get_plan_for_session(db, session)
-    if not verbose:
-        _strip_llm_verbose(tasks, plan)
 
+async def _load_status_rows(db, session: str, after: int, verbose: bool):
+    tasks = await main_mod.get_tasks_for_session(db, session, after=after, transcripts=verbose)
+    plan = await main_mod.get_plan_for_session(db, session, transcripts=verbose)
+    return tasks, plan
+
+
+def _worker_state(session: str) -> dict:
     entry = main_mod._workers.get(session)
     worker_running = entry is not None and not entry.task.done()
-    queue_length = entry.queue.qsize() if entry and not entry.task.done() else 0
-    inflight = main_mod._llm_mod.get_inflight_call(session)
-    if inflight and not verbose:
-        inflight = {k: v for k, v in inflight.items() if k not in ("messages", "partial_content")}
-
     return {
-        "tasks": tasks,
-        "plan": plan,
-        "queue_length": queue_length,
+        "queue_length": entry.queue.qsize() if worker_running else 0,
         "worker_running": worker_running,
-        "active_task": None,
         "worker_phase": main_mod._worker_phases.get(session, main_mod.WORKER_PHASE_IDLE)
         if worker_running
         else main_mod.WORKER_PHASE_IDLE,
-        "inflight_call": inflight,
     }
 
 
-def _strip_llm_verbose(tasks: list[dict], plan: dict | None) -> None:
-    """Remove messages/response from llm_calls to keep default response compact."""
-    for obj in ([plan] if plan else []) + tasks:
-        raw = obj.get("llm_calls")
-        if not raw:
-            continue
-        try:
-            calls = json.loads(raw)
-        except (ValueError, TypeError):
-            continue
-        for call in calls:
-            call.pop("messages", None)
-            call.pop("response", None)
-        obj["llm_calls"] = json.dumps(calls)
+_VERBOSE_INFLIGHT_KEYS = ("messages", "partial_content", "partial_reasoning")
+
+
+def _inflight_view(inflight: dict | None, verbose: bool) -> dict | None:
+    if inflight and not verbose:
+        return {k: v for k, v in inflight.items() if k not in _VERBOSE_INFLIGHT_KEYS}
+    return dict(inflight) if inflight else None
+
+
+def _coalesce_partials(batch: list) -> list:
+    """Merge runs of ``partial`` events into one event per run.
+
+    A batch covers the coalescing window, so a fast stream becomes one
+    SSE ``partial`` per window instead of one per token.
+    """
+    merged: list = []
+    for e in batch:
+        if e.kind == "partial" and merged and merged[-1].kind == "partial":
+            prev = merged[-1]
+            data = dict(prev.data)
+            for key, text in e.data.items():
+                data[key] = data.get(key, "") + text
+            merged[-1] = main_mod._events.Event(prev.session, "partial", data)
+        else:
+            merged.append(e)
+    return merged
+
+
+@router.get("/status/{session}")
+async def get_status(
+    session: str,
+    request: Request,
+    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
+    user: str = Query(...),
+    after: int = Query(0),
+    verbose: bool = Query(False),
+):
+    await _authorize_status(request, auth, session, user)
+    tasks, plan = await _load_status_rows(request.app.state.db, session, after, verbose)
+    state = _worker_state(session)
+    return {
+        "tasks": tasks,
+        "plan": plan,
+        "queue_length": state["queue_length"],
+        "worker_running": state["worker_running"],
+        "active_task": get_live_exec(session),
+        "active_tasks": get_live_execs(session),
+        "worker_phase": state["worker_phase"],
+        "inflight_call": _inflight_view(main_mod._llm_mod.get_inflight_call(session), verbose),
+    }
+
+
+@router.get("/status/{session}/llm-calls")
+async def get_llm_calls(
+    session: str,
+    request: Request,
+    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
+    user: str = Query(...),
+    plan_id: int = Query(...),
+    task_id: int | None = Query(None),
+):
+    """Full LLM call transcripts of one plan (or one of its tasks).
+
+    ``/status`` only carries call summaries; clients fetch prompts and
+    responses here when the user asks to see them.
+    """
+    await _authorize_status(request, auth, session, user)
+    calls = await main_mod.get_llm_calls(
+        request.app.state.db, session, plan_id, task_id,
+    )
+    return {"plan_id": plan_id, "task_id": task_id, "calls": calls}
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/status/{session}/stream")
+async def stream_status(
+    session: str,
+    request: Request,
+    auth: main_mod.AuthInfo = Depends(main_mod.require_auth),
+    user: str = Query(...),
+    after: int = Query(0),
+    verbose: bool = Query(False),
+):
+    """Server-sent events equivalent of ``GET /status/{session}``.
+
+    Sends one ``snapshot`` event with the full ``/status`` payload,
+    then deltas: ``tasks`` (changed task rows only), ``plan``,
+    ``worker`` (running/phase/queue), ``inflight``, ``active_task``
+    (running exec command with its output tail) and — in verbose
+    mode — ``partial`` (streamed LLM output, one merged chunk per
+    coalescing window). The DB is only
+    re-read when the event bus reports a task/plan write.
+    """
+    await _authorize_status(request, auth, session, user)
+    return StreamingResponse(
+        _status_event_stream(request, session, after, verbose),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _status_event_stream(request: Request, session: str, after: int, verbose: bool):
+    db = request.app.state.db
+    # Subscribe once streaming starts (a client gone before then leaves
+    # nothing behind) and before the snapshot read, so no write slips
+    # between the two.
+    sub = main_mod._events.bus.subscribe(session)
+    try:
+        tasks, plan = await _load_status_rows(db, session, after, verbose)
+        sent_tasks = {t["id"]: t for t in tasks}
+        sent_plan = plan
+        sent_worker = _worker_state(session)
+        yield _sse("snapshot", {
+            "tasks": tasks,
+            "plan": plan,
+            **sent_worker,
+            "active_task": get_live_exec(session),
+            "active_tasks": get_live_execs(session),
+            "inflight_call": _inflight_view(main_mod._llm_mod.get_inflight_call(session), verbose),
+        })
+        while True:
+            event = await sub.get(timeout=_STREAM_KEEPALIVE_S)
+            if await request.is_disconnected():
+                break
+            if event is None:
+                # Quiet period: keep proxies happy and resync rows the
+                # bus could not route (e.g. written by another process).
+                yield ": keepalive\n\n"
+                batch = []
+                rows_dirty = True
+            else:
+                await asyncio.sleep(_STREAM_COALESCE_S)
+                batch = [event] + sub.drain()
+                rows_dirty = sub.overflowed or any(e.kind in ("tasks", "plan") for e in batch)
+                sub.overflowed = False
+
+            for e in _coalesce_partials(batch):
+                if e.kind == "inflight":
+                    yield _sse("inflight", {"inflight_call": _inflight_view(e.data, verbose)})
+                elif e.kind == "partial" and verbose:
+                    yield _sse("partial", e.data)
+                elif e.kind == "active_task":
+                    yield _sse("active_task", {
+                        "active_task": e.data, "active_tasks": get_live_execs(session),
+                    })
+            worker = _worker_state(session)
+            if worker != sent_worker:
+                sent_worker = worker
+                yield _sse("worker", worker)
+
+            if not rows_dirty:
+                continue
+            tasks, plan = await _load_status_rows(db, session, after, verbose)
+            changed = [t for t in tasks if sent_tasks.get(t["id"]) != t]
+            if changed:
+                sent_tasks.update((t["id"], t) for t in changed)
+                yield _sse("tasks", {"tasks": changed})
+            if plan != sent_plan:
+                sent_plan = plan
+                yield _sse("plan", {"plan": plan})
+    finally:
+        main_mod._events.bus.unsubscribe(sub)
 
 
 @router.get("/sessions/{session}/info")
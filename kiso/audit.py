@@ -1,4 +1,21 @@
-"""Structured audit logging — JSONL files in ~/.kiso/audit/."""
+"""Structured audit logging — JSONL files in ~/.kiso/audit/.
+
+Without a sink, every entry is written synchronously: open the day's
+file, lock it, append one line, close it. The server instead starts an
+:class:`AuditSink` (:func:`start_sink`). Entries then go into a bounded
+in-memory queue, and a background thread does the expensive work:
+
+- sanitizing entries against secrets, using the cached redactors from
+  :mod:`kiso.security`;
+- appending whatever is queued as one batch to the day's file, which
+  stays open between batches and is reopened when the date changes;
+- mirroring LLM calls into the ``llm_usage`` table when a usage
+  database is configured, with one commit per batch.
+
+A full queue never blocks the caller. The entry is dropped and counted
+instead (:meth:`AuditSink.stats`). :func:`flush` waits until everything
+queued so far is on disk, and :func:`stop_sink` flushes at shutdown.
+"""
 
 from __future__ import annotations
 
@@ -6,9 +23,13 @@ import fcntl
 import json
 import logging
 import os
+import queue
+import sqlite3
+import threading
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import IO
 
 from kiso.config import KISO_DIR
 from kiso.security import sanitize_value
@@ -40,6 +61,8 @@ class LlmAuditEntry:
     output_tokens: int
     duration_ms: int
     status: str
+    cache: str = ""  # "hit" / "miss" for cacheable calls, "" otherwise
+    cached_tokens: int = 0  # input tokens served from the provider's prompt cache
 
 
 @dataclass(frozen=True, slots=True)
@@ -82,6 +105,26 @@ def _ensure_audit_dir(audit_dir: Path) -> None:
     _audit_dir_ready.add(audit_dir)
 
 
+def _open_day_file(path: Path) -> IO[str]:
+    opener = lambda p, flags: os.open(p, flags, 0o600)
+    return open(path, "a", opener=opener)
+
+
+def _sanitize_entry(
+    entry: dict,
+    deploy_secrets: dict[str, str] | None,
+    session_secrets: dict[str, str] | None,
+) -> dict:
+    if not (deploy_secrets or session_secrets):
+        return entry
+    ds = deploy_secrets or {}
+    ss = session_secrets or {}
+    return {
+        key: value if key in _MASK_EXEMPT else sanitize_value(value, ds, ss)
+        for key, value in entry.items()
+    }
+
+
 def _write_entry(
     entry: dict | LlmAuditEntry | TaskAuditEntry | ReviewAuditEntry | WebhookAuditEntry,
     deploy_secrets: dict[str, str] | None = None,
@@ -92,6 +135,7 @@ def _write_entry(
     - Adds ISO 8601 timestamp
     - Sanitizes string fields when secrets are provided
     - Creates audit directory if needed
+    - Hands the entry to the running :class:`AuditSink`, if any
     - Never raises — audit failures are logged and swallowed
     """
     try:
@@ -100,21 +144,19 @@ def _write_entry(
             entry = asdict(entry)
         entry = {**entry, "timestamp": now.isoformat()}
 
-        if deploy_secrets or session_secrets:
-            ds = deploy_secrets or {}
-            ss = session_secrets or {}
-            entry = {
-                key: value if key in _MASK_EXEMPT else sanitize_value(value, ds, ss)
-                for key, value in entry.items()
-            }
+        sink = _sink
+        if sink is not None:
+            sink.submit(_AuditItem(entry, deploy_secrets, session_secrets))
+            return
+
+        entry = _sanitize_entry(entry, deploy_secrets, session_secrets)
 
         audit_dir = KISO_DIR / "audit"
         _ensure_audit_dir(audit_dir)
 
         today = now.strftime("%Y-%m-%d")
         path = audit_dir / f"{today}.jsonl"
-        opener = lambda p, flags: os.open(p, flags, 0o600)
-        with open(path, "a", opener=opener) as f:
+        with _open_day_file(path) as f:
             fcntl.flock(f, fcntl.LOCK_EX)
             try:
                 f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -125,6 +167,212 @@ def _write_entry(
         log.warning("Audit write failed", exc_info=True)
 
 
+@dataclass(slots=True)
+class _AuditItem:
+    entry: dict
+    deploy_secrets: dict[str, str] | None = None
+    session_secrets: dict[str, str] | None = None
+
+
+@dataclass(slots=True)
+class _UsageItem:
+    row: tuple  # (session, role, model, input_tokens, output_tokens, cached_tokens, cost, ts)
+
+
+class AuditSink:
+    """Bounded queue of audit entries, written in batches by a background thread."""
+
+    def __init__(
+        self,
+        audit_dir: Path,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 512,
+        usage_db: Path | None = None,
+    ) -> None:
+        self.audit_dir = audit_dir
+        self.usage_db = usage_db
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._file: IO[str] | None = None
+        self._file_day = ""
+        self._usage_conn: sqlite3.Connection | None = None
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="kiso-audit", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: _AuditItem | _UsageItem) -> bool:
+        """Queue *item*; False (and counted as dropped) when the queue is full."""
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                log.warning("Audit queue full, %d entries dropped so far", self.dropped)
+            return False
+        return True
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """Block until every item queued before the call is written."""
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)  # waits for room: never dropped
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            log.warning("Audit writer did not stop within %.0fs", timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+        }
+
+    # -- writer thread ---------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            while True:
+                items = [self._queue.get()]
+                while len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = self._write_batch(items)
+                if stop:
+                    return
+        finally:
+            self._close_files()
+
+    def _write_batch(self, items: list) -> bool:
+        lines: dict[str, list[str]] = {}
+        usage: list[tuple] = []
+        waiters: list[threading.Event] = []
+        stop = False
+        for item in items:
+            if item is None:
+                stop = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, _UsageItem):
+                usage.append(item.row)
+            else:
+                try:
+                    entry = _sanitize_entry(item.entry, item.deploy_secrets, item.session_secrets)
+                    day = entry["timestamp"][:10]
+                    lines.setdefault(day, []).append(json.dumps(entry, ensure_ascii=False) + "\n")
+                except Exception:
+                    log.warning("Audit entry dropped: cannot serialise", exc_info=True)
+        for day, day_lines in lines.items():
+            try:
+                self._append(day, day_lines)
+                self.written += len(day_lines)
+            except Exception:
+                log.warning("Audit write failed", exc_info=True)
+        if usage:
+            self._record_usage(usage)
+        self.batches += 1
+        for done in waiters:
+            done.set()
+        return stop
+
+    def _append(self, day: str, lines: list[str]) -> None:
+        if self._file is None or self._file_day != day:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            _ensure_audit_dir(self.audit_dir)
+            self._file = _open_day_file(self.audit_dir / f"{day}.jsonl")
+            self._file_day = day
+        f = self._file
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.writelines(lines)
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _record_usage(self, rows: list[tuple]) -> None:
+        from kiso.store.usage import ensure_usage_table, record_usage
+
+        try:
+            if self._usage_conn is None:
+                self._usage_conn = sqlite3.connect(str(self.usage_db), timeout=5)
+                ensure_usage_table(self._usage_conn)
+            for session, role, model, prompt, completion, cached, cost, ts in rows:
+                record_usage(
+                    self._usage_conn, session=session, role=role, model=model,
+                    prompt_tokens=prompt, completion_tokens=completion,
+                    cost_usd=cost, ts=ts, cached_tokens=cached,
+                )
+            self._usage_conn.commit()
+        except Exception:
+            log.warning("Usage mirror write of %d row(s) failed", len(rows), exc_info=True)
+
+    def _close_files(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._usage_conn is not None:
+            self._usage_conn.close()
+            self._usage_conn = None
+
+
+_sink: AuditSink | None = None
+
+
+def start_sink(
+    audit_dir: Path | None = None,
+    *,
+    max_queue: int = 10_000,
+    usage_db: Path | None = None,
+) -> AuditSink:
+    """Route audit writes through a background :class:`AuditSink`."""
+    global _sink
+    stop_sink()
+    sink = AuditSink(
+        audit_dir if audit_dir is not None else KISO_DIR / "audit",
+        max_queue=max_queue, usage_db=usage_db,
+    )
+    sink.start()
+    _sink = sink
+    return sink
+
+
+def stop_sink() -> None:
+    """Flush and stop the running sink; later writes are synchronous again."""
+    global _sink
+    sink, _sink = _sink, None
+    if sink is not None:
+        sink.stop()
+
+
+def flush(timeout: float | None = 10.0) -> None:
+    """Wait until queued audit entries are on disk (no-op without a sink)."""
+    sink = _sink
+    if sink is not None:
+        sink.flush(timeout)
+
+
+def get_sink() -> AuditSink | None:
+    return _sink
+
+
 def log_llm_call(
     session: str,
     role: str,
@@ -134,8 +382,15 @@ def log_llm_call(
     output_tokens: int,
     duration_ms: int,
     status: str,
+    cache: str = "",
+    cached_tokens: int = 0,
 ) -> None:
-    """Log an LLM call."""
+    """Log an LLM call.
+
+    *cache* is ``"hit"`` or ``"miss"`` when the role's responses are
+    cached (see ``kiso/llm_cache.py``). *cached_tokens* is the part of
+    *input_tokens* the provider served from its prompt-prefix cache.
+    """
     _write_entry(LlmAuditEntry(
         type="llm",
         session=session,
@@ -146,17 +401,29 @@ def log_llm_call(
         output_tokens=output_tokens,
         duration_ms=duration_ms,
         status=status,
+        cache=cache,
+        cached_tokens=cached_tokens,
     ))
-    # Mirror into the dedicated llm_usage SQLite table if a recorder
-    # callback is installed. Cost resolution is the recorder's job
-    # (uses kiso/stats.py::compute_cost).
-    if _usage_recorder is not None and status != "error":
-        try:
-            from kiso.stats import compute_cost
-            cost = compute_cost(model, input_tokens, output_tokens)
+    # Mirror into the dedicated llm_usage SQLite table: batched by the
+    # sink when it has a usage database, else through the recorder
+    # callback if one is installed.
+    sink = _sink
+    mirror = sink is not None and sink.usage_db is not None
+    if status == "error" or not (mirror or _usage_recorder is not None):
+        return
+    try:
+        from kiso.stats import compute_cost
+        cost = compute_cost(model, input_tokens, output_tokens, cached_tokens)
+        if mirror:
+            from kiso.store.usage import _now_iso
+            sink.submit(_UsageItem((
+                session, role, model, input_tokens, output_tokens, cached_tokens,
+                cost, _now_iso(),
+            )))
+        else:
             _usage_recorder(session, role, model, input_tokens, output_tokens, cost)
-        except Exception:  # pragma: no cover — best-effort
-            log.debug("usage recorder failed", exc_info=True)
+    except Exception:  # pragma: no cover — best-effort
+        log.debug("usage recorder failed", exc_info=True)
 
 
 def log_task(
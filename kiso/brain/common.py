@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import heapq
 import json
 import logging
+import math
 import re
+import weakref
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
@@ -17,6 +21,7 @@ from .prompts import (
     _ANSWER_IN_LANG_RE,
     _add_context_section,
     _add_section,
+    _build_layered_messages,
     _build_messages,
     _build_messages_from_sections,
 )
@@ -26,7 +31,8 @@ from kiso.security import fence_content
 from kiso.store import (
     _normalize_entity_name,
     delete_facts, get_all_entities, get_all_tags, get_facts, get_kv, get_pending_items,
-    get_behavior_facts, get_recent_messages, get_safety_facts, get_session, search_facts,
+    get_behavior_facts, get_recent_messages, get_safety_facts, get_session, hashed_features,
+    search_facts,
     search_facts_by_entity, search_facts_by_tags, search_facts_scored,
     set_kv, update_fact_content,
 )
@@ -724,6 +730,13 @@ async def _retry_llm_with_validation(
     attempt = 0
     active_model: str | None = None  # None means use default from config
 
+    def _cache_accept(raw: str) -> bool:
+        # Only answers that would be accepted below may be cached.
+        try:
+            return not validate_fn(json.loads(_repair_json(raw)))
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            return False
+
     while attempt < max_total:
         attempt += 1
 
@@ -737,6 +750,7 @@ async def _retry_llm_with_validation(
             raw = await call_llm(
                 config, role, messages, response_format=schema,
                 session=session, model_override=active_model,
+                cache_accept=_cache_accept,
             )
         except LLMStallError as e:
             # stall = provider-level issue — retry on same model is futile.
@@ -1172,6 +1186,13 @@ _CONTEXT_POOL_SECTIONS: tuple[tuple[str, str], ...] = (
     ("plan_outputs", "Plan Outputs"),
 )
 
+# Context pool entries that only change when plugins, connectors or the
+# host change — rendered ahead of the per-message sections (see
+# build_briefer_messages).
+_STABLE_POOL_KEYS = frozenset({
+    "skills", "mcp_methods", "mcp_resources", "mcp_prompts", "connectors", "system_env",
+})
+
 
 def filter_skills_by_user(
     skill_names: list[str],
@@ -1286,6 +1307,12 @@ _MCP_TYPE_LABELS = {
 }
 
 
+# Rendered method catalog per manager: ((catalog_version, servers), text).
+_mcp_catalog_renders: "weakref.WeakKeyDictionary[Any, tuple[tuple, str]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 def format_mcp_catalog(manager: "Any") -> str:
     """Render an MCPManager-like object's *cached* catalog as briefer text.
 
@@ -1303,7 +1330,9 @@ def format_mcp_catalog(manager: "Any") -> str:
     deterministically.
 
     *Cached only*: never spawns a server. Calls ``available_servers()``
-    and ``list_methods_cached_only(name)`` per server.
+    and ``list_methods_cached_only(name)`` per server. Managers exposing
+    ``catalog_version()`` get their rendered text reused until the
+    version or the set of servers with live cache entries changes.
     """
     if manager is None:
         return ""
@@ -1311,13 +1340,38 @@ def format_mcp_catalog(manager: "Any") -> str:
         servers = manager.available_servers()
     except Exception:  # pragma: no cover — defensive
         return ""
-    lines: list[str] = []
-    consumers: dict[str, list[str]] = {}
+    cached: list[tuple[str, list]] = []
     for server in sorted(servers):
         try:
             methods = manager.list_methods_cached_only(server)
         except Exception:  # pragma: no cover — defensive
             continue
+        if methods:
+            cached.append((server, methods))
+
+    key = None
+    version_fn = getattr(manager, "catalog_version", None)
+    if callable(version_fn):
+        version = version_fn()
+        if isinstance(version, int):
+            key = (version, tuple(server for server, _ in cached))
+            try:
+                hit = _mcp_catalog_renders.get(manager)
+            except TypeError:  # not hashable / weak-referenceable
+                key = hit = None
+            if hit is not None and hit[0] == key:
+                return hit[1]
+
+    text = _render_mcp_catalog(cached)
+    if key is not None:
+        _mcp_catalog_renders[manager] = (key, text)
+    return text
+
+
+def _render_mcp_catalog(cached: list[tuple[str, list]]) -> str:
+    lines: list[str] = []
+    consumers: dict[str, list[str]] = {}
+    for server, methods in cached:
         for m in methods:
             lines.append(_format_mcp_method_line(server, m))
             ext = parse_x_kiso_extension(m.description or "")
@@ -1326,10 +1380,12 @@ def format_mcp_catalog(manager: "Any") -> str:
                     consumers.setdefault(kind, []).append(
                         f"{server}:{m.name}"
                     )
+    return _join_mcp_catalog(lines, consumers)
+
 
+def _join_mcp_catalog(lines: list[str], consumers: dict[str, list[str]]) -> str:
     if not consumers:
         return "\n".join(lines)
-
     header: list[str] = ["## File processing"]
     for kind in sorted(consumers):
         names = ", ".join(sorted(consumers[kind]))
@@ -1338,6 +1394,118 @@ def format_mcp_catalog(manager: "Any") -> str:
     return "\n".join(header + lines)
 
 
+_MCP_FILE_HEADER = "## File processing"
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_IDENT_SEP_RE = re.compile(r"[_\-.:/]+")
+_MCP_STOP_WORDS = frozenset(
+    "about and any are can could for from have how into its not our please "
+    "that the their then there this those use using what when which will "
+    "with would you your".split()
+)
+
+
+def _mcp_search_text(text: str) -> str:
+    """Split identifiers (``read_file``, ``listIssues``) into plain words,
+    dropping short and stop words."""
+    words = _IDENT_SEP_RE.sub(" ", _CAMEL_RE.sub(" ", text)).lower().split()
+    return " ".join(w for w in words if len(w) > 2 and w not in _MCP_STOP_WORDS)
+
+
+class _MCPCatalogIndex:
+    """Hashed-feature index over the method lines of one rendered catalog.
+
+    Each method is indexed by its name, argument names, description and
+    the content types it ``consumes``, using the same sparse vectors as
+    the fact index (:func:`kiso.store.hashed_features`).
+    """
+
+    def __init__(self, catalog_text: str) -> None:
+        self.entries: list[tuple[str, str]] = []  # (qualified name, line)
+        self.consumers: dict[str, list[str]] = {}
+        in_header = False
+        for line in catalog_text.splitlines():
+            if line == _MCP_FILE_HEADER:
+                in_header = True
+                continue
+            if in_header:
+                if not line:
+                    in_header = False
+                elif line.startswith("- ") and ":" in line:
+                    kind, _, names = line[2:].partition(": ")
+                    self.consumers[kind] = [n.strip() for n in names.split(",") if n.strip()]
+                continue
+            m = _POOL_NAME_RE.match(line)
+            if m:
+                self.entries.append((m.group(1).split("(", 1)[0], line))
+
+        kinds_by_name: dict[str, list[str]] = {}
+        for kind, names in self.consumers.items():
+            for name in names:
+                kinds_by_name.setdefault(name, []).append(kind)
+        self._postings: dict[int, dict[int, float]] = {}
+        for i, (name, line) in enumerate(self.entries):
+            # Content types count double: a message naming a file type
+            # is a strong hint even against a long description.
+            doc = " ".join([line[2:], *kinds_by_name.get(name, []) * 2])
+            for b, w in hashed_features(_mcp_search_text(doc)).items():
+                self._postings.setdefault(b, {})[i] = w
+
+    def search(self, query: str, k: int) -> list[int]:
+        """Positions of the *k* best entries; empty when none reaches
+        ``_MCP_SELECT_MIN_SCORE``."""
+        n = len(self.entries)
+        scores: dict[int, float] = {}
+        for b, qw in hashed_features(_mcp_search_text(query)).items():
+            posting = self._postings.get(b)
+            if not posting:
+                continue
+            weight = qw * math.log(1 + n / len(posting))
+            for i, dw in posting.items():
+                scores[i] = scores.get(i, 0.0) + weight * dw
+        ranked = heapq.nsmallest(k, scores.items(), key=lambda x: (-x[1], x[0]))
+        if not ranked or ranked[0][1] < _MCP_SELECT_MIN_SCORE:
+            return []
+        return [i for i, _ in ranked]
+
+
+# A message whose best method scores below this matches nothing (shared
+# trigrams alone stay under it).
+_MCP_SELECT_MIN_SCORE = 0.3
+
+
+@functools.lru_cache(maxsize=8)
+def _mcp_catalog_index(catalog_text: str) -> _MCPCatalogIndex:
+    return _MCPCatalogIndex(catalog_text)
+
+
+def select_mcp_catalog(catalog_text: str, query: str, top_k: int) -> str:
+    """Keep the *top_k* catalog methods most relevant to *query*.
+
+    Catalogs of at most *top_k* methods, ``top_k <= 0`` and queries that
+    match no method return *catalog_text* unchanged, so a miss falls back
+    to the full list. Selected lines keep their catalog order and the
+    "File processing" summary is narrowed to the selected methods. The
+    index is built once per distinct catalog text.
+    """
+    if top_k <= 0 or not catalog_text or not query.strip():
+        return catalog_text
+    index = _mcp_catalog_index(catalog_text)
+    if len(index.entries) <= top_k:
+        return catalog_text
+    picked = index.search(query, top_k)
+    if not picked:
+        return catalog_text
+    picked.sort()
+    selected = [index.entries[i] for i in picked]
+    names = {name for name, _ in selected}
+    consumers = {
+        kind: kept
+        for kind, members in index.consumers.items()
+        if (kept := [n for n in members if n in names])
+    }
+    return _join_mcp_catalog([line for _, line in selected], consumers)
+
+
 _MCP_RESOURCE_LINE_BUDGET = 200
 
 
@@ -1545,12 +1713,15 @@ def build_briefer_messages(
     # to save ~400 tokens per briefer call for these simple consumers.
     _simple_consumer = consumer_role in ("messenger", "worker")
 
+    # Module list and catalogs lead the prompt as its cacheable prefix;
+    # role, task and session context follow.
+    stable: list[str] = []
+    if not _simple_consumer:
+        stable.append(f"## Available Modules\n{_BRIEFER_MODULES_STR}")
     parts: list[str] = [
         f"## Consumer Role\n{consumer_role}",
         f"## Task\n{task_description}",
     ]
-    if not _simple_consumer:
-        parts.append(f"## Available Modules\n{_BRIEFER_MODULES_STR}")
 
     # skip sections irrelevant for simple consumers
     _skip_keys = {"wrappers", "system_env", "connectors"} if _simple_consumer else set()
@@ -1559,9 +1730,9 @@ def build_briefer_messages(
         if key in _skip_keys:
             continue
         if val := pool.get(key):
-            parts.append(f"## {heading}\n{val}")
+            (stable if key in _STABLE_POOL_KEYS else parts).append(f"## {heading}\n{val}")
 
-    return _build_messages_from_sections(system_prompt, parts)
+    return _build_layered_messages(system_prompt, stable, parts)
 
 
 _BRIEFING_ARRAY_FIELDS: tuple[str, ...] = (
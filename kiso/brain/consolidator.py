@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import zlib
 
 import aiosqlite
 
-from kiso.config import Config
-from kiso.store import delete_facts, get_all_entities, get_facts, update_fact_content
+from kiso.config import Config, setting_int
+from kiso.store import (
+    apply_fact_changes,
+    find_similar_facts,
+    get_all_entities,
+    get_changed_facts,
+    get_fact_rev,
+    get_facts_for_entities,
+    get_kv,
+)
+from kiso.store.knowledge import _CONSOLIDATION_REV_KV_KEY
+from kiso.store.shared import _dedup_words, _word_set_overlap
 
 from .common import (
     _build_messages,
@@ -18,6 +30,25 @@ from .common import (
 
 log = logging.getLogger("kiso.brain")
 
+# Word-set Jaccard above which two facts are treated as possible
+# duplicates (the same bar ``save_learning`` dedups at).
+_SIMILARITY_THRESHOLD = 0.55
+# FTS neighbours looked up per changed fact.
+_NEIGHBOURS_PER_FACT = 5
+# MinHash LSH: 16 hashes in 8 bands of 2 rows, so pairs around the
+# threshold collide in at least one band with high probability.
+_MINHASH_BANDS = 8
+_MINHASH_ROWS = 2
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_PARAMS = [
+    (zlib.crc32(f"a{i}".encode()) | 1, zlib.crc32(f"b{i}".encode()))
+    for i in range(_MINHASH_BANDS * _MINHASH_ROWS)
+]
+# Members of one LSH bucket verified against each new arrival.
+_MAX_BUCKET_CHECKS = 50
+# Shards sent to the LLM at the same time.
+_SHARD_CONCURRENCY = 4
+
 _IMPORTED_NAMES = set(globals())
 
 class ConsolidatorError(Exception):
@@ -97,48 +128,202 @@ def _group_facts_by_entity(
     return grouped
 
 
-async def run_consolidator(
-    config: Config, db: aiosqlite.Connection, session: str = "",
-) -> dict:
-    """Run the consolidator on all stored facts.
+def _minhash(words: set[str]) -> tuple[int, ...]:
+    hashes = [zlib.crc32(w.encode()) for w in words]
+    return tuple(
+        min((a * h + b) % _MINHASH_PRIME for h in hashes)
+        for a, b in _MINHASH_PARAMS
+    )
+
+
+def cluster_facts(facts: list[dict]) -> list[list[dict]]:
+    """Group *facts* that may need to be reviewed together.
 
-    Returns dict with keys: delete, update, keep.
-    Raises ConsolidatorError if all retries exhausted.
+    Facts sharing an entity always land in the same cluster; others are
+    joined when MinHash LSH flags them and their word overlap (see
+    ``_word_overlap_ratio``) reaches :data:`_SIMILARITY_THRESHOLD`.
+    Clusters come back largest first, members ordered by id.
     """
-    all_facts = await get_facts(db, is_admin=True)
-    if not all_facts:
-        return {"delete": [], "update": [], "keep": []}
+    parent = list(range(len(facts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    by_entity: dict[int, int] = {}
+    buckets: dict[tuple, list[int]] = {}
+    words = [_dedup_words(f["content"]) for f in facts]
+    for i, f in enumerate(facts):
+        entity_id = f.get("entity_id")
+        if entity_id is not None:
+            if entity_id in by_entity:
+                union(by_entity[entity_id], i)
+            else:
+                by_entity[entity_id] = i
+        if not words[i]:
+            continue
+        sig = _minhash(words[i])
+        for band in range(_MINHASH_BANDS):
+            key = (band, sig[band * _MINHASH_ROWS:(band + 1) * _MINHASH_ROWS])
+            members = buckets.setdefault(key, [])
+            for j in members[:_MAX_BUCKET_CHECKS]:
+                if find(i) != find(j) and (
+                    _word_set_overlap(words[i], words[j]) >= _SIMILARITY_THRESHOLD
+                ):
+                    union(i, j)
+            members.append(i)
+
+    clusters: dict[int, list[dict]] = {}
+    for i, f in enumerate(facts):
+        clusters.setdefault(find(i), []).append(f)
+    result = [sorted(c, key=lambda f: f["id"]) for c in clusters.values()]
+    result.sort(key=lambda c: (-len(c), c[0]["id"]))
+    return result
+
 
-    entities = await get_all_entities(db)
-    facts_by_entity = _group_facts_by_entity(all_facts, entities)
-    messages = build_consolidator_messages(facts_by_entity)
-    expected_ids = {f["id"] for f in all_facts}
+def pack_shards(clusters: list[list[dict]], shard_size: int) -> list[list[dict]]:
+    """First-fit *clusters* into shards of at most *shard_size* facts.
 
-    result = await _retry_llm_with_validation(
-        config, "consolidator", messages, CONSOLIDATOR_SCHEMA,
+    A cluster larger than a shard is cut into consecutive pieces, grouped
+    by entity so siblings stay together as far as possible.
+    """
+    pieces: list[list[dict]] = []
+    for cluster in clusters:
+        if len(cluster) <= shard_size:
+            pieces.append(cluster)
+            continue
+        ordered = sorted(cluster, key=lambda f: (f.get("entity_id") or 0, f["id"]))
+        pieces.extend(
+            ordered[i:i + shard_size] for i in range(0, len(ordered), shard_size)
+        )
+    shards: list[list[dict]] = []
+    for piece in sorted(pieces, key=len, reverse=True):
+        for shard in shards:
+            if len(shard) + len(piece) <= shard_size:
+                shard.extend(piece)
+                break
+        else:
+            shards.append(list(piece))
+    return shards
+
+
+async def _collect_candidates(
+    db: aiosqlite.Connection, changed: list[dict], full: bool,
+) -> list[dict]:
+    """Changed facts plus the stored facts they could clash with."""
+    pool = {f["id"]: f for f in changed}
+    entity_ids = [f["entity_id"] for f in changed if f.get("entity_id") is not None]
+    if entity_ids:
+        for f in await get_facts_for_entities(db, entity_ids):
+            pool.setdefault(f["id"], f)
+    if not full:
+        for f in changed:
+            words = _dedup_words(f["content"])
+            for other in await find_similar_facts(db, f["content"], _NEIGHBOURS_PER_FACT):
+                if other["id"] in pool:
+                    continue
+                if _word_set_overlap(words, _dedup_words(other["content"])) >= _SIMILARITY_THRESHOLD:
+                    pool[other["id"]] = other
+    return list(pool.values())
+
+
+async def _consolidate_shard(
+    config: Config,
+    shard: list[dict],
+    entities: list[dict],
+    session: str,
+) -> dict:
+    messages = build_consolidator_messages(_group_facts_by_entity(shard, entities))
+    expected_ids = {f["id"] for f in shard}
+    return await _retry_llm_with_validation(
+        config, "consolidator", messages,
+        CONSOLIDATOR_SCHEMA,
         lambda r: validate_consolidator(r, expected_ids),
         ConsolidatorError, "Consolidator",
         session=session,
     )
+
+
+async def run_consolidator(
+    config: Config, db: aiosqlite.Connection, session: str = "",
+) -> dict:
+    """Review the facts written since the last run.
+
+    Only facts stamped after the ``consolidation_fact_rev`` watermark are
+    picked up (every fact on the first run), together with the facts of
+    their entities and their near-duplicates.  Candidates are clustered
+    locally and sent in shards of at most ``consolidation_shard_size``
+    facts, several at a time.  Facts with nothing to compare against
+    fill up the shards, so every new fact still gets a quality review.
+
+    Returns dict with keys: delete, update, keep, and ``rev`` — the
+    watermark to store once the result is applied, or None when some
+    shards failed and the same changes must be retried next time.
+    Raises ConsolidatorError if every shard exhausted its retries.
+    """
+    raw_rev = await get_kv(db, _CONSOLIDATION_REV_KV_KEY)
+    since = int(raw_rev) if raw_rev else None
+    rev = await get_fact_rev(db)
+    changed = await get_changed_facts(db, since)
+    if not changed:
+        return {"delete": [], "update": [], "keep": [], "rev": rev}
+
+    candidates = await _collect_candidates(db, changed, full=since is None)
+    clusters = cluster_facts(candidates)
+    shard_size = setting_int(config.settings, "consolidation_shard_size", lo=2)
+    shards = pack_shards(clusters, shard_size)
+
+    entities = await get_all_entities(db) if shards else []
+    sem = asyncio.Semaphore(_SHARD_CONCURRENCY)
+
+    async def _run(shard: list[dict]) -> dict:
+        async with sem:
+            return await _consolidate_shard(config, shard, entities, session)
+
+    outcomes = await asyncio.gather(
+        *(_run(shard) for shard in shards), return_exceptions=True,
+    )
+    result: dict = {"delete": [], "update": [], "keep": [], "rev": rev}
+    failures = 0
+    for outcome in outcomes:
+        if isinstance(outcome, ConsolidatorError):
+            failures += 1
+            log.warning("Consolidator shard failed: %s", outcome)
+            continue
+        if isinstance(outcome, BaseException):
+            raise outcome
+        for key in ("delete", "update", "keep"):
+            result[key].extend(outcome.get(key, []))
+    if failures:
+        if failures == len(shards):
+            raise ConsolidatorError(f"All {failures} consolidator shards failed")
+        result["rev"] = None
     log.info(
-        "Consolidator: delete=%d update=%d keep=%d",
+        "Consolidator: changed=%d candidates=%d shards=%d failed=%d "
+        "delete=%d update=%d keep=%d",
+        len(changed), len(candidates), len(shards), failures,
         len(result["delete"]), len(result["update"]), len(result["keep"]),
     )
     return result
 
 
 async def apply_consolidation_result(db: aiosqlite.Connection, result: dict) -> None:
-    """Apply consolidator result: delete and update facts."""
-    # Deletions
-    to_delete = result.get("delete", [])
-    if to_delete:
-        await delete_facts(db, to_delete)
-
-    # Updates
-    for item in result.get("update", []):
-        content = item.get("content", "").strip()
-        if content:
-            await update_fact_content(db, item["id"], content)
+    """Apply consolidator result in one transaction, advancing the watermark."""
+    updates = [
+        (item["id"], item.get("content", "").strip())
+        for item in result.get("update", [])
+        if item.get("content", "").strip()
+    ]
+    await apply_fact_changes(
+        db, list(result.get("delete", [])), updates, rev=result.get("rev"),
+    )
 
 
 __brain_exports__ = [
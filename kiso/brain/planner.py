@@ -22,10 +22,9 @@ from kiso.skill_runtime import (
 from kiso.security import fence_content
 from kiso.trust_store import load_trust_store
 from kiso.store import (
-    _normalize_entity_name,
-    get_all_entities,
     get_all_tags,
     get_behavior_facts,
+    get_entity_index,
     get_pending_items,
     get_recent_messages,
     get_safety_facts,
@@ -66,7 +65,7 @@ from .common import (
     _add_context_section,
     _add_section,
     _build_install_mode_context,
-    _build_messages,
+    _build_layered_messages,
     _build_planner_memory_pack,
     _classify_install_mode,
     _format_pending_items,
@@ -82,6 +81,7 @@ from .common import (
     format_mcp_prompts,
     format_mcp_resources,
     run_briefer,
+    select_mcp_catalog,
 )
 
 if TYPE_CHECKING:
@@ -735,7 +735,7 @@ async def _gather_planner_context(
     context_pool["system_env"] = sys_env_full
 
     # inject available entities for briefer selection, enriched with fact tags
-    all_entities = await get_all_entities(db)
+    all_entities = (await get_entity_index(db)).entities
     if all_entities:
         # collect fact tags per entity so the briefer knows what each contains
         entity_ids = [e["id"] for e in all_entities]
@@ -776,7 +776,62 @@ async def _gather_planner_context(
     )
 
 
-async def build_planner_messages(
+@dataclass
+class PlannerPreparation:
+    """Planner inputs that do not depend on the classifier's verdict.
+
+    Built by :func:`prepare_planner`: the gathered session context, the
+    briefer's context pool and, when the briefer is enabled, its
+    briefing. ``_process_message`` builds it while the classifier is
+    still running and hands it to :func:`run_planner`.
+    """
+
+    state: PlannerPromptState
+    context_pool: dict
+    installed_skills: list
+    install_mode_ctx: str
+    briefing: dict | None = None
+
+
+def _mcp_catalog_texts(mcp_manager: "Any | None") -> tuple[str | None, str | None, str | None]:
+    """Method, resource and prompt catalogs of *mcp_manager* (all None without one)."""
+    if not mcp_manager:
+        return None, None, None
+    return (
+        format_mcp_catalog(mcp_manager),
+        format_mcp_resources(mcp_manager),
+        format_mcp_prompts(mcp_manager),
+    )
+
+
+async def prepare_planner(
+    db: aiosqlite.Connection,
+    config: Config,
+    session: str,
+    user_role: str,
+    new_message: str,
+    user_mcp: str | list[str] | None = None,
+    user_skills: str | list[str] | None = None,
+    paraphrased_context: str | None = None,
+    mcp_manager: "Any | None" = None,
+) -> PlannerPreparation:
+    """Gather planner context and run the briefer for a first plan.
+
+    Pass the result to :func:`run_planner` as ``prepared`` with the same
+    arguments.
+    """
+    catalog, resources, prompts = _mcp_catalog_texts(mcp_manager)
+    return await _prepare_planner_context(
+        db, config, session, user_role, new_message,
+        user_mcp=user_mcp, user_skills=user_skills,
+        paraphrased_context=paraphrased_context,
+        mcp_catalog_text=catalog,
+        mcp_resources_text=resources,
+        mcp_prompts_text=prompts,
+    )
+
+
+async def _prepare_planner_context(
     db: aiosqlite.Connection,
     config: Config,
     session: str,
@@ -786,33 +841,15 @@ async def build_planner_messages(
     user_skills: str | list[str] | None = None,
     paraphrased_context: str | None = None,
     is_replan: bool = False,
-    install_approved: bool = False,
-    investigate: bool = False,
     mcp_catalog_text: str | None = None,
     mcp_resources_text: str | None = None,
     mcp_prompts_text: str | None = None,
-    out_state: "dict | None" = None,
-) -> list[dict]:
-    """Build the message list for the planner LLM call.
-
-    Assembles context from session summary, facts, pending questions,
-    system environment, skills/MCP catalogs, and recent messages.
-
-    When ``briefer_enabled`` is True in config, calls the briefer LLM to
-    select prompt modules and synthesize context. Falls back to full
-    context on briefer failure.
-    """
+) -> PlannerPreparation:
+    """Context gathering, skill/MCP catalogs and the briefer call."""
     planner_state = await _gather_planner_context(
         db, config, session, user_role, new_message, paraphrased_context,
     )
-    summary = planner_state.summary
-    facts = planner_state.facts
-    pending = planner_state.pending
-    recent = planner_state.recent
     context_pool: dict = dict(planner_state.context_sections)
-    sys_env_essential = planner_state.sys_env_essential
-    sys_env_full = planner_state.sys_env_full
-    install_ctx = planner_state.install_context
 
     # system env doesn't change between plan and replan — exclude from
     # briefer context pool to reduce redundant tokens.
@@ -871,6 +908,15 @@ async def build_planner_messages(
             user_role=user_role,
             user_mcp_allow=user_mcp,
         )
+        # Large inventories: only the methods most relevant to the
+        # message reach the briefer and planner (full list on a miss).
+        # Replan keeps the full list, like the skill pre-filter above.
+        if not is_replan:
+            mcp_catalog_text = select_mcp_catalog(
+                mcp_catalog_text,
+                new_message,
+                setting_int(config.settings, "mcp_catalog_top_k", lo=0, hi=1000),
+            )
         if mcp_catalog_text:
             context_pool["mcp_methods"] = mcp_catalog_text
 
@@ -923,6 +969,70 @@ async def build_planner_messages(
         except Exception as exc:
             log.warning("Briefer failed for planner, falling back to full context: %s", exc)
 
+    return PlannerPreparation(
+        state=planner_state,
+        context_pool=context_pool,
+        installed_skills=installed_skills,
+        install_mode_ctx=install_mode_ctx,
+        briefing=briefing,
+    )
+
+
+async def build_planner_messages(
+    db: aiosqlite.Connection,
+    config: Config,
+    session: str,
+    user_role: str,
+    new_message: str,
+    user_mcp: str | list[str] | None = None,
+    user_skills: str | list[str] | None = None,
+    paraphrased_context: str | None = None,
+    is_replan: bool = False,
+    install_approved: bool = False,
+    investigate: bool = False,
+    mcp_catalog_text: str | None = None,
+    mcp_resources_text: str | None = None,
+    mcp_prompts_text: str | None = None,
+    out_state: "dict | None" = None,
+    prepared: "PlannerPreparation | None" = None,
+) -> list[dict]:
+    """Build the message list for the planner LLM call.
+
+    Assembles context from session summary, facts, pending questions,
+    system environment, skills/MCP catalogs, and recent messages.
+
+    When ``briefer_enabled`` is True in config, calls the briefer LLM to
+    select prompt modules and synthesize context. Falls back to full
+    context on briefer failure.
+
+    *prepared* is the result of an earlier :func:`prepare_planner` call
+    for the same message; when given, context gathering and the briefer
+    are not run again.
+
+    Sections that rarely change between calls lead the user message as
+    its cacheable prefix; the per-message sections follow, ending with
+    the new message.
+    """
+    if prepared is None:
+        prepared = await _prepare_planner_context(
+            db, config, session, user_role, new_message,
+            user_mcp=user_mcp, user_skills=user_skills,
+            paraphrased_context=paraphrased_context, is_replan=is_replan,
+            mcp_catalog_text=mcp_catalog_text,
+            mcp_resources_text=mcp_resources_text,
+            mcp_prompts_text=mcp_prompts_text,
+        )
+    planner_state = prepared.state
+    facts = planner_state.facts
+    context_pool = prepared.context_pool
+    sys_env_essential = planner_state.sys_env_essential
+    sys_env_full = planner_state.sys_env_full
+    install_ctx = planner_state.install_context
+    installed_skills = prepared.installed_skills
+    install_mode_ctx = prepared.install_mode_ctx
+    briefing = prepared.briefing
+    msg_lower = new_message.lower()
+
     # session_files module when files exist in workspace
     _has_session_files = "session_files" in context_pool
 
@@ -966,16 +1076,15 @@ async def build_planner_messages(
     if briefing:
         entity_id = None
         if briefing.get("relevant_entities"):
-            all_entities = await get_all_entities(db)
-            entity_map = {_normalize_entity_name(e["name"]): e["id"] for e in all_entities}
+            entity_index = await get_entity_index(db)
             # filter out hallucinated entity names
             valid_entities = []
             for ename in briefing["relevant_entities"]:
-                eid = entity_map.get(_normalize_entity_name(ename))
-                if eid is not None:
+                entity = entity_index.lookup(ename)
+                if entity is not None:
                     valid_entities.append(ename)
                     if entity_id is None:
-                        entity_id = eid  # primary entity
+                        entity_id = entity["id"]  # primary entity
             briefing["relevant_entities"] = valid_entities
         planner_project_id = await get_session_project_id(db, session)
         scored_facts = await search_facts_scored(
@@ -991,6 +1100,11 @@ async def build_planner_messages(
             scored_facts_text = "\n".join(f"- {f['content']}" for f in scored_facts)
 
     # --- Build context block ---
+    # stable_parts: sections that rarely change between calls (system
+    # env, catalogs, standing rules). They lead the user message so the
+    # provider can serve them from its prompt cache; context_parts holds
+    # the per-message sections that follow.
+    stable_parts: list[str] = []
     context_parts: list[str] = []
 
     if briefing:
@@ -1005,14 +1119,14 @@ async def build_planner_messages(
         _SYSENV_MODULES = {"plugin_install", "kiso_commands", "user_mgmt"}
         _needs_full_sysenv = bool(set(briefing["modules"]) & _SYSENV_MODULES)
         if _needs_full_sysenv:
-            context_parts.append(f"## System Environment\n{sys_env_full}")
+            stable_parts.append(f"## System Environment\n{sys_env_full}")
         else:
-            context_parts.append(f"## System Environment\n{sys_env_essential}")
+            stable_parts.append(f"## System Environment\n{sys_env_essential}")
             # when skills_and_mcp is loaded (install-decision rules) but
             # full sysenv isn't warranted, inject just the install-critical
             # fields so the planner can route install commands correctly.
             if "skills_and_mcp" in modules and install_ctx:
-                _add_section(context_parts, "Install Context", install_ctx)
+                _add_section(stable_parts, "Install Context", install_ctx)
         # suppress generic routing when approved — Install Status
         # section (added later) has the authoritative instructions.
         if not install_approved:
@@ -1020,7 +1134,7 @@ async def build_planner_messages(
         # inject user-facing settings only when kiso_commands loaded.
         if "kiso_commands" in modules:
             _settings_text = build_user_settings_text(get_system_env(config))
-            _add_section(context_parts, "User Settings", _settings_text)
+            _add_section(stable_parts, "User Settings", _settings_text)
         # Session workspace files + previous plan results — operational data
         # that must reach the planner verbatim (not gated by briefer synthesis).
         _add_context_section(context_parts, context_pool, "session_files", "Session Workspace")
@@ -1038,14 +1152,16 @@ async def build_planner_messages(
 
         # entity-based fact enrichment (parity with briefer path)
         # Use word-level matching with normalization so "config" matches entity "configuration"
-        all_entities = await get_all_entities(db)
-        if all_entities:
-            msg_words = set(new_message.lower().split())
+        entity_index = await get_entity_index(db)
+        if entity_index.entities:
+            mentioned = {
+                e["id"]
+                for e in entity_index.find(new_message, whole_words=False)
+                + entity_index.find_by_words(set(new_message.lower().split()))
+            }
             existing_ids = {f["id"] for f in facts} if facts else set()
-            for ent in all_entities:
-                ent_norm = _normalize_entity_name(ent["name"])
-                ent_words = set(ent_norm.split())
-                if ent_words & msg_words or ent_norm in new_message.lower():
+            for ent in entity_index.entities:
+                if ent["id"] in mentioned:
                     ent_facts = await search_facts_by_entity(db, ent["id"])
                     new_facts = [f for f in ent_facts if f["id"] not in existing_ids]
                     if new_facts:
@@ -1053,9 +1169,8 @@ async def build_planner_messages(
                         context_parts.append(f"## Additional Facts (entity: {ent['name']})\n{extra}")
                         existing_ids.update(f["id"] for f in new_facts)
 
-        # System env in original position (after facts, before pending)
         # Fallback path: inject full system env (conservative, no briefer).
-        context_parts.append(f"## System Environment\n{sys_env_full}")
+        stable_parts.append(f"## System Environment\n{sys_env_full}")
         if not install_approved:
             _add_section(context_parts, "Install Routing", install_mode_ctx)
         # Session workspace files + previous plan results (same as briefer path)
@@ -1099,7 +1214,7 @@ async def build_planner_messages(
             body = instructions_for_planner(skill).strip()
             block = header + ("\n\n" + body if body else "")
             skill_blocks.append(block)
-        context_parts.append(
+        stable_parts.append(
             "## Skills (planner guidance)\n\n" + "\n\n".join(skill_blocks)
         )
 
@@ -1110,28 +1225,28 @@ async def build_planner_messages(
     # MCPManager in scope. When empty, the section is omitted entirely
     # and the planner falls back to plain exec routing.
     if context_pool.get("mcp_methods"):
-        context_parts.append(
+        stable_parts.append(
             f"## MCP Methods\n{context_pool['mcp_methods']}"
         )
 
     if context_pool.get("mcp_resources"):
-        context_parts.append(
+        stable_parts.append(
             f"## MCP Resources\n{context_pool['mcp_resources']}"
         )
 
     if context_pool.get("mcp_prompts"):
-        context_parts.append(
+        stable_parts.append(
             f"## MCP Prompts\n{context_pool['mcp_prompts']}"
         )
 
     # always-inject safety facts (not gated by briefer)
     safety_facts = await get_safety_facts(db)
-    _add_section(context_parts, "Safety Rules (MUST OBEY)",
+    _add_section(stable_parts, "Safety Rules (MUST OBEY)",
                  _join_or_empty(safety_facts, lambda f: f"- {f['content']}"))
 
     # always-inject behavior facts (soft guidelines, not hard constraints)
     behavior_facts = await get_behavior_facts(db)
-    _add_section(context_parts, "Behavior Guidelines (follow these preferences)",
+    _add_section(stable_parts, "Behavior Guidelines (follow these preferences)",
                  _join_or_empty(behavior_facts, lambda f: f"- {f['content']}"))
 
     # tell the planner it may proceed with install execs when approved.
@@ -1160,7 +1275,7 @@ async def build_planner_messages(
         for _prefix in _trust_store.skill:
             _trusted_lines.append(f"- {_prefix} (skill): tier=custom (previously approved)")
         if _trusted_lines:
-            context_parts.append(
+            stable_parts.append(
                 "## Trusted Sources Status\n"
                 "Sources the user has previously approved. When the user requests "
                 "to install one of these sources, the trust tier is `custom` "
@@ -1172,9 +1287,7 @@ async def build_planner_messages(
     context_parts.append(f"## Caller Role\n{user_role}")
     context_parts.append(f"## New Message\n{fence_content(new_message, 'USER_MSG')}")
 
-    context_block = "\n\n".join(context_parts)
-
-    return _build_messages(system_prompt, context_block)
+    return _build_layered_messages(system_prompt, stable_parts, context_parts)
 
 
 async def run_planner(
@@ -1193,6 +1306,7 @@ async def run_planner(
     max_tasks_override: int | None = None,
     investigate: bool = False,
     mcp_manager: "Any | None" = None,
+    prepared: PlannerPreparation | None = None,
 ) -> dict:
     """Run the planner: build context, call LLM, validate, retry if needed.
 
@@ -1210,16 +1324,14 @@ async def run_planner(
             ``format_mcp_catalog`` and injected into the planner
             and briefer context, and its structured pool is used
             for validate_plan's type=mcp validation.
+        prepared: context from an earlier :func:`prepare_planner` call
+            for this message (first plans only).
 
     Returns the validated plan dict with keys: goal, secrets, tasks.
     Raises PlanError if all retries exhausted.
     """
-    _mcp_catalog_text = format_mcp_catalog(mcp_manager) if mcp_manager else None
-    _mcp_resources_text = (
-        format_mcp_resources(mcp_manager) if mcp_manager else None
-    )
-    _mcp_prompts_text = (
-        format_mcp_prompts(mcp_manager) if mcp_manager else None
+    _mcp_catalog_text, _mcp_resources_text, _mcp_prompts_text = (
+        _mcp_catalog_texts(mcp_manager)
     )
     planner_out_state: dict = {}
     messages = await build_planner_messages(
@@ -1231,6 +1343,7 @@ async def run_planner(
         mcp_resources_text=_mcp_resources_text,
         mcp_prompts_text=_mcp_prompts_text,
         out_state=planner_out_state,
+        prepared=prepared,
     )
     if on_context_ready:
         await on_context_ready()
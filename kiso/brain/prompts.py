@@ -7,6 +7,7 @@ import re
 from pathlib import Path
 
 from kiso.config import KISO_DIR
+from kiso.llm import CACHE_PREFIX_KEY
 
 log = logging.getLogger(__name__)
 
@@ -127,6 +128,22 @@ def _build_messages_from_sections(system_prompt: str, parts: list[str]) -> list[
     return _build_messages(system_prompt, "\n\n".join(parts))
 
 
+def _build_layered_messages(
+    system_prompt: str, stable_parts: list[str], volatile_parts: list[str],
+) -> list[dict]:
+    """Assemble the message pair with *stable_parts* leading the user message.
+
+    Sections that rarely change between calls (system environment,
+    catalogs, standing rules) go first so the provider can reuse its
+    cached prompt prefix; the user message records where that prefix
+    ends under ``CACHE_PREFIX_KEY`` for ``call_llm``.
+    """
+    messages = _build_messages_from_sections(system_prompt, stable_parts + volatile_parts)
+    if stable_parts and volatile_parts:
+        messages[1][CACHE_PREFIX_KEY] = len("\n\n".join(stable_parts))
+    return messages
+
+
 def _add_section(parts: list[str], name: str, content: str) -> None:
     """Append a ``## {name}`` section to *parts* if *content* is non-empty."""
     if content:
@@ -145,6 +162,7 @@ __brain_exports__ = [
     "_ROLES_DIR",
     "_add_context_section",
     "_add_section",
+    "_build_layered_messages",
     "_build_messages",
     "_build_messages_from_sections",
     "_load_modular_prompt",
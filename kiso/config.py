@@ -7,6 +7,7 @@ import os
 import re
 import sys
 import tomllib
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -64,10 +65,15 @@ _SETTINGS_METADATA: tuple[tuple[str, int | float | str | bool | list], ...] = (
     ("fact_decay_rate", 0.1),
     ("fact_archive_threshold", 0.3),
     ("fact_consolidation_min_ratio", 0.3),
+    ("fact_vector_index", False),
+    # store maintenance (decay, archive, index upkeep)
+    ("maintenance_interval_hours", 24),
+    ("maintenance_batch_size", 500),
     # consolidator (periodic knowledge quality review)
     ("consolidation_enabled", True),
     ("consolidation_interval_hours", 24),
     ("consolidation_min_facts", 20),
+    ("consolidation_shard_size", 80),
     # planning
     ("max_replan_depth", 5),
     ("max_validation_retries", 3),
@@ -78,12 +84,22 @@ _SETTINGS_METADATA: tuple[tuple[str, int | float | str | bool | list], ...] = (
     ("classifier_timeout", 30),
     ("llm_timeout", 600),
     ("stall_timeout", 60),
+    ("llm_max_concurrency", 16),
+    ("llm_max_concurrency_per_model", 8),
+    ("llm_tokens_per_minute", 0),
+    ("llm_prompt_caching", True),
+    ("llm_cache_enabled", False),
+    ("llm_cache_role_ttls", [
+        "classifier:3600", "briefer:600", "worker:3600", "curator:3600", "paraphraser:86400",
+    ]),
+    ("llm_cache_max_entries", 2000),
     ("max_output_size", 1048576),
     ("max_worker_retries", 2),
     # limits
     ("max_memory_gb", 4),
     ("max_cpus", 2),
     ("max_disk_gb", 32),
+    ("disk_usage_rescan_interval", 300),
     ("max_pids", 512),
     ("max_llm_calls_per_message", 200),
     ("max_message_size", 65536),
@@ -93,8 +109,15 @@ _SETTINGS_METADATA: tuple[tuple[str, int | float | str | bool | list], ...] = (
     ("port", 8333),
     ("external_url", ""),
     ("worker_idle_timeout", 300),
+    ("db_read_connections", 4),
+    ("db_group_commit_ms", 0),
+    ("audit_queue_max", 10000),
+    ("cron_max_concurrent", 8),
+    ("cron_misfire_policy", "run_once"),
+    ("cron_misfire_grace", 60),
     # fast path
     ("fast_path_enabled", True),
+    ("speculative_planning", True),
     # briefer (context intelligence layer)
     ("briefer_enabled", True),
     ("briefer_wrapper_filter_threshold", 10),
@@ -106,8 +129,12 @@ _SETTINGS_METADATA: tuple[tuple[str, int | float | str | bool | list], ...] = (
     # MCP catalog warm-up (daemon boot)
     ("mcp_warmup_concurrency", 3),
     ("mcp_warmup_deadline_s", 10),
+    # MCP method catalog: relevance cut for large inventories
+    ("mcp_catalog_top_k", 40),
     # MCP client-side LLM sampling (servers delegating completions to us)
     ("mcp_sampling_enabled", True),
+    # MCP stdio transport: largest single JSON-RPC message accepted
+    ("mcp_max_message_mb", 256),
     # webhooks
     ("webhook_allow_list", []),
     ("webhook_require_https", True),
@@ -216,9 +243,13 @@ fact_decay_days           = 7
 fact_decay_rate           = 0.1
 fact_archive_threshold    = 0.3
 fact_consolidation_min_ratio = 0.3  # abort consolidation if fewer than this fraction survive
+fact_vector_index         = false    # hybrid FTS5 + vector fact search, capped at the planner's limit
+maintenance_interval_hours = 24      # hours between decay/archive/index maintenance runs
+maintenance_batch_size    = 500      # rows per commit during maintenance
 consolidation_enabled             = true    # periodic holistic knowledge review
 consolidation_interval_hours      = 24      # minimum hours between consolidation runs
 consolidation_min_facts           = 20      # minimum facts to trigger a consolidation
+consolidation_shard_size          = 80      # max facts per consolidator LLM call
 
 # --- planning ---
 max_replan_depth          = 5
@@ -231,6 +262,13 @@ planner_fallback_model    = "minimax/minimax-m2.7"  # secondary model used when
 classifier_timeout        = 30       # seconds for classifier LLM call; falls back to planner on timeout
 llm_timeout               = 600      # seconds; hard timeout for all LLM calls
 stall_timeout             = 60       # seconds; abort streaming if no chunk arrives within this window
+llm_max_concurrency       = 16       # max LLM requests in flight per provider
+llm_max_concurrency_per_model = 8    # max LLM requests in flight per model
+llm_tokens_per_minute     = 0        # token budget per provider and minute (0 = unlimited)
+llm_prompt_caching        = true     # cache breakpoints on stable prompt prefixes (OpenRouter/Anthropic)
+llm_cache_enabled         = false    # reuse responses to byte-identical calls of the roles below
+llm_cache_role_ttls       = ["classifier:3600", "briefer:600", "worker:3600", "curator:3600", "paraphraser:86400"]  # "role:seconds"
+llm_cache_max_entries     = 2000     # responses kept in the cache
 max_output_size           = 1048576  # max chars per task output (0 = unlimited)
 max_worker_retries        = 2
 
@@ -238,6 +276,7 @@ max_worker_retries        = 2
 max_memory_gb             = 4          # container RAM limit (applied via docker run/update)
 max_cpus                  = 2          # container CPU limit (applied via docker run/update)
 max_disk_gb               = 32         # app-level disk limit (applied immediately)
+disk_usage_rescan_interval = 300       # seconds between background rescans of ~/.kiso size (10-86400)
 max_pids                  = 512        # container PID limit (applied via docker run/update)
 
 # --- limits ---
@@ -250,9 +289,16 @@ host                      = "0.0.0.0"
 port                      = 8333
 external_url              = ""       # public base URL for webhook callbacks (empty = derive from host:port)
 worker_idle_timeout       = 300
+db_read_connections       = 4        # read-only SQLite connections next to the writer (0-32, 0 = reads share the writer)
+db_group_commit_ms        = 0        # coalesce commits arriving within this many ms into one (0-50, 0 = off)
+audit_queue_max           = 10000    # audit entries buffered for the background writer; extra entries are dropped
+cron_max_concurrent       = 8        # cron jobs dispatched at the same time
+cron_misfire_policy       = "run_once"  # late cron jobs: "run_once" or "skip" (when later than the grace)
+cron_misfire_grace        = 60       # seconds a cron job may be late before it counts as missed
 
 # --- fast path ---
 fast_path_enabled         = true     # skip planner for conversational messages
+speculative_planning      = true     # prepare the planner context while the classifier runs
 
 # --- briefer (context intelligence layer) ---
 briefer_enabled           = true     # LLM-based context selection for each pipeline stage
@@ -265,7 +311,9 @@ mcp_session_idle_timeout  = 1800     # shut down a per-session MCP client idle f
 mcp_max_session_clients_per_server = 32  # LRU bound on per-session clients for a single MCP server (1-256)
 mcp_warmup_concurrency    = 3        # parallelism for daemon-boot MCP catalog warm-up (1-16)
 mcp_warmup_deadline_s     = 10       # total wall-clock deadline for warm-up to complete (1-120)
+mcp_catalog_top_k         = 40       # larger method catalogs are cut to the methods most relevant to the message (0 = always send all)
 mcp_sampling_enabled      = true     # allow MCP servers to request LLM completions via sampling/createMessage
+mcp_max_message_mb        = 256      # largest single message accepted from a stdio MCP server, in MiB (1-4096)
 
 # --- webhooks (only needed when using connector integrations) ---
 webhook_allow_list        = []       # IPs exempt from SSRF check
@@ -562,3 +610,124 @@ def reload_config(path: Path | None = None) -> Config:
     def _raise(msg: str) -> None:
         raise ConfigError(msg)
     return _build_config(path or CONFIG_PATH, _raise)
+
+
+ConfigListener = Callable[[Config], None]
+
+
+class ConfigService:
+    """Versioned config snapshots, re-parsed only when the file changes.
+
+    :meth:`current` stats ``config.toml`` and hands back the last
+    snapshot while the file's modification time and size are unchanged,
+    so frequent callers (the worker re-checks permissions before every
+    execution batch) pay a ``stat`` instead of a TOML parse. Each new
+    snapshot bumps :attr:`version` and is passed to every subscribed
+    listener, which is how caches derived from config (system env,
+    prompts, skills, MCP catalogs) learn about an edit. The first
+    snapshot is not announced.
+
+    A changed file that fails validation raises :class:`ConfigError`;
+    the previous snapshot stays current and the same error is raised,
+    without re-parsing, until the file changes again.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._config: Config | None = None
+        self._stamp: tuple[int, int] | None = None
+        self._failed: tuple[tuple[int, int], ConfigError] | None = None
+        self._listeners: list[ConfigListener] = []
+        self.version = 0
+        self.parses = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path or CONFIG_PATH
+
+    def _file_stamp(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def current(self) -> Config:
+        """Latest snapshot, re-parsed first if the file changed on disk."""
+        stamp = self._file_stamp()
+        if stamp is not None:
+            if self._config is not None and stamp == self._stamp:
+                return self._config
+            if self._failed is not None and self._failed[0] == stamp:
+                raise self._failed[1]
+        self.parses += 1
+        try:
+            config = reload_config(self.path)
+        except ConfigError as e:
+            self._failed = (stamp, e) if stamp is not None else None
+            raise
+        self._failed = None
+        self.publish(config, stamp=stamp, notify=self._config is not None)
+        return config
+
+    def reload(self) -> Config:
+        """Re-parse the file even if unchanged and announce the result.
+
+        For explicit reloads, e.g. after ``${env:...}`` values changed.
+        Raises ConfigError and keeps the current snapshot on failure.
+        """
+        stamp = self._file_stamp()
+        self.parses += 1
+        config = reload_config(self.path)
+        self._failed = None
+        self.publish(config, stamp=stamp)
+        return config
+
+    def publish(
+        self, config: Config, *, stamp: tuple[int, int] | None = None, notify: bool = True,
+    ) -> None:
+        """Make *config* the current snapshot (e.g. after a forced reload).
+
+        *stamp* defaults to the file's current mtime and size. Listeners
+        are called unless *notify* is false; one raising does not stop
+        the others.
+        """
+        self._config = config
+        self._stamp = stamp if stamp is not None else self._file_stamp()
+        self.version += 1
+        if not notify:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(config)
+            except Exception:  # noqa: BLE001
+                log.exception("Config listener %r failed", listener)
+
+    def subscribe(self, listener: ConfigListener) -> ConfigListener:
+        """Call *listener* with every new snapshot; returns *listener*."""
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: ConfigListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def reset(self) -> None:
+        """Forget the current snapshot (used in tests)."""
+        self._config = None
+        self._stamp = None
+        self._failed = None
+
+    def stats(self) -> dict:
+        return {"version": self.version, "parses": self.parses, "path": str(self.path)}
+
+
+config_service = ConfigService()
+
+
+def current_config() -> Config:
+    """Current snapshot of ``config.toml`` from :data:`config_service`.
+
+    Raises ConfigError when the file is missing or a changed file is invalid.
+    """
+    return config_service.current()
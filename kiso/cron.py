@@ -0,0 +1,242 @@
+"""Cron job dispatch from an in-memory heap of next-fire times.
+
+:class:`CronScheduler` loads the enabled ``cron_jobs`` rows at boot and
+keeps a min-heap of ``(next_run, job_id)``. It sleeps exactly until the
+earliest entry is due, or until :meth:`CronScheduler.refresh` reports a
+created, changed or deleted job. The database is not polled.
+
+Due jobs are dispatched concurrently, at most ``cron_max_concurrent``
+at a time. A job fires at most once per dispatch. Its next run is
+computed from the firing time, so a job that was due several times
+while the server was down runs once, not once per missed slot. With
+``cron_misfire_policy = "skip"``, a job more than
+``cron_misfire_grace`` seconds late does not run at all and is only
+rescheduled. A job whose dispatch raises is retried after
+``_RETRY_DELAY`` seconds without moving its stored ``next_run``.
+
+Times in ``cron_jobs`` are naive local ISO strings, as written by
+``POST /cron``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable
+
+import aiosqlite
+
+from kiso.store import get_cron_job, list_cron_jobs, update_cron_last_run, update_cron_next_run
+
+log = logging.getLogger(__name__)
+
+MISFIRE_POLICIES = ("run_once", "skip")
+
+_RETRY_DELAY = 60.0  # seconds before a failed dispatch is retried
+_MAX_SLEEP = 300.0  # re-check the heap at least this often (clock changes)
+_LATENCY_SAMPLES = 64  # recent firing latencies kept per job
+
+
+@dataclass
+class _JobStats:
+    fired: int = 0
+    skipped: int = 0
+    failures: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=_LATENCY_SAMPLES))
+
+
+def _next_fire(schedule: str, after: datetime) -> datetime:
+    from croniter import croniter
+
+    return croniter(schedule, after).get_next(datetime)
+
+
+def _timestamp(iso: str) -> float:
+    return datetime.fromisoformat(iso).timestamp()
+
+
+class CronScheduler:
+    """Fire due cron jobs from a heap, concurrently under a cap."""
+
+    def __init__(
+        self,
+        db: aiosqlite.Connection,
+        fire: Callable[[dict], Awaitable[None]],
+        *,
+        max_concurrent: int = 8,
+        misfire_policy: str = "run_once",
+        misfire_grace: float = 60.0,
+    ) -> None:
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"unknown cron misfire policy: {misfire_policy}")
+        self._db = db
+        self._fire = fire
+        self.max_concurrent = max_concurrent
+        self.misfire_policy = misfire_policy
+        self.misfire_grace = misfire_grace
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self._heap: list[tuple[float, int]] = []
+        self._due_at: dict[int, float] = {}  # job id → heap entry that is current
+        self._jobs: dict[int, dict] = {}
+        self._running: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._stats: dict[int, _JobStats] = {}
+
+    # -- job table ---------------------------------------------------------
+
+    async def load(self) -> int:
+        """(Re)build the heap from the enabled jobs in the database."""
+        self._heap.clear()
+        self._due_at.clear()
+        self._jobs.clear()
+        for job in await list_cron_jobs(self._db):
+            if job["enabled"]:
+                self._schedule(job, _timestamp(job["next_run"]))
+        self._wakeup.set()
+        return len(self._jobs)
+
+    async def refresh(self, job_id: int) -> None:
+        """Re-read *job_id* after it was created, changed or deleted."""
+        job = await get_cron_job(self._db, job_id)
+        if job is None or not job["enabled"]:
+            self._forget(job_id)
+        elif job_id not in self._running:
+            self._schedule(job, _timestamp(job["next_run"]))
+        else:
+            self._jobs[job_id] = job  # rescheduled when the running dispatch ends
+        self._wakeup.set()
+
+    def _schedule(self, job: dict, due: float) -> None:
+        self._jobs[job["id"]] = job
+        self._due_at[job["id"]] = due
+        heapq.heappush(self._heap, (due, job["id"]))
+
+    def _forget(self, job_id: int) -> None:
+        # Heap entries are dropped lazily when they reach the top.
+        self._jobs.pop(job_id, None)
+        self._due_at.pop(job_id, None)
+        self._stats.pop(job_id, None)
+
+    def _pop_due(self, now: float) -> list[tuple[float, int]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            at, job_id = heapq.heappop(self._heap)
+            if self._due_at.get(job_id) == at:
+                del self._due_at[job_id]
+                due.append((at, job_id))
+        return due
+
+    def _next_delay(self, now: float) -> float:
+        while self._heap and self._due_at.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)  # stale entry
+        if not self._heap:
+            return _MAX_SLEEP
+        return min(max(0.0, self._heap[0][0] - now), _MAX_SLEEP)
+
+    # -- dispatch ----------------------------------------------------------
+
+    async def run(self) -> None:
+        """Dispatch jobs as they come due, until cancelled."""
+        try:
+            while True:
+                now = time.time()
+                for due, job_id in self._pop_due(now):
+                    self._running.add(job_id)
+                    task = asyncio.create_task(self._dispatch(self._jobs[job_id], due))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                self._wakeup.clear()
+                # Not wait_for: on 3.11 it drops a cancel() that races
+                # with the wakeup, and the loop would never stop.
+                try:
+                    async with asyncio.timeout(self._next_delay(time.time())):
+                        await self._wakeup.wait()
+                except TimeoutError:
+                    pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+    async def _dispatch(self, job: dict, due: float) -> None:
+        job_id = job["id"]
+        stats = self._stats.setdefault(job_id, _JobStats())
+        failed = True
+        try:
+            async with self._sem:
+                now = datetime.now()
+                late = now.timestamp() - due
+                if self.misfire_policy == "skip" and late > self.misfire_grace:
+                    stats.skipped += 1
+                    next_dt = _next_fire(job["schedule"], now)
+                    await update_cron_next_run(self._db, job_id, next_dt.isoformat())
+                    log.warning(
+                        "Cron job %d skipped: %.0fs late (grace %.0fs)",
+                        job_id, late, self.misfire_grace,
+                    )
+                else:
+                    stats.latencies.append(max(0.0, late))
+                    log.info(
+                        "Cron job %d fired: session=%s prompt=%r",
+                        job_id, job["session"], job["prompt"][:80],
+                    )
+                    await self._fire(job)
+                    stats.fired += 1
+                    next_dt = _next_fire(job["schedule"], now)
+                    await update_cron_last_run(
+                        self._db, job_id, now.isoformat(), next_dt.isoformat(),
+                    )
+                next_due = next_dt.timestamp()
+                failed = False
+        except asyncio.CancelledError:
+            self._running.discard(job_id)
+            raise
+        except Exception:
+            stats.failures += 1
+            next_due = time.time() + _RETRY_DELAY
+            log.exception("Cron job %d failed (will retry in %.0fs)", job_id, _RETRY_DELAY)
+        if job_id in self._jobs and self._jobs[job_id] is not job:
+            # Changed while running: the row now holds the latest next_run.
+            job = await get_cron_job(self._db, job_id)
+            if job is not None and not failed:
+                next_due = _timestamp(job["next_run"])
+        self._running.discard(job_id)
+        if job_id not in self._jobs or job is None or not job["enabled"]:
+            self._forget(job_id)
+            return  # deleted or disabled while running
+        self._schedule(job, next_due)
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        """Heap size, occupancy and per-job firing latency, JSON-ready."""
+        now = time.time()
+        jobs: dict[str, dict] = {}
+        for job_id, stats in self._stats.items():
+            samples = stats.latencies
+            jobs[str(job_id)] = {
+                "fired": stats.fired,
+                "skipped": stats.skipped,
+                "failures": stats.failures,
+                "latency_ms": {
+                    "samples": len(samples),
+                    "avg": round(sum(samples) / len(samples) * 1000) if samples else 0,
+                    "max": round(max(samples) * 1000) if samples else 0,
+                },
+            }
+        next_due = min(self._due_at.values(), default=None)
+        return {
+            "limits": {
+                "max_concurrent": self.max_concurrent,
+                "misfire_policy": self.misfire_policy,
+                "misfire_grace_s": self.misfire_grace,
+            },
+            "scheduled": len(self._due_at),
+            "running": len(self._running),
+            "next_due_s": round(max(0.0, next_due - now), 1) if next_due is not None else None,
+            "jobs": jobs,
+        }
@@ -0,0 +1,163 @@
+"""In-process per-session event bus for push status streams.
+
+Producers (store writes, worker phase changes, inflight LLM calls)
+publish small events keyed by session; ``GET /status/{session}/stream``
+subscribes and turns them into SSE deltas. Publishing never blocks and
+never touches the DB: with no subscriber for a session it is a dict
+lookup.
+
+Event kinds:
+
+- ``tasks`` — a task row of the session changed (payload ``{"id": …}``)
+- ``plan`` — a plan row of the session changed (payload ``{"id": …}``)
+- ``phase`` — worker phase changed (payload ``{"phase": …}``)
+- ``worker`` — worker started/stopped (payload ``{"running": …}``)
+- ``inflight`` — an LLM call started (payload: call metadata) or ended
+  (payload ``None``)
+- ``partial`` — streamed LLM output delta (payload ``{"text": …}``, or
+  ``{"reasoning": …}`` for reasoning deltas)
+- ``active_task`` — a running exec task's output tail (payload: the
+  ``/status`` ``active_task`` view); when it ends, the view of another
+  exec of the session still running, or ``None`` after the last one
+
+Task/plan writes only know the row id, so the store registers the
+owning session at insert time (:func:`note_plan`, :func:`note_task`)
+and :func:`publish_plan_change` / :func:`publish_task_change` resolve
+it. Rows created before the daemon started are not tracked; their
+subscribers resync on the stream's keepalive.
+
+Each subscription has a bounded queue. When a slow consumer falls
+behind, further events are dropped and the subscription is flagged
+``overflowed`` so the consumer can resync from the DB once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+_DEFAULT_QUEUE_SIZE = 256
+# Bound on the id → session maps used to route task/plan changes.
+_MAX_TRACKED_ROWS = 20_000
+
+
+@dataclass(slots=True)
+class Event:
+    """One bus event: *kind* plus a JSON-serializable payload."""
+    session: str
+    kind: str
+    data: Any = None
+
+
+@dataclass(eq=False)
+class Subscription:
+    """A consumer's view of one session's event stream."""
+    session: str
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(_DEFAULT_QUEUE_SIZE))
+    overflowed: bool = False
+
+    async def get(self, timeout: float | None = None) -> Event | None:
+        """Wait for the next event; return None on *timeout*."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> list[Event]:
+        """Return every event already queued, without waiting."""
+        events: list[Event] = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return events
+
+
+class EventBus:
+    """Fan-out of per-session events to any number of subscribers."""
+
+    def __init__(self) -> None:
+        self._subs: dict[str, set[Subscription]] = {}
+        self._plan_sessions: OrderedDict[int, str] = OrderedDict()
+        self._task_sessions: OrderedDict[int, str] = OrderedDict()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, session: str, maxsize: int = _DEFAULT_QUEUE_SIZE) -> Subscription:
+        sub = Subscription(session, asyncio.Queue(maxsize))
+        self._subs.setdefault(session, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._subs.get(sub.session)
+        if subs is None:
+            return
+        subs.discard(sub)
+        if not subs:
+            self._subs.pop(sub.session, None)
+
+    def subscriber_count(self, session: str | None = None) -> int:
+        if session is not None:
+            return len(self._subs.get(session, ()))
+        return sum(len(s) for s in self._subs.values())
+
+    def publish(self, session: str, kind: str, data: Any = None) -> None:
+        """Deliver an event to every subscriber of *session*. Never blocks."""
+        subs = self._subs.get(session)
+        if not subs:
+            return
+        event = Event(session, kind, data)
+        self.published += 1
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                sub.overflowed = True
+                self.dropped += 1
+
+    # -- task/plan routing ------------------------------------------------
+
+    def note_plan(self, plan_id: int, session: str) -> None:
+        _remember(self._plan_sessions, plan_id, session)
+
+    def note_task(self, task_id: int, session: str) -> None:
+        _remember(self._task_sessions, task_id, session)
+
+    def publish_plan_change(self, plan_id: int) -> None:
+        session = self._plan_sessions.get(plan_id)
+        if session is not None:
+            self.publish(session, "plan", {"id": plan_id})
+
+    def publish_task_change(self, task_id: int) -> None:
+        session = self._task_sessions.get(task_id)
+        if session is not None:
+            self.publish(session, "tasks", {"id": task_id})
+
+    def reset(self) -> None:
+        """Drop every subscriber and routing entry (used in tests)."""
+        self._subs.clear()
+        self._plan_sessions.clear()
+        self._task_sessions.clear()
+        self.published = 0
+        self.dropped = 0
+
+
+def _remember(mapping: OrderedDict[int, str], key: int, session: str) -> None:
+    mapping[key] = session
+    mapping.move_to_end(key)
+    while len(mapping) > _MAX_TRACKED_ROWS:
+        mapping.popitem(last=False)
+
+
+bus = EventBus()
+
+publish = bus.publish
+note_plan = bus.note_plan
+note_task = bus.note_task
+publish_plan_change = bus.publish_plan_change
+publish_task_change = bus.publish_task_change
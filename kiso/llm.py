@@ -10,11 +10,14 @@ import logging
 import os
 import ssl
 import time
+from typing import Callable
+from urllib.parse import urlsplit
 
 import httpx
 
-from kiso import audit
-from kiso.config import Config, CLASSIFIER_MAX_TOKENS, LLM_API_KEY_ENV, Provider, REASONING_DEFAULTS
+from kiso import audit, events, llm_cache
+from kiso.config import Config, CLASSIFIER_MAX_TOKENS, LLM_API_KEY_ENV, Provider, REASONING_DEFAULTS, setting_bool, setting_int
+from kiso.llm_scheduler import estimate_tokens, scheduler as _scheduler
 from kiso.text import extract_thinking
 
 log = logging.getLogger(__name__)
@@ -57,51 +60,6 @@ _MAX_RATE_RETRIES = 4
 _RATE_INITIAL_BACKOFF: float = 1.0
 _RATE_MAX_BACKOFF: float = 60.0
 
-# circuit breaker — protects against provider-wide degradation.
-# When consecutive transport failures exceed the threshold, subsequent
-# calls fail immediately instead of wasting time on doomed retries.
-_CB_FAILURE_THRESHOLD = 5
-_CB_COOLDOWN = 30.0
-_cb_consecutive_failures = 0
-_cb_open_until: float = 0.0  # monotonic timestamp
-
-
-def _cb_record_failure() -> None:
-    """Record a transport failure.  Opens circuit after threshold."""
-    global _cb_consecutive_failures, _cb_open_until
-    _cb_consecutive_failures += 1
-    if _cb_consecutive_failures >= _CB_FAILURE_THRESHOLD:
-        _cb_open_until = time.monotonic() + _CB_COOLDOWN
-        log.warning(
-            "Circuit breaker OPEN — %d consecutive transport failures, "
-            "failing fast for %.0fs",
-            _cb_consecutive_failures, _CB_COOLDOWN,
-        )
-
-
-def _cb_record_success() -> None:
-    """Reset circuit breaker on success."""
-    global _cb_consecutive_failures, _cb_open_until
-    _cb_consecutive_failures = 0
-    _cb_open_until = 0.0
-
-
-def _cb_is_open() -> bool:
-    """Check if circuit is open (should fail fast)."""
-    if _cb_open_until <= 0:
-        return False
-    if time.monotonic() >= _cb_open_until:
-        # Cooldown expired → half-open, allow one probe
-        return False
-    return True
-
-
-def _cb_reset() -> None:
-    """Reset circuit breaker state (for tests)."""
-    global _cb_consecutive_failures, _cb_open_until
-    _cb_consecutive_failures = 0
-    _cb_open_until = 0.0
-
 # Actionable hints for common HTTP error status codes from LLM providers.
 _LLM_ERROR_HINTS: dict[int, str] = {
     400: " — model may be unavailable or API key invalid",
@@ -121,6 +79,69 @@ def _strip_messages(messages: list[dict]) -> list[dict]:
     return [{"role": m["role"], "content": m["content"]} for m in messages]
 
 
+# Message key set by the prompt builders (kiso/brain/prompts.py): length
+# of the stable head of the message content. Never sent to the provider.
+CACHE_PREFIX_KEY = "cache_prefix"
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+_MAX_CACHE_BREAKPOINTS = 4  # Anthropic rejects requests with more
+# Hosts known to accept text-part content with ``cache_control``. Other
+# OpenAI-compatible servers (Ollama, vLLM, ...) may reject a structured
+# system message, so they get plain string content.
+_CACHE_BREAKPOINT_HOSTS = ("openrouter.ai", "anthropic.com")
+
+
+def _supports_cache_breakpoints(provider: Provider) -> bool:
+    """True when *provider*'s base_url is a host known to take ``cache_control``."""
+    host = (urlsplit(provider.base_url).hostname or "").lower()
+    return any(host == h or host.endswith("." + h) for h in _CACHE_BREAKPOINT_HOSTS)
+
+
+def _payload_messages(messages: list[dict], cache_breakpoints: bool) -> list[dict]:
+    """Return *messages* as sent to the provider.
+
+    With *cache_breakpoints*, the system prompt and the stable head of
+    each builder-marked message become text parts carrying
+    ``cache_control``, so providers that cache prompt prefixes on
+    request (Anthropic, Gemini via OpenRouter) keep them between calls.
+    Providers that cache prefixes on their own ignore the marker.
+    """
+    out: list[dict] = []
+    budget = _MAX_CACHE_BREAKPOINTS if cache_breakpoints else 0
+    for m in messages:
+        prefix = m.get(CACHE_PREFIX_KEY)
+        content = m.get("content")
+        cacheable = budget > 0 and isinstance(content, str) and content
+        if prefix is None and not (cacheable and m["role"] == "system"):
+            out.append(m)
+            continue
+        m = {k: v for k, v in m.items() if k != CACHE_PREFIX_KEY}
+        if cacheable and m["role"] == "system":
+            m["content"] = [{"type": "text", "text": content, "cache_control": _CACHE_CONTROL}]
+            budget -= 1
+        elif cacheable and prefix and 0 < prefix < len(content):
+            m["content"] = [
+                {"type": "text", "text": content[:prefix], "cache_control": _CACHE_CONTROL},
+                {"type": "text", "text": content[prefix:]},
+            ]
+            budget -= 1
+        out.append(m)
+    return out
+
+
+def _cached_prompt_tokens(usage: dict) -> int | None:
+    """Prompt tokens the provider served from its prefix cache, if reported.
+
+    OpenAI and OpenRouter report ``prompt_tokens_details.cached_tokens``;
+    Anthropic-style usage blocks report ``cache_read_input_tokens``.
+    """
+    details = usage.get("prompt_tokens_details")
+    cached = details.get("cached_tokens") if isinstance(details, dict) else None
+    if cached is None:
+        cached = usage.get("cache_read_input_tokens")
+    return cached if isinstance(cached, int) else None
+
+
 @asynccontextmanager
 async def _http_client_ctx(timeout: float):
     """Yield an httpx.AsyncClient, reusing the shared one or creating a temporary one."""
@@ -202,12 +223,15 @@ class LLMBudgetExceeded(LLMError):
     """Raised when per-message LLM call budget is exhausted."""
 
 
-# Per-message LLM call budget tracking via contextvars.
+# Per-message LLM call budget tracking via contextvars. The count is a
+# one-element list, like the usage accumulator below, so tasks started
+# for the message (which run in a copy of the context) spend the same
+# budget.
 _llm_budget_max: contextvars.ContextVar[int | None] = contextvars.ContextVar(
     "_llm_budget_max", default=None,
 )
-_llm_budget_count: contextvars.ContextVar[int] = contextvars.ContextVar(
-    "_llm_budget_count", default=0,
+_llm_budget_count: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "_llm_budget_count", default=None,
 )
 
 
@@ -259,28 +283,83 @@ def get_usage_since(start_index: int) -> dict:
 def set_llm_budget(max_calls: int) -> None:
     """Set per-message LLM call budget. Resets the counter to 0."""
     _llm_budget_max.set(max_calls)
-    _llm_budget_count.set(0)
+    _llm_budget_count.set([0])
 
 
 def clear_llm_budget() -> None:
     """Clear the LLM budget (disable tracking)."""
     _llm_budget_max.set(None)
-    _llm_budget_count.set(0)
+    _llm_budget_count.set(None)
 
 
 def get_llm_call_count() -> int:
     """Return the current LLM call count for the active budget."""
-    return _llm_budget_count.get()
+    counter = _llm_budget_count.get(None)
+    return counter[0] if counter else 0
+
+
+class _ChunkBuffer:
+    """Append-only text buffer; joins pending chunks only when read."""
+
+    __slots__ = ("_parts", "chars")
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self.chars = 0
+
+    def append(self, text: str) -> None:
+        self._parts.append(text)
+        self.chars += len(text)
+
+    def text(self) -> str:
+        if len(self._parts) > 1:
+            self._parts[:] = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+
+class StreamProgress:
+    """Content and reasoning received so far from one streaming response.
+
+    The SSE reader only appends; readers take a :meth:`snapshot`, so a
+    response costs one join per poll instead of one per delta.
+    ``cached_tokens`` holds the prompt-cache hits of the usage block.
+    """
+
+    __slots__ = ("content", "reasoning", "cached_tokens")
+
+    def __init__(self) -> None:
+        self.content = _ChunkBuffer()
+        self.reasoning = _ChunkBuffer()
+        self.cached_tokens = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "partial_content": self.content.text(),
+            "partial_reasoning": self.reasoning.text(),
+            "content_chars": self.content.chars,
+            "reasoning_chars": self.reasoning.chars,
+        }
 
 
 # Per-session inflight LLM call tracking.
 # Populated just before the HTTP request, cleared in the finally block.
 _inflight_calls: dict[str, dict] = {}
+_inflight_progress: dict[str, StreamProgress] = {}
 
 
 def get_inflight_call(session: str) -> dict | None:
-    """Return the inflight LLM call for *session*, or None."""
-    return _inflight_calls.get(session)
+    """Return the inflight LLM call for *session*, or None.
+
+    Includes the streamed output so far (``partial_content``,
+    ``partial_reasoning`` and their lengths) once the response started.
+    """
+    call = _inflight_calls.get(session)
+    if call is None:
+        return None
+    progress = _inflight_progress.get(session)
+    if progress is None:
+        return dict(call)
+    return {**call, **progress.snapshot()}
 
 
 def get_provider(config: Config, model_string: str) -> tuple[Provider, str]:
@@ -312,58 +391,79 @@ class LLMStallError(LLMError):
     """Raised when the LLM stream stalls (no chunks for stall_timeout seconds)."""
 
 
+async def _iter_sse_data(response: httpx.Response, stall_timeout: float):
+    """Yield the payload bytes of each ``data:`` line of an SSE response.
+
+    Lines are split straight from the raw byte chunks; comments, other
+    fields and blank lines are skipped without decoding.
+    """
+    chunk_iter = response.aiter_bytes().__aiter__()
+    pending = b""
+    while True:
+        try:
+            chunk = await asyncio.wait_for(chunk_iter.__anext__(), timeout=stall_timeout)
+        except StopAsyncIteration:
+            break
+        except asyncio.TimeoutError:
+            raise LLMStallError(
+                f"LLM stream stalled (no data for {stall_timeout}s)"
+            )
+        if pending:
+            chunk = pending + chunk
+        lines = chunk.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.startswith(b"data:"):
+                yield line[5:].strip()
+    if pending.startswith(b"data:"):
+        yield pending[5:].strip()
+
+
 async def _read_sse_stream(
     response: httpx.Response,
     stall_timeout: float = 60,
-    inflight_dict: dict | None = None,
+    progress: StreamProgress | None = None,
+    session: str = "",
 ) -> tuple[str, str, int, int, str]:
     """Read an OpenAI-compatible SSE stream with stall detection.
 
-    If no line arrives within *stall_timeout* seconds, raises LLMStallError.
-    When *inflight_dict* is provided, updates its ``partial_content`` key on
-    each content chunk so the CLI can display live streaming output.
+    If no bytes arrive within *stall_timeout* seconds, raises LLMStallError.
+    Content and reasoning deltas are appended to *progress* (a private one
+    when not given) so ``/status`` can show live streaming output.
+    When *session* is set, each delta is also published on the event bus
+    as a ``partial`` event. Cached prompt tokens reported in the usage
+    block land in ``progress.cached_tokens``.
 
     Returns (content, reasoning_content, prompt_tokens, completion_tokens, finish_reason).
     """
-    content_parts: list[str] = []
-    reasoning_parts: list[str] = []
+    if progress is None:
+        progress = StreamProgress()
     prompt_tokens = 0
     completion_tokens = 0
     last_finish_reason = ""
 
-    line_iter = response.aiter_lines().__aiter__()
-    while True:
-        try:
-            raw_line = await asyncio.wait_for(line_iter.__anext__(), timeout=stall_timeout)
-        except StopAsyncIteration:
+    async for data in _iter_sse_data(response, stall_timeout):
+        if data == b"[DONE]":
             break
-        except asyncio.TimeoutError:
-            raise LLMStallError(
-                f"LLM stream stalled (no data for {stall_timeout}s)"
-            )
-
-        line = raw_line.strip()
-        if not line or line.startswith(":"):
-            continue
-        if line == "data: [DONE]":
-            break
-        if not line.startswith("data: "):
-            continue
         try:
-            chunk = json.loads(line[6:])
+            chunk = json.loads(data)
         except json.JSONDecodeError:
             continue
+        if not isinstance(chunk, dict):
+            continue
 
         for choice in chunk.get("choices") or []:
             delta = choice.get("delta") or {}
             c = delta.get("content")
             if c:
-                content_parts.append(c)
-                if inflight_dict is not None:
-                    inflight_dict["partial_content"] = "".join(content_parts)
+                progress.content.append(c)
+                if session:
+                    events.publish(session, "partial", {"text": c})
             r = delta.get("reasoning_content")
             if r:
-                reasoning_parts.append(r)
+                progress.reasoning.append(r)
+                if session:
+                    events.publish(session, "partial", {"reasoning": r})
             fr = choice.get("finish_reason")
             if fr:
                 last_finish_reason = fr
@@ -372,8 +472,14 @@ async def _read_sse_stream(
         if usage:
             prompt_tokens = usage.get("prompt_tokens", prompt_tokens)
             completion_tokens = usage.get("completion_tokens", completion_tokens)
+            cached = _cached_prompt_tokens(usage)
+            if cached is not None:
+                progress.cached_tokens = cached
 
-    return "".join(content_parts), "".join(reasoning_parts), prompt_tokens, completion_tokens, last_finish_reason
+    return (
+        progress.content.text(), progress.reasoning.text(),
+        prompt_tokens, completion_tokens, last_finish_reason,
+    )
 
 
 async def call_llm(
@@ -384,6 +490,7 @@ async def call_llm(
     session: str = "",
     max_tokens: int | None = None,
     model_override: str | None = None,
+    cache_accept: Callable[[str], bool] | None = None,
 ) -> str:
     """Call an LLM via streaming SSE. Returns the response content string.
 
@@ -391,17 +498,16 @@ async def call_llm(
     - messages: OpenAI-format message list [{"role": ..., "content": ...}]
     - response_format: JSON schema dict for structured output (required for
       planner/reviewer/curator)
-    """
-    # Budget enforcement
-    budget_max = _llm_budget_max.get(None)
-    if budget_max is not None:
-        count = _llm_budget_count.get(0)
-        if count >= budget_max:
-            raise LLMBudgetExceeded(
-                f"LLM call budget exhausted ({count}/{budget_max} calls used)"
-            )
-        _llm_budget_count.set(count + 1)
 
+    Each HTTP attempt first waits for a slot from the shared
+    :mod:`kiso.llm_scheduler`, which enforces the provider limits, orders
+    waiting calls by role priority and session, and spreads 429 backoff
+    across every caller of the provider.
+
+    For cached roles, *cache_accept* decides whether a response may be
+    stored (and whether a stored one may be served), so callers that
+    validate the answer never get a rejected response replayed.
+    """
     model_string = model_override or config.models.get(role)
     if not model_string:
         raise LLMError(f"No model configured for role '{role}'")
@@ -432,6 +538,33 @@ async def call_llm(
     # Resolve provider name for audit
     provider_name = model_string.split(":", 1)[0] if ":" in model_string else next(iter(config.providers))
 
+    # Opt-in response cache for roles with a TTL (see kiso/llm_cache.py)
+    cache_ttl = llm_cache.role_ttl(config, role)
+    cache = cache_key = None
+    if cache_ttl > 0:
+        cache = llm_cache.get_response_cache(config)
+        cache_key = llm_cache.cache_key(
+            provider_name, model_name, role, messages, response_format, max_tokens,
+        )
+        cached = await cache.get(cache_key)
+        if cached is not None and cache_accept is not None and not cache_accept(cached):
+            await cache.discard(cache_key)
+            cached = None
+        if cached is not None:
+            audit.log_llm_call(session, role, model_name, provider_name, 0, 0, 0, "ok", cache="hit")
+            _record_usage_entry(role, model_name, 0, 0, 0, "", messages, cached, time.time())
+            return cached
+
+    # Budget enforcement (cache hits above are free)
+    budget_max = _llm_budget_max.get(None)
+    counter = _llm_budget_count.get(None)
+    if budget_max is not None and counter is not None:
+        if counter[0] >= budget_max:
+            raise LLMBudgetExceeded(
+                f"LLM call budget exhausted ({counter[0]}/{budget_max} calls used)"
+            )
+        counter[0] += 1
+
     llm_timeout = int(config.settings["llm_timeout"])
 
     stall_timeout = int(config.settings.get("stall_timeout", 60))
@@ -450,6 +583,7 @@ async def call_llm(
     reasoning_api = ""
     input_tokens = 0
     output_tokens = 0
+    cached_tokens = 0
     _transport_retries = 0
     _rate_retries = 0
     _rate_backoff = _RATE_INITIAL_BACKOFF
@@ -457,16 +591,30 @@ async def call_llm(
     _json_schema_retried = False  # track whether we already fell back to json_object
 
     # circuit breaker — fail fast when provider is degraded
-    if _cb_is_open():
+    if _scheduler.is_open(provider_name):
         raise LLMError(
             f"Circuit breaker open — provider transport degraded, failing fast "
             f"[model={model_name}, role={role}]"
         )
 
+    _scheduler.configure(
+        max_concurrency=setting_int(config.settings, "llm_max_concurrency", lo=1),
+        max_concurrency_per_model=setting_int(
+            config.settings, "llm_max_concurrency_per_model", lo=1,
+        ),
+        tokens_per_minute=setting_int(config.settings, "llm_tokens_per_minute", lo=0),
+    )
+    est_tokens = estimate_tokens(messages, max_tokens)
+    payload_messages = _payload_messages(
+        messages,
+        setting_bool(config.settings, "llm_prompt_caching")
+        and _supports_cache_breakpoints(provider),
+    )
+
     while True:
         payload: dict = {
             "model": model_name,
-            "messages": messages,
+            "messages": payload_messages,
             "stream": True,
             "stream_options": {"include_usage": True},
         }
@@ -495,9 +643,13 @@ async def call_llm(
                 "messages": stripped_messages,
                 "ts": call_ts,
             }
+            events.publish(session, "inflight", _inflight_calls[session])
 
         try:
-            async with _http_client_ctx(llm_timeout) as client:
+            async with _scheduler.slot(
+                provider_name, model_name, role=role, session=session, tokens=est_tokens,
+            ) as slot, _http_client_ctx(llm_timeout) as client:
+                t0 = time.perf_counter()  # exclude the queue wait
                 async with client.stream(
                     "POST", url, headers=headers, json=payload, timeout=llm_timeout,
                 ) as resp:
@@ -535,18 +687,24 @@ async def call_llm(
                                 _resp_status, _rate_retries, _MAX_RATE_RETRIES,
                                 wait, model_name,
                             )
-                            await asyncio.sleep(wait)
+                            # Back off the whole provider, not just this call.
+                            _scheduler.pause(provider_name, wait)
                             _rate_backoff = min(_rate_backoff * 2, _RATE_MAX_BACKOFF)
                             continue
                         break  # non-retryable error, handle after loop
 
-                    # Read SSE stream — pass inflight dict for live partial output
-                    _inflight = _inflight_calls.get(session) if session else None
+                    # Read SSE stream — expose its progress for live partial output
+                    _progress = StreamProgress()
+                    if session:
+                        _inflight_progress[session] = _progress
                     content, reasoning_api, input_tokens, output_tokens, finish_reason = await _read_sse_stream(
-                        resp, stall_timeout=stall_timeout, inflight_dict=_inflight,
+                        resp, stall_timeout=stall_timeout, progress=_progress,
+                        session=session,
                     )
+                    cached_tokens = _progress.cached_tokens
+                slot.settle(input_tokens + output_tokens)
 
-            _cb_record_success()
+            _scheduler.record_success(provider_name)
             if finish_reason == "length":
                 log.warning(
                     "LLM response truncated (max_tokens hit) [role=%s, model=%s]",
@@ -574,7 +732,7 @@ async def call_llm(
             duration_ms = _ms_since(t0)
             audit.log_llm_call(session, role, model_name, provider_name, 0, 0, duration_ms, "error")
             _detail = str(e) or "no detail"
-            _cb_record_failure()
+            _scheduler.record_failure(provider_name)
             _transport_retries += 1
             if _transport_retries <= _MAX_TRANSPORT_RETRIES:
                 backoff = _TRANSPORT_RETRY_BACKOFF * (2 ** (_transport_retries - 1))
@@ -601,7 +759,7 @@ async def call_llm(
                 raise LLMError(
                     f"LLM request failed ({type(e).__name__}): {_detail} [model={model_name}]"
                 )
-            _cb_record_failure()
+            _scheduler.record_failure(provider_name)
             _transport_retries += 1
             if _transport_retries <= _MAX_TRANSPORT_RETRIES:
                 backoff = _TRANSPORT_RETRY_BACKOFF * (2 ** (_transport_retries - 1))
@@ -615,7 +773,9 @@ async def call_llm(
                 continue
             raise LLMError(f"LLM request failed ({type(e).__name__}): {_detail} [model={model_name}]")
         finally:
-            _inflight_calls.pop(session, None)
+            _inflight_progress.pop(session, None)
+            if _inflight_calls.pop(session, None) is not None:
+                events.publish(session, "inflight", None)
 
     duration_ms = _ms_since(t0)
 
@@ -660,23 +820,47 @@ async def call_llm(
     if tag_thinking:
         content = clean_content
 
-    audit.log_llm_call(session, role, model_name, provider_name, input_tokens, output_tokens, duration_ms, "ok")
+    audit.log_llm_call(
+        session, role, model_name, provider_name, input_tokens, output_tokens, duration_ms, "ok",
+        cache="miss" if cache_key else "", cached_tokens=cached_tokens,
+    )
+    if cache is not None and (cache_accept is None or cache_accept(content)):
+        await cache.put(cache_key, role, content, cache_ttl)
 
-    # Accumulate usage for per-message tracking
-    entries = _llm_usage_entries.get(None)
-    if entries is not None:
-        if stripped_messages is None:
-            stripped_messages = _strip_messages(messages)
-        entries.append({
-            "role": role,
-            "model": model_name,
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
-            "duration_ms": duration_ms,
-            "thinking": thinking,
-            "messages": stripped_messages,
-            "response": content,
-            "ts": call_ts,
-        })
+    _record_usage_entry(
+        role, model_name, input_tokens, output_tokens, duration_ms, thinking,
+        messages, content, call_ts, stripped_messages,
+    )
 
     return content
+
+
+def _record_usage_entry(
+    role: str,
+    model_name: str,
+    input_tokens: int,
+    output_tokens: int,
+    duration_ms: int,
+    thinking: str,
+    messages: list[dict],
+    response: str,
+    ts: float,
+    stripped_messages: list[dict] | None = None,
+) -> None:
+    """Accumulate usage for per-message tracking, when a collector is active."""
+    entries = _llm_usage_entries.get(None)
+    if entries is None:
+        return
+    if stripped_messages is None:
+        stripped_messages = _strip_messages(messages)
+    entries.append({
+        "role": role,
+        "model": model_name,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "duration_ms": duration_ms,
+        "thinking": thinking,
+        "messages": stripped_messages,
+        "response": response,
+        "ts": ts,
+    })
@@ -0,0 +1,279 @@
+"""Content-addressed cache of LLM responses (opt-in).
+
+Several roles are called again and again with byte-identical message
+lists — cron jobs re-firing the same prompt, validation retries,
+repeated status questions.  With ``llm_cache_enabled`` set,
+:func:`kiso.llm.call_llm` looks those calls up here first and only goes
+to the provider on a miss.
+
+- Keys hash (provider, model, role, messages, response_format,
+  max_tokens), so any change in the prompt is a different entry.
+- Only roles listed in ``llm_cache_role_ttls`` (``"role:seconds"``) are
+  cached, each for its own TTL.
+- Callers that validate the answer pass ``cache_accept`` to
+  :func:`~kiso.llm.call_llm`; responses it rejects are never stored,
+  and a cached response it rejects is dropped and fetched again.
+- Hits do not count against the per-message LLM call budget.
+- Entries live in an in-memory LRU bounded by ``llm_cache_max_entries``
+  and by :data:`_MAX_BYTES`, and are written through to
+  ``~/.kiso/llm_cache.db`` so they survive a restart.
+
+Every cacheable call is logged in the audit trail with
+``"cache": "hit"`` or ``"cache": "miss"``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from kiso import config as _config_mod
+from kiso.config import Config, setting_int
+
+log = logging.getLogger(__name__)
+
+# Upper bound on the response bytes kept in memory.
+_MAX_BYTES = 64 * 1024 * 1024
+# Puts between two prunes of the SQLite file.
+_PRUNE_EVERY = 200
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key         TEXT PRIMARY KEY,
+    role        TEXT NOT NULL,
+    response    TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at);
+"""
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    role: str,
+    messages: list[dict],
+    response_format: dict | None,
+    max_tokens: int | None,
+) -> str:
+    """Hash of everything that determines a response."""
+    blob = json.dumps(
+        [provider, model, role, messages, response_format, max_tokens],
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def parse_role_ttls(entries: list) -> dict[str, int]:
+    """Parse ``["role:seconds", ...]``; malformed entries are skipped."""
+    ttls: dict[str, int] = {}
+    for entry in entries or []:
+        role, sep, seconds = str(entry).partition(":")
+        try:
+            ttl = int(seconds) if sep else -1
+        except ValueError:
+            ttl = -1
+        if not role.strip() or ttl < 0:
+            log.warning("Ignoring malformed llm_cache_role_ttls entry %r", entry)
+            continue
+        ttls[role.strip()] = ttl
+    return ttls
+
+
+def role_ttl(config: Config, role: str) -> int:
+    """Seconds responses of *role* stay cached; 0 when not cacheable."""
+    if not config.settings.get("llm_cache_enabled"):
+        return 0
+    return parse_role_ttls(config.settings.get("llm_cache_role_ttls", [])).get(role, 0)
+
+
+@dataclass(slots=True)
+class _Entry:
+    response: str
+    expires_at: float
+
+
+class ResponseCache:
+    """In-memory LRU of responses, written through to SQLite at *path*."""
+
+    def __init__(self, path: Path | None, max_entries: int = 2000,
+                 max_bytes: int = _MAX_BYTES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._mem: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._conn: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._loaded = path is None
+        self._load_lock = asyncio.Lock()
+        self._puts = 0
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached response for *key*, or None."""
+        await self._ensure_loaded()
+        entry = self._mem.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            self._evict(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._mem.move_to_end(key)
+        self.hits += 1
+        return entry.response
+
+    async def put(self, key: str, role: str, response: str, ttl: int) -> None:
+        """Store *response* under *key* for *ttl* seconds."""
+        if ttl <= 0 or len(response) > self.max_bytes:
+            return
+        await self._ensure_loaded()
+        now = time.time()
+        self._insert(key, _Entry(response, now + ttl))
+        if self.path is None:
+            return
+        self._puts += 1
+        prune = self._puts % _PRUNE_EVERY == 0
+        try:
+            await asyncio.to_thread(
+                self._db_write, key, role, response, now, now + ttl, prune,
+            )
+        except (OSError, sqlite3.Error) as exc:
+            log.warning("LLM cache write to %s failed: %s", self.path, exc)
+
+    async def discard(self, key: str) -> None:
+        """Drop *key* from memory and from the SQLite file."""
+        await self._ensure_loaded()
+        if key in self._mem:
+            self._evict(key)
+        if self.path is None:
+            return
+        try:
+            await asyncio.to_thread(self._db_delete, key)
+        except (OSError, sqlite3.Error) as exc:
+            log.warning("LLM cache delete from %s failed: %s", self.path, exc)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._mem),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -- memory ----------------------------------------------------------
+
+    def _insert(self, key: str, entry: _Entry) -> None:
+        if key in self._mem:
+            self._evict(key)
+        self._mem[key] = entry
+        self._bytes += len(entry.response)
+        while self._mem and (
+            len(self._mem) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._evict(next(iter(self._mem)))
+
+    def _evict(self, key: str) -> None:
+        entry = self._mem.pop(key)
+        self._bytes -= len(entry.response)
+
+    # -- SQLite ----------------------------------------------------------
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                rows = await asyncio.to_thread(self._db_load)
+            except (OSError, sqlite3.Error) as exc:
+                log.warning("LLM cache %s unreadable, starting empty: %s", self.path, exc)
+                rows = []
+            # Oldest first, so the newest end up most recently used.
+            for key, response, expires_at in rows:
+                if key not in self._mem:
+                    self._insert(key, _Entry(response, expires_at))
+                    self._mem.move_to_end(key, last=False)
+            self._loaded = True
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _db_load(self) -> list[tuple[str, str, float]]:
+        with self._db_lock:
+            cur = self._db().execute(
+                "SELECT key, response, expires_at FROM llm_cache "
+                "WHERE expires_at > ? ORDER BY created_at DESC LIMIT ?",
+                (time.time(), self.max_entries),
+            )
+            return cur.fetchall()
+
+    def _db_delete(self, key: str) -> None:
+        with self._db_lock:
+            conn = self._db()
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def _db_write(self, key: str, role: str, response: str, created_at: float,
+                  expires_at: float, prune: bool) -> None:
+        with self._db_lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, role, response, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, role, response, created_at, expires_at),
+            )
+            if prune:
+                conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (created_at,))
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key NOT IN "
+                    "(SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+            conn.commit()
+
+
+_cache: ResponseCache | None = None
+
+
+def get_response_cache(config: Config) -> ResponseCache:
+    """The daemon-wide cache, created on first use."""
+    global _cache
+    path = _config_mod.KISO_DIR / "llm_cache.db"
+    if _cache is None or _cache.path != path:
+        if _cache is not None:
+            _cache.close()
+        _cache = ResponseCache(path)
+    _cache.max_entries = setting_int(config.settings, "llm_cache_max_entries", lo=1)
+    return _cache
+
+
+def reset_response_cache() -> None:
+    """Drop the daemon-wide cache (for tests)."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
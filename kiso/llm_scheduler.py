@@ -0,0 +1,410 @@
+"""Admission control for outgoing LLM requests.
+
+Every HTTP attempt made by :func:`kiso.llm.call_llm` takes a slot from
+the daemon-wide :data:`scheduler` first.  The scheduler keeps, per
+provider:
+
+- a concurrency limit (``llm_max_concurrency``) plus a per-model limit
+  (``llm_max_concurrency_per_model``);
+- a token bucket refilled at ``llm_tokens_per_minute`` (0 = unlimited),
+  charged with an estimate up front and settled with the real usage;
+- a shared backoff: a 429/529 pauses the whole provider instead of only
+  the caller that hit it;
+- the transport circuit breaker.
+
+When requests have to queue, interactive roles go first (classifier,
+messenger), background roles last (curator, consolidator, summarizer).
+Waiting raises a request's priority over time so background work never
+starves.  Within a priority class the session with the fewest calls in
+flight is served first, then the one served least recently, then FIFO —
+one busy session cannot monopolise a provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+log = logging.getLogger(__name__)
+
+# Priority classes — lower is served first.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+
+_ROLE_PRIORITY: dict[str, int] = {
+    "classifier": PRIORITY_INTERACTIVE,
+    "messenger": PRIORITY_INTERACTIVE,
+    "curator": PRIORITY_BACKGROUND,
+    "consolidator": PRIORITY_BACKGROUND,
+    "summarizer": PRIORITY_BACKGROUND,
+}
+_PRIORITY_NAMES = ("interactive", "normal", "background")
+
+# Seconds of queueing that promote a waiter by one priority class.
+_AGING_SECONDS = 20.0
+
+# Circuit breaker — protects against provider-wide degradation.
+# When consecutive transport failures reach the threshold, subsequent
+# calls to that provider fail immediately instead of wasting time on
+# doomed retries.
+CB_FAILURE_THRESHOLD = 5
+CB_COOLDOWN = 30.0
+
+# Recent queue waits kept per priority class for the metrics.
+_WAIT_SAMPLES = 256
+
+
+def role_priority(role: str) -> int:
+    """Return the priority class of an LLM *role*."""
+    return _ROLE_PRIORITY.get(role, PRIORITY_NORMAL)
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int | None = None) -> int:
+    """Cheap up-front token estimate of a request (~4 chars per token)."""
+    chars = 0
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict) and isinstance(part.get("text"), str):
+                    chars += len(part["text"])
+    return chars // 4 + (max_tokens or 0)
+
+
+@dataclass
+class _ProviderState:
+    """Admission and health state of one provider."""
+
+    active: int = 0
+    model_active: dict[str, int] = field(default_factory=dict)
+    tokens: float = 0.0
+    tokens_at: float = 0.0
+    paused_until: float = 0.0
+    failures: int = 0
+    open_until: float = 0.0
+    admitted: int = 0
+
+    def refill(self, now: float, tokens_per_minute: int) -> None:
+        if tokens_per_minute <= 0:
+            return
+        if self.tokens_at <= 0:
+            self.tokens = float(tokens_per_minute)
+        else:
+            self.tokens = min(
+                float(tokens_per_minute),
+                self.tokens + (now - self.tokens_at) * tokens_per_minute / 60.0,
+            )
+        self.tokens_at = now
+
+
+@dataclass
+class _Waiter:
+    provider: str
+    model: str
+    session: str
+    priority: int
+    cost: int
+    seq: int
+    enqueued_at: float
+    future: asyncio.Future
+
+
+class Slot:
+    """An admitted request; returned by :meth:`LLMScheduler.slot`."""
+
+    def __init__(self, scheduler: "LLMScheduler", provider: str, model: str,
+                 session: str, cost: int) -> None:
+        self._scheduler = scheduler
+        self.provider = provider
+        self.model = model
+        self.session = session
+        self.cost = cost
+
+    def settle(self, used_tokens: int) -> None:
+        """Correct the token bucket with the real usage of the request."""
+        if used_tokens > 0:
+            self._scheduler._settle(self.provider, used_tokens - self.cost)
+            self.cost = used_tokens
+
+
+class LLMScheduler:
+    """Daemon-wide queue in front of the LLM providers."""
+
+    def __init__(self) -> None:
+        self.max_concurrency = 16
+        self.max_concurrency_per_model = 8
+        self.tokens_per_minute = 0
+        self._providers: dict[str, _ProviderState] = {}
+        self._waiters: list[_Waiter] = []
+        self._session_active: dict[str, int] = {}
+        self._session_served: dict[str, float] = {}
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._waits: tuple[deque[float], ...] = tuple(
+            deque(maxlen=_WAIT_SAMPLES) for _ in _PRIORITY_NAMES
+        )
+
+    def configure(
+        self,
+        *,
+        max_concurrency: int,
+        max_concurrency_per_model: int,
+        tokens_per_minute: int,
+    ) -> None:
+        """Apply the limits from the current settings."""
+        changed = (
+            max_concurrency, max_concurrency_per_model, tokens_per_minute,
+        ) != (
+            self.max_concurrency, self.max_concurrency_per_model, self.tokens_per_minute,
+        )
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_concurrency_per_model = max(1, max_concurrency_per_model)
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        if changed and self._waiters:
+            self._dispatch()
+
+    def reset(self) -> None:
+        """Drop all state (for tests)."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self.__init__()
+
+    def _state(self, provider: str) -> _ProviderState:
+        state = self._providers.get(provider)
+        if state is None:
+            state = self._providers[provider] = _ProviderState()
+        return state
+
+    # -- circuit breaker -------------------------------------------------
+
+    def record_failure(self, provider: str) -> None:
+        """Record a transport failure.  Opens the circuit after the threshold."""
+        state = self._state(provider)
+        state.failures += 1
+        if state.failures >= CB_FAILURE_THRESHOLD:
+            state.open_until = time.monotonic() + CB_COOLDOWN
+            log.warning(
+                "Circuit breaker OPEN for provider %s — %d consecutive transport "
+                "failures, failing fast for %.0fs",
+                provider, state.failures, CB_COOLDOWN,
+            )
+
+    def record_success(self, provider: str) -> None:
+        """Close the circuit of *provider* after a successful call."""
+        state = self._state(provider)
+        state.failures = 0
+        state.open_until = 0.0
+
+    def is_open(self, provider: str) -> bool:
+        """Check if the circuit of *provider* is open (should fail fast)."""
+        state = self._providers.get(provider)
+        if state is None or state.open_until <= 0:
+            return False
+        # Cooldown expired → half-open, allow probes again.
+        return time.monotonic() < state.open_until
+
+    def consecutive_failures(self, provider: str) -> int:
+        state = self._providers.get(provider)
+        return state.failures if state is not None else 0
+
+    # -- shared backoff --------------------------------------------------
+
+    def pause(self, provider: str, seconds: float) -> None:
+        """Hold back every new request to *provider* for *seconds*."""
+        if seconds <= 0:
+            return
+        state = self._state(provider)
+        state.paused_until = max(state.paused_until, time.monotonic() + seconds)
+
+    # -- admission -------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        model: str,
+        *,
+        role: str = "",
+        session: str = "",
+        tokens: int = 0,
+    ) -> AsyncIterator[Slot]:
+        """Wait for admission to *provider*/*model*; release on exit."""
+        waiter = _Waiter(
+            provider=provider,
+            model=model,
+            session=session,
+            priority=role_priority(role),
+            cost=max(0, tokens),
+            seq=next(self._seq),
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except BaseException:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the caller gave up.
+                self._release(waiter.provider, waiter.model, waiter.session)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        self._waits[waiter.priority].append(time.monotonic() - waiter.enqueued_at)
+        try:
+            yield Slot(self, provider, model, session, waiter.cost)
+        finally:
+            self._release(provider, model, session)
+
+    def _release(self, provider: str, model: str, session: str) -> None:
+        state = self._state(provider)
+        state.active -= 1
+        left = state.model_active.get(model, 0) - 1
+        if left > 0:
+            state.model_active[model] = left
+        else:
+            state.model_active.pop(model, None)
+        active = self._session_active.get(session, 0) - 1
+        if active > 0:
+            self._session_active[session] = active
+        else:
+            self._session_active.pop(session, None)
+        if self._waiters:
+            self._dispatch()
+
+    def _settle(self, provider: str, delta: int) -> None:
+        if self.tokens_per_minute > 0:
+            state = self._state(provider)
+            state.refill(time.monotonic(), self.tokens_per_minute)
+            state.tokens -= delta
+
+    def _order(self, waiter: _Waiter, now: float) -> tuple:
+        aged = waiter.priority - int((now - waiter.enqueued_at) / _AGING_SECONDS)
+        return (
+            aged,
+            self._session_active.get(waiter.session, 0),
+            self._session_served.get(waiter.session, 0.0),
+            waiter.seq,
+        )
+
+    def _dispatch(self) -> None:
+        """Admit every waiter the limits allow, best-ordered first."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        retry_at = 0.0
+        while True:
+            now = time.monotonic()
+            admitted = None
+            # A waiter that is held back blocks lower-ordered waiters of
+            # the same provider (or model) so they cannot overtake it.
+            blocked_providers: set[str] = set()
+            blocked_models: set[tuple[str, str]] = set()
+            for waiter in sorted(self._waiters, key=lambda w: self._order(w, now)):
+                if waiter.future.done():
+                    continue
+                if waiter.provider in blocked_providers:
+                    continue
+                if (waiter.provider, waiter.model) in blocked_models:
+                    continue
+                state = self._state(waiter.provider)
+                if state.paused_until > now:
+                    blocked_providers.add(waiter.provider)
+                    retry_at = min(retry_at or state.paused_until, state.paused_until)
+                    continue
+                if state.active >= self.max_concurrency:
+                    blocked_providers.add(waiter.provider)
+                    continue
+                if state.model_active.get(waiter.model, 0) >= self.max_concurrency_per_model:
+                    blocked_models.add((waiter.provider, waiter.model))
+                    continue
+                if self.tokens_per_minute > 0:
+                    state.refill(now, self.tokens_per_minute)
+                    # A request larger than the whole bucket only needs a full one.
+                    need = min(waiter.cost, self.tokens_per_minute)
+                    if state.tokens < need:
+                        blocked_providers.add(waiter.provider)
+                        ready = now + (need - state.tokens) * 60.0 / self.tokens_per_minute
+                        retry_at = min(retry_at or ready, ready)
+                        continue
+                    state.tokens -= waiter.cost
+                admitted = waiter
+                break
+            if admitted is None:
+                break
+            self._waiters.remove(admitted)
+            state = self._state(admitted.provider)
+            state.active += 1
+            state.admitted += 1
+            state.model_active[admitted.model] = state.model_active.get(admitted.model, 0) + 1
+            self._session_active[admitted.session] = self._session_active.get(admitted.session, 0) + 1
+            self._session_served[admitted.session] = now
+            admitted.future.set_result(None)
+        self._waiters = [w for w in self._waiters if not w.future.done()]
+        if retry_at and self._waiters:
+            delay = max(0.0, retry_at - time.monotonic())
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+        if len(self._session_served) > 4 * (len(self._session_active) + len(self._waiters)) + 64:
+            self._forget_idle_sessions()
+
+    def _forget_idle_sessions(self) -> None:
+        keep = set(self._session_active) | {w.session for w in self._waiters}
+        self._session_served = {
+            s: t for s, t in self._session_served.items() if s in keep
+        }
+
+    # -- metrics ---------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Queue depth, occupancy and recent wait times, JSON-ready."""
+        now = time.monotonic()
+        providers: dict[str, dict] = {}
+        for name, state in self._providers.items():
+            state.refill(now, self.tokens_per_minute)
+            providers[name] = {
+                "active": state.active,
+                "queued": sum(1 for w in self._waiters if w.provider == name),
+                "admitted": state.admitted,
+                "models": dict(state.model_active),
+                "tokens_available": (
+                    int(state.tokens) if self.tokens_per_minute > 0 else None
+                ),
+                "paused_s": round(max(0.0, state.paused_until - now), 1),
+                "circuit_open": self.is_open(name),
+                "consecutive_failures": state.failures,
+            }
+        wait_ms: dict[str, dict] = {}
+        queued: dict[str, int] = {}
+        for prio, name in enumerate(_PRIORITY_NAMES):
+            samples = self._waits[prio]
+            queued[name] = sum(1 for w in self._waiters if w.priority == prio)
+            wait_ms[name] = {
+                "samples": len(samples),
+                "avg": round(sum(samples) / len(samples) * 1000) if samples else 0,
+                "max": round(max(samples) * 1000) if samples else 0,
+            }
+        oldest = min((w.enqueued_at for w in self._waiters), default=now)
+        return {
+            "limits": {
+                "max_concurrency": self.max_concurrency,
+                "max_concurrency_per_model": self.max_concurrency_per_model,
+                "tokens_per_minute": self.tokens_per_minute,
+            },
+            "queued": len(self._waiters),
+            "queued_by_priority": queued,
+            "oldest_wait_ms": round((now - oldest) * 1000),
+            "wait_ms": wait_ms,
+            "providers": providers,
+        }
+
+
+scheduler = LLMScheduler()
@@ -21,6 +21,8 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from starlette.responses import JSONResponse
 
+from kiso import audit as _audit
+from kiso import events as _events
 from kiso.auth import AuthInfo, ResolvedUser, require_auth, resolve_user
 from kiso.stats import aggregate, read_audit_entries
 from kiso.brain import (
@@ -28,7 +30,9 @@ from kiso.brain import (
     _VALID_FACT_CATEGORIES,
     build_recent_context, run_inflight_classifier, is_stop_message,
 )
-from kiso.config import ConfigError, KISO_DIR, load_config, reload_config, setting_bool, setting_int
+from kiso.config import (
+    ConfigError, KISO_DIR, config_service, load_config, setting_bool, setting_int,
+)
 import kiso.llm as _llm_mod
 from kiso.log import setup_logging
 from kiso.pub import pub_token, resolve_pub_token
@@ -40,6 +44,7 @@ from kiso.store import (
     create_session,
     delete_project,
     get_all_sessions,
+    get_llm_calls,
     get_plan_for_session,
     get_project,
     get_recent_messages,
@@ -57,7 +62,11 @@ from kiso.store import (
     save_fact,
     session_owned_by,
     get_unprocessed_trusted_messages,
+    close_read_pool,
+    configure_group_commit,
+    enable_fact_index,
     init_db,
+    open_read_pool,
     recover_stale_running,
     save_message,
     unbind_session_from_project,
@@ -72,7 +81,6 @@ from kiso.api import (
     runtime_router,
     sessions_router,
 )
-from kiso.api.sessions import _strip_llm_verbose
 
 log = logging.getLogger(__name__)
 
@@ -451,10 +459,19 @@ _workers: dict[str, WorkerEntry] = {}
 # Per-session worker phase: session → phase string (e.g. "classifying", "planning", "executing", "idle")
 _worker_phases: dict[str, str] = {}
 
+# Daemon-wide MCP client pool, owned by lifespan and shared by every
+# session worker. None when no MCP servers are configured.
+_mcp_manager = None
+# Background catalog warm-up (or reconfigure + warm-up) of the shared
+# pool; cancelled at shutdown so it never outlives the manager.
+_mcp_warmup: asyncio.Task | None = None
+
 
 def _set_worker_phase(session: str, phase: str) -> None:
     """Set the current worker phase for a session (injected as callback into run_worker)."""
-    _worker_phases[session] = phase
+    if _worker_phases.get(session) != phase:
+        _worker_phases[session] = phase
+        _events.publish(session, "phase", {"phase": phase})
 
 
 class SessionRequest(BaseModel):
@@ -485,15 +502,18 @@ def _ensure_worker(session: str, db, config) -> asyncio.Queue:
     task = asyncio.create_task(
         run_worker(db, config, session, queue, cancel_event=cancel_event,
                    set_phase=lambda phase, s=session: _set_worker_phase(s, phase),
-                   pending_messages=pending, update_hints=hints)
+                   pending_messages=pending, update_hints=hints,
+                   mcp_manager=_mcp_manager)
     )
 
     def _cleanup(t, s=session):
         _workers.pop(s, None)
         _worker_phases.pop(s, None)
+        _events.publish(s, "worker", {"running": False})
 
     task.add_done_callback(_cleanup)
     _workers[session] = WorkerEntry(queue, task, cancel_event, pending, hints)
+    _events.publish(session, "worker", {"running": True})
     return queue
 
 
@@ -524,6 +544,7 @@ def _init_app_state(app: FastAPI, config, db) -> None:
     """Set minimal app state. Called from lifespan and test fixtures."""
     app.state.config = config
     app.state.db = db
+    app.state.cron_scheduler = None
 
 
 async def _startup_recovery(db, config) -> None:
@@ -577,72 +598,168 @@ async def _startup_recovery(db, config) -> None:
         log.info("Startup recovery: re-enqueued %d unprocessed messages", recovered_count)
 
 
-_CRON_CHECK_INTERVAL = 60  # seconds between cron checks
+async def _fire_cron_job(db, config, job: dict) -> None:
+    """Queue a cron job's prompt on its session worker as an admin message."""
+    session = job["session"]
+    prompt = job["prompt"]
+    msg_id = await save_message(
+        db, session, "cron", "system", prompt,
+        trusted=True, processed=False, source="cron",
+    )
+    msg_payload = {
+        "id": msg_id,
+        "content": prompt,
+        "user_role": "admin",
+        "user_mcp": "*",
+        "user_skills": "*",
+        "username": "cron",
+        "base_url": "",
+    }
+    queue = _ensure_worker(session, db, config)
+    await queue.put(msg_payload)
+
+
+async def _init_cron_scheduler(db, config):
+    """Build the cron scheduler and load the enabled jobs into its heap."""
+    from kiso.cron import MISFIRE_POLICIES, CronScheduler
+
+    policy = config.settings.get("cron_misfire_policy", "run_once")
+    if policy not in MISFIRE_POLICIES:
+        log.warning(
+            "cron_misfire_policy=%r is not one of %s, using 'run_once'",
+            policy, ", ".join(MISFIRE_POLICIES),
+        )
+        policy = "run_once"
+    scheduler = CronScheduler(
+        db,
+        lambda job: _fire_cron_job(db, config, job),
+        max_concurrent=setting_int(config.settings, "cron_max_concurrent", lo=1, hi=256),
+        misfire_policy=policy,
+        misfire_grace=float(setting_int(config.settings, "cron_misfire_grace", lo=0)),
+    )
+    loaded = await scheduler.load()
+    if loaded:
+        log.info("Cron scheduler loaded %d enabled job(s)", loaded)
+    return scheduler
 
 
-async def _cron_scheduler(db, config, app):
-    """Background loop that fires due cron jobs every 60 seconds."""
-    from datetime import datetime
+def _init_mcp_manager(config):
+    """Build the shared MCP pool, start idle eviction and catalog warm-up.
+
+    The pool is built even with no servers configured: workers capture
+    it when they start, so servers added by a later reload reach them.
+    Returns None when construction fails (workers then fall back to
+    their own private manager). The warm-up task is kept in
+    ``_mcp_warmup``.
+    """
+    global _mcp_warmup
+    try:
+        from kiso.mcp.manager import MCPManager
+        from kiso.mcp.warmup import start_warmup
+
+        manager = MCPManager(
+            config.mcp_servers,
+            session_idle_timeout_s=float(setting_int(
+                config.settings, "mcp_session_idle_timeout", lo=60, hi=7200,
+            )),
+            max_session_clients_per_server=setting_int(
+                config.settings, "mcp_max_session_clients_per_server",
+                lo=1, hi=256,
+            ),
+        )
+        manager.start_eviction_loop()
+        if config.mcp_servers:
+            _mcp_warmup = start_warmup(manager, config)
+    except Exception as exc:
+        log.warning("Failed to construct shared MCPManager: %s", exc)
+        return None
+    log.info("Shared MCPManager constructed for %d server(s)", len(config.mcp_servers))
+    return manager
+
+
+async def _cancel_mcp_warmup() -> None:
+    global _mcp_warmup
+    task, _mcp_warmup = _mcp_warmup, None
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception:
+        log.exception("MCP catalog warm-up failed")
 
-    from croniter import croniter
 
-    from kiso.store import get_due_cron_jobs, update_cron_last_run
+async def _reconfigure_mcp(manager, config, previous: asyncio.Task | None) -> None:
+    """Apply edited ``[mcp]`` servers to the shared pool, then re-warm it."""
+    from kiso.mcp.warmup import start_warmup
 
-    while True:
-        await asyncio.sleep(_CRON_CHECK_INTERVAL)
+    if previous is not None and not previous.done():
+        previous.cancel()
         try:
-            now = datetime.now()
-            now_iso = now.isoformat()
-            due_jobs = await get_due_cron_jobs(db, now_iso)
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            log.exception("Cron scheduler: failed to fetch due jobs")
-            continue
+            await previous
+        except (asyncio.CancelledError, Exception):  # noqa: BLE001
+            pass
+    changed = await manager.reconfigure(config.mcp_servers)
+    log.info("MCP servers reconfigured: %s", ", ".join(changed))
+    if config.mcp_servers:
+        await start_warmup(manager, config)
 
-        for job in due_jobs:
-            try:
-                session = job["session"]
-                prompt = job["prompt"]
-                log.info("Cron job %d fired: session=%s prompt=%r", job["id"], session, prompt[:80])
 
-                msg_id = await save_message(
-                    db, session, "cron", "system", prompt,
-                    trusted=True, processed=False, source="cron",
-                )
-                msg_payload = {
-                    "id": msg_id,
-                    "content": prompt,
-                    "user_role": "admin",
-                    "user_mcp": "*",
-                    "user_skills": "*",
-                    "username": "cron",
-                    "base_url": "",
-                }
-                queue = _ensure_worker(session, db, config)
-                await queue.put(msg_payload)
+def _apply_mcp_servers(config) -> None:
+    """Point the shared MCP pool at the servers of a new config snapshot.
 
-                cron = croniter(job["schedule"], now)
-                next_dt = cron.get_next(datetime)
-                await update_cron_last_run(db, job["id"], now_iso, next_dt.isoformat())
-            except asyncio.CancelledError:
-                raise
-            except Exception:
-                log.exception("Cron job %d failed (will retry next cycle)", job["id"])
+    The pool is reconfigured in place, so running and new sessions both
+    see the change. If it could not be built at startup, another attempt
+    is made now; only sessions started after that use it.
+    """
+    global _mcp_manager, _mcp_warmup
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        log.warning("MCP server definitions changed outside the event loop; not applied")
+        return
+    if _mcp_manager is None:
+        _mcp_manager = _init_mcp_manager(config)
+        app.state.mcp_manager = _mcp_manager
+        return
+    _mcp_warmup = asyncio.create_task(
+        _reconfigure_mcp(_mcp_manager, config, _mcp_warmup), name="mcp-reconfigure",
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
     config = load_config()
+    config_service.publish(config, notify=False)
     _init_kiso_dirs()
+    _audit.start_sink(
+        KISO_DIR / "audit",
+        max_queue=setting_int(config.settings, "audit_queue_max", lo=100, hi=1_000_000),
+        usage_db=KISO_DIR / "store.db",
+    )
     await _llm_mod.init_http_client(timeout=setting_int(config.settings, "llm_timeout", lo=1))
     log.info("Server starting — host=%s port=%s",
              config.settings["host"],
              config.settings["port"])
     db = await init_db(KISO_DIR / "store.db")
+    await open_read_pool(
+        db, KISO_DIR / "store.db",
+        setting_int(config.settings, "db_read_connections", lo=0, hi=32),
+    )
+    configure_group_commit(
+        db, setting_int(config.settings, "db_group_commit_ms", lo=0, hi=50) / 1000,
+    )
+    if setting_bool(config.settings, "fact_vector_index"):
+        enable_fact_index(db)
     _init_app_state(app, config, db)
 
+    global _mcp_manager
+    _mcp_manager = _init_mcp_manager(config)
+    app.state.mcp_manager = _mcp_manager
+
     await _collect_boot_facts(db)
 
     # backfill entity_id for facts created before entity model
@@ -653,6 +770,11 @@ async def lifespan(app: FastAPI):
 
     await _startup_recovery(db, config)
 
+    # Measure ~/.kiso once in the background so the first exec disk-limit
+    # check and /health already have a total to read.
+    from kiso.worker.utils import _disk_accountant
+    _disk_accountant.request_rescan()
+
     # Webhook secret length warning
     webhook_secret = config.settings["webhook_secret"]
     if webhook_secret and len(webhook_secret) < 32:
@@ -686,17 +808,22 @@ async def lifespan(app: FastAPI):
     except Exception as exc:  # pragma: no cover — best-effort
         log.debug("allowlist validation skipped: %s", exc)
 
-    # Start cron scheduler background task
-    cron_task = asyncio.create_task(_cron_scheduler(db, config, app))
+    # Start cron scheduler and store maintenance background tasks
+    app.state.cron_scheduler = await _init_cron_scheduler(db, config)
+    cron_task = asyncio.create_task(app.state.cron_scheduler.run())
+    from kiso.maintenance import maintenance_loop
+    maintenance_task = asyncio.create_task(maintenance_loop(db, config))
 
     yield
 
     # Cancel background tasks
-    cron_task.cancel()
-    try:
-        await cron_task
-    except asyncio.CancelledError:
-        pass
+    for task in (cron_task, maintenance_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    app.state.cron_scheduler = None
 
     # Graceful shutdown with timeout
     shutdown_timeout = setting_int(config.settings, "llm_timeout", lo=1)
@@ -718,12 +845,37 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     _workers.clear()
+    await _cancel_mcp_warmup()
+    if _mcp_manager is not None:
+        try:
+            await _mcp_manager.shutdown_all()
+        except Exception:
+            log.exception("Shared MCPManager shutdown failed")
+        _mcp_manager = None
     await _llm_mod.close_http_client()
+    await asyncio.to_thread(_audit.stop_sink)
+    await close_read_pool(app.state.db)
     await app.state.db.close()
     log.info("Server shut down")
 
 
 app = FastAPI(lifespan=lifespan)
+
+
+@config_service.subscribe
+def _on_config_change(config) -> None:
+    """Swap in a new config snapshot and drop the caches derived from it."""
+    from kiso.skill_loader import invalidate_skills_cache
+    from kiso.sysenv import invalidate_cache as invalidate_sysenv_cache
+
+    previous = getattr(app.state, "config", None)
+    app.state.config = config
+    invalidate_prompt_cache()
+    invalidate_sysenv_cache()
+    invalidate_skills_cache()
+    if previous is not None and previous.mcp_servers != config.mcp_servers:
+        _apply_mcp_servers(config)
+
 app.include_router(runtime_router)
 app.include_router(sessions_router)
 app.include_router(knowledge_router)
@@ -0,0 +1,121 @@
+"""Scheduled store maintenance: fact decay, archiving and index upkeep.
+
+One daemon-wide loop (started from ``lifespan``) replaces the decay and
+archive passes that used to follow every plan in every session. Every
+``maintenance_interval_hours`` it runs, in order:
+
+1. ``decay_facts`` — stale facts lose ``fact_decay_rate`` confidence;
+2. ``archive_low_confidence_facts`` — facts below
+   ``fact_archive_threshold`` move to ``facts_archive``;
+3. ``delete_orphan_fact_tags`` — tags left behind by deleted facts;
+4. ``optimize_fact_search`` — FTS5 segment merge;
+5. ``optimize_db`` — ``PRAGMA optimize`` and incremental vacuum.
+
+Row-level steps commit at most ``maintenance_batch_size`` rows at a
+time and yield between batches, so live traffic on the writer
+connection is never stuck behind one long statement. A failing step is
+logged and the next one still runs. The time of the last run is kept
+in ``kv`` so restarts do not reset the schedule.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import aiosqlite
+
+from kiso.config import Config, ConfigError, current_config, setting_float, setting_int
+from kiso.store import (
+    archive_low_confidence_facts,
+    decay_facts,
+    delete_orphan_fact_tags,
+    get_kv,
+    optimize_db,
+    optimize_fact_search,
+    set_kv,
+)
+
+log = logging.getLogger(__name__)
+
+_LAST_RUN_KV_KEY = "maintenance_last_run"
+_CHECK_INTERVAL = 300  # seconds between "is maintenance due?" checks
+
+
+async def run_maintenance(db: aiosqlite.Connection, config: Config) -> dict[str, int]:
+    """Run every maintenance step once; return what each one changed."""
+    settings = config.settings
+    batch_size = setting_int(settings, "maintenance_batch_size", lo=1, hi=100_000)
+    decay_days = setting_int(settings, "fact_decay_days", lo=1)
+    decay_rate = setting_float(settings, "fact_decay_rate", lo=0.0, hi=1.0)
+    archive_threshold = setting_float(settings, "fact_archive_threshold", lo=0.0, hi=1.0)
+
+    steps = (
+        ("decayed", "Decayed %d stale facts",
+         lambda: decay_facts(
+             db, decay_days=decay_days, decay_rate=decay_rate, batch_size=batch_size,
+         )),
+        ("archived", "Archived %d low-confidence facts",
+         lambda: archive_low_confidence_facts(
+             db, threshold=archive_threshold, batch_size=batch_size,
+         )),
+        ("orphan_tags", "Deleted %d orphan fact tags",
+         lambda: delete_orphan_fact_tags(db, batch_size=batch_size)),
+        ("fts_optimized", None, lambda: _counted(optimize_fact_search(db))),
+        ("vacuumed_pages", "Released %d free database pages",
+         lambda: optimize_db(db, vacuum_pages=batch_size)),
+    )
+    results: dict[str, int] = {}
+    for name, message, step in steps:
+        try:
+            results[name] = count = await step()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            log.error("Maintenance step %s failed: %s", name, exc)
+            continue
+        if count and message:
+            log.info(message, count)
+    return results
+
+
+async def _counted(coro) -> int:
+    """Await a step that reports nothing; count it as one unit of work."""
+    await coro
+    return 1
+
+
+async def run_due_maintenance(db: aiosqlite.Connection, config: Config) -> bool:
+    """Run maintenance if ``maintenance_interval_hours`` passed since the last run."""
+    interval_hours = setting_float(config.settings, "maintenance_interval_hours", lo=1.0)
+    last_run = await get_kv(db, _LAST_RUN_KV_KEY)
+    if last_run is not None:
+        try:
+            if (time.time() - float(last_run)) / 3600 < interval_hours:
+                return False
+        except ValueError:
+            pass
+    await run_maintenance(db, config)
+    await set_kv(db, _LAST_RUN_KV_KEY, str(time.time()))
+    return True
+
+
+async def maintenance_loop(db: aiosqlite.Connection, config: Config) -> None:
+    """Background loop that runs maintenance whenever it is due.
+
+    Each check reads the current config snapshot, so reloaded settings
+    apply; *config* is only used while ``config.toml`` cannot be read.
+    """
+    while True:
+        await asyncio.sleep(_CHECK_INTERVAL)
+        try:
+            config = current_config()
+        except ConfigError as e:
+            log.warning("Config reload failed: %s — using cached config", e)
+        try:
+            await run_due_maintenance(db, config)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Maintenance run failed")
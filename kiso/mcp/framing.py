@@ -0,0 +1,341 @@
+"""Newline-delimited JSON-RPC framing for the stdio MCP transport.
+
+``StreamReader.readline()`` gives up on lines longer than the stream
+limit (64 KiB by default), and a single ``tools/call`` result carrying
+a screenshot or a scanned PDF is routinely megabytes long. The
+:class:`FrameReader` here reads fixed-size chunks instead and splits
+them on ``\\n`` itself:
+
+- each chunk is scanned once, so a frame costs O(size) however many
+  reads it spans;
+- frames up to :data:`SPOOL_THRESHOLD` are assembled in memory; larger
+  ones are appended to a spool file under ``~/.kiso/mcp/spool`` as they
+  arrive;
+- frames larger than the per-message cap are drained and dropped
+  without being kept anywhere, and reported as oversized with the first
+  bytes kept so the caller can fail the matching request.
+
+:func:`decode_frame` parses straight from bytes (with ``orjson`` when it
+is installed). For a spooled frame, the big base64 ``data``/``blob``
+strings of MCP content blocks are cut out of the document before it is
+parsed and come back as :class:`SpooledBlob` handles. The spool file
+is deleted once the last handle is garbage collected.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import mmap
+import re
+import uuid
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+try:  # optional, noticeably faster on multi-megabyte documents
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
+log = logging.getLogger(__name__)
+
+READ_CHUNK = 64 * 1024
+# Frames above this size go to disk instead of memory.
+SPOOL_THRESHOLD = 4 * 1024 * 1024
+# Bytes kept from the start of every frame for diagnostics.
+_HEAD_BYTES = 4096
+
+_BLOB_KEY_RE = re.compile(rb'"(data|blob)"\s*:\s*"')
+_ID_RE = re.compile(rb'"id"\s*:\s*(-?\d+)')
+_PLACEHOLDER_PREFIX = "\x00kiso-spool:"
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes, using orjson when available.
+
+    Both backends raise a ``json.JSONDecodeError`` (orjson's error type
+    subclasses it).
+    """
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+class _SpoolFile:
+    """A spool file removed once nothing references it any more."""
+
+    __slots__ = ("path", "__weakref__")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        weakref.finalize(self, path.unlink, missing_ok=True)
+
+
+class SpooledBlob:
+    """A JSON string value left in a spool file instead of memory.
+
+    Stands in for the base64 ``data``/``blob`` of large MCP content
+    blocks. ``start``/``end`` delimit the raw string body (without
+    quotes, possibly still JSON-escaped) inside the spool file.
+    """
+
+    __slots__ = ("_spool", "start", "end")
+
+    def __init__(self, spool: _SpoolFile, start: int, end: int) -> None:
+        self._spool = spool
+        self.start = start
+        self.end = end
+
+    @property
+    def path(self) -> Path:
+        return self._spool.path
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __bool__(self) -> bool:
+        return self.end > self.start
+
+    def __repr__(self) -> str:
+        return f"SpooledBlob({self.path.name}, {len(self)} bytes)"
+
+    def iter_raw(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """Yield the raw (still JSON-escaped) string body in chunks."""
+        with open(self.path, "rb") as f:
+            f.seek(self.start)
+            remaining = len(self)
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    def iter_bytes(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """Yield the decoded value in chunks, without holding it whole.
+
+        Only the ``\\/`` escape can occur in base64; values with any
+        other escape should go through :meth:`read_bytes`.
+        """
+        carry = b""
+        for chunk in self.iter_raw(chunk_size):
+            chunk = carry + chunk
+            carry = b""
+            # A trailing backslash may start an escape split across chunks.
+            if chunk.endswith(b"\\") and (len(chunk) - len(chunk.rstrip(b"\\"))) % 2:
+                chunk, carry = chunk[:-1], b"\\"
+            yield chunk.replace(b"\\/", b"/") if b"\\" in chunk else chunk
+        if carry:
+            yield carry
+
+    def read_bytes(self) -> bytes:
+        """The decoded string value as ASCII bytes."""
+        raw = b"".join(self.iter_raw())
+        if b"\\" in raw:
+            return json.loads(b'"' + raw + b'"').encode("utf-8")
+        return raw
+
+    def read_text(self) -> str:
+        return self.read_bytes().decode("utf-8")
+
+
+@dataclass(slots=True)
+class Frame:
+    """One newline-delimited message read off the stream."""
+
+    size: int
+    data: bytes | None = None  # in-memory frames
+    spool: _SpoolFile | None = None  # spooled frames
+    oversized: bool = False  # dropped: exceeded the per-message cap
+    head: bytes = b""
+
+    def request_id(self) -> int | None:
+        """Best-effort JSON-RPC id, read from the first bytes of the frame."""
+        m = _ID_RE.search(self.head)
+        return int(m.group(1)) if m else None
+
+
+class FrameReader:
+    """Split a byte stream into newline-delimited frames."""
+
+    def __init__(
+        self,
+        stream: Any,
+        *,
+        max_bytes: int,
+        spool_dir: Path,
+        spool_threshold: int = SPOOL_THRESHOLD,
+        label: str = "mcp",
+    ) -> None:
+        self._stream = stream
+        self.max_bytes = max_bytes
+        self._spool_dir = spool_dir
+        self._spool_threshold = spool_threshold
+        self._label = label
+        self._buf = b""
+        self._pos = 0
+        self._eof = False
+
+    async def read_frame(self) -> Frame | None:
+        """Return the next frame, or None at end of stream.
+
+        A trailing frame without a final newline is still returned.
+        Raises whatever the underlying ``read`` raises.
+        """
+        parts: list[bytes] = []
+        size = 0
+        head = b""
+        spool: _SpoolFile | None = None
+        spool_fh = None
+        oversized = False
+        try:
+            while True:
+                if self._pos >= len(self._buf):
+                    if self._eof:
+                        break
+                    self._buf = await self._stream.read(READ_CHUNK)
+                    self._pos = 0
+                    if not self._buf:
+                        self._eof = True
+                        break
+                nl = self._buf.find(b"\n", self._pos)
+                end = len(self._buf) if nl == -1 else nl
+                piece = self._buf[self._pos:end]
+                self._pos = end + 1 if nl != -1 else end
+                if piece:
+                    size += len(piece)
+                    if len(head) < _HEAD_BYTES:
+                        head += piece[:_HEAD_BYTES - len(head)]
+                    if oversized:
+                        pass  # drain until the newline
+                    elif size > self.max_bytes:
+                        oversized = True
+                        parts = []
+                        if spool_fh is not None:
+                            spool_fh.close()
+                            spool_fh = None
+                        spool = None
+                    elif spool_fh is not None:
+                        spool_fh.write(piece)
+                    else:
+                        parts.append(piece)
+                        if size > self._spool_threshold:
+                            spool, spool_fh = self._open_spool()
+                            spool_fh.writelines(parts)
+                            parts = []
+                if nl != -1:
+                    break
+        finally:
+            if spool_fh is not None:
+                spool_fh.close()
+        if size == 0 and self._eof and not parts:
+            return None
+        if oversized:
+            log.warning(
+                "%s dropped a %d-byte message over the %d-byte limit",
+                self._label, size, self.max_bytes,
+            )
+            return Frame(size=size, oversized=True, head=head)
+        if spool is not None:
+            return Frame(size=size, spool=spool, head=head)
+        return Frame(size=size, data=b"".join(parts), head=head)
+
+    def _open_spool(self) -> tuple[_SpoolFile, Any]:
+        self._spool_dir.mkdir(parents=True, exist_ok=True)
+        path = self._spool_dir / f"{uuid.uuid4().hex}.jsonl"
+        fh = open(path, "wb")
+        return _SpoolFile(path), fh
+
+
+def _blob_string_spans(buf: Any, min_len: int) -> list[tuple[int, int]]:
+    """(start, end) of ``"data"``/``"blob"`` string bodies of *min_len*+ bytes."""
+    spans: list[tuple[int, int]] = []
+    pos = 0
+    while True:
+        m = _BLOB_KEY_RE.search(buf, pos)
+        if m is None:
+            return spans
+        # A key's opening quote is never preceded by an odd run of
+        # backslashes; otherwise the match is inside another string.
+        backslashes = 0
+        i = m.start() - 1
+        while i >= 0 and buf[i] == 0x5C:
+            backslashes += 1
+            i -= 1
+        start = m.end()
+        end = start
+        while True:
+            end = buf.find(b'"', end)
+            if end == -1:
+                return spans
+            j = end - 1
+            while j >= start and buf[j] == 0x5C:
+                j -= 1
+            if (end - 1 - j) % 2 == 0:
+                break
+            end += 1
+        if backslashes % 2 == 0 and end - start >= min_len:
+            spans.append((start, end))
+        pos = end + 1
+
+
+def _decode_spooled(spool: _SpoolFile, min_blob: int) -> Any:
+    placeholders: dict[str, SpooledBlob] = {}
+    with open(spool.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        pieces: list[bytes] = []
+        pos = 0
+        counter = itertools.count()
+        for start, end in _blob_string_spans(buf, min_blob):
+            token = f"{_PLACEHOLDER_PREFIX}{next(counter)}"
+            placeholders[token] = SpooledBlob(spool, start, end)
+            pieces.append(buf[pos:start])
+            pieces.append(json.dumps(token)[1:-1].encode())
+            pos = end
+        pieces.append(buf[pos:])
+    msg = json_loads(b"".join(pieces))
+    return _restore_placeholders(msg, placeholders) if placeholders else msg
+
+
+def _restore_placeholders(msg: Any, placeholders: dict[str, SpooledBlob]) -> Any:
+    """Swap placeholders back in: handles inside content blocks, text elsewhere."""
+    result = msg.get("result") if isinstance(msg, dict) else None
+    if isinstance(result, dict):
+        for item in result.get("content") or []:
+            if isinstance(item, dict):
+                _take_handle(item, "data", placeholders)
+                if isinstance(item.get("resource"), dict):
+                    _take_handle(item["resource"], "blob", placeholders)
+        for item in result.get("contents") or []:
+            if isinstance(item, dict):
+                _take_handle(item, "blob", placeholders)
+    return _inline_leftovers(msg, placeholders) if placeholders else msg
+
+
+def _take_handle(obj: dict, key: str, placeholders: dict[str, SpooledBlob]) -> None:
+    value = obj.get(key)
+    if isinstance(value, str) and value in placeholders:
+        obj[key] = placeholders.pop(value)
+
+
+def _inline_leftovers(obj: Any, placeholders: dict[str, SpooledBlob]) -> Any:
+    if isinstance(obj, dict):
+        return {k: _inline_leftovers(v, placeholders) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_inline_leftovers(v, placeholders) for v in obj]
+    if isinstance(obj, str) and obj in placeholders:
+        return placeholders[obj].read_text()
+    return obj
+
+
+def decode_frame(frame: Frame, *, min_blob: int = 64 * 1024) -> Any:
+    """Parse *frame*; raises ``json.JSONDecodeError`` on malformed input.
+
+    In a spooled frame, base64 ``data``/``blob`` values of at least
+    *min_blob* bytes come back as :class:`SpooledBlob` handles.
+    """
+    if frame.spool is not None:
+        return _decode_spooled(frame.spool, min_blob)
+    return json_loads(frame.data or b"")
@@ -36,6 +36,18 @@ Eviction
   is evicted first.
 
 Global clients are never evicted.
+
+Daemon-wide ownership
+---------------------
+The daemon builds a single manager in ``kiso.main.lifespan`` and hands
+it to every session worker, so servers that are not session-scoped
+spawn once per process and the method/resource/prompt catalog is warmed
+once. Workers release only their own per-session entries via
+:meth:`shutdown_session`; :meth:`shutdown_all` runs at daemon shutdown.
+When ``[mcp]`` changes in ``config.toml``, :meth:`reconfigure` swaps the
+server definitions in place and stops only the clients of servers that
+were removed or changed. :meth:`pool_stats` reports occupancy and spawn
+counts.
 """
 
 from __future__ import annotations
@@ -141,11 +153,14 @@ class MCPManager:
         self._method_cache: dict[str, tuple[float, list[MCPMethod]]] = {}
         self._resource_cache: dict[str, tuple[float, list[MCPResource]]] = {}
         self._prompt_cache: dict[str, tuple[float, list[MCPPrompt]]] = {}
+        self._catalog_version = 0
         self._restart_times: dict[str, Deque[float]] = {}
         self._unhealthy: set[str] = set()
         self._locks: dict[PoolKey, asyncio.Lock] = {}
         self._session_env: dict[str, dict[str, str]] = {}
         self._eviction_task: asyncio.Task | None = None
+        self._spawn_counts: dict[str, int] = {}
+        self._restart_counts: dict[str, int] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -165,6 +180,46 @@ class MCPManager:
             return False
         return name not in self._unhealthy
 
+    def pool_stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool occupancy and lifetime spawn counts.
+
+        ``spawns`` counts every successful client spawn (first spawn and
+        restarts); ``restarts`` counts only forced respawns after a
+        transport failure.
+        """
+        servers: dict[str, dict[str, Any]] = {}
+        for name in sorted(self._servers):
+            servers[name] = {
+                "global_clients": 0,
+                "session_clients": 0,
+                "spawns": self._spawn_counts.get(name, 0),
+                "restarts": self._restart_counts.get(name, 0),
+                "healthy": name not in self._unhealthy,
+            }
+        sessions: set[str] = set()
+        for name, scope, _uid in self._pool:
+            entry = servers.setdefault(name, {
+                "global_clients": 0, "session_clients": 0,
+                "spawns": 0, "restarts": 0, "healthy": True,
+            })
+            if scope == GLOBAL_SCOPE:
+                entry["global_clients"] += 1
+            else:
+                entry["session_clients"] += 1
+                sessions.add(scope)
+        return {
+            "clients": len(self._pool),
+            "global_clients": sum(
+                s["global_clients"] for s in servers.values()
+            ),
+            "session_clients": sum(
+                s["session_clients"] for s in servers.values()
+            ),
+            "sessions": len(sessions),
+            "spawns": sum(self._spawn_counts.values()),
+            "servers": servers,
+        }
+
     def set_session_env(self, session: str, env: dict[str, str]) -> None:
         """Register per-session env to inject into session-scoped spawns.
 
@@ -193,6 +248,8 @@ class MCPManager:
             return cached[1]
         client = await self._get_or_spawn(name, session, sandbox_uid)
         methods = await client.list_methods()
+        if cached is None or cached[1] != methods:
+            self._catalog_version += 1
         self._method_cache[name] = (now, methods)
         return methods
 
@@ -210,6 +267,8 @@ class MCPManager:
             return cached[1]
         client = await self._get_or_spawn(name, session, sandbox_uid)
         resources = await client.list_resources()
+        if cached is None or cached[1] != resources:
+            self._catalog_version += 1
         self._resource_cache[name] = (now, resources)
         return resources
 
@@ -276,6 +335,8 @@ class MCPManager:
             return cached[1]
         client = await self._get_or_spawn(name, session, sandbox_uid)
         prompts = await client.list_prompts()
+        if cached is None or cached[1] != prompts:
+            self._catalog_version += 1
         self._prompt_cache[name] = (now, prompts)
         return prompts
 
@@ -397,6 +458,15 @@ class MCPManager:
         except Exception as e:  # noqa: BLE001
             log.debug("mcp[%s] cancel failed: %s", name, e)
 
+    def catalog_version(self) -> int:
+        """Counter bumped whenever a cached catalog changes content.
+
+        Re-listing a server that returns the same catalog (the usual TTL
+        refresh) leaves it unchanged, so renderers can key pre-rendered
+        text on it.
+        """
+        return self._catalog_version
+
     def invalidate_cache(self, name: str | None = None) -> None:
         if name is None:
             self._method_cache.clear()
@@ -406,6 +476,7 @@ class MCPManager:
             self._method_cache.pop(name, None)
             self._resource_cache.pop(name, None)
             self._prompt_cache.pop(name, None)
+        self._catalog_version += 1
 
     def reset_health(self, name: str) -> None:
         self._unhealthy.discard(name)
@@ -432,8 +503,43 @@ class MCPManager:
         self._method_cache.clear()
         self._resource_cache.clear()
         self._prompt_cache.clear()
+        self._catalog_version += 1
         self._last_used.clear()
 
+    async def reconfigure(self, servers: dict[str, MCPServer]) -> list[str]:
+        """Switch to *servers*; return the names that were added, removed or changed.
+
+        Clients of removed or changed servers are shut down and their
+        cached catalogs and health state dropped. The next call spawns
+        them from the new definition. Unchanged servers keep running.
+        """
+        changed = sorted(
+            name for name in set(self._servers) | set(servers)
+            if self._servers.get(name) != servers.get(name)
+        )
+        self._servers = servers
+        # Take the stale clients out of the pool before awaiting anything,
+        # so a call racing with this one spawns from the new definition.
+        stale = []
+        for key in [k for k in list(self._pool.keys()) if k[0] in changed]:
+            stale.append((key, self._pool.pop(key)))
+            self._last_used.pop(key, None)
+            self._locks.pop(key, None)
+        for name in changed:
+            self.invalidate_cache(name)
+            self.reset_health(name)
+        for key, client in stale:
+            if key[1] != GLOBAL_SCOPE:
+                self._maybe_prune_session(key[1])
+            try:
+                await client.shutdown()
+            except Exception as e:  # noqa: BLE001
+                log.warning(
+                    "mcp[%s:%s:%s] shutdown failed: %s",
+                    key[0], key[1], key[2], e,
+                )
+        return changed
+
     async def shutdown_session(self, session: str) -> None:
         """Shut down every pool entry scoped to *session*."""
         keys = [k for k in list(self._pool.keys()) if k[1] == session]
@@ -536,6 +642,11 @@ class MCPManager:
                     pass
                 raise
             self._pool[key] = client
+            self._spawn_counts[name] = self._spawn_counts.get(name, 0) + 1
+            if force:
+                self._restart_counts[name] = (
+                    self._restart_counts.get(name, 0) + 1
+                )
             if is_session_scope:
                 self._last_used[key] = self._clock()
             return client
@@ -548,6 +659,7 @@ class MCPManager:
             self._method_cache.pop(key[0], None)
             self._resource_cache.pop(key[0], None)
             self._prompt_cache.pop(key[0], None)
+            self._catalog_version += 1
         else:
             self._maybe_prune_session(key[1])
         if client is None:
@@ -580,6 +692,7 @@ class MCPManager:
             self._method_cache.pop(name, None)
             self._resource_cache.pop(name, None)
             self._prompt_cache.pop(name, None)
+            self._catalog_version += 1
             for key in [k for k in list(self._pool.keys()) if k[0] == name]:
                 await self._shutdown_key(key)
 
@@ -21,17 +21,30 @@ flat string, so we normalise the mixed content into:
 
 Binary content goes to ``sessions/<session>/pub/mcp-<server>-<method>
 -<task_id>-<idx>.<ext>`` so it ends up URL-addressable alongside
-the artifacts produced by traditional wrappers.
+the artifacts produced by traditional wrappers. Payloads are decoded
+in fixed-size chunks straight into the file (spooled
+:class:`~kiso.mcp.framing.SpooledBlob` values are never read whole),
+and a payload identical to one already written to the same ``pub/``
+directory becomes a copy-on-write clone of that file where the
+filesystem supports it (never a hard link: exec tasks may rewrite
+either file in place). Rendering does blocking file I/O, so the
+worker runs it in a thread.
 """
 
 from __future__ import annotations
 
 import base64
 import binascii
+import hashlib
 import json
 import logging
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterator
 
+from kiso.mcp.framing import SpooledBlob, json_loads
 from kiso.mcp.schemas import MCPCallResult, MCPPromptResult, MCPResourceContent
 
 log = logging.getLogger(__name__)
@@ -59,6 +72,13 @@ _MIME_EXT = {
 }
 
 
+# Base64 characters decoded per step (a multiple of 4).
+_B64_CHUNK = 1024 * 1024
+# Above this size a text block duplicating structuredContent is kept
+# verbatim as the structured line instead of re-serialising the object.
+_LARGE_STRUCTURED_CHARS = 256 * 1024
+
+
 def _ext_for_mime(mime: str | None) -> str:
     if not mime or not isinstance(mime, str):
         return "bin"
@@ -93,15 +113,11 @@ def render_mcp_result(
     lines: list[str] = []
     published: list[tuple[str, Path]] = []
 
-    # Collect the text that appears alongside structured content so we
-    # can dedupe if the text blocks are just the JSON-serialized form
-    # of structuredContent (per the MCP spec backwards-compat note).
-    structured_json: str | None = None
-    if structured is not None:
-        try:
-            structured_json = json.dumps(structured, sort_keys=True)
-        except (TypeError, ValueError):
-            structured_json = None
+    # Text blocks that are just the JSON-serialized form of
+    # structuredContent (per the MCP spec backwards-compat note) are
+    # dropped; the first one is remembered so a large payload need not
+    # be serialized again for the structured line below.
+    duplicate_text: str | None = None
 
     idx = 0
     for item in content:
@@ -111,12 +127,14 @@ def render_mcp_result(
         if itype == "text":
             text = str(item.get("text", ""))
             if (
-                structured_json is not None
+                structured is not None
                 and text.strip()
                 and _looks_like_json_of(text, structured)
             ):
                 # Duplicate of structured content → drop the text to
                 # save tokens for the reviewer.
+                if duplicate_text is None:
+                    duplicate_text = text
                 continue
             lines.append(text)
         elif itype in ("image", "audio"):
@@ -150,7 +168,7 @@ def render_mcp_result(
                     header += f" ({mime})"
                 header += "]"
                 lines.append(f"{header}\n{text_body}")
-            elif isinstance(blob, str):
+            elif isinstance(blob, (str, SpooledBlob)):
                 saved = _write_blob_block(
                     server, method, task_id, idx, res, session_pub_dir
                 )
@@ -169,8 +187,10 @@ def render_mcp_result(
     # Append the structured content as the last "ground truth" line
     # so the reviewer and messenger see exactly what the server
     # returned, even when the text blocks above omit it.
-    if structured is not None and structured_json is not None:
-        lines.append(structured_json)
+    if structured is not None:
+        structured_json = _structured_line(structured, duplicate_text)
+        if structured_json is not None:
+            lines.append(structured_json)
 
     stdout_text = "\n".join(line for line in lines if line is not None)
 
@@ -285,26 +305,13 @@ def _write_resource_blob(
     block: MCPResourceContent,
     pub_dir: Path | None,
 ) -> tuple[str, Path] | None:
-    if pub_dir is None:
-        return None
-    blob_b64 = block.blob
-    if not isinstance(blob_b64, str) or not blob_b64:
-        return None
-    try:
-        raw = base64.b64decode(blob_b64, validate=True)
-    except (binascii.Error, ValueError):
+    if pub_dir is None or not _has_b64_payload(block.blob):
         return None
     ext = _ext_for_mime(block.mime_type)
     # Reuse the same filename helper used by tool results to keep pub/
     # naming consistent. ``method`` is the synthetic __resource_read.
     name = _binary_filename(server, "__resource_read", task_id, idx, ext)
-    try:
-        pub_dir.mkdir(parents=True, exist_ok=True)
-        out_path = pub_dir / name
-        out_path.write_bytes(raw)
-    except OSError:
-        return None
-    return (name, out_path)
+    return _materialise_base64(block.blob, pub_dir, name)
 
 
 # ---------------------------------------------------------------------------
@@ -312,15 +319,184 @@ def _write_resource_blob(
 # ---------------------------------------------------------------------------
 
 
+def _has_b64_payload(value: object) -> bool:
+    return isinstance(value, (str, SpooledBlob)) and bool(value)
+
+
+def _iter_b64_chunks(value: str | SpooledBlob) -> Iterator[bytes]:
+    if isinstance(value, SpooledBlob):
+        yield from value.iter_bytes(_B64_CHUNK)
+        return
+    for i in range(0, len(value), _B64_CHUNK):
+        # Non-ASCII input raises UnicodeEncodeError, a ValueError.
+        yield value[i:i + _B64_CHUNK].encode("ascii")
+
+
+def _decode_base64_to(value: str | SpooledBlob, path: Path) -> tuple[str, int]:
+    """Decode *value* into *path* chunk by chunk; returns (sha256, size).
+
+    Raises ``binascii.Error``/``ValueError`` on malformed base64 (the
+    same strict rules as ``b64decode(validate=True)``) and ``OSError``
+    on write failures.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    carry = b""
+    with open(path, "wb") as f:
+        for chunk in _iter_b64_chunks(value):
+            data = carry + chunk if carry else chunk
+            cut = len(data) - len(data) % 4
+            carry = data[cut:]
+            if not cut:
+                continue
+            raw = base64.b64decode(data[:cut], validate=True)
+            digest.update(raw)
+            size += len(raw)
+            f.write(raw)
+        if carry:
+            raise binascii.Error("truncated base64 payload")
+    return digest.hexdigest(), size
+
+
+# ioctl(2) request that clones a whole file (Linux btrfs/XFS/bcachefs).
+_FICLONE = 0x40049409
+
+
+def _file_digest(path: Path) -> str:
+    """sha256 of the file at *path*, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_B64_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _clone_artifact(src: Path, dst: Path, digest: str) -> bool:
+    """Clone *src* to a new file *dst* holding exactly the bytes *digest*.
+
+    False (and no *dst*) when the filesystem cannot share extents or
+    *src* was rewritten since it was indexed.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "xb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        if _file_digest(dst) == digest:
+            return True
+    except OSError:
+        pass
+    dst.unlink(missing_ok=True)
+    return False
+
+
+class _ArtifactIndex:
+    """Recently written artifacts by (pub dir, content hash).
+
+    Lets an identical payload returned by a later task become a
+    copy-on-write clone of the earlier file instead of a second copy.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._entries: OrderedDict[tuple[Path, str], tuple[Path, int]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def lookup(self, pub_dir: Path, digest: str, size: int) -> Path | None:
+        with self._lock:
+            entry = self._entries.get((pub_dir, digest))
+            if entry is not None:
+                self._entries.move_to_end((pub_dir, digest))
+        if entry is None or entry[1] != size:
+            return None
+        try:
+            if entry[0].stat().st_size != size:
+                return None
+        except OSError:
+            return None
+        return entry[0]
+
+    def remember(self, pub_dir: Path, digest: str, size: int, path: Path) -> None:
+        with self._lock:
+            self._entries[(pub_dir, digest)] = (path, size)
+            self._entries.move_to_end((pub_dir, digest))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+_artifacts = _ArtifactIndex()
+
+
+def _materialise_base64(
+    value: str | SpooledBlob, pub_dir: Path, name: str,
+) -> tuple[str, Path] | None:
+    """Decode base64 *value* into ``pub_dir/name`` without holding it in memory.
+
+    The payload is streamed into a temporary file next to the target and
+    renamed into place; when the same bytes were already written to this
+    pub dir and still are, the target is cloned from that file instead.
+    Returns ``(name, path)``, or None when decoding or writing fails.
+    """
+    out_path = pub_dir / name
+    tmp_path = pub_dir / f".{name}.part"
+    try:
+        pub_dir.mkdir(parents=True, exist_ok=True)
+        digest, size = _decode_base64_to(value, tmp_path)
+    except (binascii.Error, ValueError) as e:
+        tmp_path.unlink(missing_ok=True)
+        log.warning("render_mcp_result: base64 decode failed for %s: %s", name, e)
+        return None
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        log.warning("render_mcp_result: write failed for %s: %s", name, e)
+        return None
+    clone_path = pub_dir / f".{name}.clone"
+    try:
+        existing = _artifacts.lookup(pub_dir, digest, size)
+        if (
+            existing is not None and existing != out_path
+            and _clone_artifact(existing, clone_path, digest)
+        ):
+            os.replace(clone_path, out_path)
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, out_path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        clone_path.unlink(missing_ok=True)
+        log.warning("render_mcp_result: write failed for %s: %s", name, e)
+        return None
+    _artifacts.remember(pub_dir, digest, size, out_path)
+    return (name, out_path)
+
+
 def _looks_like_json_of(text: str, structured: object) -> bool:
     """True when *text* is the JSON-serialized form of *structured*."""
+    if isinstance(structured, (dict, list)) and text.lstrip()[:1] not in ("{", "["):
+        return False  # cannot be a serialized object/array: skip the parse
     try:
-        parsed = json.loads(text)
+        parsed = json_loads(text)
     except (TypeError, ValueError):
         return False
     return parsed == structured
 
 
+def _structured_line(structured: object, duplicate_text: str | None) -> str | None:
+    """The ``structuredContent`` line appended to the rendered output.
+
+    Normally a key-sorted dump; when the server already sent a large
+    text block holding the same JSON, that text is reused verbatim.
+    """
+    if duplicate_text is not None and len(duplicate_text) > _LARGE_STRUCTURED_CHARS:
+        return duplicate_text.strip()
+    try:
+        return json.dumps(structured, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+
 def _binary_filename(
     server: str, method: str, task_id: int | str, idx: int, ext: str
 ) -> str:
@@ -348,31 +524,11 @@ def _write_binary_block(
     Returns (relative_name, absolute_path) on success, None if pub_dir
     is None, the data field is missing, or the base64 decode fails.
     """
-    if pub_dir is None:
-        return None
-    data_b64 = item.get("data")
-    if not isinstance(data_b64, str) or not data_b64:
-        return None
-    try:
-        raw = base64.b64decode(data_b64, validate=True)
-    except (binascii.Error, ValueError) as e:
-        log.warning(
-            "render_mcp_result: base64 decode failed for %s %s idx=%d: %s",
-            server, method, idx, e,
-        )
+    if pub_dir is None or not _has_b64_payload(item.get("data")):
         return None
     ext = _ext_for_mime(item.get("mimeType"))
     name = _binary_filename(server, method, task_id, idx, ext)
-    try:
-        pub_dir.mkdir(parents=True, exist_ok=True)
-        out_path = pub_dir / name
-        out_path.write_bytes(raw)
-    except OSError as e:
-        log.warning(
-            "render_mcp_result: write failed for %s: %s", name, e
-        )
-        return None
-    return (name, out_path)
+    return _materialise_base64(item["data"], pub_dir, name)
 
 
 def _write_blob_block(
@@ -383,24 +539,11 @@ def _write_blob_block(
     resource: dict,
     pub_dir: Path | None,
 ) -> tuple[str, Path] | None:
-    if pub_dir is None:
-        return None
-    blob_b64 = resource.get("blob")
-    if not isinstance(blob_b64, str) or not blob_b64:
-        return None
-    try:
-        raw = base64.b64decode(blob_b64, validate=True)
-    except (binascii.Error, ValueError):
+    if pub_dir is None or not _has_b64_payload(resource.get("blob")):
         return None
     ext = _ext_for_mime(resource.get("mimeType"))
     name = _binary_filename(server, method, task_id, idx, ext)
-    try:
-        pub_dir.mkdir(parents=True, exist_ok=True)
-        out_path = pub_dir / name
-        out_path.write_bytes(raw)
-    except OSError:
-        return None
-    return (name, out_path)
+    return _materialise_base64(resource["blob"], pub_dir, name)
 
 
 def _append_pub_marker(
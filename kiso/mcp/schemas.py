@@ -20,7 +20,10 @@ Kiso-facing naming uses "method" — see MCPMethod.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kiso.mcp.framing import SpooledBlob
 
 
 class MCPError(Exception):
@@ -135,7 +138,7 @@ class MCPResourceContent:
     uri: str
     mime_type: str | None
     text: str | None
-    blob: str | None
+    blob: str | SpooledBlob | None  # large stdio blobs stay on disk
 
 
 @dataclass(frozen=True)
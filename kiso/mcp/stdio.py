@@ -6,7 +6,10 @@ spec. The stderr pipe is drained continuously by a dedicated reader
 task into an in-memory ring buffer and an append-only log file at
 ``~/.kiso/mcp/<name>.err.log`` — this prevents the well-known
 deadlock where a chatty server fills the pipe and blocks the
-dispatch loop.
+dispatch loop. stdout is split into messages by
+:class:`kiso.mcp.framing.FrameReader`, so a single response may be
+arbitrarily large up to ``mcp_max_message_mb``; large base64 payloads
+are spooled to disk rather than kept as Python strings.
 
 Lifecycle:
 
@@ -42,9 +45,10 @@ import stat
 from pathlib import Path
 from typing import Any
 
-from kiso.config import KISO_DIR
+from kiso.config import KISO_DIR, setting_int
 from kiso.mcp.client import MCPClient
 from kiso.mcp.config import MCPServer
+from kiso.mcp.framing import Frame, FrameReader, SpooledBlob, decode_frame
 from kiso.mcp.schemas import (
     MCPCallResult,
     MCPError,
@@ -69,6 +73,8 @@ CLIENT_VERSION = "0.9.0"
 
 _STDERR_RING_MAX_BYTES = 1 * 1024 * 1024  # 1 MB per server in memory
 _SHUTDOWN_GRACE_S = 5.0
+# Messages above this size are parsed in a worker thread.
+_INLINE_DECODE_MAX_BYTES = 1 * 1024 * 1024
 
 _WORLD_READABLE_BITS = stat.S_IRGRP | stat.S_IWGRP | stat.S_IROTH | stat.S_IWOTH
 
@@ -567,16 +573,21 @@ class MCPStdioClient(MCPClient):
 
     async def _read_stdout_loop(self) -> None:
         assert self._proc is not None and self._proc.stdout is not None
-        stdout = self._proc.stdout
+        reader = FrameReader(
+            self._proc.stdout,
+            max_bytes=self._max_message_bytes(),
+            spool_dir=KISO_DIR / "mcp" / "spool",
+            label=f"mcp[{self._server.name}]",
+        )
         while True:
             try:
-                line = await stdout.readline()
+                frame = await reader.read_frame()
             except asyncio.CancelledError:
                 raise
             except Exception as e:  # noqa: BLE001
                 self._abort_pending(MCPTransportError(f"stdout read failed: {e}"))
                 return
-            if not line:
+            if frame is None:
                 # EOF — process exited or closed stdout. Mark the channel
                 # dead so is_healthy flips to False even if the child has
                 # not been reaped yet by the event loop.
@@ -588,21 +599,49 @@ class MCPStdioClient(MCPClient):
                     )
                 )
                 return
-            text = line.decode("utf-8", errors="replace").strip()
-            if not text:
+            if frame.oversized:
+                self._fail_oversized(frame)
+                continue
+            if frame.data is not None and not frame.data.strip():
                 continue
             try:
-                msg = json.loads(text)
-            except json.JSONDecodeError:
+                if frame.size > _INLINE_DECODE_MAX_BYTES:
+                    msg = await asyncio.to_thread(decode_frame, frame)
+                else:
+                    msg = decode_frame(frame)
+            except (ValueError, OSError):
                 # Non-JSON line on stdout: per MCP spec, server MUST NOT write
                 # non-MCP to stdout, but we recover gracefully by logging
                 # and skipping.
                 log.debug(
                     "mcp[%s] discarded non-JSON stdout line: %s",
-                    self._server.name, text[:200],
+                    self._server.name,
+                    frame.head[:200].decode("utf-8", errors="replace"),
                 )
                 continue
-            self._dispatch(msg)
+            if isinstance(msg, dict):
+                self._dispatch(msg)
+
+    def _max_message_bytes(self) -> int:
+        settings = getattr(self._config, "settings", None) or {}
+        mb = setting_int(settings, "mcp_max_message_mb", lo=1, hi=4096)
+        return mb * 1024 * 1024
+
+    def _fail_oversized(self, frame: Frame) -> None:
+        """Fail the request an over-limit response belonged to.
+
+        The frame itself is gone; only its id (when it appears near the
+        start) tells which caller to release. The transport stays up.
+        """
+        req_id = frame.request_id()
+        fut = self._pending.pop(req_id, None) if req_id is not None else None
+        if fut is not None and not fut.done():
+            fut.set_exception(
+                MCPInvocationError(
+                    f"mcp[{self._server.name}] response of {frame.size} bytes "
+                    f"exceeds mcp_max_message_mb"
+                )
+            )
 
     def _dispatch(self, msg: dict) -> None:
         # Responses have an id matching a pending request; server-to-client
@@ -874,7 +913,7 @@ def _build_resource_blocks(result: dict) -> list[MCPResourceContent]:
         if not isinstance(item, dict):
             continue
         text = item.get("text") if isinstance(item.get("text"), str) else None
-        blob = item.get("blob") if isinstance(item.get("blob"), str) else None
+        blob = item.get("blob") if isinstance(item.get("blob"), (str, SpooledBlob)) else None
         blocks.append(
             MCPResourceContent(
                 uri=item.get("uri", ""),
@@ -8,7 +8,8 @@ of the MCP method that would otherwise be available.
 ``warm_catalog(manager)`` pre-loads the catalog in the background,
 bounded by concurrency and a total wall-clock deadline. Per-server
 failures are isolated (logged + skipped). Callers fire it with
-``asyncio.create_task`` during daemon boot — they do NOT await it.
+``asyncio.create_task`` during daemon boot — they do NOT await it;
+``start_warmup`` does exactly that with the configured bounds.
 """
 
 from __future__ import annotations
@@ -21,6 +22,27 @@ from typing import Any
 log = logging.getLogger(__name__)
 
 
+def start_warmup(manager: Any, config: Any, *, name: str = "mcp-warmup") -> asyncio.Task:
+    """Fire-and-forget :func:`warm_catalog` bounded by the config settings.
+
+    Bounds come from ``mcp_warmup_concurrency`` and
+    ``mcp_warmup_deadline_s``. Returns the created task so the caller
+    can cancel it on shutdown.
+    """
+    from kiso.config import setting_int
+
+    concurrency = setting_int(
+        config.settings, "mcp_warmup_concurrency", lo=1, hi=16,
+    )
+    deadline = float(setting_int(
+        config.settings, "mcp_warmup_deadline_s", lo=1, hi=120,
+    ))
+    return asyncio.create_task(
+        warm_catalog(manager, concurrency=concurrency, deadline_s=deadline),
+        name=name,
+    )
+
+
 async def warm_catalog(
     manager: Any,
     *,
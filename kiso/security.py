@@ -8,10 +8,13 @@ import logging
 import os
 import re
 import secrets
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from urllib.parse import quote
 
 from kiso.config import Config, LLM_API_KEY_ENV
+from kiso.text import AhoCorasick
 
 log = logging.getLogger(__name__)
 
@@ -122,7 +125,115 @@ def build_secret_variants(value: str) -> list[str]:
     return list(variants)
 
 
-_sanitize_cache: tuple[frozenset[str], re.Pattern[str] | None] = (frozenset(), None)
+REDACTED = "[REDACTED]"
+# Compiled redactors kept, one per distinct (deploy, session) secret set.
+_REDACTOR_CACHE_SIZE = 64
+
+
+class Redactor:
+    """Replaces every variant of a fixed set of secrets with ``[REDACTED]``.
+
+    All variants go into one :class:`~kiso.text.AhoCorasick` automaton,
+    so a text is scanned once however many secrets there are. A cheap
+    substring check skips the scan for texts that contain none of them.
+    Overlapping variants resolve leftmost-longest, like an alternation
+    regex with the longest alternative first.
+    """
+
+    __slots__ = ("variants", "max_len", "_matcher")
+
+    def __init__(self, variants: list[str]) -> None:
+        self.variants = sorted(set(variants), key=len, reverse=True)
+        self.max_len = len(self.variants[0]) if self.variants else 0
+        self._matcher = AhoCorasick(self.variants)
+
+    def spans(self, text: str) -> list[tuple[int, int]]:
+        """Non-overlapping ``(start, end)`` of the secrets in *text*, in order."""
+        if not any(v in text for v in self.variants):
+            return []
+        found = sorted((start, -end) for start, end, _ in self._matcher.finditer(text))
+        spans: list[tuple[int, int]] = []
+        pos = 0
+        for start, neg_end in found:
+            if start >= pos:
+                spans.append((start, -neg_end))
+                pos = -neg_end
+        return spans
+
+    def redact(self, text: str) -> str:
+        return _apply_spans(text, self.spans(text))
+
+
+def _apply_spans(text: str, spans: list[tuple[int, int]]) -> str:
+    if not spans:
+        return text
+    parts: list[str] = []
+    pos = 0
+    for start, end in spans:
+        parts.append(text[pos:start])
+        parts.append(REDACTED)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+class StreamRedactor:
+    """Redacts a text stream chunk by chunk, without buffering it whole.
+
+    :meth:`feed` returns the redacted text that is safe to emit and holds
+    back at most ``max_len - 1`` characters that might be the start of a
+    secret continuing in the next chunk. Call :meth:`flush` at the end.
+    """
+
+    def __init__(self, redactor: Redactor) -> None:
+        self._redactor = redactor
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        buf = self._pending + chunk
+        # A match starting before *settled* is complete in *buf*, and so
+        # is every longer match it could compete with.
+        settled = max(len(buf) - self._redactor.max_len + 1, 0)
+        spans = [span for span in self._redactor.spans(buf) if span[0] < settled]
+        cut = max(settled, spans[-1][1]) if spans else settled
+        self._pending = buf[cut:]
+        return _apply_spans(buf[:cut], spans)
+
+    def flush(self) -> str:
+        out, self._pending = self._redactor.redact(self._pending), ""
+        return out
+
+
+_redactors: OrderedDict[tuple[frozenset[str], frozenset[str]], Redactor | None] = OrderedDict()
+_redactors_lock = threading.Lock()
+
+
+def get_redactor(
+    deploy_secrets: dict[str, str],
+    ephemeral_secrets: dict[str, str],
+) -> Redactor | None:
+    """The compiled :class:`Redactor` for these secrets, or None if there is nothing to redact.
+
+    Redactors are kept in an LRU keyed by the two secret sets, so
+    sessions with different ephemeral secrets do not evict each other.
+    Safe to call from worker threads.
+    """
+    if not deploy_secrets and not ephemeral_secrets:
+        return None
+    key = (frozenset(deploy_secrets.values()), frozenset(ephemeral_secrets.values()))
+    with _redactors_lock:
+        if key in _redactors:
+            _redactors.move_to_end(key)
+            return _redactors[key]
+    variants: list[str] = []
+    for v in key[0] | key[1]:
+        variants.extend(build_secret_variants(v))
+    redactor = Redactor(variants) if variants else None
+    with _redactors_lock:
+        _redactors[key] = redactor
+        while len(_redactors) > _REDACTOR_CACHE_SIZE:
+            _redactors.popitem(last=False)
+    return redactor
 
 
 def sanitize_output(
@@ -130,32 +241,9 @@ def sanitize_output(
     deploy_secrets: dict[str, str],
     ephemeral_secrets: dict[str, str],
 ) -> str:
-    """Strip known secret values from output (plaintext, base64, URL-encoded, JSON-escaped).
-
-    compile a single regex from all variants for a single-pass replacement.
-    cache compiled pattern — recompile only when secret values change.
-    """
-    global _sanitize_cache  # noqa: PLW0603
-    all_values = frozenset(
-        list(deploy_secrets.values()) + list(ephemeral_secrets.values()),
-    )
-    if not all_values:
-        return output
-
-    cache_key, cached_pattern = _sanitize_cache
-    if cache_key == all_values and cached_pattern is not None:
-        return cached_pattern.sub("[REDACTED]", output)
-
-    all_variants: list[str] = []
-    for v in all_values:
-        all_variants.extend(build_secret_variants(v))
-    if not all_variants:
-        return output
-    # Sort longest-first so greedy alternation prefers longer matches
-    all_variants.sort(key=len, reverse=True)
-    pattern = re.compile("|".join(re.escape(v) for v in all_variants))
-    _sanitize_cache = (all_values, pattern)
-    return pattern.sub("[REDACTED]", output)
+    """Strip known secret values from output (plaintext, base64, URL-encoded, JSON-escaped)."""
+    redactor = get_redactor(deploy_secrets, ephemeral_secrets)
+    return redactor.redact(output) if redactor is not None else output
 
 
 def sanitize_value(
@@ -169,23 +257,19 @@ def sanitize_value(
     runtime code can keep structured args/results in memory without first
     coercing them back into prompt-era strings.
     """
+    redactor = get_redactor(deploy_secrets, ephemeral_secrets)
+    return _redact_value(value, redactor) if redactor is not None else value
+
+
+def _redact_value(value: object, redactor: Redactor) -> object:
     if isinstance(value, str):
-        return sanitize_output(value, deploy_secrets, ephemeral_secrets)
+        return redactor.redact(value)
     if isinstance(value, dict):
-        return {
-            key: sanitize_value(item, deploy_secrets, ephemeral_secrets)
-            for key, item in value.items()
-        }
+        return {key: _redact_value(item, redactor) for key, item in value.items()}
     if isinstance(value, list):
-        return [
-            sanitize_value(item, deploy_secrets, ephemeral_secrets)
-            for item in value
-        ]
+        return [_redact_value(item, redactor) for item in value]
     if isinstance(value, tuple):
-        return tuple(
-            sanitize_value(item, deploy_secrets, ephemeral_secrets)
-            for item in value
-        )
+        return tuple(_redact_value(item, redactor) for item in value)
     return value
 
 
@@ -97,10 +97,16 @@ def _add_bytes(
     tf.addfile(info, io.BytesIO(data))
 
 
+# Workspace paths never exported: full task output dumps may hold
+# command output that was never shown to (or sanitized for) the user.
+_EXCLUDED_WORKSPACE_DIRS = (".kiso/task_outputs",)
+
+
 def _iter_workspace(root: Path) -> list[tuple[str, bytes]]:
     """Walk *root* recursively, returning (archive_name, bytes) pairs
     with a deterministic order. Symlinks and non-file entries are
     skipped — the workspace is treated as a blob of regular files.
+    Directories in ``_EXCLUDED_WORKSPACE_DIRS`` are left out.
     """
     out: list[tuple[str, bytes]] = []
     if not root.is_dir():
@@ -108,7 +114,10 @@ def _iter_workspace(root: Path) -> list[tuple[str, bytes]]:
     for p in sorted(root.rglob("*")):
         if not p.is_file() or p.is_symlink():
             continue
-        name = "workspace/" + p.relative_to(root).as_posix()
+        rel = p.relative_to(root).as_posix()
+        if any(rel.startswith(d + "/") for d in _EXCLUDED_WORKSPACE_DIRS):
+            continue
+        name = "workspace/" + rel
         out.append((name, p.read_bytes()))
     return out
 
@@ -41,6 +41,17 @@ MODEL_PRICES: dict[str, tuple[float, float]] = {
 }
 
 
+# Cache-read price as a fraction of the input price, for prompt tokens the
+# provider served from its prefix cache. Same matching as MODEL_PRICES;
+# models not listed are charged the full input price for cached tokens.
+CACHED_INPUT_RATIOS: dict[str, float] = {
+    "deepseek": 0.10,
+    "claude": 0.10,
+    "gemini": 0.25,
+    "gpt-4o": 0.50,
+}
+
+
 def _find_price(model: str) -> tuple[float, float] | None:
     """Return (in_$/MTok, out_$/MTok) for *model*, or None if unknown.
 
@@ -53,6 +64,15 @@ def _find_price(model: str) -> tuple[float, float] | None:
     return None
 
 
+def _input_cost(model: str, in_price: float, input_tokens: int, cached_tokens: int) -> float:
+    """Input-side cost in $·MTok units, discounting prompt-cache hits."""
+    cached = min(max(cached_tokens, 0), input_tokens)
+    ratio = next(
+        (r for key, r in CACHED_INPUT_RATIOS.items() if key in model.lower()), 1.0,
+    )
+    return (input_tokens - cached) * in_price + cached * in_price * ratio
+
+
 def read_audit_entries(
     audit_dir: Path,
     since: datetime | None = None,
@@ -102,7 +122,8 @@ def aggregate(entries: list[dict], by: str) -> list[dict]:
 
     *by* must be one of ``"model"``, ``"session"``, or ``"role"``.
     Returns a list sorted by total tokens descending, each item having:
-    ``key``, ``calls``, ``errors``, ``input_tokens``, ``output_tokens``.
+    ``key``, ``calls``, ``errors``, ``input_tokens``, ``output_tokens``,
+    ``cached_tokens``.
     """
     groups: dict[str, dict] = {}
     for e in entries:
@@ -114,6 +135,7 @@ def aggregate(entries: list[dict], by: str) -> list[dict]:
                 "errors": 0,
                 "input_tokens": 0,
                 "output_tokens": 0,
+                "cached_tokens": 0,
             }
         g = groups[key]
         g["calls"] += 1
@@ -121,6 +143,7 @@ def aggregate(entries: list[dict], by: str) -> list[dict]:
             g["errors"] += 1
         g["input_tokens"] += e.get("input_tokens", 0)
         g["output_tokens"] += e.get("output_tokens", 0)
+        g["cached_tokens"] += e.get("cached_tokens", 0)
 
     return sorted(
         groups.values(),
@@ -129,16 +152,23 @@ def aggregate(entries: list[dict], by: str) -> list[dict]:
     )
 
 
-def compute_cost(model: str, input_tokens: int, output_tokens: int) -> float | None:
+def compute_cost(
+    model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0,
+) -> float | None:
     """Compute USD cost for a single model+token pair.
 
+    *cached_tokens* of *input_tokens* are charged at the model's
+    cache-read rate (see ``CACHED_INPUT_RATIOS``).
     Returns None if model is not in the price table.
     """
     prices = _find_price(model)
     if prices is None:
         return None
     in_price, out_price = prices
-    return (input_tokens * in_price + output_tokens * out_price) / 1_000_000
+    return (
+        _input_cost(model, in_price, input_tokens, cached_tokens)
+        + output_tokens * out_price
+    ) / 1_000_000
 
 
 def estimate_cost(row: dict) -> float | None:
@@ -154,6 +184,6 @@ def estimate_cost(row: dict) -> float | None:
         return None
     in_price, out_price = prices
     return (
-        row.get("input_tokens", 0) * in_price
+        _input_cost(model, in_price, row.get("input_tokens", 0), row.get("cached_tokens", 0))
         + row.get("output_tokens", 0) * out_price
     ) / 1_000_000
@@ -9,6 +9,7 @@ from .admin import (
     create_project,
     delete_cron_job,
     delete_project,
+    get_cron_job,
     get_due_cron_jobs,
     get_kv,
     get_project,
@@ -22,17 +23,34 @@ from .admin import (
     unbind_session_from_project,
     update_cron_enabled,
     update_cron_last_run,
+    update_cron_next_run,
+)
+from .fact_index import (
+    FactVectorIndex,
+    disable_fact_index,
+    enable_fact_index,
+    get_fact_index,
+    hashed_features,
+    rrf_fuse,
 )
 from .knowledge import (
+    EntityIndex,
     _normalize_entity_name,
+    apply_fact_changes,
     archive_low_confidence_facts,
     backfill_fact_entities,
+    count_facts,
     decay_facts,
     delete_facts,
     find_or_create_entity,
+    find_similar_facts,
     get_all_entities,
     get_all_tags,
     get_behavior_facts,
+    get_changed_facts,
+    get_entity_index,
+    get_fact_rev,
+    get_facts_for_entities,
     get_pending_learnings,
     get_safety_facts,
     list_knowledge,
@@ -48,10 +66,24 @@ from .knowledge import (
     update_fact_usage,
     update_learning,
 )
+from .maintenance import (
+    delete_orphan_fact_tags,
+    optimize_db,
+    optimize_fact_search,
+)
+from .pool import (
+    ReadPool,
+    close_read_pool,
+    db_stats,
+    get_read_pool,
+    open_read_pool,
+    reader,
+)
 from .plans import (
     append_task_llm_call,
     create_plan,
     create_task,
+    get_llm_calls,
     get_tasks_for_plan,
     update_plan_awaits_input,
     update_plan_goal,
@@ -109,6 +141,12 @@ from .shared import (
     _update_fields,
     log,
 )
+from .transactions import (
+    commit,
+    commit_stats,
+    configure_group_commit,
+    transaction,
+)
 
 __all__ = [
     name
@@ -7,6 +7,7 @@ from typing import cast
 import aiosqlite
 
 from .shared import _row_to_dict, _rows_to_dicts
+from .transactions import commit
 
 
 async def create_cron_job(
@@ -22,7 +23,7 @@ async def create_cron_job(
         "VALUES (?, ?, ?, ?, ?)",
         (session, schedule, prompt, created_by, next_run),
     )
-    await db.commit()
+    await commit(db)
     return cast(int, cur.lastrowid)
 
 
@@ -40,7 +41,7 @@ async def list_cron_jobs(
 
 async def delete_cron_job(db: aiosqlite.Connection, job_id: int) -> bool:
     cur = await db.execute("DELETE FROM cron_jobs WHERE id = ?", (job_id,))
-    await db.commit()
+    await commit(db)
     return cur.rowcount > 0
 
 
@@ -48,10 +49,15 @@ async def update_cron_enabled(db: aiosqlite.Connection, job_id: int, enabled: bo
     cur = await db.execute(
         "UPDATE cron_jobs SET enabled = ? WHERE id = ?", (int(enabled), job_id),
     )
-    await db.commit()
+    await commit(db)
     return cur.rowcount > 0
 
 
+async def get_cron_job(db: aiosqlite.Connection, job_id: int) -> dict | None:
+    cur = await db.execute("SELECT * FROM cron_jobs WHERE id = ?", (job_id,))
+    return await _row_to_dict(cur)
+
+
 async def get_due_cron_jobs(db: aiosqlite.Connection, now_iso: str) -> list[dict]:
     cur = await db.execute(
         "SELECT * FROM cron_jobs WHERE enabled = 1 AND datetime(next_run) <= datetime(?) "
@@ -68,7 +74,16 @@ async def update_cron_last_run(
         "UPDATE cron_jobs SET last_run = ?, next_run = ? WHERE id = ?",
         (last_run, next_run, job_id),
     )
-    await db.commit()
+    await commit(db)
+
+
+async def update_cron_next_run(
+    db: aiosqlite.Connection, job_id: int, next_run: str,
+) -> None:
+    await db.execute(
+        "UPDATE cron_jobs SET next_run = ? WHERE id = ?", (next_run, job_id),
+    )
+    await commit(db)
 
 
 async def create_project(
@@ -83,7 +98,7 @@ async def create_project(
         "INSERT INTO project_members (project_id, username, role) VALUES (?, ?, 'member')",
         (project_id, created_by),
     )
-    await db.commit()
+    await commit(db)
     return project_id
 
 
@@ -109,7 +124,7 @@ async def list_projects(
 
 async def delete_project(db: aiosqlite.Connection, project_id: int) -> bool:
     cur = await db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-    await db.commit()
+    await commit(db)
     return cur.rowcount > 0
 
 
@@ -120,7 +135,7 @@ async def add_project_member(
         "INSERT OR REPLACE INTO project_members (project_id, username, role) VALUES (?, ?, ?)",
         (project_id, username, role),
     )
-    await db.commit()
+    await commit(db)
 
 
 async def remove_project_member(
@@ -130,7 +145,7 @@ async def remove_project_member(
         "DELETE FROM project_members WHERE project_id = ? AND username = ?",
         (project_id, username),
     )
-    await db.commit()
+    await commit(db)
     return cur.rowcount > 0
 
 
@@ -149,14 +164,14 @@ async def bind_session_to_project(
         "UPDATE sessions SET project_id = ? WHERE session = ?",
         (project_id, session),
     )
-    await db.commit()
+    await commit(db)
 
 
 async def unbind_session_from_project(db: aiosqlite.Connection, session: str) -> None:
     await db.execute(
         "UPDATE sessions SET project_id = NULL WHERE session = ?", (session,),
     )
-    await db.commit()
+    await commit(db)
 
 
 async def get_session_project_id(db: aiosqlite.Connection, session: str) -> int | None:
@@ -188,4 +203,4 @@ async def set_kv(db: aiosqlite.Connection, key: str, value: str) -> None:
     await db.execute(
         "INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", (key, value),
     )
-    await db.commit()
+    await commit(db)
@@ -0,0 +1,180 @@
+"""In-memory vector index over fact content for hybrid retrieval (opt-in).
+
+FTS5 only matches whole tokens, so "deploying" misses a fact about
+"deployment", and a message with no matching token used to fall back to
+every fact in scope. With ``fact_vector_index`` enabled,
+:func:`kiso.store.search_facts` also ranks facts by the similarity of
+hashed feature vectors, then fuses that ranking with the FTS5 (BM25)
+ranking by reciprocal rank. The result is always capped at ``limit``.
+
+- Features are the words of a fact plus the character trigrams of longer
+  words, hashed into :data:`_BUCKETS` buckets (the hashing trick). They
+  need no model and no extra dependency. At query time, features are
+  weighted by inverse document frequency.
+- Vectors are sparse and live in an inverted index, so a query only
+  touches the facts that share a feature with it.
+- The index is built on first use. After that, it follows the
+  ``fact_changes`` log that triggers on ``facts`` append to, so only
+  inserted, rewritten or deleted facts are re-read. If the log has been
+  trimmed past the index's position, the index is rebuilt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+import re
+import weakref
+import zlib
+from collections import Counter
+
+import aiosqlite
+
+from .shared import log
+
+_BUCKETS = 1 << 18
+# Reciprocal rank fusion constant (the usual 60 from the RRF paper).
+RRF_K = 60
+_WORD_RE = re.compile(r"\w+")
+_IN_CHUNK = 500
+
+
+def _bucket(feature: str) -> int:
+    return zlib.crc32(feature.encode()) & (_BUCKETS - 1)
+
+
+def hashed_features(text: str) -> dict[int, float]:
+    """L2-normalised sparse vector of *text*: bucket -> weight."""
+    counts: Counter[int] = Counter()
+    for word in _WORD_RE.findall(text.lower()):
+        counts[_bucket("w:" + word)] += 2
+        if len(word) > 3:
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                counts[_bucket(padded[i:i + 3])] += 1
+    if not counts:
+        return {}
+    weights = {b: 1.0 + math.log(n) for b, n in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {b: w / norm for b, w in weights.items()}
+
+
+class FactVectorIndex:
+    """Hashed feature vectors of every fact, kept in sync with the table."""
+
+    def __init__(self) -> None:
+        self._docs: dict[int, dict[int, float]] = {}
+        self._postings: dict[int, dict[int, float]] = {}
+        self.seq: int | None = None  # last fact_changes entry applied
+        self.rebuilds = 0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, fact_id: int, content: str) -> None:
+        self.remove(fact_id)
+        vec = hashed_features(content)
+        self._docs[fact_id] = vec
+        for b, w in vec.items():
+            self._postings.setdefault(b, {})[fact_id] = w
+
+    def remove(self, fact_id: int) -> None:
+        vec = self._docs.pop(fact_id, None)
+        if vec is None:
+            return
+        for b in vec:
+            posting = self._postings.get(b)
+            if posting is not None:
+                posting.pop(fact_id, None)
+                if not posting:
+                    del self._postings[b]
+
+    def search(self, text: str, k: int) -> list[tuple[int, float]]:
+        """Up to *k* (fact_id, score) pairs, most similar first."""
+        n = len(self._docs)
+        scores: dict[int, float] = {}
+        for b, qw in hashed_features(text).items():
+            posting = self._postings.get(b)
+            if not posting:
+                continue
+            weight = qw * math.log(1 + n / len(posting))
+            for fact_id, dw in posting.items():
+                scores[fact_id] = scores.get(fact_id, 0.0) + weight * dw
+        if len(scores) <= k:
+            return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return heapq.nsmallest(k, scores.items(), key=lambda x: (-x[1], x[0]))
+
+    async def sync(self, db: aiosqlite.Connection) -> None:
+        """Apply the facts changed since the last sync (or build from scratch)."""
+        async with self._lock:
+            cur = await db.execute(
+                "SELECT COALESCE(MIN(seq), 0), COALESCE(MAX(seq), 0) FROM fact_changes"
+            )
+            first, last = await cur.fetchone()
+            if self.seq is not None and last == self.seq:
+                return
+            if self.seq is None or (first and first > self.seq + 1) or last < self.seq:
+                await self._rebuild(db, last)
+                return
+            cur = await db.execute(
+                "SELECT DISTINCT fact_id FROM fact_changes WHERE seq > ? AND seq <= ?",
+                (self.seq, last),
+            )
+            ids = [row[0] for row in await cur.fetchall()]
+            for i in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[i:i + _IN_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                cur = await db.execute(
+                    f"SELECT id, content FROM facts WHERE id IN ({placeholders})", chunk,
+                )
+                found = {row[0]: row[1] for row in await cur.fetchall()}
+                for fact_id in chunk:
+                    if fact_id in found:
+                        self.add(fact_id, found[fact_id])
+                    else:
+                        self.remove(fact_id)
+            self.seq = last
+
+    async def _rebuild(self, db: aiosqlite.Connection, last: int) -> None:
+        # Changes logged after *last* are applied again on the next
+        # sync, which is harmless: add() replaces.
+        self._docs.clear()
+        self._postings.clear()
+        cur = await db.execute("SELECT id, content FROM facts")
+        for fact_id, content in await cur.fetchall():
+            self.add(fact_id, content)
+        self.seq = last
+        self.rebuilds += 1
+        log.info("Fact vector index built: %d fact(s)", len(self._docs))
+
+
+def rrf_fuse(*rankings: list[int], k: int = RRF_K) -> list[int]:
+    """Ids ordered by reciprocal rank fusion of *rankings* (best first)."""
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, fact_id in enumerate(ranking):
+            scores[fact_id] = scores.get(fact_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=lambda i: (-scores[i], i))
+
+
+_fact_indexes: weakref.WeakKeyDictionary[aiosqlite.Connection, FactVectorIndex] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def enable_fact_index(db: aiosqlite.Connection) -> FactVectorIndex:
+    """Attach a vector index to *db*; ``search_facts`` then searches hybrid."""
+    index = _fact_indexes.get(db)
+    if index is None:
+        index = _fact_indexes[db] = FactVectorIndex()
+    return index
+
+
+def disable_fact_index(db: aiosqlite.Connection) -> None:
+    _fact_indexes.pop(db, None)
+
+
+def get_fact_index(db: aiosqlite.Connection) -> FactVectorIndex | None:
+    return _fact_indexes.get(db)
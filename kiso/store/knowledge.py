@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
+import weakref
 from typing import cast
 
 import aiosqlite
 
+from kiso.text import AhoCorasick
+
+from .fact_index import FactVectorIndex, _fact_indexes, rrf_fuse
+from .pool import reader
 from .sessions import _fact_session_filter, get_facts
 from .shared import (
     _SENSITIVE_PATTERN,
@@ -16,6 +22,17 @@ from .shared import (
     _word_overlap_ratio,
     log,
 )
+from .transactions import commit, transaction
+
+# Every write that changes what a fact says stamps it with the next
+# revision, so the consolidator can pick up only what changed since its
+# watermark (kv ``consolidation_fact_rev``). Revisions come from
+# ``fact_rev_seq``, which triggers keep at the highest rev ever stamped,
+# so deleting the newest fact never makes its rev available again.
+_NEXT_FACT_REV = "(SELECT COALESCE(MAX(rev), 0) + 1 FROM fact_rev_seq)"
+_CONSOLIDATION_REV_KV_KEY = "consolidation_fact_rev"
+# Stay well below SQLite's bound-parameter limit in IN (...) lists.
+_IN_CHUNK = 500
 
 
 def _fts5_query(text: str) -> str:
@@ -49,25 +66,70 @@ async def search_facts(
     username: str | None = None,
     project_id: int | None = None,
 ) -> list[dict]:
-    q = _fts5_query(query)
-    if not q:
-        return await get_facts(db, session=session, is_admin=is_admin, username=username, project_id=project_id)
-    filt, params = _fact_session_filter(is_admin, session, prefix="f.", username=username, project_id=project_id)
-    try:
+    index = _fact_indexes.get(db)
+    async with reader(db) as db:
+        q = _fts5_query(query)
+        if index is not None:
+            filt, params = _fact_session_filter(is_admin, session, prefix="f.", username=username, project_id=project_id)
+            return await _search_facts_hybrid(db, index, query, q, limit, filt, params)
+        if not q:
+            return await get_facts(db, session=session, is_admin=is_admin, username=username, project_id=project_id)
+        filt, params = _fact_session_filter(is_admin, session, prefix="f.", username=username, project_id=project_id)
+        try:
+            cur = await db.execute(
+                "SELECT f.* FROM facts f "
+                "JOIN kiso_facts_fts fts ON fts.rowid = f.id "
+                f"WHERE kiso_facts_fts MATCH ?{filt} "
+                "ORDER BY rank LIMIT ?",
+                [q] + params + [limit],
+            )
+            results = await _rows_to_dicts(cur)
+        except Exception as exc:
+            log.debug("FTS5 search failed, falling back to full scan: %s", exc, exc_info=True)
+            return await get_facts(db, session=session, is_admin=is_admin, username=username, project_id=project_id)
+        if not results:
+            return await get_facts(db, session=session, is_admin=is_admin, username=username, project_id=project_id)
+        return results
+
+
+async def _search_facts_hybrid(
+    db: aiosqlite.Connection,
+    index: FactVectorIndex,
+    query: str,
+    fts_query: str,
+    limit: int,
+    filt: str,
+    params: list,
+) -> list[dict]:
+    """Top *limit* facts by RRF of the FTS5 and vector rankings; no full-scan fallback."""
+    fetch = limit * 4
+    fts_ids: list[int] = []
+    if fts_query:
+        try:
+            cur = await db.execute(
+                "SELECT f.id FROM facts f "
+                "JOIN kiso_facts_fts fts ON fts.rowid = f.id "
+                f"WHERE kiso_facts_fts MATCH ?{filt} "
+                "ORDER BY rank LIMIT ?",
+                [fts_query] + params + [fetch],
+            )
+            fts_ids = [row[0] for row in await cur.fetchall()]
+        except Exception as exc:
+            log.debug("FTS5 search failed, using vector ranking only: %s", exc, exc_info=True)
+    await index.sync(db)
+    candidates = [fact_id for fact_id, _ in index.search(query, fetch)]
+    rows: dict[int, dict] = {}
+    wanted = list(dict.fromkeys(fts_ids + candidates))
+    for i in range(0, len(wanted), _IN_CHUNK):
+        chunk = wanted[i:i + _IN_CHUNK]
+        placeholders = ",".join("?" for _ in chunk)
         cur = await db.execute(
-            "SELECT f.* FROM facts f "
-            "JOIN kiso_facts_fts fts ON fts.rowid = f.id "
-            f"WHERE kiso_facts_fts MATCH ?{filt} "
-            "ORDER BY rank LIMIT ?",
-            [q] + params + [limit],
+            f"SELECT f.* FROM facts f WHERE f.id IN ({placeholders}){filt}",
+            chunk + params,
         )
-        results = await _rows_to_dicts(cur)
-    except Exception as exc:
-        log.debug("FTS5 search failed, falling back to full scan: %s", exc, exc_info=True)
-        return await get_facts(db, session=session, is_admin=is_admin, username=username, project_id=project_id)
-    if not results:
-        return await get_facts(db, session=session, is_admin=is_admin, username=username, project_id=project_id)
-    return results
+        rows.update((row["id"], row) for row in await _rows_to_dicts(cur))
+    vec_ids = [fact_id for fact_id in candidates if fact_id in rows]
+    return [rows[fact_id] for fact_id in rrf_fuse(fts_ids, vec_ids)[:limit] if fact_id in rows]
 
 
 async def save_learning(
@@ -97,7 +159,7 @@ async def save_learning(
         "INSERT INTO learnings (content, session, user) VALUES (?, ?, ?)",
         (content, session, user),
     )
-    await db.commit()
+    await commit(db)
     return cast(int, cur.lastrowid)
 
 
@@ -129,8 +191,8 @@ async def save_fact(
     project_id: int | None = None,
 ) -> int:
     cur = await db.execute(
-        "INSERT INTO facts (content, source, session, category, confidence, entity_id, project_id) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        "INSERT INTO facts (content, source, session, category, confidence, entity_id, project_id, rev) "
+        f"VALUES (?, ?, ?, ?, ?, ?, ?, {_NEXT_FACT_REV})",
         (content, source, session, category, confidence, entity_id, project_id),
     )
     fact_id = cast(int, cur.lastrowid)
@@ -139,7 +201,7 @@ async def save_fact(
             "INSERT OR IGNORE INTO fact_tags (fact_id, tag) VALUES (?, ?)",
             [(fact_id, t) for t in tags],
         )
-    await db.commit()
+    await commit(db)
     return fact_id
 
 
@@ -155,11 +217,11 @@ async def save_facts_batch(db: aiosqlite.Connection, facts: list[dict]) -> None:
         for f in facts
     ]
     await db.executemany(
-        "INSERT INTO facts (content, source, session, category, confidence) "
-        "VALUES (?, ?, ?, ?, ?)",
+        "INSERT INTO facts (content, source, session, category, confidence, rev) "
+        f"VALUES (?, ?, ?, ?, ?, {_NEXT_FACT_REV})",
         rows,
     )
-    await db.commit()
+    await commit(db)
 
 
 async def save_fact_tags(db: aiosqlite.Connection, fact_id: int, tags: list[str]) -> None:
@@ -169,7 +231,7 @@ async def save_fact_tags(db: aiosqlite.Connection, fact_id: int, tags: list[str]
         "INSERT OR IGNORE INTO fact_tags (fact_id, tag) VALUES (?, ?)",
         [(fact_id, t) for t in tags],
     )
-    await db.commit()
+    await commit(db)
 
 
 async def get_all_tags(db: aiosqlite.Connection) -> list[str]:
@@ -220,13 +282,15 @@ async def find_or_create_entity(
                 "UPDATE entities SET kind = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                 (kind, existing["id"]),
             )
-            await db.commit()
+            await commit(db)
+            _entity_indexes.pop(db, None)
             log.info("Entity '%s' kind updated: %s → %s", canonical, existing["kind"], kind)
         return cast(int, existing["id"])
     cur = await db.execute(
         "INSERT INTO entities (name, kind) VALUES (?, ?)", (canonical, kind),
     )
-    await db.commit()
+    await commit(db)
+    _entity_indexes.pop(db, None)
     return cast(int, cur.lastrowid)
 
 
@@ -235,6 +299,62 @@ async def get_all_entities(db: aiosqlite.Connection) -> list[dict]:
     return await _rows_to_dicts(cur)
 
 
+class EntityIndex:
+    """Snapshot of the ``entities`` table with a compiled name matcher.
+
+    Shared between callers — treat :attr:`entities` as read-only.
+    """
+
+    def __init__(self, entities: list[dict], fingerprint: tuple = ()) -> None:
+        self.entities = entities  # ordered by name, like get_all_entities
+        self.fingerprint = fingerprint
+        self._by_name = {e["name"]: e for e in entities}
+        self._by_word: dict[str, list[dict]] = {}
+        for e in entities:
+            for word in set(e["name"].split()):
+                self._by_word.setdefault(word, []).append(e)
+        self._matcher = AhoCorasick([e["name"] for e in entities])
+
+    def lookup(self, name: str) -> dict | None:
+        """Entity whose canonical name equals *name* once normalized."""
+        return self._by_name.get(_normalize_entity_name(name))
+
+    def find(self, text: str, whole_words: bool = True) -> list[dict]:
+        """Entities mentioned in *text* (case-insensitive), in name order.
+
+        With *whole_words* an entity only counts when its name is bounded
+        by ``\\b`` on both sides, so ``java`` does not match "javascript".
+        """
+        hits = {idx for _, _, idx in self._matcher.finditer(text.lower(), whole_words)}
+        return [self.entities[i] for i in sorted(hits)]
+
+    def find_by_words(self, words: set[str]) -> list[dict]:
+        """Entities having at least one name word in *words*, in name order."""
+        hits = {e["id"]: e for w in words for e in self._by_word.get(w, ())}
+        return [e for e in self.entities if e["id"] in hits]
+
+
+# One index per connection, rebuilt when the entities table fingerprint
+# moves; writers through find_or_create_entity drop it eagerly.
+_entity_indexes: weakref.WeakKeyDictionary[aiosqlite.Connection, EntityIndex] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def get_entity_index(db: aiosqlite.Connection) -> EntityIndex:
+    """The cached :class:`EntityIndex` for *db*, rebuilt only on change."""
+    cur = await db.execute(
+        "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(MAX(updated_at), '') "
+        "FROM entities"
+    )
+    fingerprint = tuple(await cur.fetchone())
+    index = _entity_indexes.get(db)
+    if index is None or index.fingerprint != fingerprint:
+        index = EntityIndex(await get_all_entities(db), fingerprint)
+        _entity_indexes[db] = index
+    return index
+
+
 async def search_facts_by_entity(
     db: aiosqlite.Connection, entity_id: int,
 ) -> list[dict]:
@@ -333,71 +453,71 @@ async def search_facts_scored(
     username: str | None = None,
     project_id: int | None = None,
 ) -> list[dict]:
-    if not entity_id and not tags and not keywords:
-        return []
-    session_filter, session_params = _fact_session_filter(
-        is_admin, session, prefix="f.", username=username, project_id=project_id,
-    )
-    sp = list(session_params)
-    fetch_limit = limit * 2
-    has_entity_or_tags = entity_id is not None or bool(tags)
-    if has_entity_or_tags:
-        rows = await _search_facts_by_entity_tags(
-            db,
-            entity_id=entity_id,
-            tags=tags,
-            session_filter=session_filter,
-            session_params=sp,
-            fetch_limit=fetch_limit,
+    async with reader(db) as db:
+        if not entity_id and not tags and not keywords:
+            return []
+        session_filter, session_params = _fact_session_filter(
+            is_admin, session, prefix="f.", username=username, project_id=project_id,
         )
-        if not rows and keywords:
+        sp = list(session_params)
+        fetch_limit = limit * 2
+        has_entity_or_tags = entity_id is not None or bool(tags)
+        if has_entity_or_tags:
+            rows = await _search_facts_by_entity_tags(
+                db,
+                entity_id=entity_id,
+                tags=tags,
+                session_filter=session_filter,
+                session_params=sp,
+                fetch_limit=fetch_limit,
+            )
+            if not rows and keywords:
+                rows = await _search_facts_by_keywords(
+                    db, keywords, session_filter=session_filter, session_params=sp, fetch_limit=fetch_limit,
+                )
+        else:
             rows = await _search_facts_by_keywords(
-                db, keywords, session_filter=session_filter, session_params=sp, fetch_limit=fetch_limit,
+                db, keywords or [], session_filter=session_filter, session_params=sp, fetch_limit=fetch_limit,
             )
-    else:
-        rows = await _search_facts_by_keywords(
-            db, keywords or [], session_filter=session_filter, session_params=sp, fetch_limit=fetch_limit,
-        )
-    kw_set = {w.lower() for w in (keywords or [])} if keywords else set()
-    scored: list[tuple[int, dict]] = []
-    for row in rows:
-        base = row.get("entity_score", 0) + row.get("tag_score", 0)
-        if kw_set:
-            content_lower = row["content"].lower()
-            base += sum(1 for kw in kw_set if kw in content_lower)
-        scored.append((base, row))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    results: list[dict] = []
-    for _, row in scored[:limit]:
-        row.pop("entity_score", None)
-        row.pop("tag_score", None)
-        row.pop("tag_count", None)
-        results.append(row)
-    return results
+        kw_set = {w.lower() for w in (keywords or [])} if keywords else set()
+        scored: list[tuple[int, dict]] = []
+        for row in rows:
+            base = row.get("entity_score", 0) + row.get("tag_score", 0)
+            if kw_set:
+                content_lower = row["content"].lower()
+                base += sum(1 for kw in kw_set if kw in content_lower)
+            scored.append((base, row))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        results: list[dict] = []
+        for _, row in scored[:limit]:
+            row.pop("entity_score", None)
+            row.pop("tag_score", None)
+            row.pop("tag_count", None)
+            results.append(row)
+        return results
 
 
 async def backfill_fact_entities(db: aiosqlite.Connection) -> int:
-    entities = await get_all_entities(db)
-    if not entities:
+    """Link orphan facts to the first entity (by name) they mention."""
+    index = await get_entity_index(db)
+    if not index.entities:
         return 0
     orphan_cur = await db.execute("SELECT id, content FROM facts WHERE entity_id IS NULL")
     orphans = await orphan_cur.fetchall()
     if not orphans:
         return 0
-    updated = 0
+    links = []
     for row in orphans:
-        content_lower = row["content"].lower()
-        for entity in entities:
-            if re.search(r"\b" + re.escape(entity["name"]) + r"\b", content_lower):
-                await db.execute(
-                    "UPDATE facts SET entity_id = ? WHERE id = ?",
-                    (entity["id"], row["id"]),
-                )
-                updated += 1
-                break
-    if updated:
-        await db.commit()
-    return updated
+        found = index.find(row["content"])
+        if found:
+            links.append((found[0]["id"], row["id"]))
+    if links:
+        await db.executemany(
+            f"UPDATE facts SET entity_id = ?, rev = {_NEXT_FACT_REV} WHERE id = ?",
+            links,
+        )
+        await commit(db)
+    return len(links)
 
 
 async def delete_facts(db: aiosqlite.Connection, fact_ids: list[int]) -> None:
@@ -405,7 +525,7 @@ async def delete_facts(db: aiosqlite.Connection, fact_ids: list[int]) -> None:
         return
     placeholders = ",".join("?" for _ in fact_ids)
     await db.execute(f"DELETE FROM facts WHERE id IN ({placeholders})", fact_ids)
-    await db.commit()
+    await commit(db)
 
 
 async def update_fact_usage(db: aiosqlite.Connection, fact_ids: list[int]) -> None:
@@ -417,7 +537,7 @@ async def update_fact_usage(db: aiosqlite.Connection, fact_ids: list[int]) -> No
         f"last_used = CURRENT_TIMESTAMP WHERE id IN ({placeholders})",
         fact_ids,
     )
-    await db.commit()
+    await commit(db)
 
 
 async def get_safety_facts(db: aiosqlite.Connection) -> list[dict]:
@@ -443,46 +563,47 @@ async def list_knowledge(
     search: str | None = None,
     limit: int = 50,
 ) -> list[dict]:
-    if search:
-        fts_q = _fts5_query(search)
-        if fts_q:
-            try:
-                cur = await db.execute(
-                    "SELECT f.id, f.content, f.category, f.confidence, f.created_at, "
-                    "e.name AS entity_name, e.kind AS entity_kind "
-                    "FROM facts f "
-                    "LEFT JOIN entities e ON f.entity_id = e.id "
-                    "JOIN kiso_facts_fts fts ON fts.rowid = f.id "
-                    "WHERE kiso_facts_fts MATCH ? "
-                    "ORDER BY rank LIMIT ?",
-                    (fts_q, limit),
-                )
-                rows = await _rows_to_dicts(cur)
-            except Exception:
-                rows = []
-            if rows:
-                return await _attach_tags(db, rows)
-    clauses: list[str] = []
-    params: list = []
-    if category:
-        clauses.append("f.category = ?")
-        params.append(category)
-    if entity:
-        clauses.append("LOWER(e.name) = LOWER(?)")
-        params.append(entity)
-    if tag:
-        clauses.append("f.id IN (SELECT fact_id FROM fact_tags WHERE tag = ?)")
-        params.append(tag.lower())
-    where = (" AND " + " AND ".join(clauses)) if clauses else ""
-    cur = await db.execute(
-        "SELECT f.id, f.content, f.category, f.confidence, f.created_at, "
-        "e.name AS entity_name, e.kind AS entity_kind "
-        f"FROM facts f LEFT JOIN entities e ON f.entity_id = e.id "
-        f"WHERE 1=1{where} ORDER BY f.id DESC LIMIT ?",
-        params + [limit],
-    )
-    rows = await _rows_to_dicts(cur)
-    return await _attach_tags(db, rows)
+    async with reader(db) as db:
+        if search:
+            fts_q = _fts5_query(search)
+            if fts_q:
+                try:
+                    cur = await db.execute(
+                        "SELECT f.id, f.content, f.category, f.confidence, f.created_at, "
+                        "e.name AS entity_name, e.kind AS entity_kind "
+                        "FROM facts f "
+                        "LEFT JOIN entities e ON f.entity_id = e.id "
+                        "JOIN kiso_facts_fts fts ON fts.rowid = f.id "
+                        "WHERE kiso_facts_fts MATCH ? "
+                        "ORDER BY rank LIMIT ?",
+                        (fts_q, limit),
+                    )
+                    rows = await _rows_to_dicts(cur)
+                except Exception:
+                    rows = []
+                if rows:
+                    return await _attach_tags(db, rows)
+        clauses: list[str] = []
+        params: list = []
+        if category:
+            clauses.append("f.category = ?")
+            params.append(category)
+        if entity:
+            clauses.append("LOWER(e.name) = LOWER(?)")
+            params.append(entity)
+        if tag:
+            clauses.append("f.id IN (SELECT fact_id FROM fact_tags WHERE tag = ?)")
+            params.append(tag.lower())
+        where = (" AND " + " AND ".join(clauses)) if clauses else ""
+        cur = await db.execute(
+            "SELECT f.id, f.content, f.category, f.confidence, f.created_at, "
+            "e.name AS entity_name, e.kind AS entity_kind "
+            f"FROM facts f LEFT JOIN entities e ON f.entity_id = e.id "
+            f"WHERE 1=1{where} ORDER BY f.id DESC LIMIT ?",
+            params + [limit],
+        )
+        rows = await _rows_to_dicts(cur)
+        return await _attach_tags(db, rows)
 
 
 async def _attach_tags(db: aiosqlite.Connection, rows: list[dict]) -> list[dict]:
@@ -507,40 +628,189 @@ async def decay_facts(
     db: aiosqlite.Connection,
     decay_days: int = 7,
     decay_rate: float = 0.1,
+    batch_size: int | None = None,
 ) -> int:
-    cur = await db.execute(
-        "UPDATE facts SET confidence = MAX(0.0, confidence - ?) "
-        "WHERE COALESCE(last_used, created_at) < datetime('now', ?) "
-        "AND category != 'safety'",
-        (decay_rate, f"-{decay_days} days"),
+    """Lower the confidence of facts not used for *decay_days* days.
+
+    With *batch_size*, rows are updated in id order at most that many
+    per commit, so other writes on the connection run in between.
+    """
+    stale = (
+        "COALESCE(last_used, created_at) < datetime('now', ?) "
+        "AND category != 'safety'"
     )
-    await db.commit()
-    return cur.rowcount
+    cutoff = f"-{decay_days} days"
+    decayed = 0
+    async for lo, hi in _id_batches(db, stale, (cutoff,), batch_size):
+        cur = await db.execute(
+            "UPDATE facts SET confidence = MAX(0.0, confidence - ?) "
+            f"WHERE id > ? AND id <= ? AND {stale}",
+            (decay_rate, lo, hi, cutoff),
+        )
+        await commit(db)
+        decayed += cur.rowcount
+    return decayed
 
 
 async def archive_low_confidence_facts(
-    db: aiosqlite.Connection, threshold: float = 0.3,
+    db: aiosqlite.Connection,
+    threshold: float = 0.3,
+    batch_size: int | None = None,
 ) -> int:
-    cur = await db.execute(
-        "INSERT INTO facts_archive (original_id, content, source, session, "
-        "category, confidence, last_used, use_count, created_at) "
-        "SELECT id, content, source, session, category, confidence, "
-        "last_used, use_count, created_at FROM facts "
-        "WHERE confidence < ? AND category != 'safety'",
-        (threshold,),
-    )
-    archived = cur.rowcount
-    if archived:
-        await db.execute(
-            "DELETE FROM facts WHERE confidence < ? AND category != 'safety'",
-            (threshold,),
+    """Move facts below *threshold* confidence to ``facts_archive``.
+
+    *batch_size* works as in :func:`decay_facts`; each batch is copied
+    and deleted in the same commit.
+    """
+    low = "confidence < ? AND category != 'safety'"
+    archived = 0
+    async for lo, hi in _id_batches(db, low, (threshold,), batch_size):
+        cur = await db.execute(
+            "INSERT INTO facts_archive (original_id, content, source, session, "
+            "category, confidence, last_used, use_count, created_at) "
+            "SELECT id, content, source, session, category, confidence, "
+            "last_used, use_count, created_at FROM facts "
+            f"WHERE id > ? AND id <= ? AND {low}",
+            (lo, hi, threshold),
         )
-    await db.commit()
+        if cur.rowcount:
+            await db.execute(
+                f"DELETE FROM facts WHERE id > ? AND id <= ? AND {low}",
+                (lo, hi, threshold),
+            )
+        await commit(db)
+        archived += cur.rowcount
     return archived
 
 
+async def _id_batches(
+    db: aiosqlite.Connection,
+    where: str,
+    params: tuple,
+    batch_size: int | None,
+):
+    """Yield ``(lo, hi]`` fact id ranges covering the rows matching *where*.
+
+    Each range holds at most *batch_size* matching rows (all of them
+    when None). Control returns to the event loop between ranges.
+    """
+    last_id = 0
+    while True:
+        cur = await db.execute(
+            f"SELECT MAX(id), COUNT(*) FROM (SELECT id FROM facts "
+            f"WHERE id > ? AND {where} ORDER BY id LIMIT ?)",
+            (last_id, *params, batch_size or -1),
+        )
+        hi, count = await cur.fetchone()
+        if not count:
+            return
+        yield last_id, hi
+        if batch_size is None or count < batch_size:
+            return
+        last_id = hi
+        await asyncio.sleep(0)
+
+
 async def update_fact_content(
     db: aiosqlite.Connection, fact_id: int, content: str,
 ) -> None:
-    await db.execute("UPDATE facts SET content = ? WHERE id = ?", (content, fact_id))
-    await db.commit()
+    await db.execute(
+        f"UPDATE facts SET content = ?, rev = {_NEXT_FACT_REV} WHERE id = ?",
+        (content, fact_id),
+    )
+    await commit(db)
+
+
+async def count_facts(db: aiosqlite.Connection) -> int:
+    cur = await db.execute("SELECT COUNT(*) FROM facts")
+    row = await cur.fetchone()
+    return int(row[0]) if row else 0
+
+
+async def get_fact_rev(db: aiosqlite.Connection) -> int:
+    """Return the highest fact revision stamped so far."""
+    cur = await db.execute("SELECT COALESCE(MAX(rev), 0) FROM fact_rev_seq")
+    row = await cur.fetchone()
+    return int(row[0]) if row else 0
+
+
+async def get_changed_facts(
+    db: aiosqlite.Connection, since_rev: int | None,
+) -> list[dict]:
+    """Facts written after revision *since_rev* (all facts when None)."""
+    if since_rev is None:
+        cur = await db.execute("SELECT id, content, entity_id FROM facts ORDER BY id")
+    else:
+        cur = await db.execute(
+            "SELECT id, content, entity_id FROM facts WHERE rev > ? ORDER BY id",
+            (since_rev,),
+        )
+    return await _rows_to_dicts(cur)
+
+
+async def get_facts_for_entities(
+    db: aiosqlite.Connection, entity_ids: list[int],
+) -> list[dict]:
+    """All facts attached to any of *entity_ids*."""
+    rows: list[dict] = []
+    ids = sorted(set(entity_ids))
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i:i + _IN_CHUNK]
+        placeholders = ",".join("?" for _ in chunk)
+        cur = await db.execute(
+            "SELECT id, content, entity_id FROM facts "
+            f"WHERE entity_id IN ({placeholders}) ORDER BY id",
+            chunk,
+        )
+        rows.extend(await _rows_to_dicts(cur))
+    return rows
+
+
+async def find_similar_facts(
+    db: aiosqlite.Connection, content: str, limit: int = 10,
+) -> list[dict]:
+    """Best FTS matches for *content* across all sessions (no fallback scan)."""
+    q = _fts5_query(content)
+    if not q:
+        return []
+    try:
+        cur = await db.execute(
+            "SELECT f.id, f.content, f.entity_id FROM facts f "
+            "JOIN kiso_facts_fts fts ON fts.rowid = f.id "
+            "WHERE kiso_facts_fts MATCH ? ORDER BY rank LIMIT ?",
+            (q, limit),
+        )
+        return await _rows_to_dicts(cur)
+    except Exception as exc:
+        log.debug("FTS5 neighbour lookup failed: %s", exc, exc_info=True)
+        return []
+
+
+async def apply_fact_changes(
+    db: aiosqlite.Connection,
+    delete_ids: list[int],
+    updates: list[tuple[int, str]],
+    rev: int | None = None,
+) -> None:
+    """Delete and rewrite facts in one transaction.
+
+    When *rev* is given it is stored as the consolidation watermark in the
+    same commit.  Rewrites keep their revision: they are the consolidator's
+    own output and must not be fed back to it on the next run.
+    """
+    async with transaction(db):
+        ids = list(delete_ids)
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            await db.execute(f"DELETE FROM facts WHERE id IN ({placeholders})", chunk)
+        if updates:
+            await db.executemany(
+                "UPDATE facts SET content = ? WHERE id = ?",
+                [(content, fact_id) for fact_id, content in updates],
+            )
+        if rev is not None:
+            await db.execute(
+                "INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)",
+                (_CONSOLIDATION_REV_KV_KEY, str(rev)),
+            )
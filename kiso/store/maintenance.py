@@ -0,0 +1,61 @@
+"""Housekeeping statements run by the maintenance engine (kiso/maintenance.py)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import aiosqlite
+
+from .transactions import commit
+
+
+async def delete_orphan_fact_tags(
+    db: aiosqlite.Connection, batch_size: int | None = None,
+) -> int:
+    """Delete ``fact_tags`` rows whose fact no longer exists.
+
+    The delete trigger on ``facts`` keeps new databases clean; this
+    catches rows left by older releases. At most *batch_size* rows go
+    per commit.
+    """
+    deleted = 0
+    while True:
+        cur = await db.execute(
+            "DELETE FROM fact_tags WHERE rowid IN ("
+            "SELECT ft.rowid FROM fact_tags ft LEFT JOIN facts f ON f.id = ft.fact_id "
+            "WHERE f.id IS NULL LIMIT ?)",
+            (batch_size or -1,),
+        )
+        await commit(db)
+        deleted += cur.rowcount
+        if batch_size is None or cur.rowcount < batch_size:
+            return deleted
+        await asyncio.sleep(0)
+
+
+async def optimize_fact_search(db: aiosqlite.Connection) -> None:
+    """Merge the FTS5 index segments of ``kiso_facts_fts``."""
+    await db.execute("INSERT INTO kiso_facts_fts(kiso_facts_fts) VALUES ('optimize')")
+    await commit(db)
+
+
+async def optimize_db(db: aiosqlite.Connection, vacuum_pages: int) -> int:
+    """Refresh planner statistics and return free pages to the filesystem.
+
+    ``PRAGMA incremental_vacuum`` only acts on databases with
+    ``auto_vacuum = INCREMENTAL``; it releases at most *vacuum_pages*
+    pages per call. Returns the number of pages released.
+    """
+    await db.execute("PRAGMA optimize")
+    cur = await db.execute("PRAGMA auto_vacuum")
+    (mode,) = await cur.fetchone()
+    if mode != 2:
+        return 0
+    cur = await db.execute("PRAGMA freelist_count")
+    (before,) = await cur.fetchone()
+    cur = await db.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})")
+    await cur.fetchall()  # the pragma frees one page per step
+    await commit(db)
+    cur = await db.execute("PRAGMA freelist_count")
+    (after,) = await cur.fetchone()
+    return before - after
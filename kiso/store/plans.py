@@ -7,14 +7,19 @@ from typing import cast
 
 import aiosqlite
 
+from kiso import events
+
+from .pool import reader
 from .shared import (
     _KEEP_LLM_CALLS,
+    _attach_llm_calls,
+    _llm_call_row,
     _rows_to_dicts,
-    _serialize_llm_calls,
     _serialize_task_args,
     _update_field,
     _update_fields,
 )
+from .transactions import commit
 
 
 async def create_plan(
@@ -28,8 +33,32 @@ async def create_plan(
         "INSERT INTO plans (session, message_id, goal, parent_id) VALUES (?, ?, ?, ?)",
         (session, message_id, goal, parent_id),
     )
-    await db.commit()
-    return cast(int, cur.lastrowid)
+    await commit(db)
+    plan_id = cast(int, cur.lastrowid)
+    events.note_plan(plan_id, session)
+    events.publish(session, "plan", {"id": plan_id})
+    return plan_id
+
+
+# One ``llm_calls`` row per call. The owning plan/session are copied from
+# the task (or plan) row and seq is the next free slot, all in a single
+# statement so concurrent appends never race on the sequence number.
+_LLM_CALL_INSERT = (
+    "INSERT INTO llm_calls (plan_id, task_id, seq, session, role, model, "
+    "input_tokens, output_tokens, duration_ms, summary, transcript) "
+)
+_TASK_LLM_CALL_INSERT = _LLM_CALL_INSERT + (
+    "SELECT t.plan_id, t.id, "
+    "(SELECT COALESCE(MAX(c.seq) + 1, 0) FROM llm_calls c "
+    " WHERE c.plan_id = t.plan_id AND c.task_id = t.id), "
+    "t.session, ?, ?, ?, ?, ?, ?, ? FROM tasks t WHERE t.id = ?"
+)
+_PLAN_LLM_CALL_INSERT = _LLM_CALL_INSERT + (
+    "SELECT p.id, 0, "
+    "(SELECT COALESCE(MAX(c.seq) + 1, 0) FROM llm_calls c "
+    " WHERE c.plan_id = p.id AND c.task_id = 0), "
+    "p.session, ?, ?, ?, ?, ?, ?, ? FROM plans p WHERE p.id = ?"
+)
 
 
 async def update_task(
@@ -44,6 +73,7 @@ async def update_task(
         "status": status, "output": output, "stderr": stderr,
         "duration_ms": duration_ms,
     }, task_id)
+    events.publish_task_change(task_id)
 
 
 async def update_task_review(
@@ -57,12 +87,14 @@ async def update_task_review(
         "review_verdict": verdict, "review_reason": reason,
         "review_learning": learning,
     }, task_id)
+    events.publish_task_change(task_id)
 
 
 async def update_task_command(
     db: aiosqlite.Connection, task_id: int, command: str,
 ) -> None:
     await _update_field(db, "tasks", "command", command, task_id, update_timestamp=True)
+    events.publish_task_change(task_id)
 
 
 async def update_task_usage(
@@ -72,68 +104,72 @@ async def update_task_usage(
     output_tokens: int,
     llm_calls: list[dict] | None | object = _KEEP_LLM_CALLS,
 ) -> None:
-    update, calls_json = _serialize_llm_calls(llm_calls)
-    if update:
+    await db.execute(
+        "UPDATE tasks SET input_tokens = ?, output_tokens = ? WHERE id = ?",
+        (input_tokens, output_tokens, task_id),
+    )
+    if llm_calls is not _KEEP_LLM_CALLS:
         await db.execute(
-            "UPDATE tasks SET input_tokens = ?, output_tokens = ?, llm_calls = ? WHERE id = ?",
-            (input_tokens, output_tokens, calls_json, task_id),
+            "DELETE FROM llm_calls "
+            "WHERE plan_id = (SELECT plan_id FROM tasks WHERE id = ?) AND task_id = ?",
+            (task_id, task_id),
         )
-    else:
-        await db.execute(
-            "UPDATE tasks SET input_tokens = ?, output_tokens = ? WHERE id = ?",
-            (input_tokens, output_tokens, task_id),
+        await db.executemany(
+            _TASK_LLM_CALL_INSERT,
+            [(*_llm_call_row(c), task_id) for c in llm_calls or ()],
         )
-    await db.commit()
+    await commit(db)
+    events.publish_task_change(task_id)
 
 
 async def update_task_substatus(
     db: aiosqlite.Connection, task_id: int, substatus: str,
 ) -> None:
     await _update_field(db, "tasks", "substatus", substatus, task_id, update_timestamp=True)
+    events.publish_task_change(task_id)
 
 
 async def update_task_retry_count(
     db: aiosqlite.Connection, task_id: int, retry_count: int,
 ) -> None:
     await _update_field(db, "tasks", "retry_count", retry_count, task_id, update_timestamp=True)
+    events.publish_task_change(task_id)
 
 
 async def append_task_llm_call(
     db: aiosqlite.Connection, task_id: int, call_data: dict,
 ) -> None:
-    await db.execute(
-        "UPDATE tasks "
-        "SET llm_calls = json_insert("
-        "    CASE WHEN json_valid(llm_calls) THEN llm_calls ELSE '[]' END,"
-        "    '$[#]', json(?)"
-        ") WHERE id = ?",
-        (json.dumps(call_data), task_id),
-    )
-    await db.commit()
+    await db.execute(_TASK_LLM_CALL_INSERT, (*_llm_call_row(call_data), task_id))
+    await commit(db)
+    events.publish_task_change(task_id)
 
 
 async def update_plan_status(
     db: aiosqlite.Connection, plan_id: int, status: str,
 ) -> None:
     await _update_field(db, "plans", "status", status, plan_id)
+    events.publish_plan_change(plan_id)
 
 
 async def update_plan_goal(
     db: aiosqlite.Connection, plan_id: int, goal: str,
 ) -> None:
     await _update_field(db, "plans", "goal", goal, plan_id)
+    events.publish_plan_change(plan_id)
 
 
 async def update_plan_install_proposal(
     db: aiosqlite.Connection, plan_id: int, value: bool = True,
 ) -> None:
     await _update_field(db, "plans", "install_proposal", int(value), plan_id)
+    events.publish_plan_change(plan_id)
 
 
 async def update_plan_awaits_input(
     db: aiosqlite.Connection, plan_id: int, value: bool = True,
 ) -> None:
     await _update_field(db, "plans", "awaits_input", int(value), plan_id)
+    events.publish_plan_change(plan_id)
 
 
 async def update_plan_usage(
@@ -144,27 +180,60 @@ async def update_plan_usage(
     model: str | None = None,
     llm_calls: list[dict] | None | object = _KEEP_LLM_CALLS,
 ) -> None:
-    update, calls_json = _serialize_llm_calls(llm_calls)
-    if update:
+    await db.execute(
+        "UPDATE plans SET total_input_tokens = ?, total_output_tokens = ?, model = ? "
+        "WHERE id = ?",
+        (input_tokens, output_tokens, model, plan_id),
+    )
+    if llm_calls is not _KEEP_LLM_CALLS:
         await db.execute(
-            "UPDATE plans SET total_input_tokens = ?, total_output_tokens = ?, model = ?, llm_calls = ? "
-            "WHERE id = ?",
-            (input_tokens, output_tokens, model, calls_json, plan_id),
+            "DELETE FROM llm_calls WHERE plan_id = ? AND task_id = 0", (plan_id,),
         )
-    else:
-        await db.execute(
-            "UPDATE plans SET total_input_tokens = ?, total_output_tokens = ?, model = ? "
-            "WHERE id = ?",
-            (input_tokens, output_tokens, model, plan_id),
+        await db.executemany(
+            _PLAN_LLM_CALL_INSERT,
+            [(*_llm_call_row(c), plan_id) for c in llm_calls or ()],
         )
-    await db.commit()
+    await commit(db)
+    events.publish_plan_change(plan_id)
 
 
 async def get_tasks_for_plan(db: aiosqlite.Connection, plan_id: int) -> list[dict]:
     cur = await db.execute(
         "SELECT * FROM tasks WHERE plan_id = ? ORDER BY id", (plan_id,),
     )
-    return await _rows_to_dicts(cur)
+    tasks = await _rows_to_dicts(cur)
+    await _attach_llm_calls(
+        db, tasks, "plan_id = ? AND task_id != 0", (plan_id,), key="id",
+    )
+    return tasks
+
+
+async def get_llm_calls(
+    db: aiosqlite.Connection,
+    session: str,
+    plan_id: int,
+    task_id: int | None = None,
+) -> list[dict]:
+    """Return full LLM call entries (with transcripts) of a plan or task.
+
+    *task_id* None selects the plan-level calls (classifier, planner,
+    messenger, …). Calls are scoped to *session*, so a plan id of
+    another session yields an empty list. Each entry carries its ``seq``.
+    """
+    async with reader(db) as db:
+        cur = await db.execute(
+            "SELECT seq, summary, transcript FROM llm_calls "
+            "WHERE plan_id = ? AND task_id = ? AND session = ? ORDER BY seq",
+            (plan_id, task_id or 0, session),
+        )
+        calls = []
+        for row in await cur.fetchall():
+            entry = json.loads(row["summary"])
+            if row["transcript"]:
+                entry.update(json.loads(row["transcript"]))
+            entry["seq"] = row["seq"]
+            calls.append(entry)
+        return calls
 
 
 async def create_task(
@@ -185,5 +254,8 @@ async def create_task(
         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
         (plan_id, session, type, detail, args, expect, parallel_group, server, method),
     )
-    await db.commit()
-    return cast(int, cur.lastrowid)
+    await commit(db)
+    task_id = cast(int, cur.lastrowid)
+    events.note_task(task_id, session)
+    events.publish(session, "tasks", {"id": task_id})
+    return task_id
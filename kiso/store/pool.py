@@ -0,0 +1,170 @@
+"""Read-only connection pool next to the writer connection.
+
+aiosqlite runs every statement of a connection on that connection's
+single thread, so with one shared connection a slow write holds up
+every read queued behind it. The database runs in WAL mode, where
+readers never block the writer or each other. :func:`open_read_pool`
+therefore attaches a small pool of read-only connections to the
+writer returned by ``init_db``.
+
+Read helpers wrap their queries in ``async with reader(db) as db:``.
+This borrows a pooled connection when *db* has a pool and otherwise
+uses *db* itself, so tests and tools that only open the writer behave
+as before. Writes always go through the writer. Every statement outside
+a transaction sees the last committed state, so a read issued after a
+write that has been committed sees that write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import aiosqlite
+
+from .shared import log
+from .transactions import commit_stats
+
+
+class _ReaderStats:
+    __slots__ = ("acquired", "wait_total", "wait_max")
+
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "acquired": self.acquired,
+            "wait_ms_total": round(self.wait_total * 1000, 1),
+            "wait_ms_max": round(self.wait_max * 1000, 1),
+        }
+
+
+class ReadPool:
+    """A fixed set of read-only connections to the database at *path*."""
+
+    def __init__(self, path: Path, size: int) -> None:
+        self.path = path
+        self.size = size
+        self._conns: list[aiosqlite.Connection] = []
+        self._idle: asyncio.Queue[int] = asyncio.Queue()
+        self._stats: list[_ReaderStats] = []
+        self._waiting = 0
+        self._closed = False
+
+    async def open(self) -> None:
+        uri = f"{Path(self.path).resolve().as_uri()}?mode=ro"
+        try:
+            for i in range(self.size):
+                conn = await aiosqlite.connect(uri, uri=True)
+                await conn.execute("PRAGMA busy_timeout = 5000")
+                await conn.execute("PRAGMA query_only = ON")
+                conn.row_factory = aiosqlite.Row
+                self._conns.append(conn)
+                self._stats.append(_ReaderStats())
+                self._idle.put_nowait(i)
+        except BaseException:
+            await self.close()
+            raise
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a connection, waiting for one to be returned if all are busy."""
+        t0 = time.monotonic()
+        self._waiting += 1
+        try:
+            i = await self._idle.get()
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - t0
+        stats = self._stats[i]
+        stats.acquired += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        try:
+            yield self._conns[i]
+        finally:
+            self._idle.put_nowait(i)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def close(self) -> None:
+        self._closed = True
+        conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                await conn.close()
+            except Exception as exc:  # noqa: BLE001 — best-effort shutdown
+                log.warning("Closing read connection failed: %s", exc)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "waiting": self._waiting,
+            "readers": [s.as_dict() for s in self._stats],
+        }
+
+
+_read_pools: weakref.WeakKeyDictionary[aiosqlite.Connection, ReadPool] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def open_read_pool(
+    db: aiosqlite.Connection, path: Path, size: int,
+) -> ReadPool | None:
+    """Open *size* read-only connections to *path* and attach them to *db*.
+
+    *size* 0 leaves *db* without a pool (every read uses the writer).
+    """
+    await close_read_pool(db)
+    if size <= 0:
+        return None
+    pool = ReadPool(path, size)
+    await pool.open()
+    _read_pools[db] = pool
+    log.info("Opened %d read-only connection(s) to %s", size, path)
+    return pool
+
+
+async def close_read_pool(db: aiosqlite.Connection) -> None:
+    pool = _read_pools.pop(db, None)
+    if pool is not None:
+        await pool.close()
+
+
+def get_read_pool(db: aiosqlite.Connection) -> ReadPool | None:
+    return _read_pools.get(db)
+
+
+@asynccontextmanager
+async def reader(db: aiosqlite.Connection) -> AsyncIterator[aiosqlite.Connection]:
+    """A connection for read-only queries: pooled when *db* has a pool."""
+    pool = _read_pools.get(db)
+    if pool is None or pool.closed:
+        yield db
+        return
+    async with pool.acquire() as conn:
+        yield conn
+
+
+def db_stats(db: aiosqlite.Connection) -> dict:
+    """Queue depth and commits of the writer, wait times of the readers."""
+    tx = getattr(db, "_tx", None)  # aiosqlite's statement queue
+    pool = _read_pools.get(db)
+    return {
+        "writer": {
+            "queued": tx.qsize() if tx is not None else None,
+            "commits": commit_stats(db),
+        },
+        "read_pool": pool.stats() if pool is not None else None,
+    }
@@ -6,15 +6,18 @@ from typing import cast
 
 import aiosqlite
 
+from .pool import reader
 from .shared import (
     MessageDict,
     PlanDict,
     SessionDict,
     TaskDict,
+    _attach_llm_calls,
     _row_to_dict,
     _rows_to_dicts,
     _update_field,
 )
+from .transactions import commit
 
 
 async def get_session(db: aiosqlite.Connection, session: str) -> SessionDict | None:
@@ -34,7 +37,7 @@ async def create_session(
         "INSERT OR IGNORE INTO sessions (session, connector, webhook, description) VALUES (?, ?, ?, ?)",
         (session, connector, webhook, description),
     )
-    await db.commit()
+    await commit(db)
     return cast(SessionDict, await get_session(db, session))
 
 
@@ -56,7 +59,7 @@ async def upsert_session(
             "updated_at = CURRENT_TIMESTAMP WHERE session = ?",
             (connector, webhook, description, session),
         )
-    await db.commit()
+    await commit(db)
     return cast(SessionDict, await get_session(db, session)), created
 
 
@@ -80,7 +83,7 @@ async def save_message(
         "UPDATE sessions SET updated_at = CURRENT_TIMESTAMP WHERE session = ?",
         (session,),
     )
-    await db.commit()
+    await commit(db)
     return cast(int, msg_id)
 
 
@@ -95,17 +98,18 @@ async def mark_messages_processed(db: aiosqlite.Connection, msg_ids: list[int])
     await db.execute(
         f"UPDATE messages SET processed = 1 WHERE id IN ({placeholders})", msg_ids
     )
-    await db.commit()
+    await commit(db)
 
 
 async def get_sessions_for_user(db: aiosqlite.Connection, username: str) -> list[SessionDict]:
-    cur = await db.execute(
-        "SELECT DISTINCT s.* "
-        "FROM sessions s JOIN messages m ON s.session = m.session "
-        "WHERE m.user = ? ORDER BY s.updated_at DESC",
-        (username,),
-    )
-    return cast(list[SessionDict], await _rows_to_dicts(cur))
+    async with reader(db) as db:
+        cur = await db.execute(
+            "SELECT DISTINCT s.* "
+            "FROM sessions s JOIN messages m ON s.session = m.session "
+            "WHERE m.user = ? ORDER BY s.updated_at DESC",
+            (username,),
+        )
+        return cast(list[SessionDict], await _rows_to_dicts(cur))
 
 
 async def session_owned_by(db: aiosqlite.Connection, session: str, username: str) -> bool:
@@ -117,27 +121,50 @@ async def session_owned_by(db: aiosqlite.Connection, session: str, username: str
 
 
 async def get_all_sessions(db: aiosqlite.Connection) -> list[SessionDict]:
-    cur = await db.execute("SELECT * FROM sessions ORDER BY updated_at DESC")
-    return cast(list[SessionDict], await _rows_to_dicts(cur))
+    async with reader(db) as db:
+        cur = await db.execute("SELECT * FROM sessions ORDER BY updated_at DESC")
+        return cast(list[SessionDict], await _rows_to_dicts(cur))
 
 
 async def get_tasks_for_session(
     db: aiosqlite.Connection, session: str, after: int = 0,
+    *, transcripts: bool = False,
 ) -> list[TaskDict]:
-    cur = await db.execute(
-        "SELECT * FROM tasks WHERE session = ? AND id > ? ORDER BY id",
-        (session, after),
-    )
-    return cast(list[TaskDict], await _rows_to_dicts(cur))
+    """Tasks of *session* with id > *after*, ``llm_calls`` attached.
 
+    ``llm_calls`` holds call summaries; *transcripts* also merges in the
+    full ``messages``/``response`` of every call.
+    """
+    async with reader(db) as db:
+        cur = await db.execute(
+            "SELECT * FROM tasks WHERE session = ? AND id > ? ORDER BY id",
+            (session, after),
+        )
+        tasks = await _rows_to_dicts(cur)
+        await _attach_llm_calls(
+            db, tasks, "session = ? AND task_id > ?", (session, after),
+            key="id", transcripts=transcripts,
+        )
+        return cast(list[TaskDict], tasks)
 
-async def get_plan_for_session(db: aiosqlite.Connection, session: str) -> PlanDict | None:
-    cur = await db.execute(
-        "SELECT * FROM plans WHERE session = ? ORDER BY id DESC LIMIT 1",
-        (session,),
-    )
-    row = await cur.fetchone()
-    return cast(PlanDict | None, dict(row) if row else None)
+
+async def get_plan_for_session(
+    db: aiosqlite.Connection, session: str, *, transcripts: bool = False,
+) -> PlanDict | None:
+    async with reader(db) as db:
+        cur = await db.execute(
+            "SELECT * FROM plans WHERE session = ? ORDER BY id DESC LIMIT 1",
+            (session,),
+        )
+        row = await cur.fetchone()
+        if row is None:
+            return None
+        plan = dict(row)
+        await _attach_llm_calls(
+            db, [plan], "plan_id = ? AND task_id = 0", (plan["id"],),
+            key="plan", transcripts=transcripts,
+        )
+        return cast(PlanDict, plan)
 
 
 async def session_has_install_proposal(db: aiosqlite.Connection, session: str) -> bool:
@@ -188,9 +215,10 @@ async def _get_messages_filtered(
 async def get_recent_messages(
     db: aiosqlite.Connection, session: str, limit: int = 20,
 ) -> list[MessageDict]:
-    return await _get_messages_filtered(
-        db, session=session, trusted=1, order="DESC", limit=limit, reverse=True,
-    )
+    async with reader(db) as db:
+        return await _get_messages_filtered(
+            db, session=session, trusted=1, order="DESC", limit=limit, reverse=True,
+        )
 
 
 def _fact_session_filter(
@@ -281,27 +309,29 @@ async def get_facts(
     project_id: int | None = None,
 ) -> list[dict]:
     """Return facts filtered by session scope."""
-    limit_val = limit if limit is not None else -1
-    filt, params = _fact_session_filter(
-        is_admin, session, username=username, project_id=project_id,
-    )
-    if filt:
-        cur = await db.execute(
-            f"SELECT * FROM facts WHERE 1=1{filt} ORDER BY id LIMIT ?",
-            params + [limit_val],
+    async with reader(db) as db:
+        limit_val = limit if limit is not None else -1
+        filt, params = _fact_session_filter(
+            is_admin, session, username=username, project_id=project_id,
         )
-    else:
-        cur = await db.execute("SELECT * FROM facts ORDER BY id LIMIT ?", (limit_val,))
-    return await _rows_to_dicts(cur)
+        if filt:
+            cur = await db.execute(
+                f"SELECT * FROM facts WHERE 1=1{filt} ORDER BY id LIMIT ?",
+                params + [limit_val],
+            )
+        else:
+            cur = await db.execute("SELECT * FROM facts ORDER BY id LIMIT ?", (limit_val,))
+        return await _rows_to_dicts(cur)
 
 
 async def get_pending_items(db: aiosqlite.Connection, session: str) -> list[dict]:
-    cur = await db.execute(
-        "SELECT * FROM pending WHERE status = 'open' "
-        "AND (scope = 'global' OR scope = ?) ORDER BY id",
-        (session,),
-    )
-    return await _rows_to_dicts(cur)
+    async with reader(db) as db:
+        cur = await db.execute(
+            "SELECT * FROM pending WHERE status = 'open' "
+            "AND (scope = 'global' OR scope = ?) ORDER BY id",
+            (session,),
+        )
+        return await _rows_to_dicts(cur)
 
 
 async def save_pending_item(
@@ -314,7 +344,7 @@ async def save_pending_item(
         "INSERT INTO pending (content, scope, source) VALUES (?, ?, ?)",
         (content, scope, source),
     )
-    await db.commit()
+    await commit(db)
     return cast(int, cur.lastrowid)
 
 
@@ -360,7 +390,7 @@ async def recover_stale_running(db: aiosqlite.Connection) -> tuple[int, int]:
         "WHERE status = 'running'"
     )
     tasks_count = cur.rowcount
-    await db.commit()
+    await commit(db)
     return plans_count, tasks_count
 
 
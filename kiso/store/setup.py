@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import aiosqlite
 
-from .shared import SCHEMA
+from .shared import SCHEMA, _llm_call_row
+from .transactions import connect_writer
 
 
 # Idempotent column-add migrations. Each entry is (table, column, definition).
@@ -15,8 +17,26 @@ from .shared import SCHEMA
 # matters for upgrading databases created by an older release.
 _COLUMN_MIGRATIONS: tuple[tuple[str, str, str], ...] = (
     ("plans", "awaits_input", "INTEGER DEFAULT 0"),  # M1579a
+    ("facts", "rev", "INTEGER DEFAULT 0"),
 )
 
+# Indexes and triggers on migrated columns — created once the columns exist.
+# The rev counter is seeded from the live facts and the consolidation
+# watermark, so an upgraded database never hands out a reviewed rev again.
+_POST_MIGRATION_SCHEMA = """\
+CREATE INDEX IF NOT EXISTS idx_facts_rev ON facts(rev);
+INSERT OR IGNORE INTO fact_rev_seq (id, rev) SELECT 0, MAX(
+    COALESCE((SELECT MAX(rev) FROM facts), 0),
+    COALESCE((SELECT CAST(value AS INTEGER) FROM kv WHERE key = 'consolidation_fact_rev'), 0)
+);
+CREATE TRIGGER IF NOT EXISTS fact_rev_seq_insert AFTER INSERT ON facts BEGIN
+    UPDATE fact_rev_seq SET rev = new.rev WHERE id = 0 AND new.rev > rev;
+END;
+CREATE TRIGGER IF NOT EXISTS fact_rev_seq_update AFTER UPDATE OF rev ON facts BEGIN
+    UPDATE fact_rev_seq SET rev = new.rev WHERE id = 0 AND new.rev > rev;
+END;
+"""
+
 
 async def _ensure_columns(db: aiosqlite.Connection) -> None:
     for table, column, definition in _COLUMN_MIGRATIONS:
@@ -28,20 +48,88 @@ async def _ensure_columns(db: aiosqlite.Connection) -> None:
             )
 
 
+async def _migrate_fts_update_trigger(db: aiosqlite.Connection) -> None:
+    """Limit the FTS update trigger of older databases to content changes.
+
+    Older releases reindexed a fact on every UPDATE, so confidence and
+    usage bumps rewrote its FTS row too.
+    """
+    cur = await db.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'facts_fts_update'"
+    )
+    row = await cur.fetchone()
+    if row is None or "UPDATE OF content" in row[0]:
+        return
+    await db.execute("DROP TRIGGER facts_fts_update")
+    await db.execute(
+        "CREATE TRIGGER facts_fts_update AFTER UPDATE OF content ON facts BEGIN "
+        "INSERT INTO kiso_facts_fts(kiso_facts_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); "
+        "INSERT INTO kiso_facts_fts(rowid, content) VALUES (new.id, new.content); "
+        "END"
+    )
+
+
+async def _migrate_inline_llm_calls(db: aiosqlite.Connection) -> None:
+    """Move legacy ``tasks``/``plans.llm_calls`` JSON into ``llm_calls`` rows.
+
+    Older releases stored the whole call list (prompts included) inline.
+    Each non-NULL value is split into rows and the column cleared, so
+    this is a no-op once a database has been migrated. Unparseable
+    values are dropped.
+    """
+    for table, task_expr, plan_expr in (
+        ("tasks", "id", "plan_id"),
+        ("plans", "0", "id"),
+    ):
+        cur = await db.execute(
+            f"SELECT {plan_expr} AS plan_id, {task_expr} AS task_id, session, "
+            f"llm_calls FROM {table} WHERE llm_calls IS NOT NULL"
+        )
+        rows = await cur.fetchall()
+        if not rows:
+            continue
+        inserts = []
+        for row in rows:
+            try:
+                calls = json.loads(row["llm_calls"])
+            except (ValueError, TypeError):
+                continue
+            if not isinstance(calls, list):
+                continue
+            inserts.extend(
+                (row["plan_id"], row["task_id"], seq, row["session"], *_llm_call_row(call))
+                for seq, call in enumerate(calls)
+                if isinstance(call, dict)
+            )
+        await db.executemany(
+            "INSERT OR IGNORE INTO llm_calls (plan_id, task_id, seq, session, "
+            "role, model, input_tokens, output_tokens, duration_ms, summary, "
+            "transcript) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            inserts,
+        )
+        await db.execute(f"UPDATE {table} SET llm_calls = NULL WHERE llm_calls IS NOT NULL")
+
+
 async def init_db(db_path: Path) -> aiosqlite.Connection:
     """Create tables and return a configured connection.
 
     The schema in shared.py is the single source of truth for new
     databases. For existing databases, `_ensure_columns` runs
     idempotent ALTER TABLE statements so column additions land
-    without data loss.
+    without data loss, `_migrate_fts_update_trigger` narrows the old
+    FTS update trigger, and `_migrate_inline_llm_calls` moves per-call
+    LLM data out of the old inline columns.
     """
-    db = await aiosqlite.connect(db_path)
+    db = await connect_writer(db_path)
     await db.execute("PRAGMA journal_mode=WAL")
     await db.execute("PRAGMA busy_timeout = 5000")
     await db.execute("PRAGMA foreign_keys = ON")
     db.row_factory = aiosqlite.Row
     await db.executescript(SCHEMA)
     await _ensure_columns(db)
+    await db.executescript(_POST_MIGRATION_SCHEMA)
+    await _migrate_fts_update_trigger(db)
+    await _migrate_inline_llm_calls(db)
     await db.commit()
     return db
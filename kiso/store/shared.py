@@ -9,6 +9,8 @@ from typing import TypedDict
 
 import aiosqlite
 
+from .transactions import commit
+
 log = logging.getLogger(__name__)
 
 
@@ -161,6 +163,22 @@ CREATE INDEX IF NOT EXISTS idx_tasks_plan ON tasks(plan_id, id);
 CREATE INDEX IF NOT EXISTS idx_tasks_session ON tasks(session, id);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(session, status);
 
+CREATE TABLE IF NOT EXISTS llm_calls (
+    plan_id       INTEGER NOT NULL,
+    task_id       INTEGER NOT NULL DEFAULT 0,
+    seq           INTEGER NOT NULL,
+    session       TEXT NOT NULL,
+    role          TEXT,
+    model         TEXT,
+    input_tokens  INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    duration_ms   INTEGER,
+    summary       TEXT NOT NULL,
+    transcript    TEXT,
+    PRIMARY KEY (plan_id, task_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_session ON llm_calls(session, task_id, seq);
+
 CREATE TABLE IF NOT EXISTS facts (
     id         INTEGER PRIMARY KEY AUTOINCREMENT,
     content    TEXT NOT NULL,
@@ -172,9 +190,20 @@ CREATE TABLE IF NOT EXISTS facts (
     use_count  INTEGER DEFAULT 0,
     project_id INTEGER REFERENCES projects(id),
     entity_id  INTEGER REFERENCES entities(id),
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    rev        INTEGER DEFAULT 0
 );
 CREATE INDEX IF NOT EXISTS idx_facts_cat_sess ON facts(category, session);
+-- Serve the decay and archive predicates (kiso/maintenance.py).
+CREATE INDEX IF NOT EXISTS idx_facts_stale ON facts(COALESCE(last_used, created_at));
+CREATE INDEX IF NOT EXISTS idx_facts_confidence ON facts(confidence);
+
+-- Highest fact revision ever stamped (one row). Unlike MAX(facts.rev)
+-- it does not go back when the newest fact is deleted or archived.
+CREATE TABLE IF NOT EXISTS fact_rev_seq (
+    id  INTEGER PRIMARY KEY CHECK (id = 0),
+    rev INTEGER NOT NULL
+);
 
 CREATE VIRTUAL TABLE IF NOT EXISTS kiso_facts_fts USING fts5(
     content,
@@ -184,7 +213,7 @@ CREATE VIRTUAL TABLE IF NOT EXISTS kiso_facts_fts USING fts5(
 CREATE TRIGGER IF NOT EXISTS facts_fts_insert AFTER INSERT ON facts BEGIN
     INSERT INTO kiso_facts_fts(rowid, content) VALUES (new.id, new.content);
 END;
-CREATE TRIGGER IF NOT EXISTS facts_fts_update AFTER UPDATE ON facts BEGIN
+CREATE TRIGGER IF NOT EXISTS facts_fts_update AFTER UPDATE OF content ON facts BEGIN
     INSERT INTO kiso_facts_fts(kiso_facts_fts, rowid, content) VALUES ('delete', old.id, old.content);
     INSERT INTO kiso_facts_fts(rowid, content) VALUES (new.id, new.content);
 END;
@@ -192,6 +221,25 @@ CREATE TRIGGER IF NOT EXISTS facts_fts_delete AFTER DELETE ON facts BEGIN
     INSERT INTO kiso_facts_fts(kiso_facts_fts, rowid, content) VALUES ('delete', old.id, old.content);
 END;
 
+-- Ids of facts whose content changed, for the in-memory retrieval index
+-- (kiso/store/fact_index.py). Only the newest 10000 entries are kept.
+CREATE TABLE IF NOT EXISTS fact_changes (
+    seq     INTEGER PRIMARY KEY,
+    fact_id INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS fact_changes_insert AFTER INSERT ON facts BEGIN
+    INSERT INTO fact_changes (fact_id) VALUES (new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS fact_changes_update AFTER UPDATE OF content ON facts BEGIN
+    INSERT INTO fact_changes (fact_id) VALUES (new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS fact_changes_delete AFTER DELETE ON facts BEGIN
+    INSERT INTO fact_changes (fact_id) VALUES (old.id);
+END;
+CREATE TRIGGER IF NOT EXISTS fact_changes_trim AFTER INSERT ON fact_changes BEGIN
+    DELETE FROM fact_changes WHERE seq <= new.seq - 10000;
+END;
+
 CREATE TABLE IF NOT EXISTS fact_tags (
     fact_id INTEGER NOT NULL,
     tag     TEXT NOT NULL,
@@ -325,7 +373,7 @@ async def _update_field(
     else:
         sql = f"UPDATE {table} SET {field} = ? WHERE {id_column} = ?"
     await db.execute(sql, (value, row_id))
-    await db.commit()
+    await commit(db)
 
 
 async def _update_fields(
@@ -341,7 +389,7 @@ async def _update_fields(
     set_clauses.append("updated_at = CURRENT_TIMESTAMP")
     sql = f"UPDATE {table} SET {', '.join(set_clauses)} WHERE {id_column} = ?"
     await db.execute(sql, (*fields.values(), row_id))
-    await db.commit()
+    await commit(db)
 
 
 _KEEP_LLM_CALLS = object()
@@ -356,6 +404,73 @@ def _serialize_llm_calls(
     return True, _json_text_or_none(llm_calls)
 
 
+# Keys of an LLM call entry that hold the full prompt/response. They go
+# to ``llm_calls.transcript`` and are only loaded on demand.
+_LLM_TRANSCRIPT_KEYS = ("messages", "response")
+
+
+def _llm_call_row(call: dict) -> tuple:
+    """Split a call entry into the column values of an ``llm_calls`` row.
+
+    Returns ``(role, model, input_tokens, output_tokens, duration_ms,
+    summary, transcript)``; *summary* is the entry minus transcript keys.
+    """
+    summary = {k: v for k, v in call.items() if k not in _LLM_TRANSCRIPT_KEYS}
+    transcript = {k: call[k] for k in _LLM_TRANSCRIPT_KEYS if k in call}
+    return (
+        call.get("role"),
+        call.get("model"),
+        call.get("input_tokens") or 0,
+        call.get("output_tokens") or 0,
+        call.get("duration_ms"),
+        json.dumps(summary),
+        json.dumps(transcript) if transcript else None,
+    )
+
+
+def _llm_call_entry(row, transcripts: bool) -> str:
+    """Return the JSON text of one call entry from an ``llm_calls`` row."""
+    if not transcripts or not row["transcript"]:
+        return row["summary"]
+    entry = json.loads(row["summary"])
+    entry.update(json.loads(row["transcript"]))
+    return json.dumps(entry)
+
+
+async def _attach_llm_calls(
+    db: aiosqlite.Connection,
+    rows: list[dict],
+    where: str,
+    params: tuple,
+    *,
+    key: str,
+    transcripts: bool = False,
+) -> None:
+    """Set ``row["llm_calls"]`` on *rows* from the ``llm_calls`` table.
+
+    *where* filters the calls to load; rows are matched on *key*
+    (``"id"`` for tasks, ``"plan"`` to attach the plan-level calls to a
+    single plan row). The value is the JSON array text the inline column
+    used to hold, or None when there are no calls. Without *transcripts*
+    the transcript column is not even read and summaries are
+    concatenated as stored, so the compact path never parses JSON.
+    """
+    if not rows:
+        return
+    transcript_col = "transcript" if transcripts else "NULL AS transcript"
+    cur = await db.execute(
+        f"SELECT task_id, summary, {transcript_col} FROM llm_calls "
+        f"WHERE {where} ORDER BY task_id, seq",
+        params,
+    )
+    grouped: dict[int, list[str]] = {}
+    for r in await cur.fetchall():
+        grouped.setdefault(r["task_id"], []).append(_llm_call_entry(r, transcripts))
+    for row in rows:
+        entries = grouped.get(0 if key == "plan" else row["id"])
+        row["llm_calls"] = "[" + ",".join(entries) + "]" if entries else None
+
+
 _SENSITIVE_PATTERN = re.compile(
     r"\b(password|passwd|token)\b"
     r"|[0-9a-fA-F]{32,}",
@@ -369,12 +484,20 @@ _DEDUP_STOPWORDS = frozenset({
 })
 
 
-def _word_overlap_ratio(a: str, b: str) -> float:
-    """Return the Jaccard similarity of word sets from *a* and *b*."""
-    wa = {w.strip(".,;:!?\"'()") for w in a.lower().split()} - _DEDUP_STOPWORDS
-    wb = {w.strip(".,;:!?\"'()") for w in b.lower().split()} - _DEDUP_STOPWORDS
-    wa.discard("")
-    wb.discard("")
+def _dedup_words(text: str) -> set[str]:
+    """Lower-cased words of *text* without punctuation and stopwords."""
+    words = {w.strip(".,;:!?\"'()") for w in text.lower().split()} - _DEDUP_STOPWORDS
+    words.discard("")
+    return words
+
+
+def _word_set_overlap(wa: set[str], wb: set[str]) -> float:
+    """Jaccard similarity of two :func:`_dedup_words` sets."""
     if not wa or not wb:
         return 0.0
     return len(wa & wb) / len(wa | wb)
+
+
+def _word_overlap_ratio(a: str, b: str) -> float:
+    """Return the Jaccard similarity of word sets from *a* and *b*."""
+    return _word_set_overlap(_dedup_words(a), _dedup_words(b))
@@ -0,0 +1,224 @@
+"""Commits on the shared writer connection: units of work and group commit.
+
+Store helpers end with ``await commit(db)`` rather than
+``await db.commit()``. When nothing else is configured, this is the
+same thing. Two modes change it:
+
+- :func:`transaction` is a unit of work. Helper commits inside the
+  block are deferred, the block commits once when it exits, and it
+  rolls back if it raises. Commits from other callers that arrive
+  while the block is open wait for that single commit, so they never
+  commit half of the block.
+- :func:`configure_group_commit` turns on group commit. A commit
+  request waits up to ``window`` seconds for others to arrive, and
+  one commit (one WAL fsync) then covers all of them. Each caller
+  returns only once the commit that covers its writes has completed.
+
+All writes share one connection. On a :class:`WriterConnection` (what
+``init_db`` returns), every statement and commit from outside an open
+unit of work waits until that unit has committed or rolled back, so a
+rollback only ever discards the unit's own writes. Writes issued before
+a unit opens are committed first. Units of work on one connection run
+one at a time; keep them short, as every other writer waits on them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import sqlite3
+import weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import aiosqlite
+
+log = logging.getLogger(__name__)
+
+# The connection whose unit of work the current context is inside.
+_current_uow: contextvars.ContextVar[aiosqlite.Connection | None] = (
+    contextvars.ContextVar("_current_uow", default=None)
+)
+
+
+class _Committer:
+    """Commit coordination for one writer connection."""
+
+    def __init__(self, db: aiosqlite.Connection) -> None:
+        self._db_ref = weakref.ref(db)
+        self.window = 0.0
+        self._waiters: list[asyncio.Future] = []
+        self._timer: asyncio.Task | None = None
+        self._uow_lock = asyncio.Lock()
+        self._uow_open = False
+        self._uow_closed = asyncio.Event()
+        self._uow_closed.set()
+        self.commits = 0
+        self.requests = 0
+
+    @property
+    def _db(self) -> aiosqlite.Connection:
+        db = self._db_ref()
+        if db is None:  # pragma: no cover - the committer dies with its connection
+            raise RuntimeError("connection is gone")
+        return db
+
+    async def commit(self) -> None:
+        self.requests += 1
+        if self.window <= 0 and not self._uow_open:
+            await self._db.commit()
+            self.commits += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        if not self._uow_open and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        await fut
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        if not self._uow_open:
+            await self.flush()
+
+    async def flush(self, *, reraise: bool = False) -> None:
+        """Commit now and release every caller waiting for a commit."""
+        waiters, self._waiters = self._waiters, []
+        pending = bool(waiters) or self._db.in_transaction
+        try:
+            await self._db.commit()
+        except BaseException as exc:
+            _settle(waiters, exc)
+            if reraise or not isinstance(exc, Exception):
+                raise
+            log.error("Group commit failed: %s", exc)
+            return
+        if pending:
+            self.commits += 1
+        _settle(waiters)
+
+    async def rollback(self) -> None:
+        # Callers waiting here wrote nothing inside the unit of work:
+        # their writes were committed when it opened.
+        waiters, self._waiters = self._waiters, []
+        try:
+            await self._db.rollback()
+        finally:
+            _settle(waiters)
+
+    def _open(self) -> None:
+        self._uow_open = True
+        self._uow_closed.clear()
+
+    def _close(self) -> None:
+        self._uow_open = False
+        self._uow_closed.set()
+
+    async def wait_outside(self) -> None:
+        """Wait while a unit of work of another context is open."""
+        while self._uow_open:
+            await self._uow_closed.wait()
+
+    def stats(self) -> dict:
+        return {
+            "group_commit_ms": round(self.window * 1000, 1),
+            "commit_requests": self.requests,
+            "commits": self.commits,
+            "pending": len(self._waiters),
+        }
+
+
+def _settle(waiters: list[asyncio.Future], exc: BaseException | None = None) -> None:
+    for fut in waiters:
+        if fut.done():  # caller was cancelled
+            continue
+        if exc is None:
+            fut.set_result(None)
+        else:
+            fut.set_exception(exc)
+
+
+_committers: weakref.WeakKeyDictionary[aiosqlite.Connection, _Committer] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _committer(db: aiosqlite.Connection) -> _Committer:
+    committer = _committers.get(db)
+    if committer is None:
+        committer = _committers[db] = _Committer(db)
+    return committer
+
+
+class WriterConnection(aiosqlite.Connection):
+    """The shared writer: keeps other callers out of an open unit of work.
+
+    Every statement, fetch and commit of aiosqlite goes through
+    ``_execute``; from outside the open unit of work, it waits until the
+    unit has finished.
+    """
+
+    async def _execute(self, fn, *args, **kwargs):
+        committer = _committers.get(self)
+        if committer is not None and _current_uow.get() is not self:
+            await committer.wait_outside()
+        return await super()._execute(fn, *args, **kwargs)
+
+
+def connect_writer(path: Path) -> WriterConnection:
+    """Open *path* as a :class:`WriterConnection` (await it, like ``aiosqlite.connect``)."""
+    return WriterConnection(lambda: sqlite3.connect(str(path)), 64)
+
+
+async def commit(db: aiosqlite.Connection) -> None:
+    """Commit the writes made so far on *db*: see the module docstring."""
+    if _current_uow.get() is db:
+        return  # the enclosing unit of work commits
+    committer = _committers.get(db)
+    if committer is None:
+        await db.commit()
+        return
+    await committer.commit()
+
+
+@asynccontextmanager
+async def transaction(db: aiosqlite.Connection) -> AsyncIterator[aiosqlite.Connection]:
+    """Run the block as one unit of work on *db*: one commit, or rollback.
+
+    Nested blocks on the same connection join the outer one.
+    """
+    if _current_uow.get() is db:
+        yield db
+        return
+    committer = _committer(db)
+    async with committer._uow_lock:
+        committer._open()
+        token = _current_uow.set(db)
+        try:
+            # Commit writes queued before the block, so a rollback
+            # cannot take them with it.
+            await committer.flush(reraise=True)
+            yield db
+            await committer.flush(reraise=True)
+        except BaseException:
+            try:
+                await committer.rollback()
+            finally:
+                committer._close()
+            raise
+        else:
+            committer._close()
+        finally:
+            _current_uow.reset(token)
+
+
+def configure_group_commit(db: aiosqlite.Connection, window: float) -> None:
+    """Coalesce commits on *db* arriving within *window* seconds (0 = off)."""
+    _committer(db).window = max(0.0, window)
+
+
+def commit_stats(db: aiosqlite.Connection) -> dict | None:
+    committer = _committers.get(db)
+    return committer.stats() if committer is not None else None
@@ -12,6 +12,9 @@ let the CLI aggregate by session or by role without a full scan:
 Cost is stored nullable: pricing may not be known for every model
 (a new OpenRouter provider, a self-hosted endpoint, etc.). Null
 costs are excluded from totals rather than booked as zero.
+
+``cached_tokens`` is the part of ``prompt_tokens`` the provider served
+from its prompt-prefix cache (0 when not reported).
 """
 
 from __future__ import annotations
@@ -31,6 +34,7 @@ CREATE TABLE IF NOT EXISTS llm_usage (
     model              TEXT NOT NULL,
     prompt_tokens      INTEGER NOT NULL,
     completion_tokens  INTEGER NOT NULL,
+    cached_tokens      INTEGER NOT NULL DEFAULT 0,
     cost_usd           REAL,
     ts                 TEXT NOT NULL
 );
@@ -42,6 +46,11 @@ CREATE INDEX IF NOT EXISTS idx_usage_role_ts    ON llm_usage(role, ts);
 def ensure_usage_table(conn: sqlite3.Connection) -> None:
     """Create ``llm_usage`` + indexes if missing. Idempotent."""
     conn.executescript(_SCHEMA)
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(llm_usage)")}
+    if "cached_tokens" not in cols:
+        conn.execute(
+            "ALTER TABLE llm_usage ADD COLUMN cached_tokens INTEGER NOT NULL DEFAULT 0"
+        )
 
 
 def _now_iso() -> str:
@@ -58,6 +67,7 @@ def record_usage(
     completion_tokens: int,
     cost_usd: float | None,
     ts: str | None = None,
+    cached_tokens: int = 0,
 ) -> None:
     """Insert one llm_usage row.
 
@@ -68,10 +78,10 @@ def record_usage(
     conn.execute(
         "INSERT INTO llm_usage "
         "(session, role, model, prompt_tokens, completion_tokens, "
-        " cost_usd, ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        " cached_tokens, cost_usd, ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
         (
             session, role, model,
-            int(prompt_tokens), int(completion_tokens),
+            int(prompt_tokens), int(completion_tokens), int(cached_tokens),
             cost_usd, ts or _now_iso(),
         ),
     )
@@ -86,7 +96,7 @@ def query_usage(
     """Aggregated usage rows for the last *since_days* days.
 
     Rows are ``{key, calls, prompt_tokens, completion_tokens,
-    cost_usd}`` and are sorted by total cost descending. ``cost_usd``
+    cached_tokens, cost_usd}`` and are sorted by total cost descending. ``cost_usd``
     is the sum of non-null costs in the group (calls with unknown
     price contribute tokens but no cost).
     """
@@ -103,6 +113,7 @@ def query_usage(
         f"       COUNT(*) AS calls,"
         f"       SUM(prompt_tokens) AS prompt_tokens,"
         f"       SUM(completion_tokens) AS completion_tokens,"
+        f"       SUM(cached_tokens) AS cached_tokens,"
         f"       SUM(CASE WHEN cost_usd IS NULL THEN 0 ELSE cost_usd END) "
         f"         AS cost_usd "
         f"  FROM llm_usage "
@@ -112,12 +123,13 @@ def query_usage(
         (cutoff,),
     )
     out: list[dict] = []
-    for key, calls, pt, ct, cost in cur.fetchall():
+    for key, calls, pt, ct, cached, cost in cur.fetchall():
         out.append({
             "key": key,
             "calls": int(calls),
             "prompt_tokens": int(pt or 0),
             "completion_tokens": int(ct or 0),
+            "cached_tokens": int(cached or 0),
             "cost_usd": float(cost or 0.0),
         })
     return out
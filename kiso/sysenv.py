@@ -64,7 +64,8 @@ def get_resource_limits() -> dict:
 
     Returns a dict with keys: memory_mb, memory_used_mb, cpu_limit,
     disk_used_gb, disk_total_gb, pids_limit, pids_used.
-    Values are None when the corresponding source is unavailable.
+    Values are None when the corresponding source is unavailable
+    (``disk_used_gb`` also until the first background disk scan ends).
     """
     result: dict[str, int | float | None] = {
         "memory_mb": None,
@@ -114,10 +115,11 @@ def get_resource_limits() -> dict:
     except (ValueError, OSError):
         pass
 
-    # Disk usage — KISO_DIR actual size (not whole filesystem)
-    from kiso.worker.utils import _kiso_dir_bytes
+    # Disk usage — KISO_DIR actual size (not whole filesystem), from the
+    # cached total kept by the exec disk-limit accountant.
+    from kiso.worker.utils import _disk_accountant
 
-    dir_bytes = _kiso_dir_bytes()
+    dir_bytes = _disk_accountant.total()
     if dir_bytes is not None:
         result["disk_used_gb"] = round(dir_bytes / (1024**3), 1)
     # Filesystem capacity (for context)
@@ -319,27 +321,23 @@ def _collect_workspace_files(session: str) -> str:
     """List files in the session workspace (excluding .kiso/ internals).
 
     Returns a compact listing: relative path + human size, max 30 entries.
+    Reads the worker's incremental workspace index, so hidden files and
+    ignored cache directories are not listed either.
     """
+    import heapq
+
+    from kiso.worker.utils import _PUB_IGNORE_DIRS
+    from kiso.worker.workspace_index import workspace_index
+
     workspace = KISO_DIR / "sessions" / session
     if not workspace.is_dir():
         return ""
 
-    # Collect at most _MAX_SCAN candidates to avoid materialising a huge rglob.
-    _MAX_SCAN = 1000
-    candidates: list[Path] = []
-    for f in workspace.rglob("*"):
-        if f.is_file() and ".kiso" not in f.relative_to(workspace).parts:
-            candidates.append(f)
-        if len(candidates) >= _MAX_SCAN:
-            break
-    entries: list[str] = []
-    for f in sorted(candidates):
-        rel = f.relative_to(workspace)
-        size = _format_size(f.stat().st_size)
-        entries.append(f"{rel} ({size})")
-        if len(entries) >= 30:
-            entries.append("... (truncated, use `find` for full listing)")
-            break
+    indexed = workspace_index(workspace, _PUB_IGNORE_DIRS).files()
+    first = heapq.nsmallest(31, indexed.items(), key=lambda item: item[0])
+    entries = [f"{rel} ({_format_size(entry.size)})" for rel, entry in first[:30]]
+    if len(first) > 30:
+        entries.append("... (truncated, use `find` for full listing)")
     return ", ".join(entries)
 
 
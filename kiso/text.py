@@ -24,3 +24,78 @@ def extract_thinking(text: str) -> tuple[str, str]:
         blocks.append(m.group(1).strip())
     clean = _THINK_RE.sub("", text).strip()
     return "\n".join(blocks), clean
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _word_boundary(text: str, pos: int) -> bool:
+    """Whether regex ``\\b`` holds at *pos* in *text*."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every pattern in one pass over the text.
+
+    Built once from *patterns*; :meth:`finditer` then costs
+    O(len(text) + matches) regardless of how many patterns there are.
+    Matching is exact (callers lower-case both sides if they want
+    case-insensitivity).
+    """
+
+    __slots__ = ("patterns", "_goto", "_fail", "_out")
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.patterns = list(patterns)
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for idx, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(idx)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:  # breadth-first: parents before children
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                out[child] = out[child] + out[fail[child]]
+                queue.append(child)
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def finditer(self, text: str, whole_words: bool = False):
+        """Yield ``(start, end, pattern_index)`` for every occurrence.
+
+        With *whole_words*, only occurrences bounded by ``\\b`` on both
+        sides are reported — the same rule as ``re.search(r"\\b…\\b")``.
+        """
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for idx in out[node]:
+                end = i + 1
+                start = end - len(patterns[idx])
+                if whole_words and not (
+                    _word_boundary(text, start) and _word_boundary(text, end)
+                ):
+                    continue
+                yield start, end, idx
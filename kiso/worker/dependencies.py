@@ -8,9 +8,10 @@ from pathlib import Path
 
 from kiso.worker.utils import (
     _PUB_IGNORE_DIRS,
-    _build_execution_state,
+    _collect_workspace_files,
     _make_file_ref,
     _session_workspace,
+    _workspace_index,
 )
 
 _FILE_ARG_NAME_HINTS = (
@@ -33,10 +34,13 @@ _INSTRUCTION_HINTS = (
 
 
 def _workspace_visible_files(session: str) -> list[str]:
-    """Return visible workspace file paths relative to the session root."""
-    state = _build_execution_state(session)
+    """Return visible workspace file paths relative to the session root.
+
+    Same files the planner sees (newest first, capped), read from the
+    workspace index without rebuilding the whole execution state.
+    """
     files: list[str] = []
-    for entry in state.workspace_files:
+    for entry in _collect_workspace_files(session):
         workspace_path = entry.get("workspace_path") or entry.get("path")
         if workspace_path:
             files.append(workspace_path)
@@ -205,7 +209,7 @@ def _build_new_artifact_refs(
     """Build artifact refs for newly created visible files since *pre_snapshot*."""
     workspace = _session_workspace(session)
     refs: list[dict] = []
-    for path in sorted(set(workspace.rglob("*")) - pre_snapshot):
+    for path in sorted(_workspace_index(session).snapshot() - pre_snapshot):
         if not path.is_file():
             continue
         try:
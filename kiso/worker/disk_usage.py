@@ -0,0 +1,124 @@
+"""Cached disk-usage accounting for KISO_DIR.
+
+Exec admission (``_check_disk_limit``) and ``/health`` need the size of
+KISO_DIR, but measuring it means walking the whole tree (``du -sb``),
+which can take seconds on a busy instance. The accountant keeps a
+running total instead:
+
+- a full rescan runs in a daemon thread, at startup and whenever the
+  cached total is older than the rescan interval — never on the caller;
+- between rescans, callers that create files (workspace snapshot diffs
+  after an exec task) add their sizes with :meth:`DiskUsageAccountant.add`
+  or :meth:`DiskUsageAccountant.note_files`.
+
+Deletions are only picked up by the next rescan, so the cached total
+errs on the high side. Reading it is O(1).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RESCAN_INTERVAL = 300.0
+
+
+class DiskUsageAccountant:
+    """Running total of bytes under a directory, refreshed off-thread.
+
+    *scan* returns the full size in bytes (or None on error); it is only
+    ever called from the rescan thread or :meth:`rescan`.
+    """
+
+    def __init__(
+        self,
+        scan: Callable[[], int | None],
+        rescan_interval: float = DEFAULT_RESCAN_INTERVAL,
+    ) -> None:
+        self._scan = scan
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        self._total: int | None = None
+        self._scanned_at: float | None = None
+        self._thread: threading.Thread | None = None
+        self.scans = 0
+
+    def total(self, max_age: float | None = None) -> int | None:
+        """Return the cached total; None until the first scan finishes.
+
+        Starts a background rescan when the last one is older than
+        *max_age* (default: the rescan interval). Never blocks.
+        """
+        age_limit = self.rescan_interval if max_age is None else max_age
+        with self._lock:
+            total = self._total
+            stale = (
+                self._scanned_at is None
+                or time.monotonic() - self._scanned_at >= age_limit
+            )
+        if stale:
+            self.request_rescan()
+        return total
+
+    def add(self, nbytes: int) -> None:
+        """Account *nbytes* written (or freed, if negative) since the last scan."""
+        with self._lock:
+            if self._total is not None:
+                self._total = max(0, self._total + nbytes)
+
+    def note_files(self, paths: Iterable[Path]) -> int:
+        """Add the sizes of newly created *paths*; return the bytes added."""
+        added = 0
+        for path in paths:
+            try:
+                if path.is_file():
+                    added += path.stat().st_size
+            except OSError:
+                continue
+        if added:
+            self.add(added)
+        return added
+
+    def request_rescan(self) -> bool:
+        """Start a rescan thread unless one is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(
+                target=self.rescan, name="kiso-disk-usage", daemon=True,
+            )
+            self._thread.start()
+        return True
+
+    def rescan(self) -> int | None:
+        """Measure the directory now (blocking) and replace the total."""
+        try:
+            total = self._scan()
+        except Exception:
+            log.exception("Disk usage scan failed")
+            total = None
+        with self._lock:
+            self.scans += 1
+            self._scanned_at = time.monotonic()
+            if total is not None:
+                self._total = total
+        return total
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait for a running rescan thread to finish."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def reset(self) -> None:
+        """Forget the cached total (used in tests)."""
+        self.wait()
+        with self._lock:
+            self._total = None
+            self._scanned_at = None
+            self._thread = None
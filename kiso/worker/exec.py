@@ -3,21 +3,33 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
 
-from kiso.security import check_command_deny_list
+from kiso.security import Redactor, check_command_deny_list
 
-from kiso.worker.utils import _build_exec_env, _run_subprocess, _session_workspace
+from kiso.worker.output_capture import OutputCapture, track_exec
+from kiso.worker.utils import (
+    _build_exec_env,
+    _capture_head_limit,
+    _run_subprocess,
+    _session_workspace,
+)
 
 
 async def _exec_task(
     session: str, detail: str, sandbox_uid: int | None = None,
     max_output_size: int = 0,
     cancel_event: "asyncio.Event | None" = None,
+    task_id: int | None = None,
+    redactor: Redactor | None = None,
 ) -> tuple[str, str, bool, int]:
     """Run a shell command. Returns (stdout, stderr, success, exit_code).
 
     When *max_output_size* > 0, stdout and stderr are each truncated to
-    that many characters to prevent memory exhaustion from oversized output.
+    that many characters to prevent memory exhaustion from oversized output;
+    the full streams are then kept in ``.kiso/task_outputs/``. While the
+    command runs, its output tail is visible in ``/status`` as the
+    session's ``active_task``, with secrets in *redactor* masked.
     *exit_code* is the raw process return code (-1 for OSError).
     """
     denial = check_command_deny_list(detail)
@@ -27,12 +39,29 @@ async def _exec_task(
     workspace = _session_workspace(session)
     clean_env = _build_exec_env()
 
-    return await _run_subprocess(
-        detail,
-        env=clean_env,
-        cwd=str(workspace),
-        shell=True,
-        uid=sandbox_uid,
-        max_output_size=max_output_size,
-        cancel_event=cancel_event,
+    spill_stem = workspace / ".kiso" / "task_outputs" / (
+        f"exec_{task_id}" if task_id is not None else f"exec_{uuid.uuid4().hex[:12]}"
     )
+    head_limit = _capture_head_limit(max_output_size)
+    # Spill as soon as the output could be truncated: that takes more
+    # than max_output_size bytes, but the head needs up to 4x that.
+    stdout = OutputCapture(
+        head_limit, spill_after=max_output_size,
+        spill_path=spill_stem.with_suffix(".stdout"), redactor=redactor,
+    )
+    stderr = OutputCapture(
+        head_limit, spill_after=max_output_size,
+        spill_path=spill_stem.with_suffix(".stderr"), redactor=redactor,
+    )
+
+    with track_exec(session, task_id, detail, stdout, stderr):
+        return await _run_subprocess(
+            detail,
+            env=clean_env,
+            cwd=str(workspace),
+            shell=True,
+            uid=sandbox_uid,
+            max_output_size=max_output_size,
+            cancel_event=cancel_event,
+            captures=(stdout, stderr),
+        )
@@ -12,10 +12,11 @@ from dataclasses import dataclass, field
 import aiosqlite
 
 from kiso import audit
-from kiso.config import ConfigError, KISO_DIR, reload_config
+from kiso.config import ConfigError, KISO_DIR, current_config
 from kiso.log import SessionLogger
 from kiso.security import (
     collect_deploy_secrets,
+    get_redactor,
     revalidate_permissions,
     sanitize_output,
     sanitize_value,
@@ -41,7 +42,9 @@ from kiso.brain import (
     MessengerError,
     ParaphraserError,
     PlanError,
+    PlannerPreparation,
     ReviewError,
+    prepare_planner,
     run_classifier,
     apply_consolidation_result,
     run_briefer,
@@ -91,13 +94,12 @@ from kiso.worker.message_flow import (
 )
 from kiso.worker.review_flow import _review_task_impl, _store_step_usage_impl
 from kiso.store import (
-    archive_low_confidence_facts,
+    commit,
     create_plan,
     create_task,
-    decay_facts,
     delete_facts,
     find_or_create_entity,
-    get_all_entities,
+    get_entity_index,
     get_oldest_messages,
     get_session_project_id,
     get_safety_facts,
@@ -115,6 +117,7 @@ from kiso.store import (
     save_pending_item,
     search_facts,
     search_facts_scored,
+    transaction,
     update_fact_usage,
     update_learning,
     update_plan_awaits_input,
@@ -394,7 +397,9 @@ async def _post_plan_knowledge(
       Phase 1 — Curator + Summarizer in parallel (independent LLM calls,
                  no shared data between them).
       Phase 2 — Fact consolidation (after Curator so promoted facts are visible).
-      Phase 3 — Decay + Archive in parallel (pure SQL, no LLM dependency).
+
+    Fact decay and archiving run on the daemon's maintenance schedule
+    (kiso/maintenance.py), not here.
     """
 
     await _post_plan_knowledge_impl(
@@ -407,8 +412,6 @@ async def _post_plan_knowledge(
         run_curator_fn=run_curator,
         run_summarizer_fn=run_summarizer,
         get_oldest_messages_fn=get_oldest_messages,
-        decay_facts_fn=decay_facts,
-        archive_low_confidence_facts_fn=archive_low_confidence_facts,
         run_consolidator_fn=run_consolidator,
         apply_consolidation_result_fn=apply_consolidation_result,
     )
@@ -1131,6 +1134,8 @@ async def _handle_exec_task(
             ctx.session, command, sandbox_uid=ctx.sandbox_uid,
             max_output_size=ctx.max_output_size,
             cancel_event=ctx.cancel_event,
+            task_id=task_id,
+            redactor=get_redactor(ctx.deploy_secrets, ctx.session_secrets),
         )
         task_duration_ms = int((time.perf_counter() - t0) * 1000)
 
@@ -1357,9 +1362,10 @@ async def _execute_plan(
             await _cleanup_plan_outputs(session)
             return False, "cancelled", None, completed, [dict(t) for t in tasks[first_idx:]], ctx.plan_outputs
 
-        # --- Permission re-validation (once per batch) ---
+        # --- Permission re-validation (once per batch); config.toml is
+        # only re-parsed when it changed on disk ---
         try:
-            fresh_config = reload_config()
+            fresh_config = current_config()
         except ConfigError as e:
             log.warning("Config reload failed: %s — using cached config", e)
             fresh_config = config
@@ -1536,7 +1542,7 @@ async def _tag_task_from_curator(
             "UPDATE tasks SET review_learning_tags = ? WHERE review_learning = ? AND review_learning_tags IS NULL",
             (tags_str, learning_content),
         )
-        await db.commit()
+        await commit(db)
     except Exception as e:
         log.debug("Failed to tag task from curator: %s", e)
 
@@ -1553,48 +1559,50 @@ async def _apply_curator_result(
     # resolve project_id once for the session
     session_project_id = await get_session_project_id(db, session)
 
-    for ev in result.get("evaluations", []):
-        lid = ev.get("learning_id")
-        verdict = ev.get("verdict")
-        if lid is None or verdict is None:
-            log.warning("Curator evaluation missing learning_id or verdict, skipping: %s", ev)
-            continue
-        if verdict == CURATOR_VERDICT_PROMOTE:
-            fact_content = ev.get("fact")
-            if not fact_content:
-                log.warning("Curator promote verdict has no fact content for learning_id=%s", lid)
-                await update_learning(db, lid, "discarded")
+    # one commit for the whole result, rolled back if any step fails
+    async with transaction(db):
+        for ev in result.get("evaluations", []):
+            lid = ev.get("learning_id")
+            verdict = ev.get("verdict")
+            if lid is None or verdict is None:
+                log.warning("Curator evaluation missing learning_id or verdict, skipping: %s", ev)
                 continue
-            category = ev.get("category") or "general"
-            fact_session = session if category == "user" else None
-            tags = ev.get("tags") or None
-            entity_id = None
-            if ev.get("entity_name") and ev.get("entity_kind"):
-                entity_id = await find_or_create_entity(db, ev["entity_name"], ev["entity_kind"])
-            # scope project/behavior facts to session's project
-            fact_project_id = (
-                session_project_id
-                if session_project_id and category in _PROJECT_SCOPED_CATEGORIES
-                else None
-            )
-            await save_fact(
-                db, fact_content, source="curator",
-                session=fact_session, category=category, tags=tags,
-                entity_id=entity_id, project_id=fact_project_id,
-            )
-            await update_learning(db, lid, "promoted")
-            # Write entity+tags back to the task for CLI display
-            await _tag_task_from_curator(db, lid, ev)
-        elif verdict == CURATOR_VERDICT_ASK:
-            question = ev.get("question")
-            if not question:
-                log.warning("Curator ask verdict has no question for learning_id=%s", lid)
+            if verdict == CURATOR_VERDICT_PROMOTE:
+                fact_content = ev.get("fact")
+                if not fact_content:
+                    log.warning("Curator promote verdict has no fact content for learning_id=%s", lid)
+                    await update_learning(db, lid, "discarded")
+                    continue
+                category = ev.get("category") or "general"
+                fact_session = session if category == "user" else None
+                tags = ev.get("tags") or None
+                entity_id = None
+                if ev.get("entity_name") and ev.get("entity_kind"):
+                    entity_id = await find_or_create_entity(db, ev["entity_name"], ev["entity_kind"])
+                # scope project/behavior facts to session's project
+                fact_project_id = (
+                    session_project_id
+                    if session_project_id and category in _PROJECT_SCOPED_CATEGORIES
+                    else None
+                )
+                await save_fact(
+                    db, fact_content, source="curator",
+                    session=fact_session, category=category, tags=tags,
+                    entity_id=entity_id, project_id=fact_project_id,
+                )
+                await update_learning(db, lid, "promoted")
+                # Write entity+tags back to the task for CLI display
+                await _tag_task_from_curator(db, lid, ev)
+            elif verdict == CURATOR_VERDICT_ASK:
+                question = ev.get("question")
+                if not question:
+                    log.warning("Curator ask verdict has no question for learning_id=%s", lid)
+                    await update_learning(db, lid, "discarded")
+                    continue
+                await save_pending_item(db, question, scope=session, source="curator")
+                await update_learning(db, lid, "promoted")
+            elif verdict == CURATOR_VERDICT_DISCARD:
                 await update_learning(db, lid, "discarded")
-                continue
-            await save_pending_item(db, question, scope=session, source="curator")
-            await update_learning(db, lid, "promoted")
-        elif verdict == CURATOR_VERDICT_DISCARD:
-            await update_learning(db, lid, "discarded")
 
 
 async def run_worker(
@@ -1606,8 +1614,13 @@ async def run_worker(
     set_phase: Callable[[str], None] | None = None,
     pending_messages: list | None = None,
     update_hints: list | None = None,
+    mcp_manager: "Any | None" = None,
 ):
-    """Worker loop for a session. Drains queue, plans, executes tasks."""
+    """Worker loop for a session. Drains queue, plans, executes tasks.
+
+    *mcp_manager* is the daemon-wide shared pool; when omitted and MCP
+    servers are configured, the worker builds a private one.
+    """
     idle_timeout = setting_float(config.settings, "worker_idle_timeout", lo=0.01)
     classifier_timeout = setting_int(config.settings, "classifier_timeout", lo=1)
     llm_timeout = setting_int(config.settings, "llm_timeout", lo=1)
@@ -1615,35 +1628,24 @@ async def run_worker(
     max_replan_depth = setting_int(config.settings, "max_replan_depth", lo=0)
     slog = SessionLogger(session, base_dir=KISO_DIR)
 
-    # Construct a session-scoped MCPManager so the briefer and planner
-    # can see the available MCP methods (M1373). The manager is lazily
-    # constructed only when the config has MCP servers defined. Its
-    # method cache survives across messages/replans within the session
-    # so format_mcp_catalog() returns real data after the first warm-up.
-    _mcp_manager = None
-    if config.mcp_servers:
+    # The daemon owns one shared MCPManager (see kiso.main.lifespan) and
+    # hands it in here, so global-scope servers and the method catalog
+    # are shared across sessions. Standalone callers that pass nothing
+    # get a private manager that lives and dies with this worker
+    # (M1373): its method cache survives across messages/replans within
+    # the session so format_mcp_catalog() returns real data after the
+    # first warm-up.
+    _mcp_manager = mcp_manager
+    _owns_mcp_manager = False
+    _mcp_warmup: asyncio.Task | None = None
+    if _mcp_manager is None and config.mcp_servers:
         try:
             from kiso.mcp.manager import MCPManager
-            from kiso.mcp.warmup import warm_catalog
+            from kiso.mcp.warmup import start_warmup
             _mcp_manager = MCPManager(config.mcp_servers)
+            _owns_mcp_manager = True
             log.info("MCPManager constructed for %d server(s)", len(config.mcp_servers))
-            # Fire-and-forget catalog warm-up so the first message's
-            # planner sees a non-empty MCP catalog. Bounded by
-            # mcp_warmup_concurrency + mcp_warmup_deadline_s.
-            _warmup_concurrency = setting_int(
-                config.settings, "mcp_warmup_concurrency", lo=1, hi=16,
-            )
-            _warmup_deadline = float(setting_int(
-                config.settings, "mcp_warmup_deadline_s", lo=1, hi=120,
-            ))
-            asyncio.create_task(
-                warm_catalog(
-                    _mcp_manager,
-                    concurrency=_warmup_concurrency,
-                    deadline_s=_warmup_deadline,
-                ),
-                name=f"mcp-warmup-{session}",
-            )
+            _mcp_warmup = start_warmup(_mcp_manager, config, name=f"mcp-warmup-{session}")
         except Exception as exc:
             log.warning("Failed to construct MCPManager: %s", exc)
 
@@ -1699,9 +1701,18 @@ async def run_worker(
                 await _pending_knowledge_task
             except Exception:
                 log.exception("Background knowledge task failed during shutdown for session=%s", session)
+        if _mcp_warmup is not None and not _mcp_warmup.done():
+            _mcp_warmup.cancel()
+            try:
+                await _mcp_warmup
+            except (asyncio.CancelledError, Exception):  # noqa: BLE001
+                pass
         if _mcp_manager is not None:
             try:
-                await _mcp_manager.shutdown_all()
+                if _owns_mcp_manager:
+                    await _mcp_manager.shutdown_all()
+                else:
+                    await _mcp_manager.shutdown_session(session)
             except Exception:
                 log.exception("MCPManager shutdown failed for session=%s", session)
         _notify_phase(set_phase, WORKER_PHASE_IDLE)
@@ -2284,6 +2295,50 @@ async def _handle_plan_error(
     )
 
 
+async def _paraphrase_untrusted(
+    db: aiosqlite.Connection, config: Config, session: str,
+) -> str | None:
+    """Paraphrase the session's untrusted messages; None when there are none."""
+    untrusted = await get_untrusted_messages(db, session)
+    if not untrusted:
+        return None
+    try:
+        return await run_paraphraser(config, untrusted, session=session)
+    except ParaphraserError as e:
+        log.warning("Paraphraser failed: %s", e)
+        return None
+
+
+async def _preplan(
+    db: aiosqlite.Connection,
+    config: Config,
+    session: str,
+    user_role: str,
+    content: str,
+    user_mcp: str | list[str] | None,
+    user_skills: str | list[str] | None,
+    mcp_manager: "Any | None",
+) -> tuple[str | None, PlannerPreparation]:
+    """Paraphraser, planner context and briefer for a first plan."""
+    paraphrased_context = await _paraphrase_untrusted(db, config, session)
+    prepared = await prepare_planner(
+        db, config, session, user_role, content,
+        user_mcp=user_mcp, user_skills=user_skills,
+        paraphrased_context=paraphrased_context,
+        mcp_manager=mcp_manager,
+    )
+    return paraphrased_context, prepared
+
+
+def _discard_preplan(preplan: asyncio.Task | None) -> None:
+    """Cancel a speculative :func:`_preplan` whose result is not needed."""
+    if preplan is None:
+        return
+    preplan.cancel()
+    # Retrieve the outcome so a failure is not reported as never retrieved.
+    preplan.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
 async def _process_message(
     db: aiosqlite.Connection,
     config: Config,
@@ -2323,11 +2378,13 @@ async def _process_message(
     # session summary + facts + the current user message (all trusted).
     # Untrusted messages feed into planner context, not messenger context.
     # fetch recent conversation (user + kiso) for classifier context
-    _recent_for_classifier = await get_recent_messages(db, session, limit=3)
-    _classifier_ctx = build_recent_context(_recent_for_classifier, max_chars=500)
-
     # Compact entity names for classifier — helps distinguish chat_kb vs plan
-    _all_entities = await get_all_entities(db)
+    _recent_for_classifier, _entity_index = await asyncio.gather(
+        get_recent_messages(db, session, limit=3),
+        get_entity_index(db),
+    )
+    _classifier_ctx = build_recent_context(_recent_for_classifier, max_chars=500)
+    _all_entities = _entity_index.entities
     _entity_names = ", ".join(e["name"] for e in _all_entities) if _all_entities else ""
 
     # Create plan record before classifier so the CLI can render it immediately.
@@ -2337,6 +2394,14 @@ async def _process_message(
     fast_path_enabled = setting_bool(config.settings, "fast_path_enabled")
     user_lang = ""  # empty = messenger detects from user message
     msg_class = "plan"  # tracked so run_planner gets the investigate flag below
+    # Paraphraser, planner context and briefer only depend on the message,
+    # so they run while the classifier decides; a chat verdict discards them.
+    preplan: asyncio.Task | None = None
+    if fast_path_enabled and setting_bool(config.settings, "speculative_planning"):
+        preplan = asyncio.create_task(_preplan(
+            db, config, session, user_role, content,
+            user_mcp, user_skills, mcp_manager,
+        ))
     if fast_path_enabled:
         _notify_phase(set_phase, WORKER_PHASE_CLASSIFYING)
         try:
@@ -2352,6 +2417,12 @@ async def _process_message(
             log.warning("Classifier timed out after %ds, falling back to chat",
                         classifier_timeout)
             msg_class = "chat"
+        except BaseException:
+            _discard_preplan(preplan)
+            raise
+        if msg_class in ("chat", "chat_kb"):
+            _discard_preplan(preplan)
+            preplan = None
         # chat_kb safety net (M1291 + M1579d): if the classifier routed
         # to chat_kb but the KB has no facts matching the user message,
         # the fallback persists a graceful msg-only plan with
@@ -2395,13 +2466,15 @@ async def _process_message(
 
     # Paraphraser — fetch untrusted messages, paraphrase if any
     paraphrased_context: str | None = None
-    untrusted = await get_untrusted_messages(db, session)
-    if untrusted:
+    prepared: PlannerPreparation | None = None
+    if preplan is not None:
         try:
-            paraphrased_context = await run_paraphraser(config, untrusted, session=session)
-        except ParaphraserError as e:
-            log.warning("Paraphraser failed: %s", e)
-            paraphrased_context = None
+            paraphrased_context, prepared = await preplan
+        except Exception as e:
+            log.warning("Speculative pre-planning failed, planning from scratch: %s", e)
+            preplan = None
+    if preplan is None:
+        paraphrased_context = await _paraphrase_untrusted(db, config, session)
 
     # Plan
     _notify_phase(set_phase, WORKER_PHASE_PLANNING)
@@ -2436,6 +2509,7 @@ async def _process_message(
             # diagnose-first contract injected as a modular section.
             investigate=(msg_class == "investigate"),
             mcp_manager=mcp_manager,
+            prepared=prepared,
         )
     except PlanError as e:
         log.error("Planning failed session=%s msg=%d: %s", session, msg_id, e)
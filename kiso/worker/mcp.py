@@ -22,6 +22,7 @@ to the appropriate task status:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from typing import Any
@@ -284,7 +285,10 @@ async def _handle_mcp_task(
                 session=ctx.session,
                 sandbox_uid=ctx.sandbox_uid,
             )
-            raw_result = render_mcp_resource_result(
+            # Rendering decodes and writes binary payloads: keep it off
+            # the event loop.
+            raw_result = await asyncio.to_thread(
+                render_mcp_resource_result,
                 server_name, args["uri"], task_id, pub_dir, blocks,
             )
         elif is_prompt_get:
@@ -351,8 +355,9 @@ async def _handle_mcp_task(
     if hasattr(raw_result, "stdout_text"):
         call_result = raw_result
     else:
-        call_result = render_mcp_result(
-            server_name, method_name, task_id, pub_dir, raw_result
+        call_result = await asyncio.to_thread(
+            render_mcp_result,
+            server_name, method_name, task_id, pub_dir, raw_result,
         )
 
     if call_result.is_error:
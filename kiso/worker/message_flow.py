@@ -33,14 +33,12 @@ from kiso.llm import (
     set_llm_budget,
 )
 from kiso.store import (
-    _normalize_entity_name,
     append_task_llm_call,
-    archive_low_confidence_facts,
     backfill_fact_entities,
+    count_facts,
     count_messages,
-    decay_facts,
-    get_all_entities,
     get_all_tags,
+    get_entity_index,
     get_facts,
     get_kv,
     get_session_project_id,
@@ -169,7 +167,8 @@ async def _msg_task_impl(
                 project_id=session_project_id,
             )
             all_tags = await get_all_tags(db)
-            all_entities = await get_all_entities(db)
+            entity_index = await get_entity_index(db)
+            all_entities = entity_index.entities
             memory_pack = _build_worker_memory_pack(
                 summary=sess["summary"] if sess and sess["summary"] else "",
                 facts=facts,
@@ -196,13 +195,10 @@ async def _msg_task_impl(
                 briefing_context = briefing["context"]
             entity_id = None
             if briefing.get("relevant_entities") and all_entities:
-                entity_map = {
-                    _normalize_entity_name(e["name"]): e["id"] for e in all_entities
-                }
                 for ename in briefing["relevant_entities"]:
-                    eid = entity_map.get(_normalize_entity_name(ename))
-                    if eid is not None:
-                        entity_id = eid
+                    entity = entity_index.lookup(ename)
+                    if entity is not None:
+                        entity_id = entity["id"]
                         break
             scored_facts = await search_facts_scored(
                 db,
@@ -282,8 +278,7 @@ async def _maybe_run_consolidation_impl(
     if hours_elapsed < interval_hours:
         return
 
-    all_facts = await get_facts(db, is_admin=True)
-    if len(all_facts) < consolidation_min_facts:
+    if await count_facts(db) < consolidation_min_facts:
         return
 
     try:
@@ -319,8 +314,6 @@ async def _post_plan_knowledge_impl(
     run_curator_fn=run_curator,
     run_summarizer_fn=run_summarizer,
     get_oldest_messages_fn=get_oldest_messages,
-    decay_facts_fn=decay_facts,
-    archive_low_confidence_facts_fn=archive_low_confidence_facts,
     run_consolidator_fn=run_consolidator,
     apply_consolidation_result_fn=apply_consolidation_result,
 ) -> None:
@@ -332,11 +325,9 @@ async def _post_plan_knowledge_impl(
             return
         try:
             tags = await get_all_tags(db)
-            entities = await get_all_entities(db)
-            lower_contents = [l["content"].lower() for l in learnings]
-            matched: list[dict] = [
-                e for e in entities if any(e["name"] in lc for lc in lower_contents)
-            ]
+            entity_index = await get_entity_index(db)
+            entities = entity_index.entities
+            matched = entity_index.find("\n".join(l["content"] for l in learnings))
             if matched:
                 results = await asyncio.gather(
                     *(
@@ -398,41 +389,6 @@ async def _post_plan_knowledge_impl(
 
     await asyncio.gather(_run_curator(), _run_summarizer())
 
-    decay_days = setting_int(config.settings, "fact_decay_days", lo=1)
-    decay_rate = setting_float(config.settings, "fact_decay_rate", lo=0.0, hi=1.0)
-    archive_threshold = setting_float(
-        config.settings, "fact_archive_threshold", lo=0.0, hi=1.0
-    )
-
-    async def _run_decay() -> None:
-        try:
-            decayed = await decay_facts_fn(
-                db,
-                decay_days=decay_days,
-                decay_rate=decay_rate,
-            )
-            if decayed:
-                log.info("Decayed %d stale facts", decayed)
-        except asyncio.CancelledError:
-            raise
-        except Exception as exc:  # noqa: BLE001
-            log.error("Fact decay failed: %s", exc)
-
-    async def _run_archive() -> None:
-        try:
-            archived = await archive_low_confidence_facts_fn(
-                db,
-                threshold=archive_threshold,
-            )
-            if archived:
-                log.info("Archived %d low-confidence facts", archived)
-        except asyncio.CancelledError:
-            raise
-        except Exception as exc:  # noqa: BLE001
-            log.error("Fact archiving failed: %s", exc)
-
-    await asyncio.gather(_run_decay(), _run_archive())
-
     if setting_bool(config.settings, "consolidation_enabled"):
         await _maybe_run_consolidation_impl(
             db,
@@ -0,0 +1,252 @@
+"""Bounded, streaming capture of exec task output.
+
+``_run_subprocess`` reads stdout and stderr as they are produced and
+feeds each stream to an :class:`OutputCapture` instead of buffering the
+whole output with ``communicate()``:
+
+- the first ``head_limit`` bytes are kept in memory — that is all the
+  task output ever shows after ``max_output_size`` truncation;
+- the last ``tail_limit`` bytes are kept in a small ring for the live
+  tail. With a ``redactor``, the tail is kept as text that went through
+  a :class:`~kiso.security.StreamRedactor` instead, so secrets never
+  reach ``/status`` even when they are split across reads;
+- once a stream passes ``spill_after`` bytes (by default its head), the
+  full stream is written to a spill file so it can still be read with
+  cat/grep. Exec tasks spill from ``max_output_size`` bytes on, the
+  first size at which the task output can be truncated. With a
+  ``redactor``, the spill is written through its own
+  :class:`~kiso.security.StreamRedactor` as well, so secrets never land
+  on disk in plain text.
+
+Running exec tasks are registered per session (:func:`track_exec`);
+several run at once in a parallel group. ``/status`` reports all of
+them as ``active_tasks`` and the most recently started one as
+``active_task``, each with its live tail, and the status stream
+receives throttled ``active_task`` events while output keeps arriving.
+"""
+
+from __future__ import annotations
+
+import codecs
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from kiso import events
+from kiso.security import Redactor, StreamRedactor
+
+log = logging.getLogger(__name__)
+
+# Bytes of each stream kept for the live tail.
+TAIL_BYTES = 4096
+# Longest command text reported in ``active_task``.
+_COMMAND_PREVIEW = 500
+# Min seconds between ``active_task`` events of one session.
+_PUBLISH_INTERVAL = 1.0
+
+
+class OutputCapture:
+    """Head + tail of one output stream, full copy spilled to *spill_path*.
+
+    *head_limit* 0 keeps the whole stream in memory and never spills.
+    Otherwise the stream is spilled once it passes *spill_after* bytes
+    (at most, and by default, *head_limit*). Without a *spill_path* the
+    bytes past the head are simply dropped.
+    With a *redactor*, the live tail and the spill file are redacted (the
+    spill is then UTF-8 text); the head stays raw and is sanitized with
+    the rest of the task output.
+    """
+
+    def __init__(
+        self,
+        head_limit: int = 0,
+        *,
+        spill_after: int | None = None,
+        spill_path: Path | None = None,
+        tail_limit: int = TAIL_BYTES,
+        redactor: Redactor | None = None,
+    ) -> None:
+        self.head_limit = head_limit
+        self.spill_after = head_limit if spill_after is None else min(spill_after, head_limit)
+        self.spill_path = spill_path
+        self.tail_limit = tail_limit
+        self.total = 0
+        self.spilled = False
+        self.on_feed: Callable[[], None] | None = None
+        self._head = bytearray()
+        self._tail: deque[bytes | str] = deque()
+        self._tail_len = 0
+        self._spill: BinaryIO | None = None
+        self._redactor = redactor
+        self._redacting = StreamRedactor(redactor) if redactor is not None else None
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._spill_redacting: StreamRedactor | None = None
+        self._spill_decoder: codecs.IncrementalDecoder | None = None
+
+    @property
+    def truncated(self) -> bool:
+        return 0 < self.head_limit < self.total
+
+    def feed(self, chunk: bytes) -> None:
+        """Account one chunk read from the stream."""
+        if not chunk:
+            return
+        self.total += len(chunk)
+        if self.head_limit <= 0:
+            self._head += chunk
+        else:
+            if self.total > self.spill_after and self.spill_path is not None:
+                self._write_spill(chunk)
+            room = self.head_limit - len(self._head)
+            if room > 0:
+                self._head += chunk[:room]
+        self._push_tail(chunk)
+        if self.on_feed is not None:
+            self.on_feed()
+
+    def text(self) -> str:
+        """Decoded head of the stream (the whole stream if not truncated)."""
+        return self._head.decode(errors="replace")
+
+    def tail(self) -> str:
+        """Decoded last ``tail_limit`` bytes (characters when redacting) of the stream."""
+        if self._redacting is not None:
+            return "".join(self._tail)[-self.tail_limit:]
+        data = b"".join(self._tail)[-self.tail_limit:]
+        return data.decode(errors="replace")
+
+    def close(self) -> None:
+        """Flush the redacted tail and close the spill file, if one was opened."""
+        if self._redacting is not None:
+            rest = self._redacting.flush()
+            if rest:
+                self._tail.append(rest)
+                self._tail_len += len(rest)
+        if self._spill is not None:
+            try:
+                if self._spill_redacting is not None:
+                    rest = self._spill_redacting.feed(self._spill_decoder.decode(b"", final=True))
+                    self._spill_redacting, redacting = None, self._spill_redacting
+                    try:
+                        self._spill.write((rest + redacting.flush()).encode())
+                    finally:
+                        self._spill.close()
+                else:
+                    self._spill.close()
+            except OSError as exc:
+                log.warning("Cannot close output spill %s: %s", self.spill_path, exc)
+            self._spill = None
+
+    def _write_spill(self, chunk: bytes) -> None:
+        try:
+            if self._spill is None:
+                self.spilled = True
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill = open(self.spill_path, "wb")
+                if self._redactor is not None:
+                    self._spill_redacting = StreamRedactor(self._redactor)
+                    self._spill_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                # Everything before this chunk is still in the head.
+                self._spill.write(self._spill_bytes(bytes(self._head)))
+            self._spill.write(self._spill_bytes(chunk))
+        except OSError as exc:
+            log.warning("Cannot spill output to %s: %s", self.spill_path, exc)
+            self.close()
+            self.spilled = False
+            self.spill_path = None
+
+    def _spill_bytes(self, chunk: bytes) -> bytes:
+        if self._spill_redacting is None:
+            return chunk
+        return self._spill_redacting.feed(self._spill_decoder.decode(chunk)).encode()
+
+    def _push_tail(self, chunk: bytes) -> None:
+        if self._redacting is not None:
+            chunk = self._redacting.feed(self._decoder.decode(chunk))
+            if not chunk:
+                return
+        self._tail.append(chunk)
+        self._tail_len += len(chunk)
+        while self._tail_len - len(self._tail[0]) >= self.tail_limit:
+            self._tail_len -= len(self._tail.popleft())
+
+
+@dataclass
+class LiveExec:
+    """A running exec task and the captures of its two streams."""
+
+    session: str
+    task_id: int | None
+    command: str
+    stdout: OutputCapture
+    stderr: OutputCapture
+    started_at: float = field(default_factory=time.time)
+    _published_at: float = 0.0
+
+    def view(self) -> dict:
+        """JSON-ready ``active_task`` payload for ``/status``."""
+        return {
+            "id": self.task_id,
+            "type": "exec",
+            "command": self.command[:_COMMAND_PREVIEW],
+            "elapsed_s": round(time.time() - self.started_at, 1),
+            "stdout_bytes": self.stdout.total,
+            "stderr_bytes": self.stderr.total,
+            "stdout_tail": self.stdout.tail(),
+            "stderr_tail": self.stderr.tail(),
+        }
+
+    def _touched(self) -> None:
+        now = time.monotonic()
+        if now - self._published_at >= _PUBLISH_INTERVAL:
+            self._published_at = now
+            events.publish(self.session, "active_task", self.view())
+
+
+_live_execs: dict[str, list[LiveExec]] = {}
+
+
+def get_live_execs(session: str) -> list[dict]:
+    """Return the ``active_task`` views of every running exec of *session*, oldest first."""
+    return [live.view() for live in _live_execs.get(session, ())]
+
+
+def get_live_exec(session: str) -> dict | None:
+    """Return the view of the session's most recently started running exec, or None."""
+    running = _live_execs.get(session)
+    return running[-1].view() if running else None
+
+
+@contextmanager
+def track_exec(
+    session: str,
+    task_id: int | None,
+    command: str,
+    stdout: OutputCapture,
+    stderr: OutputCapture,
+) -> Iterator[LiveExec]:
+    """Register a running exec task of *session* for the live tail.
+
+    When it ends, ``active_task`` falls back to another exec of the
+    session that is still running, and is published as None only when
+    the last one ends.
+    """
+    live = LiveExec(session, task_id, command, stdout, stderr)
+    stdout.on_feed = stderr.on_feed = live._touched
+    _live_execs.setdefault(session, []).append(live)
+    events.publish(session, "active_task", live.view())
+    try:
+        yield live
+    finally:
+        stdout.on_feed = stderr.on_feed = None
+        running = _live_execs.get(session, [])
+        if live in running:
+            running.remove(live)
+        if not running:
+            _live_execs.pop(session, None)
+        events.publish(session, "active_task", get_live_exec(session))
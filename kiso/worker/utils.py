@@ -14,9 +14,11 @@ from dataclasses import dataclass, field
 import datetime
 from pathlib import Path
 
-from kiso.config import KISO_DIR, Config
+from kiso.config import KISO_DIR, Config, setting_int
 from kiso.pub import pub_token
 from kiso.security import fence_content
+from kiso.worker.disk_usage import DiskUsageAccountant
+from kiso.worker.output_capture import OutputCapture
 from kiso.worker.replan import (
     _build_cancel_summary,
     _build_failure_summary,
@@ -39,6 +41,7 @@ from kiso.worker.state import (
     _normalize_task_contract,
     _task_result_from_source,
 )
+from kiso.worker.workspace_index import WorkspaceIndex, workspace_index
 
 log = logging.getLogger(__name__)
 
@@ -105,6 +108,61 @@ async def _kill_proc(proc: asyncio.subprocess.Process) -> None:
         await proc.wait()
 
 
+# Bytes per read from a subprocess pipe.
+_READ_CHUNK = 65536
+
+
+def _capture_head_limit(max_output_size: int) -> int:
+    """Head bytes to keep for *max_output_size* characters (0 = unlimited).
+
+    UTF-8 needs at most 4 bytes per character, so a stream longer than
+    this always decodes to more than *max_output_size* characters.
+    """
+    return max_output_size * 4 if max_output_size > 0 else 0
+
+
+def _capture_output(capture: OutputCapture, max_output_size: int) -> str:
+    """Task output text of *capture*, truncated to *max_output_size*."""
+    note = ""
+    if capture.spilled:
+        note = (
+            f"\n[Full output saved to {capture.spill_path} "
+            f"({capture.total} bytes). Use cat/grep on this file.]"
+        )
+    return _truncate_output(capture.text(), max_output_size, note)
+
+
+async def _stream_communicate(
+    proc: asyncio.subprocess.Process,
+    stdin_data: bytes | None,
+    out_capture: OutputCapture,
+    err_capture: OutputCapture,
+) -> None:
+    """Feed *stdin_data*, pump stdout/stderr into the captures, wait for exit."""
+
+    async def _write_stdin() -> None:
+        if stdin_data is None or proc.stdin is None:
+            return
+        try:
+            proc.stdin.write(stdin_data)
+            await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # process exited without reading all of its input
+        finally:
+            proc.stdin.close()
+
+    async def _pump(stream: asyncio.StreamReader, capture: OutputCapture) -> None:
+        while chunk := await stream.read(_READ_CHUNK):
+            capture.feed(chunk)
+
+    await asyncio.gather(
+        _write_stdin(),
+        _pump(proc.stdout, out_capture),
+        _pump(proc.stderr, err_capture),
+    )
+    await proc.wait()
+
+
 async def _run_subprocess(
     cmd,
     *,
@@ -115,9 +173,14 @@ async def _run_subprocess(
     uid: int | None = None,
     max_output_size: int = 0,
     cancel_event: "asyncio.Event | None" = None,
+    captures: tuple[OutputCapture, OutputCapture] | None = None,
 ) -> tuple[str, str, bool, int]:
     """Run a subprocess and return its output.
 
+    stdout and stderr are streamed into bounded output captures rather
+    than buffered whole, so memory use does not grow with the size of
+    the output.
+
     Args:
         cmd: Shell command string (shell=True) or list of args (shell=False).
         env: Subprocess environment dict.
@@ -129,6 +192,9 @@ async def _run_subprocess(
         cancel_event: If set and fired during execution, the subprocess is
             terminated (SIGTERM → SIGKILL) and the function returns with
             exit_code -15.
+        captures: Optional (stdout, stderr) captures to feed, e.g. with
+            spill files or registered for the live tail. By default
+            each stream keeps just enough to honour *max_output_size*.
 
     Returns:
         (stdout, stderr, success, exit_code) where success is True iff
@@ -144,6 +210,12 @@ async def _run_subprocess(
     )
     if uid is not None:
         kwargs["user"] = uid
+    if captures is None:
+        captures = (
+            OutputCapture(_capture_head_limit(max_output_size)),
+            OutputCapture(_capture_head_limit(max_output_size)),
+        )
+    out_capture, err_capture = captures
 
     try:
         if shell:
@@ -153,13 +225,15 @@ async def _run_subprocess(
         else:
             proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
 
-        # race communicate() against cancel_event
+        # race the output readers against cancel_event
         if cancel_event is not None and cancel_event.is_set():
             # Already cancelled — kill immediately
             await _kill_proc(proc)
             return "", "cancelled", False, -15
         if cancel_event is not None:
-            comm_task = asyncio.ensure_future(proc.communicate(input=stdin_data))
+            comm_task = asyncio.ensure_future(
+                _stream_communicate(proc, stdin_data, out_capture, err_capture),
+            )
             cancel_task = asyncio.ensure_future(cancel_event.wait())
             done, pending = await asyncio.wait(
                 {comm_task, cancel_task}, return_when=asyncio.FIRST_COMPLETED,
@@ -170,14 +244,19 @@ async def _run_subprocess(
                 # Cancel fired — kill subprocess
                 await _kill_proc(proc)
                 return "", "cancelled", False, -15
-            stdout_bytes, stderr_bytes = comm_task.result()
+            comm_task.result()
         else:
-            stdout_bytes, stderr_bytes = await proc.communicate(input=stdin_data)
+            await _stream_communicate(proc, stdin_data, out_capture, err_capture)
     except OSError as e:
         return "", f"Executable not found: {e}", False, -1
-
-    stdout = _truncate_output(stdout_bytes.decode(errors="replace"), max_output_size)
-    stderr = _truncate_output(stderr_bytes.decode(errors="replace"), max_output_size)
+    finally:
+        for capture in (out_capture, err_capture):
+            capture.close()
+            if capture.spilled:
+                _disk_accountant.note_files((capture.spill_path,))
+
+    stdout = _capture_output(out_capture, max_output_size)
+    stderr = _capture_output(err_capture, max_output_size)
     rc = proc.returncode or 0
     return stdout, stderr, rc == 0, rc
 
@@ -246,11 +325,16 @@ async def _ensure_sandbox_user(session: str) -> int | None:
     return await _run_sync(_ensure_sandbox_user_sync, session)
 
 
-def _truncate_output(text: str, limit: int) -> str:
-    """Truncate text to *limit* characters, appending a marker if truncated."""
+def _truncate_output(text: str, limit: int, note: str = "") -> str:
+    """Truncate text to *limit* characters, appending a marker if truncated.
+
+    *note* goes right before the marker when it fits within *limit*.
+    """
     marker = "\n[truncated]"
     if limit > 0 and len(text) > limit:
-        return text[: limit - len(marker)] + marker
+        if len(note) + len(marker) >= limit:
+            note = ""
+        return text[: limit - len(note) - len(marker)] + note + marker
     return text
 
 
@@ -340,14 +424,27 @@ def _kiso_dir_bytes() -> int | None:
         return None
 
 
+# Daemon-wide KISO_DIR size. Rescans call ``_kiso_dir_bytes`` in a thread;
+# the lambda keeps the module-level name patchable.
+_disk_accountant = DiskUsageAccountant(lambda: _kiso_dir_bytes())
+
+
 def _check_disk_limit(config: Config) -> str | None:
-    """Check KISO_DIR usage against max_disk_gb. Returns error msg or None."""
+    """Check KISO_DIR usage against max_disk_gb. Returns error msg or None.
+
+    Reads the cached total from ``_disk_accountant`` and never scans on
+    the caller. Before the first background scan completes the check
+    passes; once over the limit every check requests a fresh rescan so
+    freed space is noticed quickly.
+    """
     max_gb = config.settings.get("max_disk_gb", 32)
-    total = _kiso_dir_bytes()
+    max_age = setting_int(config.settings, "disk_usage_rescan_interval", lo=10, hi=86400)
+    total = _disk_accountant.total(max_age=max_age)
     if total is None:
         return None
     used_gb = total / (1024**3)
     if used_gb > max_gb:
+        _disk_accountant.request_rescan()
         return f"Disk limit exceeded: {used_gb:.1f} GB used, limit {max_gb} GB"
     return None
 
@@ -406,10 +503,14 @@ def _format_pub_note(pub_urls: list[dict]) -> str:
     )
 
 
+def _workspace_index(session: str) -> WorkspaceIndex:
+    """Return the incremental file index of the session workspace."""
+    return workspace_index(_session_workspace(session), _PUB_IGNORE_DIRS)
+
+
 def _snapshot_workspace(session: str) -> set[Path]:
-    """Return the set of file paths currently in the session workspace."""
-    workspace = _session_workspace(session)
-    return set(workspace.rglob("*"))
+    """Return the set of visible file paths currently in the session workspace."""
+    return _workspace_index(session).snapshot()
 
 
 # Top-level directories in the workspace that should never be auto-published.
@@ -430,13 +531,15 @@ def _auto_publish_skill_files(
 
     Skips directories and files already inside pub/, files under ignored
     directories (caches, profiles, etc.), and hidden dotfiles. Returns
-    list of published filenames.
+    list of published filenames. The new files and their pub/ copies are
+    added to the disk-usage total.
     """
     workspace = _session_workspace(session)
     pub_dir = workspace / "pub"
     pub_dir.mkdir(exist_ok=True)
 
-    new_files = set(workspace.rglob("*")) - pre_snapshot
+    new_files = _workspace_index(session).snapshot() - pre_snapshot
+    _disk_accountant.note_files(new_files)
     published: list[str] = []
     for f in sorted(new_files):
         if not f.is_file():
@@ -457,6 +560,7 @@ def _auto_publish_skill_files(
         dest = pub_dir / rel
         dest.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(f, dest)
+        _disk_accountant.note_files((dest,))
         published.append(str(rel))
         log.debug("Auto-published %s → %s", f, dest)
     return published
@@ -568,54 +672,37 @@ def _make_artifact_ref(
 
 
 def _collect_workspace_files(session: str) -> list[dict]:
-    """Collect visible workspace files as structured records."""
+    """Collect visible workspace files as structured records.
+
+    Answers from the workspace index; only the newest
+    ``_SESSION_FILES_CAP`` files are turned into records.
+    """
+    import heapq
     import time
 
     workspace = _session_workspace(session)
     now = time.time()
-    entries: list[tuple[float, dict]] = []
-
-    for f in workspace.rglob("*"):
-        if not f.is_file():
-            continue
-        rel = f.relative_to(workspace)
-        parts = rel.parts
-        # Skip .kiso/ directory
-        if parts[0] == ".kiso":
-            continue
-        # Skip _PUB_IGNORE_DIRS
-        if parts[0] in _PUB_IGNORE_DIRS:
-            continue
-        # Skip hidden dotfiles/dotdirs
-        if any(p.startswith(".") for p in parts):
-            continue
-
-        stat = f.stat()
-        ext = f.suffix.lower()
-        category = _FILE_TYPE_MAP.get(ext, "other")
-        entries.append((
-            stat.st_mtime,
-            {
-                "file_id": _make_file_ref(f, workspace=workspace).file_id,
-                "path": str(rel),
-                "workspace_path": str(rel),
-                "abs_path": str(f),
-                "size_bytes": stat.st_size,
-                "size_human": _human_size(stat.st_size),
-                "age_human": _human_age(now - stat.st_mtime),
-                "mtime": stat.st_mtime,
-                "type": category,
-                "exists": True,
-                "module_name": _module_name_for_path(f),
-            },
-        ))
-
-    if not entries:
-        return []
-
-    # Sort by mtime descending, cap at 20
-    entries.sort(key=lambda e: e[0], reverse=True)
-    return [e[1] for e in entries[:_SESSION_FILES_CAP]]
+    indexed = _workspace_index(session).files()
+    newest = heapq.nlargest(
+        _SESSION_FILES_CAP, indexed.items(), key=lambda item: item[1].mtime,
+    )
+    files: list[dict] = []
+    for rel, entry in newest:
+        f = workspace / rel
+        files.append({
+            "file_id": f"file:{rel}",
+            "path": rel,
+            "workspace_path": rel,
+            "abs_path": str(f),
+            "size_bytes": entry.size,
+            "size_human": _human_size(entry.size),
+            "age_human": _human_age(now - entry.mtime),
+            "mtime": entry.mtime,
+            "type": _path_type(f),
+            "exists": True,
+            "module_name": _module_name_for_path(f),
+        })
+    return files
 
 
 def _format_workspace_files(files: list[dict]) -> str:
@@ -662,8 +749,7 @@ def _build_last_plan_summary_data(
 ) -> dict:
     """Build the persisted last-plan summary payload."""
     workspace = _session_workspace(session)
-    post_snapshot = set(workspace.rglob("*"))
-    new_files = post_snapshot - pre_snapshot
+    new_files = _workspace_index(session).snapshot() - pre_snapshot
 
     # Per-file provenance derived from plan_output file/artifact refs.
     # If a file has no matching ref, provenance stays None — we never
@@ -836,6 +922,7 @@ def _save_large_output(session: str, task_index: int, output: str) -> str:
     out_dir.mkdir(parents=True, exist_ok=True)
     path = out_dir / f"task_{task_index}.txt"
     path.write_text(output, encoding="utf-8")
+    _disk_accountant.note_files((path,))
     head = output[:_LARGE_OUTPUT_HEAD]
     return (
         f"[Full output saved to {path} ({len(output)} chars). "
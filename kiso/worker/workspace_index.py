@@ -0,0 +1,197 @@
+"""Incremental per-session index of visible workspace files.
+
+The worker needs the same workspace view many times per plan: a
+snapshot before and after every exec task (new-file diff for
+auto-publish and artifact refs), the planner's file listing, the
+last-plan summary and fuzzy file-reference resolution. Rebuilding it
+with ``rglob("*")`` each time is O(entries) and dominated by large trees
+(``node_modules``, datasets, cloned repos).
+
+:class:`WorkspaceIndex` keeps ``relative path → (size, mtime)`` for the
+visible files of one workspace and refreshes itself incrementally:
+
+- every refresh ``stat``\\ s each indexed *directory* and re-lists only
+  those whose mtime changed (a file created, removed or renamed always
+  bumps its parent directory's mtime);
+- directories modified within :data:`_RACY_WINDOW_NS` of their last
+  listing are listed again on the next refresh, since a change in the
+  same timestamp tick would not move the mtime;
+- files are re-``stat``\\ ed in bulk at most every :data:`_RESTAT_INTERVAL`
+  seconds, so the size/mtime of files rewritten in place may lag by
+  that much. Creation and deletion are seen immediately.
+
+Paths the worker never shows or publishes are not indexed at all:
+``.kiso/``, top-level ignored directories (``_PUB_IGNORE_DIRS``: caches,
+virtualenvs, ``node_modules``, …) and anything with a dot-prefixed
+component.
+"""
+
+from __future__ import annotations
+
+import os
+import stat as stat_mod
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Directory modified this close to its listing time is listed again.
+_RACY_WINDOW_NS = 2_000_000_000
+# Seconds between bulk re-stats of indexed files (in-place edits).
+_RESTAT_INTERVAL = 30.0
+# Max workspaces kept indexed at once (LRU).
+_MAX_INDEXES = 256
+
+
+@dataclass(slots=True)
+class IndexedFile:
+    size: int
+    mtime: float
+
+
+@dataclass(slots=True)
+class _DirState:
+    mtime_ns: int
+    racy: bool
+    subdirs: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+
+
+class WorkspaceIndex:
+    """Visible files under *root*, refreshed by directory mtime."""
+
+    def __init__(self, root: Path, ignore_top: frozenset[str] = frozenset()) -> None:
+        self.root = root
+        self._ignore_top = ignore_top | {".kiso"}
+        self._lock = threading.Lock()
+        self._dirs: dict[str, _DirState] = {}
+        self._files: dict[str, IndexedFile] = {}
+        self._restat_at = 0.0
+        self._paths: set[Path] | None = None
+        self.listings = 0
+
+    # -- queries ----------------------------------------------------------
+
+    def files(self) -> dict[str, IndexedFile]:
+        """Refresh and return ``{relative posix path: IndexedFile}``."""
+        with self._lock:
+            self._refresh()
+            return dict(self._files)
+
+    def snapshot(self) -> set[Path]:
+        """Refresh and return absolute paths of every indexed file.
+
+        Compatible with the ``set(workspace.rglob("*"))`` snapshots the
+        worker diffs against: new files are ``snapshot() - pre``.
+        """
+        with self._lock:
+            self._refresh()
+            if self._paths is None:
+                self._paths = {self.root / rel for rel in self._files}
+            return set(self._paths)
+
+    # -- refresh ----------------------------------------------------------
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._restat_at >= _RESTAT_INTERVAL:
+            self._restat_files()
+            self._restat_at = now
+        seen: set[str] = set()
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            try:
+                st = os.stat(self.root / rel if rel else self.root)
+            except OSError:
+                continue
+            if not stat_mod.S_ISDIR(st.st_mode):
+                continue
+            seen.add(rel)
+            state = self._dirs.get(rel)
+            if state is None or state.racy or state.mtime_ns != st.st_mtime_ns:
+                state = self._list_dir(rel, st.st_mtime_ns)
+            stack.extend(state.subdirs)
+        for rel in [d for d in self._dirs if d not in seen]:
+            self._drop_dir(rel)
+
+    def _list_dir(self, rel: str, mtime_ns: int) -> _DirState:
+        listed_at = time.time_ns()
+        path = self.root / rel if rel else self.root
+        state = _DirState(
+            mtime_ns=mtime_ns,
+            racy=listed_at - mtime_ns < _RACY_WINDOW_NS,
+        )
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            entries = []
+        self.listings += 1
+        for entry in entries:
+            name = entry.name
+            if name.startswith("."):
+                continue
+            if not rel and name in self._ignore_top:
+                continue
+            child = f"{rel}/{name}" if rel else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    state.subdirs.append(child)
+                elif entry.is_file():
+                    st = entry.stat()
+                    self._files[child] = IndexedFile(st.st_size, st.st_mtime)
+                    state.files.append(child)
+            except OSError:
+                continue
+        old = self._dirs.get(rel)
+        if old is not None:
+            current = set(state.files)
+            for gone in old.files:
+                if gone not in current:
+                    self._files.pop(gone, None)
+            kept = set(state.subdirs)
+            for gone in old.subdirs:
+                if gone not in kept:
+                    self._drop_dir(gone)
+        self._dirs[rel] = state
+        self._paths = None
+        return state
+
+    def _drop_dir(self, rel: str) -> None:
+        state = self._dirs.pop(rel, None)
+        if state is None:
+            return
+        for f in state.files:
+            self._files.pop(f, None)
+        for sub in state.subdirs:
+            self._drop_dir(sub)
+        self._paths = None
+
+    def _restat_files(self) -> None:
+        for rel, entry in self._files.items():
+            try:
+                st = os.stat(self.root / rel)
+            except OSError:
+                continue
+            entry.size = st.st_size
+            entry.mtime = st.st_mtime
+
+
+_indexes: OrderedDict[Path, WorkspaceIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def workspace_index(root: Path, ignore_top: frozenset[str] = frozenset()) -> WorkspaceIndex:
+    """Return the shared index for the workspace at *root*."""
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = WorkspaceIndex(root, ignore_top)
+            _indexes[root] = index
+            while len(_indexes) > _MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(root)
+        return index
+
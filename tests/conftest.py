@@ -11,7 +11,7 @@ import httpx
 import pytest
 import pytest_asyncio
 
-from kiso.config import load_config
+from kiso.config import config_service, load_config
 from kiso.main import app, _init_app_state, _rate_limiter
 from kiso.store import init_db
 
@@ -182,15 +182,16 @@ def _no_retry_backoff():
     """Set retry/delay constants to 0 for fast tests."""
     import kiso.llm
     import kiso.brain
+    from kiso.llm_scheduler import scheduler
     old_transport = kiso.llm._TRANSPORT_RETRY_BACKOFF
     old_rate = kiso.llm._RATE_INITIAL_BACKOFF
     old_messenger = kiso.brain._MESSENGER_RETRY_BACKOFF
     kiso.llm._TRANSPORT_RETRY_BACKOFF = 0.0
     kiso.llm._RATE_INITIAL_BACKOFF = 0.0
     kiso.brain._MESSENGER_RETRY_BACKOFF = 0.0
-    kiso.llm._cb_reset()
+    scheduler.reset()
     yield
-    kiso.llm._cb_reset()
+    scheduler.reset()
     kiso.llm._TRANSPORT_RETRY_BACKOFF = old_transport
     kiso.llm._RATE_INITIAL_BACKOFF = old_rate
     kiso.brain._MESSENGER_RETRY_BACKOFF = old_messenger
@@ -289,6 +290,14 @@ def reset_rate_limiter():
     _rate_limiter.reset()
 
 
+@pytest.fixture(autouse=True)
+def reset_config_service():
+    """Drop the shared config snapshot so each test parses its own file."""
+    config_service.reset()
+    yield
+    config_service.reset()
+
+
 @pytest.fixture()
 def test_config_path(tmp_path: Path) -> Path:
     """Write a valid config.toml to tmp_path and return its Path."""
@@ -36,6 +36,9 @@ Scenarios:
   split across 3 pages via ``nextCursor`` (page_size=10).
 - ``resources_binary``: ``resources/read`` returns a base64-encoded
   binary blob (1x1 PNG) for ``kiso://img/logo``.
+- ``resources_large_binary``: ``resources/read`` returns a blob of
+  ``MOCK_MCP_BLOB_BYTES`` bytes (0x00-0xff repeated) (default 5 MiB), base64-encoded
+  on a single line.
 - ``resources_error``: ``resources/read`` returns a JSON-RPC error
   for any URI.
 - ``prompts_happy``: same lifecycle as ``happy``, plus two prompts
@@ -438,6 +441,23 @@ def _handle(req: dict) -> dict | None:
         uri = params.get("uri", "")
         if SCENARIO == "resources_error":
             return _error_response(req_id, -32002, f"cannot read {uri}")
+        if SCENARIO == "resources_large_binary":
+            size = int(os.environ.get("MOCK_MCP_BLOB_BYTES", str(5 * 1024 * 1024)))
+            return {
+                "jsonrpc": "2.0",
+                "id": req_id,
+                "result": {
+                    "contents": [
+                        {
+                            "uri": uri,
+                            "mimeType": "application/pdf",
+                            "blob": base64.b64encode(
+                                (bytes(range(256)) * (size // 256 + 1))[:size]
+                            ).decode(),
+                        },
+                    ],
+                },
+            }
         if SCENARIO == "resources_binary":
             return {
                 "jsonrpc": "2.0",
@@ -425,7 +425,7 @@ def _func_kiso_dir(func_config, tmp_path_factory):
     """Isolate functional tests from the host ~/.kiso directory.
 
     Creates a temp KISO_DIR with a clean ``sys/ssh/`` dir, patches every
-    module that imports KISO_DIR, stubs ``reload_config`` so
+    module that imports KISO_DIR, stubs ``current_config`` so
     mid-execution config reloads return func_config, writes a config.toml
     so subprocess CLI commands can load it, and sets KISO_HOME so
     subprocess processes resolve KISO_DIR to the isolated directory.
@@ -443,7 +443,7 @@ def _func_kiso_dir(func_config, tmp_path_factory):
 
     patches = [patch(f"{mod}.KISO_DIR", kiso_dir) for mod in _KISO_DIR_MODULES]
     patches.append(
-        patch("kiso.worker.loop.reload_config", return_value=func_config),
+        patch("kiso.worker.loop.current_config", return_value=func_config),
     )
 
     for p in patches:
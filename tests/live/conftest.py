@@ -81,7 +81,7 @@ def mock_noop_infra():
     """
     return patch.multiple(
         "kiso.worker.loop",
-        reload_config=MagicMock(side_effect=ConfigError("test")),
+        current_config=MagicMock(side_effect=ConfigError("test")),
         _ensure_sandbox_user=MagicMock(return_value=None),
         revalidate_permissions=MagicMock(
             return_value=MagicMock(allowed=True, role="admin"),
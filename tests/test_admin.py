@@ -240,3 +240,101 @@ async def test_reload_env_rate_limited_after_limit(client: httpx.AsyncClient, tm
         )
     assert resp.status_code == 429
     assert "Rate limit exceeded" in resp.json()["detail"]
+
+
+async def test_mcp_pool_disabled_without_servers(client: httpx.AsyncClient):
+    with patch("kiso.main._mcp_manager", None):
+        resp = await client.get(
+            "/admin/mcp/pool",
+            params={"user": "testadmin"},
+            headers=AUTH_HEADER,
+        )
+    assert resp.status_code == 200
+    assert resp.json() == {"enabled": False}
+
+
+async def test_mcp_pool_reports_shared_manager_stats(client: httpx.AsyncClient):
+    from kiso.mcp.config import parse_mcp_section
+    from kiso.mcp.manager import MCPManager
+
+    servers = parse_mcp_section({"echo": {"transport": "stdio", "command": "echo-server"}})
+    with patch("kiso.main._mcp_manager", MCPManager(servers)):
+        resp = await client.get(
+            "/admin/mcp/pool",
+            params={"user": "testadmin"},
+            headers=AUTH_HEADER,
+        )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["enabled"] is True
+    assert data["clients"] == 0
+    assert data["servers"]["echo"]["spawns"] == 0
+
+
+async def test_mcp_pool_as_user_forbidden(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/admin/mcp/pool",
+        params={"user": "testuser"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 403
+
+
+async def test_llm_scheduler_stats(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/admin/llm/scheduler",
+        params={"user": "testadmin"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["queued"] == 0
+    assert set(data["wait_ms"]) == {"interactive", "normal", "background"}
+
+
+async def test_llm_scheduler_as_user_forbidden(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/admin/llm/scheduler",
+        params={"user": "testuser"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 403
+
+
+async def test_cron_scheduler_stats_without_scheduler(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/admin/cron",
+        params={"user": "testadmin"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"enabled": False}
+
+
+async def test_cron_scheduler_stats_as_user_forbidden(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/admin/cron",
+        params={"user": "testuser"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 403
+
+
+async def test_db_pool_stats(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/admin/db/pool",
+        params={"user": "testadmin"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert set(data) == {"writer", "read_pool"}
+
+
+async def test_db_pool_as_user_forbidden(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/admin/db/pool",
+        params={"user": "testuser"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 403
@@ -241,8 +241,18 @@ class TestLogLlmCall:
         assert entry["output_tokens"] == 50
         assert entry["duration_ms"] == 1200
         assert entry["status"] == "ok"
+        assert entry["cached_tokens"] == 0
         assert "timestamp" in entry
 
+    def test_cached_tokens(self, tmp_path):
+        with patch("kiso.audit.KISO_DIR", tmp_path):
+            log_llm_call("sess1", "planner", "gpt-4", "openrouter", 2000, 50, 900, "ok",
+                         cached_tokens=1536)
+
+        files = list((tmp_path / "audit").glob("*.jsonl"))
+        entry = json.loads(files[0].read_text().strip())
+        assert entry["cached_tokens"] == 1536
+
     def test_error_status(self, tmp_path):
         with patch("kiso.audit.KISO_DIR", tmp_path):
             log_llm_call("sess1", "worker", "gpt-3.5", "openrouter", 0, 0, 50, "error")
@@ -488,3 +498,71 @@ class TestEnsureAuditDir:
 
         # chmod called exactly once for the audit dir
         assert mock_chmod.call_count == 1
+
+
+# --- AuditSink ---
+
+
+class TestAuditSink:
+    def test_batches_entries_and_masks_in_writer(self, tmp_path):
+        import kiso.audit as audit_mod
+
+        sink = audit_mod.start_sink(tmp_path / "audit")
+        try:
+            for i in range(20):
+                log_task("s1", i, "exec", f"echo sk-secret-{i:03d}-x", "done", 5, 0,
+                         deploy_secrets={"K": "sk-secret-007-x"})
+            audit_mod.flush()
+            files = list((tmp_path / "audit").glob("*.jsonl"))
+            assert len(files) == 1
+            lines = [json.loads(line) for line in files[0].read_text().splitlines()]
+            assert [e["task_id"] for e in lines] == list(range(20))
+            assert lines[7]["detail"] == "echo [REDACTED]"
+            assert sink.stats()["written"] == 20
+            assert sink.stats()["batches"] <= 20
+        finally:
+            audit_mod.stop_sink()
+        assert audit_mod.get_sink() is None
+
+    def test_rotates_on_day_change(self, tmp_path):
+        from kiso.audit import AuditSink, _AuditItem
+
+        sink = AuditSink(tmp_path / "audit")
+        sink.start()
+        sink.submit(_AuditItem({"type": "t", "timestamp": "2026-01-01T23:59:59+00:00"}))
+        sink.submit(_AuditItem({"type": "t", "timestamp": "2026-01-02T00:00:01+00:00"}))
+        sink.stop()
+        names = sorted(p.name for p in (tmp_path / "audit").glob("*.jsonl"))
+        assert names == ["2026-01-01.jsonl", "2026-01-02.jsonl"]
+
+    def test_full_queue_drops_and_counts(self, tmp_path):
+        from kiso.audit import AuditSink, _AuditItem
+
+        sink = AuditSink(tmp_path / "audit", max_queue=2)  # writer not started
+        assert sink.submit(_AuditItem({"type": "a"}))
+        assert sink.submit(_AuditItem({"type": "b"}))
+        assert not sink.submit(_AuditItem({"type": "c"}))
+        assert sink.stats()["dropped"] == 1
+
+    def test_usage_rows_mirrored_in_one_commit(self, tmp_path):
+        import sqlite3
+
+        import kiso.audit as audit_mod
+
+        usage_db = tmp_path / "usage.db"
+        audit_mod.start_sink(tmp_path / "audit", usage_db=usage_db)
+        try:
+            for _ in range(3):
+                log_llm_call("dev", "planner", "m", "openrouter", 100, 20, 5, "ok",
+                             cached_tokens=64)
+            log_llm_call("dev", "planner", "m", "openrouter", 0, 0, 5, "error")
+        finally:
+            audit_mod.stop_sink()
+        conn = sqlite3.connect(usage_db)
+        try:
+            (count, cached) = conn.execute(
+                "SELECT COUNT(*), SUM(cached_tokens) FROM llm_usage"
+            ).fetchone()
+        finally:
+            conn.close()
+        assert (count, cached) == (3, 192)
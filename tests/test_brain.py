@@ -1052,8 +1052,8 @@ class TestBuildPlannerMessages:
         expected_cwd = str(KISO_DIR / "sessions" / "sess1")
         assert f"Exec CWD: {expected_cwd}" in content
 
-    async def test_system_env_after_facts_before_pending(self, db, config):
-        """System Environment section appears between Known Facts and Pending Questions."""
+    async def test_system_env_leads_before_facts_and_pending(self, db, config):
+        """System Environment is in the stable prefix, ahead of Known Facts and Pending Questions."""
         await create_session(db, "sess1")
         await db.execute("INSERT INTO facts (content, source) VALUES (?, ?)", ("Python 3.12", "curator"))
         await db.execute(
@@ -1084,7 +1084,21 @@ class TestBuildPlannerMessages:
         facts_pos = content.index("## Known Facts")
         sysenv_pos = content.index("## System Environment")
         pending_pos = content.index("## Pending Questions")
-        assert facts_pos < sysenv_pos < pending_pos
+        assert sysenv_pos < msgs[1]["cache_prefix"] <= facts_pos < pending_pos
+
+    async def test_stable_sections_form_cache_prefix(self, db, config):
+        """Catalogs lead the user message; per-message sections follow the prefix."""
+        await create_session(db, "sess1")
+        msgs = await build_planner_messages(
+            db, config, "sess1", "admin", "hello",
+            mcp_catalog_text="- github:create_issue — open an issue",
+        )
+        content = msgs[1]["content"]
+        prefix_end = msgs[1]["cache_prefix"]
+        assert content.index("## System Environment") < prefix_end
+        assert content.index("## MCP Methods") < prefix_end
+        assert content.index("## Caller Role") > prefix_end
+        assert content.rindex("\n## ") + 1 == content.index("## New Message")
 
     async def test_distro_in_planner_context(self, db, config):
         """planner context contains distro and package manager from sysenv."""
@@ -5459,6 +5473,20 @@ class TestBrieferMessages:
         assert "Plan Outputs" in content
         assert "System Environment" in content
 
+    def test_catalogs_lead_as_cacheable_prefix(self):
+        pool = {
+            "summary": "User asked about weather",
+            "skills": "browser: navigate, screenshot",
+            "system_env": "OS: linux",
+        }
+        msgs = build_briefer_messages("planner", "plan task", pool)
+        content = msgs[1]["content"]
+        prefix = content[:msgs[1]["cache_prefix"]]
+        assert prefix.startswith("## Available Modules")
+        assert "## Available Skills" in prefix and "## System Environment" in prefix
+        assert content.index("## Consumer Role") > len(prefix)
+        assert content.index("## Session Summary") > len(prefix)
+
     def test_prefilter_removes_replan_context_when_not_replan(self):
         pool = {
             "summary": "test",
@@ -7613,9 +7641,9 @@ class _MockStreamResp:
         self.status_code = status_code
         self._sse_lines = sse_lines or []
 
-    async def aiter_lines(self):
+    async def aiter_bytes(self):
         for line in self._sse_lines:
-            yield line
+            yield (line + "\n").encode()
 
     async def aread(self):
         return b""
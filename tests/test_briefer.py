@@ -17,6 +17,7 @@ from kiso.brain import (
     BrieferError,
     build_briefer_messages,
     build_planner_messages,
+    prepare_planner,
     run_briefer,
     validate_briefing,
 )
@@ -218,6 +219,31 @@ class TestBrieferScenarios:
 # ---------------------------------------------------------------------------
 
 
+class TestPreparedPlannerContext:
+    async def test_prepared_context_reused(self, db):
+        """A prepared briefing is used as is; the briefer is not called again."""
+        briefing = _briefing(modules=["web"], context="User wants sports news.")
+        calls: list[str] = []
+
+        async def _fake_llm(cfg, role, messages, **kw):
+            calls.append(role)
+            return json.dumps(briefing)
+
+        with patch("kiso.brain.call_llm", side_effect=_fake_llm):
+            prepared = await prepare_planner(
+                db, _config(), "sess1", "admin", "vai su gazzetta.it",
+            )
+            msgs = await build_planner_messages(
+                db, _config(), "sess1", "admin", "vai su gazzetta.it",
+                investigate=True, prepared=prepared,
+            )
+
+        assert calls == ["briefer"]
+        assert prepared.briefing["context"] == "User wants sports news."
+        assert "Web interaction:" in msgs[0]["content"]
+        assert "User wants sports news." in msgs[1]["content"]
+
+
 class TestBrieferFallback:
     """Tests verifying graceful fallback when briefer fails."""
 
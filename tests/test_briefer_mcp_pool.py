@@ -38,6 +38,7 @@ from kiso.brain.common import (
     _filter_briefer_names,
     build_briefer_messages,
     format_mcp_catalog,
+    select_mcp_catalog,
 )
 from kiso.mcp.schemas import MCPMethod
 
@@ -140,6 +141,119 @@ class TestFormatMcpCatalog:
         assert "uncached_server" not in text
 
 
+@dataclass(eq=False)
+class _VersionedStubManager(_StubManager):
+    """Stub that also exposes `catalog_version()` (hashable, like MCPManager)."""
+
+    version: int = 0
+
+    __hash__ = object.__hash__
+
+    def catalog_version(self) -> int:
+        return self.version
+
+
+class TestFormatMcpCatalogReuse:
+    """Rendered text is reused until the manager's catalog version moves."""
+
+    def _manager(self) -> _VersionedStubManager:
+        return _VersionedStubManager(
+            catalog={"fs": [_method("fs", "read_file", "Read a file")]}
+        )
+
+    def test_same_version_returns_same_text(self, monkeypatch) -> None:
+        import kiso.brain.common as common
+
+        manager = self._manager()
+        first = format_mcp_catalog(manager)
+        calls: list = []
+        monkeypatch.setattr(
+            common, "_render_mcp_catalog",
+            lambda cached: calls.append(cached) or "re-rendered",
+        )
+        assert format_mcp_catalog(manager) == first
+        assert calls == []
+
+    def test_version_bump_rerenders(self) -> None:
+        manager = self._manager()
+        format_mcp_catalog(manager)
+        manager.catalog["fs"].append(_method("fs", "write_file", "Write a file"))
+        manager.version += 1
+        assert "fs:write_file" in format_mcp_catalog(manager)
+
+    def test_server_dropping_out_rerenders(self) -> None:
+        manager = self._manager()
+        assert "fs:read_file" in format_mcp_catalog(manager)
+        manager.catalog["fs"] = []  # cache entry expired
+        assert format_mcp_catalog(manager) == ""
+
+
+# ---------------------------------------------------------------------------
+# select_mcp_catalog
+# ---------------------------------------------------------------------------
+
+
+_LARGE_CATALOG = format_mcp_catalog(
+    _StubManager(
+        catalog={
+            "fs": [
+                _method("fs", "read_file", "Read a file from disk"),
+                _method("fs", "list_directory", "List directory entries"),
+            ],
+            "github": [
+                _method("github", "create_issue", "Open a new issue"),
+                _method("github", "listPullRequests", "List pull requests"),
+            ],
+            "ocr": [
+                _method(
+                    "ocr", "extract_text",
+                    'Extract text <x-kiso: {"consumes": ["image/png"]}>',
+                ),
+            ],
+            "weather": [_method("weather", "get_forecast", "Forecast for a city")],
+        }
+    )
+)
+
+
+class TestSelectMcpCatalog:
+    """Only the methods most relevant to the message survive the cut."""
+
+    def test_keeps_top_k_relevant_methods(self) -> None:
+        text = select_mcp_catalog(_LARGE_CATALOG, "open an issue on github", 2)
+        names = [line.split(" — ")[0] for line in text.splitlines()]
+        assert len(names) == 2
+        assert "- github:create_issue" in names
+
+    def test_matches_split_identifiers(self) -> None:
+        text = select_mcp_catalog(_LARGE_CATALOG, "show the pull requests", 1)
+        assert text.startswith("- github:listPullRequests")
+
+    def test_matches_consumed_content_type(self) -> None:
+        text = select_mcp_catalog(_LARGE_CATALOG, "what is in this png", 1)
+        assert "- ocr:extract_text" in text
+        assert "## File processing\n- image/png: ocr:extract_text" in text
+
+    def test_header_dropped_when_consumer_not_selected(self) -> None:
+        text = select_mcp_catalog(_LARGE_CATALOG, "weather forecast for Rome", 1)
+        assert "weather:get_forecast" in text
+        assert "File processing" not in text
+
+    def test_keeps_catalog_order(self) -> None:
+        text = select_mcp_catalog(_LARGE_CATALOG, "read a file or open an issue", 3)
+        lines = text.splitlines()
+        assert lines == sorted(lines, key=_LARGE_CATALOG.index)
+
+    def test_miss_returns_full_catalog(self) -> None:
+        assert select_mcp_catalog(_LARGE_CATALOG, "hello", 2) == _LARGE_CATALOG
+
+    def test_small_catalog_untouched(self) -> None:
+        assert select_mcp_catalog(_LARGE_CATALOG, "open an issue", 50) == _LARGE_CATALOG
+
+    def test_zero_top_k_disables(self) -> None:
+        assert select_mcp_catalog(_LARGE_CATALOG, "open an issue", 0) == _LARGE_CATALOG
+
+
 # ---------------------------------------------------------------------------
 # Briefer prompt section integration
 # ---------------------------------------------------------------------------
@@ -3987,3 +3987,55 @@ class TestHandleHttpError:
         with pytest.raises(SystemExit, match="1"):
             _handle_http_error(Exception("boom"), "http://x")
         assert "boom" in capsys.readouterr().err
+
+
+# ── StatusStream (push status) ──────────────────────────────
+
+
+def test_status_stream_merges_deltas_into_snapshot():
+    from cli._status_stream import StatusStream
+
+    stream = StatusStream(MagicMock(), "sess", {})
+    assert stream.snapshot() is None
+    stream._apply("snapshot", {
+        "plan": {"id": 1, "status": "running"},
+        "tasks": [{"id": 5, "status": "running"}],
+        "worker_running": True, "worker_phase": "executing",
+        "queue_length": 0, "inflight_call": None,
+    })
+    stream._apply("tasks", {"tasks": [{"id": 6, "status": "pending"}, {"id": 5, "status": "done"}]})
+    stream._apply("plan", {"plan": {"id": 1, "status": "done"}})
+    stream._apply("worker", {"worker_running": False, "worker_phase": "idle", "queue_length": 0})
+    stream._apply("inflight", {"inflight_call": {"role": "messenger"}})
+    stream._apply("partial", {"text": "Hel"})
+    stream._apply("partial", {"text": "lo"})
+
+    data = stream.snapshot()
+    assert [(t["id"], t["status"]) for t in data["tasks"]] == [(5, "done"), (6, "pending")]
+    assert data["plan"]["status"] == "done"
+    assert data["worker_running"] is False
+    assert data["inflight_call"]["partial_content"] == "Hello"
+
+
+def test_poll_status_stream_falls_back_to_polling_when_unavailable(capsys, plain_caps):
+    """A server without the stream endpoint (non-200) still renders via /status."""
+    mock_client = MagicMock()
+    mock_client.stream.return_value.__enter__.return_value.status_code = 404
+    status_resp = MagicMock()
+    status_resp.json.return_value = {
+        "plan": {"id": 1, "message_id": 42, "goal": "Do stuff", "status": "done"},
+        "tasks": [
+            {"id": 5, "plan_id": 1, "type": "msg", "detail": "respond", "status": "done",
+             "output": "Hello!"},
+        ],
+    }
+    mock_client.get.return_value = status_resp
+
+    with patch("time.sleep"):
+        result = _poll_status(
+            mock_client, "sess", 42, 0, quiet=False, verbose=False, caps=plain_caps,
+            stream=True,
+        )
+
+    assert result == 5
+    assert "Bot:" in capsys.readouterr().out
@@ -18,6 +18,7 @@ from cli.reset import (
     run_reset_command,
 )
 from kiso.store import SCHEMA
+from kiso.store.usage import ensure_usage_table, record_usage
 
 
 # ── Helpers ──────────────────────────────────────────────
@@ -38,6 +39,7 @@ def _create_test_db(db_path: Path) -> sqlite3.Connection:
     """Create a test database with the full schema and return the connection."""
     conn = sqlite3.connect(str(db_path))
     conn.executescript(SCHEMA)
+    ensure_usage_table(conn)
     conn.execute("PRAGMA journal_mode=WAL")
     return conn
 
@@ -57,6 +59,15 @@ def _seed_session(conn: sqlite3.Connection, session: str = "test-session") -> No
         "INSERT INTO tasks (plan_id, session, type, detail) VALUES (1, ?, 'msg', 'test')",
         (session,),
     )
+    conn.execute(
+        "INSERT INTO llm_calls (plan_id, task_id, seq, session, role, summary, transcript) "
+        "VALUES ((SELECT MAX(id) FROM plans), 1, 0, ?, 'worker', '{}', '{\"messages\": []}')",
+        (session,),
+    )
+    record_usage(
+        conn, session=session, role="worker", model="m",
+        prompt_tokens=10, completion_tokens=5, cost_usd=None,
+    )
     conn.execute(
         "INSERT INTO facts (content, source, session) VALUES ('fact1', 'curator', ?)",
         (session,),
@@ -136,6 +147,8 @@ class TestResetSession:
         assert _count(conn, "messages", "mysession") == 0
         assert _count(conn, "plans", "mysession") == 0
         assert _count(conn, "tasks", "mysession") == 0
+        assert _count(conn, "llm_calls", "mysession") == 0
+        assert _count(conn, "llm_usage", "mysession") == 0
         assert _count(conn, "facts") == 0  # facts have session column
         assert _count(conn, "learnings") == 0
         conn.close()
@@ -211,6 +224,8 @@ class TestResetSession:
         assert _count(conn, "messages", "keep-me") == 1
         assert _count(conn, "plans", "keep-me") == 1
         assert _count(conn, "tasks", "keep-me") == 1
+        assert _count(conn, "llm_calls", "keep-me") == 1
+        assert _count(conn, "llm_usage", "keep-me") == 1
         conn.close()
 
     def test_pending_scope_cleared(self, tmp_path, capsys):
@@ -311,18 +326,23 @@ class TestResetAll:
         (tmp_path / "audit").mkdir(parents=True)
         (tmp_path / "audit" / "2024-01-01.jsonl").write_text("{}")
         (tmp_path / ".chat_history").write_text("history")
+        (tmp_path / "llm_cache.db").write_text("cache")
 
         with patch("cli.reset.DB_PATH", db_path), patch("cli.reset.KISO_DIR", tmp_path):
             _reset_all(_make_args(reset_command="all"))
 
         conn = sqlite3.connect(str(db_path))
-        for table in ("sessions", "messages", "plans", "tasks", "facts", "learnings", "pending"):
+        for table in (
+            "sessions", "messages", "plans", "tasks", "llm_calls", "llm_usage", "facts",
+            "learnings", "pending",
+        ):
             assert _count(conn, table) == 0, f"{table} should be empty"
         conn.close()
 
         assert not (tmp_path / "sessions").exists()
         assert not (tmp_path / "audit").exists()
         assert not (tmp_path / ".chat_history").exists()
+        assert not (tmp_path / "llm_cache.db").exists()
 
     def test_keeps_config(self, tmp_path, capsys):
         db_path = tmp_path / "store.db"
@@ -424,6 +444,7 @@ class TestResetFactory:
         (tmp_path / ".chat_history").write_text("history")
         (tmp_path / "server.log").write_text("logs")
         (tmp_path / ".last_image_id").write_text("old123")
+        (tmp_path / "llm_cache.db").write_text("cache")
 
         with patch("cli.reset.DB_PATH", db_path), patch("cli.reset.KISO_DIR", tmp_path):
             _reset_factory(_make_args(reset_command="factory"))
@@ -433,6 +454,7 @@ class TestResetFactory:
         assert not (tmp_path / ".chat_history").exists()
         assert not (tmp_path / ".last_image_id").exists()
         assert not (tmp_path / "server.log").exists()
+        assert not (tmp_path / "llm_cache.db").exists()
 
     def test_no_db_graceful(self, tmp_path, capsys):
         db_path = tmp_path / "store.db"
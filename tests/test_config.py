@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from kiso.config import CONFIG_TEMPLATE, MODEL_DEFAULTS, MODEL_DESCRIPTIONS, SETTINGS_DEFAULTS, ConfigError, load_config, reload_config, setting_bool, setting_float, setting_int
+from kiso.config import CONFIG_TEMPLATE, MODEL_DEFAULTS, MODEL_DESCRIPTIONS, SETTINGS_DEFAULTS, ConfigError, ConfigService, load_config, reload_config, setting_bool, setting_float, setting_int
 
 
 def _write(tmp_path: Path, text: str) -> Path:
@@ -845,6 +845,87 @@ class TestResourceLimitDefaults:
         assert cfg.settings["max_pids"] == 1024
 
 
+# --- ConfigService ---
+
+
+def _touch(path: Path, text: str) -> None:
+    """Rewrite *path* and move its mtime forward so the change is seen."""
+    import os
+    before = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(before + 1_000_000_000, before + 1_000_000_000))
+
+
+class TestConfigService:
+    def test_unchanged_file_is_not_reparsed(self, tmp_path: Path):
+        service = ConfigService(_write(tmp_path, VALID))
+        first = service.current()
+        assert service.current() is first
+        assert service.parses == 1
+        assert service.version == 1
+
+    def test_edit_reparses_and_notifies(self, tmp_path: Path):
+        path = _write(tmp_path, VALID)
+        service = ConfigService(path)
+        seen = []
+        service.subscribe(seen.append)
+        service.current()
+        assert seen == []  # first snapshot is not announced
+
+        _touch(path, VALID.replace('cli = "tok"', 'cli = "tok2"'))
+        config = service.current()
+        assert config.tokens == {"cli": "tok2"}
+        assert seen == [config]
+        assert service.version == 2
+
+    def test_invalid_edit_keeps_snapshot_until_fixed(self, tmp_path: Path):
+        path = _write(tmp_path, VALID)
+        service = ConfigService(path)
+        seen = []
+        service.subscribe(seen.append)
+        service.current()
+
+        _touch(path, "not valid [[ toml {{")
+        for _ in range(2):
+            with pytest.raises(ConfigError, match="Malformed TOML"):
+                service.current()
+        assert service.parses == 2  # the broken file is parsed once
+        assert seen == []
+
+        _touch(path, VALID)
+        assert service.current().tokens == {"cli": "tok"}
+        assert len(seen) == 1
+
+    def test_reload_forces_parse(self, tmp_path: Path):
+        service = ConfigService(_write(tmp_path, VALID))
+        seen = []
+        service.subscribe(seen.append)
+        first = service.current()
+        config = service.reload()
+        assert config is not first
+        assert seen == [config]
+        assert service.current() is config
+        assert service.parses == 2
+
+    def test_failing_listener_does_not_block_others(self, tmp_path: Path):
+        path = _write(tmp_path, VALID)
+        service = ConfigService(path)
+        seen = []
+
+        def boom(config):
+            raise RuntimeError("boom")
+
+        service.subscribe(boom)
+        service.subscribe(seen.append)
+        service.current()
+        service.reload()
+        assert len(seen) == 1
+        service.unsubscribe(boom)
+        service.unsubscribe(seen.append)
+        service.reload()
+        assert len(seen) == 1
+
+
 # --- KISO_HOME env var ---
 
 
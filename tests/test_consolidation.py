@@ -15,12 +15,17 @@ from kiso.brain import (
     CONSOLIDATOR_SCHEMA,
     apply_consolidation_result,
     build_consolidator_messages,
+    cluster_facts,
+    pack_shards,
     run_consolidator,
     validate_consolidator,
     _group_facts_by_entity,
 )
 from kiso.store import (
     delete_facts,
+    get_changed_facts,
+    find_or_create_entity,
+    get_fact_rev,
     get_facts,
     get_kv,
     init_db,
@@ -28,6 +33,7 @@ from kiso.store import (
     set_kv,
     update_fact_content,
 )
+from kiso.store.knowledge import _CONSOLIDATION_REV_KV_KEY
 from kiso.worker.loop import _maybe_run_consolidation, _LAST_CONSOLIDATION_KV_KEY
 
 
@@ -183,6 +189,145 @@ class TestGroupFactsByEntity:
         assert len(result["(no entity)"]) == 1
 
 
+# ---------------------------------------------------------------------------
+# cluster_facts / pack_shards
+# ---------------------------------------------------------------------------
+
+class TestClustering:
+
+    def test_joins_entity_siblings_and_near_duplicates(self):
+        facts = [
+            {"id": 1, "content": "Project uses Flask web framework", "entity_id": None},
+            {"id": 2, "content": "The project uses the Flask web framework", "entity_id": None},
+            {"id": 3, "content": "Deploys run on Friday", "entity_id": 7},
+            {"id": 4, "content": "Staging lives on port 8080", "entity_id": 7},
+            {"id": 5, "content": "User prefers dark mode", "entity_id": None},
+        ]
+        clusters = [[f["id"] for f in c] for c in cluster_facts(facts)]
+        assert sorted(clusters) == [[1, 2], [3, 4], [5]]
+
+    def test_pack_shards_respects_size(self):
+        clusters = [
+            [{"id": i, "entity_id": None} for i in range(0, 5)],
+            [{"id": i, "entity_id": None} for i in range(10, 13)],
+            [{"id": i, "entity_id": None} for i in range(20, 22)],
+        ]
+        shards = pack_shards(clusters, 4)
+        assert all(len(s) <= 4 for s in shards)
+        assert sorted(f["id"] for s in shards for f in s) == [
+            0, 1, 2, 3, 4, 10, 11, 12, 20, 21,
+        ]
+        # The 5-fact cluster is cut; the 2-fact cluster fills a gap.
+        assert len(shards) == 3
+
+
+# ---------------------------------------------------------------------------
+# run_consolidator -- incremental, sharded
+# ---------------------------------------------------------------------------
+
+def _keep_all_llm(calls: list[set[int]], fail_ids: set[int] = frozenset()):
+    """Fake _retry_llm_with_validation that keeps every fact it is shown."""
+    import re
+
+    async def _fake(config, role, messages, schema, validate, error_cls, label, **kw):
+        ids = {int(m) for m in re.findall(r"\[(\d+)\]", messages[-1]["content"])}
+        calls.append(ids)
+        if ids & fail_ids:
+            raise error_cls("shard failed")
+        return {"delete": [], "update": [], "keep": sorted(ids)}
+    return _fake
+
+
+@pytest.mark.asyncio
+class TestIncrementalConsolidation:
+
+    async def test_first_run_reviews_every_fact(self, db):
+        a = await save_fact(db, "Project uses Flask web framework", "test")
+        b = await save_fact(db, "The project uses the Flask web framework", "test")
+        lone = await save_fact(db, "User prefers dark mode", "test")
+        calls: list[set[int]] = []
+        with patch("kiso.brain.consolidator._retry_llm_with_validation",
+                   side_effect=_keep_all_llm(calls)):
+            result = await run_consolidator(_make_config(), db)
+        # The lone fact shares a shard with the cluster: still quality-reviewed.
+        assert calls == [{a, b, lone}]
+        assert sorted(result["keep"]) == sorted([a, b, lone])
+        assert result["rev"] == await get_fact_rev(db)
+
+    async def test_next_run_only_sees_changes(self, db):
+        await save_fact(db, "Project uses Flask web framework", "test")
+        await save_fact(db, "User prefers dark mode", "test")
+        calls: list[set[int]] = []
+        with patch("kiso.brain.consolidator._retry_llm_with_validation",
+                   side_effect=_keep_all_llm(calls)):
+            await apply_consolidation_result(db, await run_consolidator(_make_config(), db))
+            assert await get_kv(db, _CONSOLIDATION_REV_KV_KEY) == str(await get_fact_rev(db))
+            calls.clear()
+            result = await run_consolidator(_make_config(), db)
+            assert result == {"delete": [], "update": [], "keep": [], "rev": await get_fact_rev(db)}
+
+            dup = await save_fact(db, "The project uses Flask as web framework", "test")
+            await run_consolidator(_make_config(), db)
+        # Only the new fact and its FTS neighbour went to the LLM.
+        assert len(calls) == 1
+        assert dup in calls[0] and len(calls[0]) == 2
+
+    async def test_entity_siblings_are_pulled_in(self, db):
+        eid = await find_or_create_entity(db, "staging", "concept")
+        old = await save_fact(db, "Staging lives on port 8080", "test", entity_id=eid)
+        await set_kv(db, _CONSOLIDATION_REV_KV_KEY, str(await get_fact_rev(db)))
+        new = await save_fact(db, "Staging moved to port 9090", "test", entity_id=eid)
+        calls: list[set[int]] = []
+        with patch("kiso.brain.consolidator._retry_llm_with_validation",
+                   side_effect=_keep_all_llm(calls)):
+            await run_consolidator(_make_config(), db)
+        assert calls == [{old, new}]
+
+    async def test_failed_shard_holds_watermark(self, db):
+        a = await save_fact(db, "Project uses Flask web framework", "test")
+        await save_fact(db, "The project uses the Flask web framework", "test")
+        c = await save_fact(db, "Deploy script lives in ops folder today", "test")
+        await save_fact(db, "The deploy script lives in the ops folder", "test")
+        config = _make_config({"consolidation_shard_size": 2})
+        calls: list[set[int]] = []
+        with patch("kiso.brain.consolidator._retry_llm_with_validation",
+                   side_effect=_keep_all_llm(calls, fail_ids={c})):
+            result = await run_consolidator(config, db)
+        assert len(calls) == 2
+        assert result["rev"] is None
+        assert a in result["keep"] and c not in result["keep"]
+        await apply_consolidation_result(db, result)
+        assert await get_kv(db, _CONSOLIDATION_REV_KV_KEY) is None
+
+    async def test_all_shards_failing_raises(self, db):
+        a = await save_fact(db, "Project uses Flask web framework", "test")
+        await save_fact(db, "The project uses the Flask web framework", "test")
+        with patch("kiso.brain.consolidator._retry_llm_with_validation",
+                   side_effect=_keep_all_llm([], fail_ids={a})):
+            with pytest.raises(ConsolidatorError):
+                await run_consolidator(_make_config(), db)
+
+    async def test_deleted_top_fact_does_not_recycle_its_revision(self, db):
+        await save_fact(db, "Project uses Flask web framework", "test")
+        top = await save_fact(db, "User prefers dark mode", "test")
+        watermark = await get_fact_rev(db)
+        await set_kv(db, _CONSOLIDATION_REV_KV_KEY, str(watermark))
+        await delete_facts(db, [top])
+        new = await save_fact(db, "Deploy script lives in ops folder", "test")
+        assert await get_fact_rev(db) == watermark + 1
+        assert [f["id"] for f in await get_changed_facts(db, watermark)] == [new]
+
+    async def test_applied_updates_keep_their_revision(self, db):
+        fid = await save_fact(db, "old content for fact", "test")
+        rev = await get_fact_rev(db)
+        await apply_consolidation_result(db, {
+            "delete": [], "update": [{"id": fid, "content": "merged"}], "keep": [],
+            "rev": rev,
+        })
+        assert await get_fact_rev(db) == rev
+        assert await get_kv(db, _CONSOLIDATION_REV_KV_KEY) == str(rev)
+
+
 # ---------------------------------------------------------------------------
 # apply_consolidation_result
 # ---------------------------------------------------------------------------
@@ -2,19 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from datetime import datetime, timedelta
 
 import pytest
 
+from kiso.cron import CronScheduler
 from kiso.store import (
     create_cron_job,
     create_session,
     delete_cron_job,
+    get_cron_job,
     get_due_cron_jobs,
     init_db,
     list_cron_jobs,
     update_cron_enabled,
     update_cron_last_run,
+    update_cron_next_run,
 )
 
 
@@ -98,110 +103,190 @@ async def test_update_cron_last_run(db):
     assert jobs[0]["next_run"] == "2026-03-18T09:00:00"
 
 
-# --- _cron_scheduler loop ---
-
-
-def _fake_sleep(max_calls=1):
-    """Return an async sleep replacement that cancels after *max_calls* iterations."""
-    import asyncio
-
-    call_count = 0
-
-    async def _sleep(seconds):
-        nonlocal call_count
-        call_count += 1
-        if call_count > max_calls:
-            raise asyncio.CancelledError
-
-    return _sleep
-
-
-async def test_cron_scheduler_processes_due_jobs(db):
-    """_cron_scheduler fetches due jobs, saves message with source='cron',
-    enqueues to worker, and updates next_run via croniter."""
-    import asyncio
-    from unittest.mock import AsyncMock, MagicMock, patch
+async def test_get_cron_job(db):
+    job_id = await create_cron_job(db, "sess1", "0 9 * * *", "job A", "admin", "2026-03-17T09:00:00")
+    job = await get_cron_job(db, job_id)
+    assert job["prompt"] == "job A"
+    assert await get_cron_job(db, 99999) is None
 
-    from kiso.store import create_cron_job, get_due_cron_jobs
 
-    # Create a due job
-    await create_cron_job(db, "sess1", "0 9 * * *", "check prices", "admin", "2026-03-17T09:00:00")
+async def test_update_cron_next_run_keeps_last_run(db):
+    job_id = await create_cron_job(db, "sess1", "0 9 * * *", "job A", "admin", "2026-03-17T09:00:00")
+    await update_cron_next_run(db, job_id, "2026-03-18T09:00:00")
+    job = await get_cron_job(db, job_id)
+    assert job["next_run"] == "2026-03-18T09:00:00"
+    assert job["last_run"] is None
+
+
+# --- CronScheduler ---
+
+
+def _iso(offset_s: float) -> str:
+    return (datetime.now() + timedelta(seconds=offset_s)).isoformat()
+
+
+class _Recorder:
+    """Fire callback that records jobs and can block until released."""
+
+    def __init__(self, block: bool = False):
+        self.fired: list[int] = []
+        self.active = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+        if not block:
+            self.release.set()
+
+    async def __call__(self, job):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.release.wait()
+            self.fired.append(job["id"])
+        finally:
+            self.active -= 1
+
+
+async def _run_until(scheduler, predicate, timeout=3.0):
+    task = asyncio.create_task(scheduler.run())
+    try:
+        async with asyncio.timeout(timeout):
+            while not predicate():
+                await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def test_scheduler_fires_due_job_and_reschedules(db):
+    job_id = await create_cron_job(db, "sess1", "0 9 * * *", "daily", "admin", _iso(-1))
+    fire = _Recorder()
+    scheduler = CronScheduler(db, fire)
+    assert await scheduler.load() == 1
+
+    await _run_until(scheduler, lambda: fire.fired and not scheduler.stats()["running"])
+
+    assert fire.fired == [job_id]
+    job = await get_cron_job(db, job_id)
+    assert job["last_run"] is not None
+    assert datetime.fromisoformat(job["next_run"]) > datetime.now()
+    stats = scheduler.stats()
+    assert stats["scheduled"] == 1
+    assert stats["jobs"][str(job_id)]["fired"] == 1
+    assert stats["jobs"][str(job_id)]["latency_ms"]["samples"] == 1
+
+
+async def test_scheduler_wakes_at_due_time_not_on_a_poll(db):
+    """A job due in 0.2s fires without waiting for any fixed interval."""
+    job_id = await create_cron_job(db, "sess1", "0 9 * * *", "soon", "admin", _iso(0.2))
+    fire = _Recorder()
+    scheduler = CronScheduler(db, fire)
+    await scheduler.load()
+    await _run_until(scheduler, lambda: fire.fired, timeout=2.0)
+    assert fire.fired == [job_id]
+
+
+async def test_scheduler_caps_concurrency(db):
+    for i in range(5):
+        await create_cron_job(db, f"sess{i}", "0 9 * * *", f"job {i}", "admin", _iso(-1))
+    fire = _Recorder(block=True)
+    scheduler = CronScheduler(db, fire, max_concurrent=2)
+    await scheduler.load()
+
+    async def _release_when_capped():
+        while fire.active < 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        fire.release.set()
+
+    releaser = asyncio.create_task(_release_when_capped())
+    await _run_until(scheduler, lambda: len(fire.fired) == 5)
+    await releaser
+    assert fire.peak == 2
+
+
+async def test_scheduler_picks_up_created_and_deleted_jobs(db):
+    fire = _Recorder()
+    scheduler = CronScheduler(db, fire)
+    await scheduler.load()
+    task = asyncio.create_task(scheduler.run())
+    try:
+        gone = await create_cron_job(db, "sess1", "0 9 * * *", "gone", "admin", _iso(0.3))
+        await scheduler.refresh(gone)
+        await delete_cron_job(db, gone)
+        await scheduler.refresh(gone)
+        kept = await create_cron_job(db, "sess1", "0 9 * * *", "kept", "admin", _iso(0.3))
+        await scheduler.refresh(kept)
+        async with asyncio.timeout(2.0):
+            while not fire.fired:
+                await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    assert fire.fired == [kept]
+
+
+async def test_scheduler_skip_policy_drops_late_job(db):
+    job_id = await create_cron_job(db, "sess1", "0 9 * * *", "late", "admin", _iso(-3600))
+    fire = _Recorder()
+    scheduler = CronScheduler(db, fire, misfire_policy="skip", misfire_grace=60)
+    await scheduler.load()
+    await _run_until(
+        scheduler, lambda: scheduler.stats()["jobs"].get(str(job_id), {}).get("skipped"),
+    )
+    assert fire.fired == []
+    job = await get_cron_job(db, job_id)
+    assert job["last_run"] is None
+    assert datetime.fromisoformat(job["next_run"]) > datetime.now()
 
-    fake_queue = AsyncMock()
 
-    with patch("kiso.main.asyncio.sleep", side_effect=_fake_sleep(max_calls=1)), \
-         patch("kiso.main._ensure_worker", return_value=fake_queue) as mock_ensure, \
-         patch("kiso.main.save_message", new_callable=AsyncMock, return_value=42) as mock_save_msg:
-        from kiso.main import _cron_scheduler
-        config = MagicMock()
-        app = MagicMock()
-
-        with pytest.raises(asyncio.CancelledError):
-            await _cron_scheduler(db, config, app)
-
-    # save_message called with source="cron"
-    mock_save_msg.assert_called_once()
-    call_kwargs = mock_save_msg.call_args
-    assert call_kwargs[1]["source"] == "cron" or call_kwargs[0][5:] == (True, False, "cron") or "cron" in str(call_kwargs)
-    # Positional: db, session, user, role, content, trusted, processed, source
-    args = call_kwargs[0] if call_kwargs[0] else None
-    kwargs = call_kwargs[1] if call_kwargs[1] else {}
-    # Verify source="cron" either as positional or keyword
-    if args and len(args) >= 8:
-        assert args[7] == "cron"
-    else:
-        assert kwargs.get("source") == "cron"
-
-    # Worker was ensured and queue.put was called
-    mock_ensure.assert_called_once()
-    fake_queue.put.assert_called_once()
-    payload = fake_queue.put.call_args[0][0]
-    assert payload["id"] == 42
-    assert payload["content"] == "check prices"
-    assert payload["username"] == "cron"
+async def test_scheduler_run_once_policy_fires_late_job_once(db):
+    job_id = await create_cron_job(db, "sess1", "*/5 * * * *", "late", "admin", _iso(-3600))
+    fire = _Recorder()
+    scheduler = CronScheduler(db, fire)
+    await scheduler.load()
+    await _run_until(scheduler, lambda: fire.fired and not scheduler.stats()["running"])
+    await asyncio.sleep(0.05)
+    assert fire.fired == [job_id]
 
 
-async def test_cron_scheduler_updates_next_run(db):
-    """After processing, next_run is updated via croniter."""
-    import asyncio
-    from unittest.mock import AsyncMock, MagicMock, patch
+async def test_scheduler_retries_failed_job_without_moving_next_run(db):
+    due = _iso(-1)
+    job_id = await create_cron_job(db, "sess1", "0 9 * * *", "boom", "admin", due)
 
-    from kiso.store import create_cron_job, list_cron_jobs
+    async def _fail(job):
+        raise RuntimeError("boom")
 
-    job_id = await create_cron_job(
-        db, "sess1", "0 9 * * *", "daily job", "admin", "2026-03-17T09:00:00",
+    scheduler = CronScheduler(db, _fail)
+    await scheduler.load()
+    await _run_until(
+        scheduler, lambda: scheduler.stats()["jobs"].get(str(job_id), {}).get("failures"),
     )
+    assert (await get_cron_job(db, job_id))["next_run"] == due
+    assert scheduler.stats()["next_due_s"] > 50
 
-    fake_queue = AsyncMock()
-
-    with patch("kiso.main.asyncio.sleep", side_effect=_fake_sleep(max_calls=1)), \
-         patch("kiso.main._ensure_worker", return_value=fake_queue), \
-         patch("kiso.main.save_message", new_callable=AsyncMock, return_value=1):
-        from kiso.main import _cron_scheduler
-        with pytest.raises(asyncio.CancelledError):
-            await _cron_scheduler(db, MagicMock(), MagicMock())
 
-    # Verify next_run was updated (should be 2026-03-18 since scheduler ran "now")
-    jobs = await list_cron_jobs(db)
-    assert len(jobs) == 1
-    assert jobs[0]["last_run"] is not None
-    assert jobs[0]["next_run"] != "2026-03-17T09:00:00"  # was updated
+def test_scheduler_rejects_unknown_misfire_policy():
+    with pytest.raises(ValueError):
+        CronScheduler(None, None, misfire_policy="catch_all")
 
 
-async def test_cron_scheduler_per_job_error_continues(db):
-    """Error processing one job doesn't crash the scheduler."""
-    import asyncio
+async def test_fire_cron_job_enqueues_admin_message(db):
+    """_fire_cron_job saves a cron-sourced message and queues it on the worker."""
     from unittest.mock import AsyncMock, MagicMock, patch
 
-    from kiso.store import create_cron_job
+    from kiso.main import _fire_cron_job
 
-    await create_cron_job(db, "sess1", "0 9 * * *", "job A", "admin", "2026-03-17T09:00:00")
+    fake_queue = AsyncMock()
+    with patch("kiso.main._ensure_worker", return_value=fake_queue) as mock_ensure, \
+         patch("kiso.main.save_message", new_callable=AsyncMock, return_value=42) as mock_save:
+        await _fire_cron_job(db, MagicMock(), {"id": 1, "session": "sess1", "prompt": "check prices"})
 
-    # save_message raises on first call but scheduler should log and continue
-    with patch("kiso.main.asyncio.sleep", side_effect=_fake_sleep(max_calls=2)), \
-         patch("kiso.main._ensure_worker", side_effect=RuntimeError("boom")), \
-         patch("kiso.main.save_message", new_callable=AsyncMock, return_value=1):
-        from kiso.main import _cron_scheduler
-        # Should not crash — logs error and retries next cycle
-        with pytest.raises(asyncio.CancelledError):
-            await _cron_scheduler(db, MagicMock(), MagicMock())
+    assert mock_save.call_args.kwargs["source"] == "cron"
+    mock_ensure.assert_called_once()
+    payload = fake_queue.put.call_args[0][0]
+    assert payload["id"] == 42
+    assert payload["content"] == "check prices"
+    assert payload["username"] == "cron"
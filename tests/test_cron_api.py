@@ -94,3 +94,28 @@ async def test_patch_cron_enable_disable(client: httpx.AsyncClient):
     resp = await client.patch(f"/cron/{job_id}", headers=AUTH_HEADER, params={"enabled": "true"})
     assert resp.status_code == 200
     assert resp.json()["enabled"] is True
+
+
+async def test_cron_changes_reach_running_scheduler(client: httpx.AsyncClient):
+    from kiso.cron import CronScheduler
+    from kiso.main import app
+
+    async def _never(job):
+        raise AssertionError("not due")
+
+    app.state.cron_scheduler = CronScheduler(app.state.db, _never)
+    try:
+        resp = await client.post("/cron", headers=AUTH_HEADER, json={
+            "session": "sched-test", "schedule": "0 9 * * *", "prompt": "watched",
+        })
+        job_id = resp.json()["id"]
+        assert app.state.cron_scheduler.stats()["scheduled"] == 1
+
+        await client.patch(f"/cron/{job_id}", headers=AUTH_HEADER, params={"enabled": "false"})
+        assert app.state.cron_scheduler.stats()["scheduled"] == 0
+
+        await client.patch(f"/cron/{job_id}", headers=AUTH_HEADER, params={"enabled": "true"})
+        await client.delete(f"/cron/{job_id}", headers=AUTH_HEADER)
+        assert app.state.cron_scheduler.stats()["scheduled"] == 0
+    finally:
+        app.state.cron_scheduler = None
@@ -0,0 +1,52 @@
+"""Tests for the in-process session event bus (kiso.events)."""
+
+from __future__ import annotations
+
+from kiso.events import EventBus
+
+
+async def test_publish_reaches_only_that_sessions_subscribers():
+    bus = EventBus()
+    a = bus.subscribe("a")
+    b = bus.subscribe("b")
+    bus.publish("a", "phase", {"phase": "planning"})
+    event = await a.get(timeout=0.1)
+    assert (event.kind, event.data) == ("phase", {"phase": "planning"})
+    assert await b.get(timeout=0.01) is None
+
+
+async def test_publish_without_subscribers_is_a_noop():
+    bus = EventBus()
+    bus.publish("nobody", "phase", {})
+    assert bus.published == 0
+
+
+async def test_task_and_plan_changes_route_by_noted_session():
+    bus = EventBus()
+    sub = bus.subscribe("s1")
+    bus.note_plan(7, "s1")
+    bus.note_task(42, "s1")
+    bus.publish_task_change(42)
+    bus.publish_plan_change(7)
+    bus.publish_task_change(999)  # unknown row: dropped silently
+    assert [(e.kind, e.data) for e in sub.drain()] == [
+        ("tasks", {"id": 42}), ("plan", {"id": 7}),
+    ]
+
+
+async def test_slow_subscriber_overflows_instead_of_blocking():
+    bus = EventBus()
+    sub = bus.subscribe("s1", maxsize=2)
+    for i in range(5):
+        bus.publish("s1", "partial", {"text": str(i)})
+    assert sub.overflowed is True
+    assert len(sub.drain()) == 2
+    assert bus.dropped == 3
+
+
+async def test_unsubscribe_removes_session_entry():
+    bus = EventBus()
+    sub = bus.subscribe("s1")
+    assert bus.subscriber_count("s1") == 1
+    bus.unsubscribe(sub)
+    assert bus.subscriber_count() == 0
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -48,9 +49,9 @@ class _MockStreamResp:
         self._body = body
         self.headers = headers or {}
 
-    async def aiter_lines(self):
+    async def aiter_bytes(self):
         for line in self._sse_lines:
-            yield line
+            yield (line + "\n").encode()
 
     async def aread(self) -> bytes:
         return self._body.encode() if isinstance(self._body, str) else self._body
@@ -399,13 +400,14 @@ class TestCallLlm:
                     _error_stream(429, "rate limited", headers={"retry-after": "2"}),
                     _ok_stream(),
                 ])
-                with patch("kiso.llm.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+                with patch("kiso.llm._scheduler.pause") as mock_pause:
                     result = await call_llm(config, "worker", [{"role": "user", "content": "hi"}])
                     assert "hello" in result
-                    # Should have slept for 2 seconds (from header)
-                    mock_sleep.assert_called()
-                    slept = mock_sleep.call_args[0][0]
-                    assert slept == pytest.approx(2.0)
+                    # Should have paused the provider for 2 seconds (from header)
+                    mock_pause.assert_called()
+                    provider, paused = mock_pause.call_args[0]
+                    assert provider == "local"
+                    assert paused == pytest.approx(2.0)
 
     @pytest.mark.asyncio
     async def test_400_error_hint(self):
@@ -670,6 +672,24 @@ class TestLLMBudget:
                 assert get_llm_call_count() == 2
         clear_llm_budget()
 
+    @pytest.mark.asyncio
+    async def test_calls_in_spawned_task_spend_the_same_budget(self):
+        """A task created for the message (its own context copy) shares the count."""
+        config = make_config()
+        set_llm_budget(2)
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}):
+            with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+                mock_client = _setup_mock(mock_cls, _ok_stream("ok"))
+                await asyncio.create_task(
+                    call_llm(config, "worker", [{"role": "user", "content": "hi"}])
+                )
+                assert get_llm_call_count() == 1
+                mock_client.stream.return_value = _ok_stream("ok")
+                await call_llm(config, "worker", [{"role": "user", "content": "hi"}])
+                with pytest.raises(LLMBudgetExceeded):
+                    await call_llm(config, "worker", [{"role": "user", "content": "hi"}])
+        clear_llm_budget()
+
     @pytest.mark.asyncio
     async def test_budget_exceeded_raises(self):
         config = make_config()
@@ -1641,11 +1661,11 @@ class TestStallDetection:
         class _StallingResp:
             status_code = 200
 
-            async def aiter_lines(self):
-                yield 'data: {"choices":[{"delta":{"content":"hi"},"index":0}]}'
+            async def aiter_bytes(self):
+                yield b'data: {"choices":[{"delta":{"content":"hi"},"index":0}]}\n'
                 # Stall forever (use Future to avoid conftest asyncio.sleep patch)
                 await asyncio.get_event_loop().create_future()
-                yield "data: [DONE]"
+                yield b"data: [DONE]\n"
 
         resp = _StallingResp()
         with pytest.raises(LLMStallError, match="no data for 0.1s"):
@@ -1680,9 +1700,9 @@ class TestStallDetection:
         from kiso.llm import _read_sse_stream as orig_read
         _orig_read = orig_read
 
-        async def _capturing_read(resp, stall_timeout=60, inflight_dict=None):
+        async def _capturing_read(resp, stall_timeout=60, progress=None, session=""):
             captured_stall.append(stall_timeout)
-            return await _orig_read(resp, stall_timeout=stall_timeout, inflight_dict=inflight_dict)
+            return await _orig_read(resp, stall_timeout=stall_timeout, progress=progress)
 
         with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}):
             with patch("kiso.llm.httpx.AsyncClient") as mock_cls, \
@@ -1700,8 +1720,8 @@ class TestStallDetection:
 
         class _StallingResp:
             status_code = 200
-            async def aiter_lines(self):
-                yield 'data: {"choices":[{"delta":{"content":"hi"},"index":0}]}'
+            async def aiter_bytes(self):
+                yield b'data: {"choices":[{"delta":{"content":"hi"},"index":0}]}\n'
                 await asyncio.sleep(999)
 
             async def aread(self):
@@ -1744,12 +1764,12 @@ class TestRaisedTimeouts:
 
 
 class TestPartialContent:
-    """_read_sse_stream updates inflight_dict with partial_content."""
+    """_read_sse_stream appends streamed deltas to a StreamProgress."""
 
     @pytest.mark.asyncio
     async def test_partial_content_accumulated(self):
-        """Each content chunk updates inflight_dict['partial_content']."""
-        from kiso.llm import _read_sse_stream
+        """Each content chunk is appended to the progress buffer."""
+        from kiso.llm import StreamProgress, _read_sse_stream
 
         lines = [
             'data: {"choices":[{"delta":{"content":"Hello"},"index":0}]}',
@@ -1757,39 +1777,40 @@ class TestPartialContent:
             'data: {"choices":[{"delta":{},"index":0,"finish_reason":"stop"}]}',
             "data: [DONE]",
         ]
-        inflight = {"role": "worker", "model": "test"}
+        progress = StreamProgress()
         resp = _MockStreamResp(200, lines)
-        content, _, _, _, _ = await _read_sse_stream(resp, inflight_dict=inflight)
+        content, _, _, _, _ = await _read_sse_stream(resp, progress=progress)
         assert content == "Hello world"
-        assert inflight["partial_content"] == "Hello world"
+        assert progress.snapshot()["partial_content"] == "Hello world"
+        assert progress.snapshot()["content_chars"] == 11
 
     @pytest.mark.asyncio
     async def test_partial_content_progressive(self):
-        """partial_content grows with each chunk."""
-        from kiso.llm import _read_sse_stream
+        """The snapshot grows with each chunk."""
+        from kiso.llm import StreamProgress, _read_sse_stream
 
         seen_partials: list[str] = []
-        original_inflight: dict = {"role": "worker"}
+        progress = StreamProgress()
 
         class _TrackingResp:
             status_code = 200
 
-            async def aiter_lines(self):
-                yield 'data: {"choices":[{"delta":{"content":"A"},"index":0}]}'
-                seen_partials.append(original_inflight.get("partial_content", ""))
-                yield 'data: {"choices":[{"delta":{"content":"B"},"index":0}]}'
-                seen_partials.append(original_inflight.get("partial_content", ""))
-                yield 'data: {"choices":[{"delta":{"content":"C"},"index":0}]}'
-                seen_partials.append(original_inflight.get("partial_content", ""))
-                yield "data: [DONE]"
+            async def aiter_bytes(self):
+                yield b'data: {"choices":[{"delta":{"content":"A"},"index":0}]}\n'
+                seen_partials.append(progress.snapshot()["partial_content"])
+                yield b'data: {"choices":[{"delta":{"content":"B"},"index":0}]}\n'
+                seen_partials.append(progress.snapshot()["partial_content"])
+                yield b'data: {"choices":[{"delta":{"content":"C"},"index":0}]}\n'
+                seen_partials.append(progress.snapshot()["partial_content"])
+                yield b"data: [DONE]\n"
 
-        await _read_sse_stream(_TrackingResp(), inflight_dict=original_inflight)
+        await _read_sse_stream(_TrackingResp(), progress=progress)
         assert seen_partials == ["A", "AB", "ABC"]
-        assert original_inflight["partial_content"] == "ABC"
+        assert progress.snapshot()["partial_content"] == "ABC"
 
     @pytest.mark.asyncio
-    async def test_no_inflight_dict_no_error(self):
-        """Without inflight_dict, streaming works normally."""
+    async def test_no_progress_no_error(self):
+        """Without a progress buffer, streaming works normally."""
         from kiso.llm import _read_sse_stream
 
         lines = [
@@ -1797,63 +1818,84 @@ class TestPartialContent:
             "data: [DONE]",
         ]
         resp = _MockStreamResp(200, lines)
-        content, _, _, _, _ = await _read_sse_stream(resp, inflight_dict=None)
+        content, _, _, _, _ = await _read_sse_stream(resp, progress=None)
         assert content == "ok"
 
     @pytest.mark.asyncio
-    async def test_reasoning_chunks_not_in_partial(self):
-        """reasoning_content chunks do NOT update partial_content."""
-        from kiso.llm import _read_sse_stream
+    async def test_reasoning_tracked_separately(self):
+        """reasoning_content chunks go to partial_reasoning, not partial_content."""
+        from kiso.llm import StreamProgress, _read_sse_stream
 
         lines = [
             'data: {"choices":[{"delta":{"reasoning_content":"think"},"index":0}]}',
             'data: {"choices":[{"delta":{"content":"answer"},"index":0}]}',
             "data: [DONE]",
         ]
-        inflight: dict = {}
+        progress = StreamProgress()
         resp = _MockStreamResp(200, lines)
-        content, reasoning, _, _, _ = await _read_sse_stream(resp, inflight_dict=inflight)
+        content, reasoning, _, _, _ = await _read_sse_stream(resp, progress=progress)
         assert content == "answer"
         assert reasoning == "think"
-        # partial_content should only have the content, not reasoning
-        assert inflight["partial_content"] == "answer"
+        snap = progress.snapshot()
+        assert snap["partial_content"] == "answer"
+        assert snap["partial_reasoning"] == "think"
+        assert snap["reasoning_chars"] == 5
+
+    @pytest.mark.asyncio
+    async def test_frames_split_across_byte_chunks(self):
+        """SSE lines are reassembled when the transport splits them."""
+        from kiso.llm import _read_sse_stream
+
+        raw = (
+            b'data: {"choices":[{"delta":{"content":"caf\xc3\xa9"},"index":0}]}\r\n\r\n'
+            b": keepalive\n"
+            b'data:{"choices":[{"delta":{"content":" ok"},"index":0}]}\n'
+            b'data: {"choices":[],"usage":{"prompt_tokens":3,"completion_tokens":2}}'
+        )
+
+        class _SplitResp:
+            status_code = 200
+
+            async def aiter_bytes(self):
+                for i in range(0, len(raw), 7):
+                    yield raw[i:i + 7]
+
+        content, _, pt, ct, _ = await _read_sse_stream(_SplitResp())
+        assert content == "caf\u00e9 ok"
+        assert (pt, ct) == (3, 2)
 
     @pytest.mark.asyncio
-    async def test_call_llm_populates_partial_content(self):
-        """call_llm passes inflight dict to _read_sse_stream for partial tracking."""
+    async def test_call_llm_exposes_progress_via_inflight(self):
+        """While streaming, get_inflight_call reports the partial output."""
         config = make_config()
         messages = [{"role": "user", "content": "hi"}]
+        seen: list[dict | None] = []
 
-        # Multi-chunk stream to verify partial_content is set
-        lines = [
-            'data: {"choices":[{"delta":{"content":"chunk1"},"index":0}]}',
-            'data: {"choices":[{"delta":{"content":"chunk2"},"index":0}]}',
-            'data: {"choices":[{"delta":{},"index":0,"finish_reason":"stop"}],"usage":{"prompt_tokens":1,"completion_tokens":1}}',
-            "data: [DONE]",
-        ]
-        stream_cm = _StreamCM(_MockStreamResp(200, lines))
-
-        captured_partial = {}
+        class _PeekResp:
+            status_code = 200
+            headers: dict = {}
 
-        # Intercept _read_sse_stream to capture the inflight_dict argument
-        original_read = None
-        import kiso.llm as _llm_module
-        original_read = _llm_module._read_sse_stream
+            async def aiter_bytes(self):
+                yield b'data: {"choices":[{"delta":{"content":"chunk1"},"index":0}]}\n'
+                yield b'data: {"choices":[{"delta":{"reasoning_content":"hm"},"index":0}]}\n'
+                seen.append(get_inflight_call("test-sess"))
+                yield b'data: {"choices":[{"delta":{"content":"chunk2"},"index":0}]}\n'
+                yield b"data: [DONE]\n"
 
-        async def _capturing_read(resp, stall_timeout=60, inflight_dict=None):
-            if inflight_dict is not None:
-                captured_partial["got_dict"] = True
-            return await original_read(resp, stall_timeout=stall_timeout, inflight_dict=inflight_dict)
+            async def aread(self):
+                return b""
 
         with patch("kiso.llm.httpx.AsyncClient") as mock_cls, \
              patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}), \
-             patch("kiso.llm.audit"), \
-             patch.object(_llm_module, "_read_sse_stream", side_effect=_capturing_read):
-            _setup_mock(mock_cls, stream_cm)
+             patch("kiso.llm.audit"):
+            _setup_mock(mock_cls, _StreamCM(_PeekResp()))
             result = await call_llm(config, "worker", messages, session="test-sess")
 
         assert result == "chunk1chunk2"
-        assert captured_partial.get("got_dict") is True
+        assert seen[0]["role"] == "worker"
+        assert seen[0]["partial_content"] == "chunk1"
+        assert seen[0]["partial_reasoning"] == "hm"
+        assert get_inflight_call("test-sess") is None
 
 
 # --- Empty response reasoning fallback ---
@@ -1963,64 +2005,69 @@ class TestReasoningFallback:
 
 
 class TestCircuitBreaker:
-    """transport circuit breaker prevents cascade timeouts."""
+    """per-provider transport circuit breaker prevents cascade timeouts."""
 
     def setup_method(self):
-        import kiso.llm
-        kiso.llm._cb_reset()
+        from kiso.llm_scheduler import scheduler
+        scheduler.reset()
 
     def teardown_method(self):
-        import kiso.llm
-        kiso.llm._cb_reset()
+        from kiso.llm_scheduler import scheduler
+        scheduler.reset()
+
+    def _fail(self, n, provider="local"):
+        from kiso.llm_scheduler import scheduler
+        for _ in range(n):
+            scheduler.record_failure(provider)
 
     def test_opens_after_threshold_failures(self):
-        import kiso.llm
-        for _ in range(kiso.llm._CB_FAILURE_THRESHOLD):
-            kiso.llm._cb_record_failure()
-        assert kiso.llm._cb_is_open()
+        from kiso.llm_scheduler import CB_FAILURE_THRESHOLD, scheduler
+        self._fail(CB_FAILURE_THRESHOLD)
+        assert scheduler.is_open("local")
 
     def test_stays_closed_below_threshold(self):
-        import kiso.llm
-        for _ in range(kiso.llm._CB_FAILURE_THRESHOLD - 1):
-            kiso.llm._cb_record_failure()
-        assert not kiso.llm._cb_is_open()
+        from kiso.llm_scheduler import CB_FAILURE_THRESHOLD, scheduler
+        self._fail(CB_FAILURE_THRESHOLD - 1)
+        assert not scheduler.is_open("local")
 
     def test_success_resets_counter(self):
-        import kiso.llm
-        for _ in range(kiso.llm._CB_FAILURE_THRESHOLD - 1):
-            kiso.llm._cb_record_failure()
-        kiso.llm._cb_record_success()
+        from kiso.llm_scheduler import CB_FAILURE_THRESHOLD, scheduler
+        self._fail(CB_FAILURE_THRESHOLD - 1)
+        scheduler.record_success("local")
         # One more failure shouldn't open it
-        kiso.llm._cb_record_failure()
-        assert not kiso.llm._cb_is_open()
+        self._fail(1)
+        assert not scheduler.is_open("local")
 
     def test_half_open_after_cooldown(self):
-        import kiso.llm
-        for _ in range(kiso.llm._CB_FAILURE_THRESHOLD):
-            kiso.llm._cb_record_failure()
-        assert kiso.llm._cb_is_open()
+        from kiso.llm_scheduler import CB_FAILURE_THRESHOLD, scheduler
+        self._fail(CB_FAILURE_THRESHOLD)
+        assert scheduler.is_open("local")
         # Simulate cooldown expiry
-        kiso.llm._cb_open_until = 0.0
-        assert not kiso.llm._cb_is_open()
+        scheduler._providers["local"].open_until = 0.0
+        assert not scheduler.is_open("local")
 
     def test_reset_clears_state(self):
-        import kiso.llm
-        for _ in range(kiso.llm._CB_FAILURE_THRESHOLD):
-            kiso.llm._cb_record_failure()
-        assert kiso.llm._cb_is_open()
-        kiso.llm._cb_reset()
-        assert not kiso.llm._cb_is_open()
-        assert kiso.llm._cb_consecutive_failures == 0
+        from kiso.llm_scheduler import CB_FAILURE_THRESHOLD, scheduler
+        self._fail(CB_FAILURE_THRESHOLD)
+        assert scheduler.is_open("local")
+        scheduler.reset()
+        assert not scheduler.is_open("local")
+        assert scheduler.consecutive_failures("local") == 0
+
+    def test_circuit_is_per_provider(self):
+        from kiso.llm_scheduler import CB_FAILURE_THRESHOLD, scheduler
+        self._fail(CB_FAILURE_THRESHOLD, provider="local")
+        assert scheduler.is_open("local")
+        assert not scheduler.is_open("other")
 
     @pytest.mark.asyncio
     async def test_call_llm_fails_fast_when_open(self):
         """When circuit is open, call_llm raises immediately without HTTP call."""
-        import kiso.llm
+        from kiso.llm_scheduler import CB_FAILURE_THRESHOLD
         config = make_config()
 
         # Open the circuit
-        for _ in range(kiso.llm._CB_FAILURE_THRESHOLD):
-            kiso.llm._cb_record_failure()
+        self._fail(CB_FAILURE_THRESHOLD)
 
         with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
              patch("kiso.llm.audit"):
@@ -2030,8 +2077,8 @@ class TestCircuitBreaker:
 
     @pytest.mark.asyncio
     async def test_transport_errors_feed_circuit_breaker(self):
-        """Consecutive transport errors increment the circuit breaker counter."""
-        import kiso.llm
+        """Consecutive transport errors increment the provider's failure counter."""
+        from kiso.llm_scheduler import scheduler
         config = make_config()
 
         mock_client = AsyncMock()
@@ -2049,4 +2096,110 @@ class TestCircuitBreaker:
                                [{"role": "user", "content": "hi"}])
 
         # Should have recorded failures (1 initial + 2 retries = 3)
-        assert kiso.llm._cb_consecutive_failures == 3
+        assert scheduler.consecutive_failures("local") == 3
+        # Every attempt gave its slot back.
+        assert scheduler.stats()["providers"]["local"]["active"] == 0
+
+
+# --- Prompt-prefix caching ---
+
+
+class TestPromptCaching:
+    _MESSAGES = [
+        {"role": "system", "content": "You are the planner."},
+        {"role": "user", "content": "## Skills\nstable\n\n## New Message\nhi", "cache_prefix": 16},
+    ]
+
+    def test_payload_messages_marks_breakpoints(self):
+        from kiso.llm import _payload_messages
+
+        system, user = _payload_messages(self._MESSAGES, True)
+        assert system["content"] == [{
+            "type": "text", "text": "You are the planner.",
+            "cache_control": {"type": "ephemeral"},
+        }]
+        assert user == {"role": "user", "content": [
+            {"type": "text", "text": "## Skills\nstable", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "\n\n## New Message\nhi"},
+        ]}
+
+    def test_payload_messages_disabled_only_drops_marker(self):
+        from kiso.llm import _payload_messages
+
+        out = _payload_messages(self._MESSAGES, False)
+        assert out == [
+            {"role": "system", "content": "You are the planner."},
+            {"role": "user", "content": "## Skills\nstable\n\n## New Message\nhi"},
+        ]
+        assert "cache_prefix" in self._MESSAGES[1]  # caller's list untouched
+
+    def test_payload_messages_caps_breakpoints(self):
+        from kiso.llm import _MAX_CACHE_BREAKPOINTS, _payload_messages
+
+        messages = [{"role": "system", "content": f"s{i}"} for i in range(6)]
+        out = _payload_messages(messages, True)
+        assert sum(isinstance(m["content"], list) for m in out) == _MAX_CACHE_BREAKPOINTS
+
+    def test_breakpoints_only_for_known_hosts(self):
+        from kiso.llm import _supports_cache_breakpoints
+
+        assert _supports_cache_breakpoints(Provider(base_url="https://openrouter.ai/api/v1"))
+        assert _supports_cache_breakpoints(Provider(base_url="https://api.anthropic.com/v1"))
+        assert not _supports_cache_breakpoints(Provider(base_url="http://localhost:11434/v1"))
+        assert not _supports_cache_breakpoints(Provider(base_url="https://openrouter.ai.evil.test/v1"))
+
+    @pytest.mark.asyncio
+    async def test_call_llm_sends_breakpoints_and_records_cached_tokens(self):
+        config = make_config(providers={"openrouter": Provider(base_url="https://openrouter.ai/api/v1")})
+        usage = {
+            "prompt_tokens": 2000, "completion_tokens": 10,
+            "prompt_tokens_details": {"cached_tokens": 1536},
+        }
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}):
+            with patch("kiso.llm.httpx.AsyncClient") as mock_cls, \
+                 patch("kiso.llm.audit.log_llm_call") as mock_audit:
+                mock_client = _setup_mock(mock_cls, _ok_stream("ok", usage=usage))
+                await call_llm(config, "worker", [dict(m) for m in self._MESSAGES])
+        payload = mock_client.stream.call_args[1]["json"]
+        assert payload["messages"][1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_prefix" not in payload["messages"][1]
+        assert mock_audit.call_args.kwargs["cached_tokens"] == 1536
+
+    @pytest.mark.asyncio
+    async def test_call_llm_plain_messages_for_local_provider(self):
+        """A generic OpenAI-compatible server gets plain string content."""
+        config = make_config()
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}):
+            with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+                mock_client = _setup_mock(mock_cls, _ok_stream("ok"))
+                await call_llm(config, "worker", [dict(m) for m in self._MESSAGES])
+        payload = mock_client.stream.call_args[1]["json"]
+        assert [m["content"] for m in payload["messages"]] == [
+            m["content"] for m in self._MESSAGES
+        ]
+
+    @pytest.mark.asyncio
+    async def test_call_llm_plain_messages_when_disabled(self):
+        config = make_config(
+            providers={"openrouter": Provider(base_url="https://openrouter.ai/api/v1")},
+            settings={"llm_prompt_caching": False},
+        )
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}):
+            with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+                mock_client = _setup_mock(mock_cls, _ok_stream("ok"))
+                await call_llm(config, "worker", [dict(m) for m in self._MESSAGES])
+        payload = mock_client.stream.call_args[1]["json"]
+        assert [m["content"] for m in payload["messages"]] == [
+            m["content"] for m in self._MESSAGES
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sse_reads_anthropic_style_cache_reads(self):
+        from kiso.llm import StreamProgress, _read_sse_stream
+
+        resp = _ok_stream("ok", usage={
+            "prompt_tokens": 900, "completion_tokens": 5, "cache_read_input_tokens": 700,
+        })._resp
+        progress = StreamProgress()
+        _, _, pt, _, _ = await _read_sse_stream(resp, progress=progress)
+        assert (pt, progress.cached_tokens) == (900, 700)
@@ -0,0 +1,200 @@
+"""Tests for kiso.llm_cache — content-addressed LLM response cache."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from kiso.llm import call_llm, clear_llm_budget, get_llm_call_count, set_llm_budget
+from kiso.llm_cache import (
+    ResponseCache,
+    cache_key,
+    get_response_cache,
+    parse_role_ttls,
+    reset_response_cache,
+    role_ttl,
+)
+from tests.conftest import make_config
+from tests.test_llm import _ok_stream, _setup_mock
+
+_MSGS = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(tmp_path):
+    reset_response_cache()
+    with patch("kiso.config.KISO_DIR", tmp_path):
+        yield
+    reset_response_cache()
+
+
+def test_cache_key_depends_on_every_input():
+    base = cache_key("p", "m", "classifier", _MSGS, None, None)
+    assert base == cache_key("p", "m", "classifier", [dict(m) for m in _MSGS], None, None)
+    assert base != cache_key("q", "m", "classifier", _MSGS, None, None)
+    assert base != cache_key("p", "m2", "classifier", _MSGS, None, None)
+    assert base != cache_key("p", "m", "briefer", _MSGS, None, None)
+    assert base != cache_key("p", "m", "classifier", _MSGS[:1], None, None)
+    assert base != cache_key("p", "m", "classifier", _MSGS, {"type": "json_object"}, None)
+    assert base != cache_key("p", "m", "classifier", _MSGS, None, 10)
+
+
+def test_parse_role_ttls_skips_malformed():
+    assert parse_role_ttls(["classifier:60", "bad", "worker:x", ":5", "curator:0"]) == {
+        "classifier": 60, "curator": 0,
+    }
+
+
+def test_role_ttl_requires_opt_in():
+    config = make_config()
+    assert role_ttl(config, "classifier") == 0
+    config = make_config(settings={"llm_cache_enabled": True})
+    assert role_ttl(config, "classifier") == 3600
+    assert role_ttl(config, "planner") == 0
+
+
+async def test_lru_bound_evicts_least_recently_used():
+    cache = ResponseCache(None, max_entries=2)
+    await cache.put("a", "r", "A", 60)
+    await cache.put("b", "r", "B", 60)
+    assert await cache.get("a") == "A"  # a is now most recent
+    await cache.put("c", "r", "C", 60)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "A"
+    assert await cache.get("c") == "C"
+
+
+async def test_byte_bound():
+    cache = ResponseCache(None, max_entries=100, max_bytes=10)
+    await cache.put("a", "r", "x" * 6, 60)
+    await cache.put("b", "r", "y" * 6, 60)
+    assert await cache.get("a") is None
+    assert cache.stats()["bytes"] == 6
+
+
+async def test_expired_entries_miss():
+    cache = ResponseCache(None)
+    await cache.put("a", "r", "A", 60)
+    with patch("kiso.llm_cache.time.time", return_value=10**12):
+        assert await cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+async def test_entries_survive_restart(tmp_path):
+    path = tmp_path / "cache.db"
+    first = ResponseCache(path)
+    await first.put("a", "classifier", "plan", 60)
+    first.close()
+
+    second = ResponseCache(path)
+    assert await second.get("a") == "plan"
+    assert second.stats() == {"entries": 1, "bytes": 4, "hits": 1, "misses": 0}
+    second.close()
+
+
+async def test_call_llm_serves_repeat_from_cache():
+    config = make_config(settings={"llm_cache_enabled": True})
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
+         patch("kiso.llm.audit") as mock_audit:
+        with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+            mock_client = _setup_mock(mock_cls, _ok_stream("plan"))
+            assert await call_llm(config, "classifier", list(_MSGS)) == "plan"
+            assert await call_llm(config, "classifier", list(_MSGS)) == "plan"
+        assert mock_client.stream.call_count == 1
+    outcomes = [c.kwargs.get("cache") for c in mock_audit.log_llm_call.call_args_list]
+    assert outcomes == ["miss", "hit"]
+    assert get_response_cache(config).stats()["hits"] == 1
+
+
+async def test_call_llm_does_not_cache_other_roles():
+    config = make_config(settings={"llm_cache_enabled": True})
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
+         patch("kiso.llm.audit"):
+        with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+            mock_client = _setup_mock(mock_cls, _ok_stream("hello"))
+            mock_client.stream.side_effect = lambda *a, **kw: _ok_stream("hello")
+            await call_llm(config, "messenger", list(_MSGS))
+            await call_llm(config, "messenger", list(_MSGS))
+        assert mock_client.stream.call_count == 2
+
+
+async def test_call_llm_cache_disabled_by_default():
+    config = make_config()
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
+         patch("kiso.llm.audit"):
+        with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+            mock_client = _setup_mock(mock_cls, _ok_stream("plan"))
+            mock_client.stream.side_effect = lambda *a, **kw: _ok_stream("plan")
+            await call_llm(config, "classifier", list(_MSGS))
+            await call_llm(config, "classifier", list(_MSGS))
+        assert mock_client.stream.call_count == 2
+
+
+async def test_call_llm_does_not_cache_rejected_response():
+    config = make_config(settings={"llm_cache_enabled": True})
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
+         patch("kiso.llm.audit"):
+        with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+            mock_client = _setup_mock(mock_cls, _ok_stream("bad"))
+            mock_client.stream.side_effect = lambda *a, **kw: _ok_stream("bad")
+            for _ in range(2):
+                await call_llm(config, "briefer", list(_MSGS),
+                               response_format={"type": "json_object"},
+                               cache_accept=lambda raw: raw == "good")
+        assert mock_client.stream.call_count == 2
+    assert get_response_cache(config).stats()["entries"] == 0
+
+
+async def test_call_llm_drops_cached_response_that_is_rejected():
+    config = make_config(settings={"llm_cache_enabled": True})
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
+         patch("kiso.llm.audit"):
+        with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+            mock_client = _setup_mock(mock_cls, _ok_stream("old"))
+            await call_llm(config, "classifier", list(_MSGS))
+            mock_client.stream.side_effect = lambda *a, **kw: _ok_stream("new")
+            text = await call_llm(config, "classifier", list(_MSGS),
+                                  cache_accept=lambda raw: raw != "old")
+            again = await call_llm(config, "classifier", list(_MSGS))
+        assert (text, again) == ("new", "new")
+        assert mock_client.stream.call_count == 2
+
+
+async def test_cache_hits_do_not_spend_the_budget():
+    config = make_config(settings={"llm_cache_enabled": True})
+    set_llm_budget(1)
+    try:
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
+             patch("kiso.llm.audit"):
+            with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+                _setup_mock(mock_cls, _ok_stream("plan"))
+                for _ in range(3):
+                    assert await call_llm(config, "classifier", list(_MSGS)) == "plan"
+        assert get_llm_call_count() == 1
+    finally:
+        clear_llm_budget()
+
+
+async def test_validation_retry_caches_only_the_accepted_answer():
+    from kiso.brain.common import _retry_llm_with_validation
+
+    config = make_config(settings={"llm_cache_enabled": True})
+    answers = iter(['{"ok": false}', '{"ok": true}'])
+    schema = {"type": "json_object"}
+
+    def validate(result):
+        return [] if result.get("ok") else ["not ok"]
+
+    with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-test"}), \
+         patch("kiso.llm.audit"):
+        with patch("kiso.llm.httpx.AsyncClient") as mock_cls:
+            mock_client = _setup_mock(mock_cls, _ok_stream(""))
+            mock_client.stream.side_effect = lambda *a, **kw: _ok_stream(next(answers))
+            result = await _retry_llm_with_validation(
+                config, "briefer", list(_MSGS), schema, validate, ValueError, "Briefing",
+            )
+            assert result == {"ok": True}
+            assert mock_client.stream.call_count == 2
+            assert get_response_cache(config).stats()["entries"] == 1
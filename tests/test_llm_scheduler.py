@@ -0,0 +1,211 @@
+"""Tests for kiso.llm_scheduler — LLM admission control."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from kiso.llm_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NORMAL,
+    LLMScheduler,
+    estimate_tokens,
+    role_priority,
+)
+
+
+def _scheduler(concurrency=1, per_model=8, tpm=0) -> LLMScheduler:
+    sched = LLMScheduler()
+    sched.configure(
+        max_concurrency=concurrency,
+        max_concurrency_per_model=per_model,
+        tokens_per_minute=tpm,
+    )
+    return sched
+
+
+async def _run(sched, order, name, *, provider="p", model="m", role="worker",
+               session="", tokens=0, hold=None):
+    async with sched.slot(provider, model, role=role, session=session, tokens=tokens):
+        order.append(name)
+        if hold is not None:
+            await hold.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_role_priority():
+    assert role_priority("classifier") == PRIORITY_INTERACTIVE
+    assert role_priority("messenger") == PRIORITY_INTERACTIVE
+    assert role_priority("planner") == PRIORITY_NORMAL
+    assert role_priority("consolidator") == PRIORITY_BACKGROUND
+    assert role_priority("unknown") == PRIORITY_NORMAL
+
+
+def test_estimate_tokens():
+    msgs = [{"role": "user", "content": "x" * 400},
+            {"role": "user", "content": [{"type": "text", "text": "y" * 40}]}]
+    assert estimate_tokens(msgs) == 110
+    assert estimate_tokens(msgs, max_tokens=50) == 160
+
+
+async def test_concurrency_limit_queues_extra_calls():
+    sched = _scheduler(concurrency=1)
+    order: list[str] = []
+    hold = asyncio.Event()
+    first = asyncio.create_task(_run(sched, order, "a", hold=hold))
+    second = asyncio.create_task(_run(sched, order, "b"))
+    await _settle()
+    assert order == ["a"]
+    assert sched.stats()["queued"] == 1
+    hold.set()
+    await asyncio.gather(first, second)
+    assert order == ["a", "b"]
+    assert sched.stats()["providers"]["p"]["active"] == 0
+
+
+async def test_providers_are_limited_independently():
+    sched = _scheduler(concurrency=1)
+    order: list[str] = []
+    hold = asyncio.Event()
+    first = asyncio.create_task(_run(sched, order, "a", provider="p1", hold=hold))
+    await _settle()
+    await _run(sched, order, "b", provider="p2")
+    assert order == ["a", "b"]
+    hold.set()
+    await first
+
+
+async def test_per_model_limit():
+    sched = _scheduler(concurrency=4, per_model=1)
+    order: list[str] = []
+    hold = asyncio.Event()
+    tasks = [
+        asyncio.create_task(_run(sched, order, "m1-a", model="m1", hold=hold)),
+        asyncio.create_task(_run(sched, order, "m1-b", model="m1")),
+        asyncio.create_task(_run(sched, order, "m2-a", model="m2")),
+    ]
+    await _settle()
+    # m1-b waits for its model, m2-a overtakes it.
+    assert order == ["m1-a", "m2-a"]
+    hold.set()
+    await asyncio.gather(*tasks)
+    assert order == ["m1-a", "m2-a", "m1-b"]
+
+
+async def test_interactive_roles_go_first():
+    sched = _scheduler(concurrency=1)
+    order: list[str] = []
+    hold = asyncio.Event()
+    tasks = [asyncio.create_task(_run(sched, order, "busy", hold=hold))]
+    await _settle()
+    tasks.append(asyncio.create_task(_run(sched, order, "consolidator", role="consolidator")))
+    await _settle()
+    tasks.append(asyncio.create_task(_run(sched, order, "planner", role="planner")))
+    await _settle()
+    tasks.append(asyncio.create_task(_run(sched, order, "classifier", role="classifier")))
+    await _settle()
+    hold.set()
+    await asyncio.gather(*tasks)
+    assert order == ["busy", "classifier", "planner", "consolidator"]
+
+
+async def test_waiting_promotes_background_calls():
+    sched = _scheduler(concurrency=1)
+    order: list[str] = []
+    hold = asyncio.Event()
+    tasks = [asyncio.create_task(_run(sched, order, "busy", hold=hold))]
+    await _settle()
+    tasks.append(asyncio.create_task(_run(sched, order, "summarizer", role="summarizer")))
+    await _settle()
+    # The summarizer has been queued long enough to rank as interactive.
+    sched._waiters[0].enqueued_at -= 100
+    tasks.append(asyncio.create_task(_run(sched, order, "classifier", role="classifier")))
+    await _settle()
+    hold.set()
+    await asyncio.gather(*tasks)
+    assert order == ["busy", "summarizer", "classifier"]
+
+
+async def test_sessions_share_fairly():
+    sched = _scheduler(concurrency=1)
+    order: list[str] = []
+    hold = asyncio.Event()
+    tasks = [asyncio.create_task(_run(sched, order, "a1", session="a", hold=hold))]
+    await _settle()
+    tasks.append(asyncio.create_task(_run(sched, order, "a2", session="a")))
+    tasks.append(asyncio.create_task(_run(sched, order, "a3", session="a")))
+    await _settle()
+    tasks.append(asyncio.create_task(_run(sched, order, "b1", session="b")))
+    await _settle()
+    hold.set()
+    await asyncio.gather(*tasks)
+    # b was never served, so it goes before a's backlog.
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+async def test_token_budget_delays_calls():
+    sched = _scheduler(concurrency=4, tpm=6000)  # 100 tokens per second
+    order: list[str] = []
+    await _run(sched, order, "big", tokens=6000)
+    t0 = time.monotonic()
+    await _run(sched, order, "small", tokens=10)
+    assert time.monotonic() - t0 >= 0.05
+    assert order == ["big", "small"]
+
+
+async def test_settle_charges_real_usage():
+    sched = _scheduler(concurrency=4, tpm=6000)
+    async with sched.slot("p", "m", tokens=10) as slot:
+        slot.settle(1000)
+    assert sched.stats()["providers"]["p"]["tokens_available"] <= 5000 + 10
+
+
+async def test_pause_holds_back_the_provider():
+    sched = _scheduler(concurrency=4)
+    sched.pause("p", 0.1)
+    t0 = time.monotonic()
+    async with sched.slot("p", "m"):
+        pass
+    assert time.monotonic() - t0 >= 0.08
+    # Other providers are unaffected.
+    t0 = time.monotonic()
+    async with sched.slot("q", "m"):
+        pass
+    assert time.monotonic() - t0 < 0.08
+
+
+async def test_cancelled_waiter_leaves_queue():
+    sched = _scheduler(concurrency=1)
+    order: list[str] = []
+    hold = asyncio.Event()
+    first = asyncio.create_task(_run(sched, order, "a", hold=hold))
+    await _settle()
+    waiting = asyncio.create_task(_run(sched, order, "b"))
+    await _settle()
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert sched.stats()["queued"] == 0
+    hold.set()
+    await first
+    assert order == ["a"]
+    assert sched.stats()["providers"]["p"]["active"] == 0
+
+
+async def test_stats_report_wait_times():
+    sched = _scheduler(concurrency=1)
+    async with sched.slot("p", "m", role="classifier"):
+        pass
+    stats = sched.stats()
+    assert stats["wait_ms"]["interactive"]["samples"] == 1
+    assert stats["wait_ms"]["background"]["samples"] == 0
+    assert stats["providers"]["p"]["admitted"] == 1
+    assert stats["providers"]["p"]["tokens_available"] is None
+    assert stats["limits"]["max_concurrency"] == 1
@@ -59,6 +59,24 @@ class TestEnsureTable:
         ensure_usage_table(conn)
 
 
+    def test_adds_cached_tokens_to_existing_table(self) -> None:
+        from kiso.store.usage import ensure_usage_table
+
+        old = sqlite3.connect(":memory:")
+        old.execute(
+            "CREATE TABLE llm_usage (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "session TEXT NOT NULL, role TEXT NOT NULL, model TEXT NOT NULL, "
+            "prompt_tokens INTEGER NOT NULL, completion_tokens INTEGER NOT NULL, "
+            "cost_usd REAL, ts TEXT NOT NULL)"
+        )
+        old.execute(
+            "INSERT INTO llm_usage (session, role, model, prompt_tokens, "
+            "completion_tokens, cost_usd, ts) VALUES ('dev', 'planner', 'm', 10, 5, NULL, 'x')"
+        )
+        ensure_usage_table(old)
+        assert old.execute("SELECT cached_tokens FROM llm_usage").fetchone() == (0,)
+
+
 class TestRecordUsage:
     def test_inserts_row(self, conn: sqlite3.Connection) -> None:
         from kiso.store.usage import record_usage
@@ -136,7 +154,7 @@ class TestQueryUsage:
                      model="deepseek/deepseek-v3.2",
                      prompt_tokens=500, completion_tokens=100,
                      cost_usd=0.0025,
-                     ts=_iso(now))
+                     ts=_iso(now), cached_tokens=384)
         record_usage(conn, session="dev", role="messenger",
                      model="google/gemini-2.5-flash",
                      prompt_tokens=200, completion_tokens=50,
@@ -161,6 +179,7 @@ class TestQueryUsage:
         assert planner["prompt_tokens"] == 1500
         assert planner["completion_tokens"] == 300
         assert planner["calls"] == 2
+        assert planner["cached_tokens"] == 384
         assert planner["cost_usd"] == pytest.approx(0.0075, abs=1e-9)
 
     def test_respects_since_window(self, conn: sqlite3.Connection) -> None:
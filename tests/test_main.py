@@ -21,6 +21,8 @@ from kiso.store import (
     create_plan,
     create_session,
     create_task,
+    get_plan_for_session,
+    get_tasks_for_session,
     update_plan_status,
     update_plan_usage,
     update_task,
@@ -168,6 +170,51 @@ async def test_status_verbose_includes_verbose_fields(client: httpx.AsyncClient)
     assert found_verbose, "Expected verbose fields in at least one llm_calls entry"
 
 
+async def test_llm_calls_endpoint_returns_transcripts(client: httpx.AsyncClient):
+    """GET /status/{session}/llm-calls returns full calls on demand."""
+    from kiso.main import app
+
+    session = await _seed_status_data(client)
+    plan = await get_plan_for_session(app.state.db, session)
+    task = (await get_tasks_for_session(app.state.db, session))[0]
+
+    resp = await client.get(
+        f"/status/{session}/llm-calls",
+        params={"user": "testadmin", "plan_id": plan["id"], "task_id": task["id"]},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 200
+    calls = resp.json()["calls"]
+    assert len(calls) == 1
+    assert calls[0]["seq"] == 0
+    assert calls[0]["messages"] == [{"role": "user", "content": "test prompt"}]
+    assert calls[0]["response"] == '{"goal": "test"}'
+
+    resp = await client.get(
+        f"/status/{session}/llm-calls",
+        params={"user": "testadmin", "plan_id": plan["id"]},
+        headers=AUTH_HEADER,
+    )
+    assert resp.json()["calls"][0]["role"] == "planner"
+
+
+async def test_llm_calls_endpoint_scoped_to_session(client: httpx.AsyncClient):
+    """A plan id of another session yields no calls."""
+    from kiso.main import app
+
+    session = await _seed_status_data(client)
+    plan = await get_plan_for_session(app.state.db, session)
+    await create_session(app.state.db, "other-sess")
+
+    resp = await client.get(
+        "/status/other-sess/llm-calls",
+        params={"user": "testadmin", "plan_id": plan["id"]},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["calls"] == []
+
+
 # ── _init_kiso_dirs ──────────────────────────────────────────
 
 
@@ -610,22 +657,14 @@ class TestInitAppState:
 # --- M66g: import json module-level + encoding ---
 
 
-class TestStripLlmVerboseModuleJson:
+class TestMainModuleJson:
     def test_uses_module_level_json(self):
-        """json must be imported at module level, not inside _strip_llm_verbose."""
+        """json must be imported at module level."""
         import kiso.main as main_mod
 
         # The module attribute 'json' must be the stdlib json module
         assert main_mod.json is json
 
-    def test_no_local_import_in_source(self):
-        """_strip_llm_verbose must not contain a local 'import json' statement."""
-        import inspect
-        import kiso.main as main_mod
-
-        source = inspect.getsource(main_mod._strip_llm_verbose)
-        assert "import json" not in source
-
 
 # --- POST /admin/reload-config (M73a) ---
 
@@ -638,7 +677,7 @@ class TestReloadConfig:
 
         new_cfg = load_config(test_config_path)
         with (
-            patch("kiso.main.reload_config", return_value=new_cfg) as mock_reload,
+            patch("kiso.config.reload_config", return_value=new_cfg) as mock_reload,
             patch("kiso.main.invalidate_prompt_cache") as mock_cache,
         ):
             resp = await client.post(
@@ -655,7 +694,7 @@ class TestReloadConfig:
 
     async def test_reload_forbidden_non_admin(self, client: httpx.AsyncClient):
         """Non-admin user gets 403."""
-        with patch("kiso.main.reload_config") as mock_reload:
+        with patch("kiso.config.reload_config") as mock_reload:
             resp = await client.post(
                 "/admin/reload-config",
                 params={"user": "testuser"},
@@ -668,7 +707,7 @@ class TestReloadConfig:
     async def test_reload_400_on_config_error(self, client: httpx.AsyncClient):
         """ConfigError from reload_config raises 400 with error detail."""
         with (
-            patch("kiso.main.reload_config", side_effect=ConfigError("bad toml")),
+            patch("kiso.config.reload_config", side_effect=ConfigError("bad toml")),
             patch("kiso.main.invalidate_prompt_cache") as mock_cache,
         ):
             resp = await client.post(
@@ -683,7 +722,7 @@ class TestReloadConfig:
 
     async def test_reload_forbidden_untrusted_user(self, client: httpx.AsyncClient):
         """User not present in config (untrusted) gets 403."""
-        with patch("kiso.main.reload_config") as mock_reload:
+        with patch("kiso.config.reload_config") as mock_reload:
             resp = await client.post(
                 "/admin/reload-config",
                 params={"user": "nobody"},
@@ -0,0 +1,108 @@
+"""Tests for kiso/maintenance.py — scheduled store maintenance."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from kiso.config import ConfigError
+from kiso.maintenance import (
+    _LAST_RUN_KV_KEY, maintenance_loop, run_due_maintenance, run_maintenance,
+)
+from kiso.store import get_facts, get_kv, save_fact, save_fact_tags, set_kv
+from tests.conftest import make_config
+
+
+def _cfg(**extra):
+    return make_config(settings={
+        "fact_decay_days": 7,
+        "fact_decay_rate": 0.1,
+        "fact_archive_threshold": 0.3,
+        "maintenance_interval_hours": 24,
+        "maintenance_batch_size": 2,
+        **extra,
+    })
+
+
+async def _backdate(db, fact_id: int) -> None:
+    await db.execute(
+        "UPDATE facts SET created_at = datetime('now', '-10 days') WHERE id = ?",
+        (fact_id,),
+    )
+    await db.commit()
+
+
+class TestRunMaintenance:
+    async def test_decays_archives_and_cleans_tags(self, db):
+        stale = await save_fact(db, "Old stale fact", "curator")
+        await _backdate(db, stale)
+        dying = await save_fact(db, "Dying fact", "curator", confidence=0.35)
+        await _backdate(db, dying)
+        await save_fact(db, "Fresh fact", "curator", confidence=0.2)
+        await save_fact_tags(db, stale, ["keep"])
+        await db.execute("INSERT INTO fact_tags (fact_id, tag) VALUES (9999, 'orphan')")
+        await db.commit()
+
+        results = await run_maintenance(db, _cfg())
+
+        assert results["decayed"] == 2
+        assert results["archived"] == 2  # the dying fact and the fresh low one
+        assert results["orphan_tags"] == 1
+        facts = await get_facts(db)
+        assert [(f["content"], f["confidence"]) for f in facts] == [
+            ("Old stale fact", pytest.approx(0.9)),
+        ]
+        cur = await db.execute("SELECT fact_id, tag FROM fact_tags")
+        assert [tuple(r) for r in await cur.fetchall()] == [(stale, "keep")]
+
+    async def test_failed_step_does_not_stop_the_rest(self, db):
+        await save_fact(db, "Weak fact", "curator", confidence=0.1)
+        with patch("kiso.maintenance.decay_facts",
+                   new_callable=AsyncMock, side_effect=RuntimeError("disk full")):
+            results = await run_maintenance(db, _cfg())
+        assert "decayed" not in results
+        assert results["archived"] == 1
+
+    async def test_cancellation_propagates(self, db):
+        with patch("kiso.maintenance.archive_low_confidence_facts",
+                   side_effect=asyncio.CancelledError):
+            with pytest.raises(asyncio.CancelledError):
+                await run_maintenance(db, _cfg())
+
+
+class TestRunDueMaintenance:
+    async def test_first_run_records_time(self, db):
+        assert await run_due_maintenance(db, _cfg()) is True
+        assert float(await get_kv(db, _LAST_RUN_KV_KEY)) == pytest.approx(time.time(), abs=5)
+
+    async def test_skips_until_interval_elapsed(self, db):
+        await set_kv(db, _LAST_RUN_KV_KEY, str(time.time() - 3600))
+        with patch("kiso.maintenance.run_maintenance", new_callable=AsyncMock) as run:
+            assert await run_due_maintenance(db, _cfg()) is False
+            run.assert_not_called()
+            await set_kv(db, _LAST_RUN_KV_KEY, str(time.time() - 25 * 3600))
+            assert await run_due_maintenance(db, _cfg()) is True
+            run.assert_awaited_once()
+
+
+class TestMaintenanceLoop:
+    async def test_each_check_uses_the_current_config(self, db):
+        startup, reloaded = _cfg(), _cfg()
+        seen = []
+
+        async def fake_due(_db, config):
+            seen.append(config)
+            if len(seen) == 2:
+                raise asyncio.CancelledError
+
+        with patch("kiso.maintenance._CHECK_INTERVAL", 0), \
+             patch("kiso.maintenance.run_due_maintenance", side_effect=fake_due), \
+             patch("kiso.maintenance.current_config",
+                   side_effect=[reloaded, ConfigError("bad toml")]):
+            with pytest.raises(asyncio.CancelledError):
+                await maintenance_loop(db, startup)
+        # A reload is picked up; an unreadable file keeps the last good one.
+        assert seen[0] is reloaded and seen[1] is reloaded
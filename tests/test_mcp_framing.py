@@ -0,0 +1,80 @@
+"""Tests for kiso.mcp.framing — stdio message framing and decoding."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from kiso.mcp.framing import FrameReader, SpooledBlob, decode_frame
+
+
+def _reader(data: bytes, tmp_path, **kw) -> FrameReader:
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    kw.setdefault("max_bytes", 1 << 30)
+    return FrameReader(stream, spool_dir=tmp_path / "spool", **kw)
+
+
+async def _frames(reader: FrameReader) -> list:
+    frames = []
+    while (frame := await reader.read_frame()) is not None:
+        frames.append(frame)
+    return frames
+
+
+async def test_splits_lines_across_chunks(tmp_path):
+    big = json.dumps({"id": 1, "result": {"text": "y" * 200_000}}).encode()
+    data = b'{"id": 0}\n' + big + b"\n\n" + b'{"id": 2}'
+    frames = await _frames(_reader(data, tmp_path))
+    assert [f.data for f in frames] == [b'{"id": 0}', big, b"", b'{"id": 2}']
+    assert decode_frame(frames[1])["result"]["text"] == "y" * 200_000
+
+
+async def test_oversized_frame_is_dropped(tmp_path):
+    data = b'{"jsonrpc":"2.0","id":7,"result":"' + b"z" * 5000 + b'"}\n{"id": 8}\n'
+    frames = await _frames(_reader(data, tmp_path, max_bytes=1000))
+    assert frames[0].oversized and frames[0].data is None
+    assert frames[0].request_id() == 7
+    assert decode_frame(frames[1]) == {"id": 8}
+
+
+async def test_spooled_frame_keeps_blobs_on_disk(tmp_path):
+    blob = "QUJD" * 50_000
+    msg = {
+        "jsonrpc": "2.0",
+        "id": 3,
+        "result": {
+            "content": [
+                {"type": "text", "text": 'quoted \\"data\\": "not a key"'},
+                {"type": "image", "mimeType": "image/png", "data": blob},
+            ],
+            "structuredContent": {"data": blob},
+        },
+    }
+    data = json.dumps(msg).encode() + b"\n"
+    frames = await _frames(_reader(data, tmp_path, spool_threshold=1024))
+    assert frames[0].spool is not None and frames[0].data is None
+
+    decoded = decode_frame(frames[0], min_blob=1024)
+    content = decoded["result"]["content"]
+    assert content[0] == msg["result"]["content"][0]
+    assert isinstance(content[1]["data"], SpooledBlob)
+    assert content[1]["data"].read_text() == blob
+    # Outside content blocks the value is inlined again.
+    assert decoded["result"]["structuredContent"] == {"data": blob}
+
+
+async def test_escaped_blob_is_unescaped(tmp_path):
+    data = b'{"result": {"contents": [{"blob": "' + b"ab\\/cd" * 400 + b'"}]}}\n'
+    frames = await _frames(_reader(data, tmp_path, spool_threshold=100))
+    blob = decode_frame(frames[0], min_blob=100)["result"]["contents"][0]["blob"]
+    assert blob.read_bytes() == b"ab/cd" * 400
+
+
+async def test_invalid_json_raises_value_error(tmp_path):
+    frames = await _frames(_reader(b"not json\n", tmp_path))
+    with pytest.raises(ValueError):
+        decode_frame(frames[0])
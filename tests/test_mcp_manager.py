@@ -299,6 +299,61 @@ class TestListMethodsCachedOnly:
         await mgr.shutdown_all()
 
 
+class TestCatalogVersion:
+    """`catalog_version` moves only when cached catalog content changes."""
+
+    async def test_first_listing_bumps(self, fake_factory):
+        mgr = MCPManager(
+            {"s1": _server("s1")}, client_factory=fake_factory
+        )
+        before = mgr.catalog_version()
+        await mgr.list_methods("s1")
+        assert mgr.catalog_version() > before
+        await mgr.shutdown_all()
+
+    async def test_ttl_refresh_with_same_content_keeps_version(self, fake_factory):
+        now = [0.0]
+        mgr = MCPManager(
+            {"s1": _server("s1")},
+            client_factory=fake_factory,
+            cache_ttl_s=10,
+            clock=lambda: now[0],
+        )
+        await mgr.list_methods("s1")
+        version = mgr.catalog_version()
+        now[0] = 60.0
+        await mgr.list_methods("s1")
+        assert fake_factory.created[0]._list_call_count == 2
+        assert mgr.catalog_version() == version
+        await mgr.shutdown_all()
+
+    async def test_changed_content_bumps(self, fake_factory):
+        now = [0.0]
+        mgr = MCPManager(
+            {"s1": _server("s1")},
+            client_factory=fake_factory,
+            cache_ttl_s=10,
+            clock=lambda: now[0],
+        )
+        await mgr.list_methods("s1")
+        version = mgr.catalog_version()
+        fake_factory.created[0]._methods = [_method("echo"), _method("ping")]
+        now[0] = 60.0
+        await mgr.list_methods("s1")
+        assert mgr.catalog_version() > version
+        await mgr.shutdown_all()
+
+    async def test_invalidate_bumps(self, fake_factory):
+        mgr = MCPManager(
+            {"s1": _server("s1")}, client_factory=fake_factory
+        )
+        await mgr.list_methods("s1")
+        version = mgr.catalog_version()
+        mgr.invalidate_cache("s1")
+        assert mgr.catalog_version() > version
+        await mgr.shutdown_all()
+
+
 # ---------------------------------------------------------------------------
 # Resources: list + read + cache
 # ---------------------------------------------------------------------------
@@ -589,6 +644,38 @@ class TestShutdownAll:
         assert fake_factory.created == []
 
 
+class TestReconfigure:
+    async def test_only_changed_servers_restart(self, fake_factory):
+        mgr = MCPManager(
+            {"s1": _server("s1"), "s2": _server("s2")},
+            client_factory=fake_factory,
+        )
+        await mgr.list_methods("s1")
+        await mgr.list_methods("s2")
+        s1_client, s2_client = fake_factory.created
+        version = mgr.catalog_version()
+
+        changed_s2 = MCPServer(name="s2", transport="stdio", command="other")
+        assert await mgr.reconfigure({"s1": _server("s1"), "s2": changed_s2}) == ["s2"]
+        assert s1_client._shutdown_called is False
+        assert s2_client._shutdown_called is True
+        assert mgr.catalog_version() > version
+
+        await mgr.list_methods("s2")
+        assert fake_factory.created[-1].server is changed_s2
+        await mgr.shutdown_all()
+
+    async def test_added_and_removed_servers(self, fake_factory):
+        mgr = MCPManager({"s1": _server("s1")}, client_factory=fake_factory)
+        await mgr.list_methods("s1")
+        assert await mgr.reconfigure({"s2": _server("s2")}) == ["s1", "s2"]
+        assert fake_factory.created[0]._shutdown_called is True
+        assert mgr.available_servers() == ["s2"]
+        with pytest.raises(KeyError):
+            await mgr.list_methods("s1")
+        await mgr.shutdown_all()
+
+
 # ---------------------------------------------------------------------------
 # available_servers / is_available
 # ---------------------------------------------------------------------------
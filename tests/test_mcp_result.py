@@ -8,16 +8,20 @@ Covers the full content-type mapping:
 - resource embedded text → inlined with header
 - isError → propagated
 - empty content → empty stdout, not an error
+- large payloads → chunked decode, content-hash dedup across tasks
 """
 
 from __future__ import annotations
 
 import base64
 import json
+import os
 from pathlib import Path
 
 import pytest
 
+from kiso.mcp import result as result_mod
+from kiso.mcp.framing import SpooledBlob, _SpoolFile
 from kiso.mcp.result import render_mcp_result
 
 
@@ -82,6 +86,17 @@ class TestStructuredContent:
         # Structured form appears exactly once
         assert out.stdout_text.count(json.dumps(payload, sort_keys=True)) == 1
 
+    def test_large_duplicate_text_reused_verbatim(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(result_mod, "_LARGE_STRUCTURED_CHARS", 16)
+        payload = {"rows": list(range(20)), "b": 1}
+        text = json.dumps(payload, indent=1)
+        result = {
+            "content": [{"type": "text", "text": text}],
+            "structuredContent": payload,
+        }
+        out = render_mcp_result("s", "m", 1, tmp_path, result)
+        assert out.stdout_text == text
+
 
 class TestImageContent:
     def test_image_saved_to_pub_dir(self, tmp_path):
@@ -261,3 +276,70 @@ class TestFilenameSanitization:
         # No '/' or '..' in the filename
         assert "/" not in name
         assert ".." not in name
+
+
+class TestLargePayloads:
+    def test_decoded_in_chunks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(result_mod, "_B64_CHUNK", 1001)  # not 4-aligned
+        raw = bytes(range(256)) * 40
+        result = {"content": [{
+            "type": "image", "mimeType": "image/png",
+            "data": base64.b64encode(raw).decode(),
+        }]}
+        out = render_mcp_result("s", "m", 1, tmp_path, result)
+        _, path = out.published_files[0]
+        assert Path(path).read_bytes() == raw
+
+    def test_spooled_blob_input(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(result_mod, "_B64_CHUNK", 7)
+        raw = bytes(range(256)) * 8
+        encoded = base64.b64encode(raw).replace(b"/", b"\\/")
+        spool_path = tmp_path / "frame.jsonl"
+        spool_path.write_bytes(b'{"data":"' + encoded + b'"}')
+        blob = SpooledBlob(_SpoolFile(spool_path), 9, 9 + len(encoded))
+        result = {"content": [{"type": "image", "mimeType": "image/png", "data": blob}]}
+        out = render_mcp_result("s", "m", 1, tmp_path / "pub", result)
+        _, path = out.published_files[0]
+        assert Path(path).read_bytes() == raw
+
+    def test_identical_payloads_are_cloned_not_linked(self, tmp_path, monkeypatch):
+        clones = []
+
+        def fake_ioctl(dst_fd, request, src_fd):
+            assert request == result_mod._FICLONE
+            clones.append(request)
+            os.write(dst_fd, os.pread(src_fd, 1 << 20, 0))
+
+        monkeypatch.setattr("fcntl.ioctl", fake_ioctl)
+        item = {"type": "image", "mimeType": "image/png", "data": _tiny_png_b64()}
+        first = render_mcp_result("s", "m", 1, tmp_path, {"content": [item]})
+        second = render_mcp_result("s", "m", 2, tmp_path, {"content": [item]})
+        (_, p1), (_, p2) = first.published_files[0], second.published_files[0]
+        assert clones and p1 != p2
+        assert Path(p1).stat().st_ino != Path(p2).stat().st_ino
+        with open(p1, "r+b") as f:  # an exec task editing one artifact in place
+            f.write(b"X")
+        assert Path(p2).read_bytes() == base64.b64decode(_tiny_png_b64())
+        assert not list(tmp_path.glob(".*"))
+
+    def test_rewritten_artifact_is_not_cloned(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "fcntl.ioctl",
+            lambda dst_fd, request, src_fd: os.write(dst_fd, os.pread(src_fd, 1 << 20, 0)),
+        )
+        raw = base64.b64decode(_tiny_png_b64())
+        item = {"type": "image", "mimeType": "image/png", "data": _tiny_png_b64()}
+        first = render_mcp_result("s", "m", 1, tmp_path, {"content": [item]})
+        _, p1 = first.published_files[0]
+        Path(p1).write_bytes(bytes(len(raw)))  # same size, different bytes
+        second = render_mcp_result("s", "m", 2, tmp_path, {"content": [item]})
+        _, p2 = second.published_files[0]
+        assert Path(p2).read_bytes() == raw
+        assert not list(tmp_path.glob(".*"))
+
+    def test_invalid_payload_leaves_no_partial_file(self, tmp_path):
+        data = base64.b64encode(b"x" * 100).decode()[:-3]  # truncated
+        result = {"content": [{"type": "image", "mimeType": "image/png", "data": data}]}
+        out = render_mcp_result("s", "m", 1, tmp_path, result)
+        assert out.published_files == []
+        assert list(tmp_path.iterdir()) == []
@@ -24,7 +24,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from kiso.config import Config, MODEL_DEFAULTS, SETTINGS_DEFAULTS, Provider
-from kiso.llm import LLMBudgetExceeded, _llm_budget_count, _llm_budget_max
+from kiso.llm import LLMBudgetExceeded, clear_llm_budget, set_llm_budget
 from kiso.mcp.config import MCPServer
 from kiso.mcp.sampling import (
     SAMPLING_MAX_TOKENS_CEILING,
@@ -207,15 +207,13 @@ class TestHandleSamplingRequest:
         }
 
         # Prime a zero-sized budget so any call raises LLMBudgetExceeded.
-        _llm_budget_max.set(0)
-        _llm_budget_count.set(0)
+        set_llm_budget(0)
         try:
             # call_llm is NOT patched — we want the real budget enforcement
             # to trigger. Reset after the test.
             response = await handle_sampling_request(config, req)
         finally:
-            _llm_budget_max.set(None)
-            _llm_budget_count.set(0)
+            clear_llm_budget()
 
         assert "error" in response
         # Budget-exhausted is surfaced as an internal error.
@@ -305,3 +305,36 @@ class TestShutdownSession:
         assert not any(c._shutdown_called for c in b_clients)
         assert not any(c._shutdown_called for c in global_clients)
         await mgr.shutdown_all()
+
+
+class TestPoolStats:
+    async def test_reports_occupancy_and_spawn_counts(
+        self, recorder, workspace_resolver
+    ):
+        mgr = MCPManager(
+            {"fs": _session_server(), "echo": _plain_server()},
+            client_factory=recorder,
+            workspace_resolver=workspace_resolver,
+        )
+        await mgr.call_method("fs", "read", {}, session="A")
+        await mgr.call_method("fs", "read", {}, session="B")
+        await mgr.call_method("echo", "echo", {}, session="A")
+        await mgr.call_method("echo", "echo", {}, session="B")
+
+        stats = mgr.pool_stats()
+        assert stats["clients"] == 3
+        assert stats["global_clients"] == 1
+        assert stats["session_clients"] == 2
+        assert stats["sessions"] == 2
+        assert stats["spawns"] == 3
+        assert stats["servers"]["fs"]["session_clients"] == 2
+        assert stats["servers"]["echo"]["global_clients"] == 1
+        assert stats["servers"]["echo"]["restarts"] == 0
+
+        await mgr.shutdown_session("A")
+        stats = mgr.pool_stats()
+        assert stats["session_clients"] == 1
+        assert stats["global_clients"] == 1
+        # Lifetime counters survive shutdown.
+        assert stats["spawns"] == 3
+        await mgr.shutdown_all()
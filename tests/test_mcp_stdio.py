@@ -415,3 +415,48 @@ class TestIsHealthy:
         await client.initialize()
         await client.shutdown()
         assert client.is_healthy() is False
+
+
+class TestLargeFrames:
+    async def test_response_over_readline_limit(self):
+        """A single response far above asyncio's 64 KiB line limit."""
+        client = MCPStdioClient(_make_server())
+        await client.initialize()
+        text = "x" * (300 * 1024)
+        result = await client.call_method("echo", {"text": text})
+        assert result.stdout_text == text
+        assert client.is_healthy()
+        await client.shutdown()
+
+    async def test_oversized_response_fails_only_that_call(self):
+        class _Config:
+            settings = {"mcp_max_message_mb": 1}
+
+        client = MCPStdioClient(_make_server(), config=_Config())
+        await client.initialize()
+        with pytest.raises(MCPInvocationError, match="exceeds mcp_max_message_mb"):
+            await client.call_method("echo", {"text": "x" * (2 * 1024 * 1024)})
+        result = await client.call_method("echo", {"text": "still alive"})
+        assert result.stdout_text == "still alive"
+        await client.shutdown()
+
+    async def test_large_blob_is_spooled(self, tmp_path, monkeypatch):
+        import base64
+        import gc
+
+        from kiso.mcp.framing import SpooledBlob
+
+        monkeypatch.setattr("kiso.mcp.stdio.KISO_DIR", tmp_path)
+        client = MCPStdioClient(_make_server("resources_large_binary"))
+        await client.initialize()
+        blocks = await client.read_resource("kiso://doc/big")
+        await client.shutdown()
+        blob = blocks[0].blob
+        assert isinstance(blob, SpooledBlob)
+        assert blob.path.parent == tmp_path / "mcp" / "spool"
+        raw = base64.b64decode(blob.read_bytes())
+        assert raw == (bytes(range(256)) * (len(raw) // 256 + 1))[:5 * 1024 * 1024]
+        spool_path = blob.path
+        del blocks, blob
+        gc.collect()
+        assert not spool_path.exists()
@@ -121,3 +121,137 @@ class TestRunPlannerBuildsCatalogFromManager:
         assert "mcp_catalog_text" in captured_kwargs
         text = captured_kwargs["mcp_catalog_text"]
         assert text and "stub:do_thing" in text
+
+
+class _SharedManagerStub:
+    def __init__(self) -> None:
+        self.shutdown_sessions: list[str] = []
+        self.shutdown_all_calls = 0
+
+    def available_servers(self):
+        return []
+
+    async def shutdown_session(self, session: str) -> None:
+        self.shutdown_sessions.append(session)
+
+    async def shutdown_all(self) -> None:
+        self.shutdown_all_calls += 1
+
+
+class TestRunWorkerSharedManager:
+    """The daemon hands one shared manager to every worker: an idle
+    worker releases only its own session's clients, never the pool."""
+
+    @pytest.mark.asyncio
+    async def test_idle_exit_releases_only_own_session(self, tmp_path) -> None:
+        import asyncio
+
+        from kiso.store import init_db
+        from kiso.worker.loop import run_worker
+        from tests.conftest import make_config
+
+        db = await init_db(tmp_path / "t.db")
+        try:
+            shared = _SharedManagerStub()
+            await asyncio.wait_for(
+                run_worker(db, make_config(), "s1", asyncio.Queue(),
+                           mcp_manager=shared),
+                timeout=3,
+            )
+        finally:
+            await db.close()
+        assert shared.shutdown_sessions == ["s1"]
+        assert shared.shutdown_all_calls == 0
+
+
+class TestEnsureWorkerPassesSharedManager:
+    @pytest.mark.asyncio
+    async def test_ensure_worker_threads_module_manager(self) -> None:
+        from unittest.mock import MagicMock, patch
+
+        import kiso.main as main_mod
+
+        shared = _SharedManagerStub()
+        captured: dict = {}
+
+        async def _fake_run_worker(*args, **kwargs):
+            captured.update(kwargs)
+
+        config = MagicMock()
+        config.settings = {"max_queue_size": 10}
+        try:
+            with patch.object(main_mod, "_mcp_manager", shared), \
+                 patch.object(main_mod, "run_worker", _fake_run_worker):
+                main_mod._ensure_worker("wiring-s1", MagicMock(), config)
+                await main_mod._workers["wiring-s1"].task
+        finally:
+            main_mod._workers.pop("wiring-s1", None)
+            main_mod._worker_phases.pop("wiring-s1", None)
+        assert captured["mcp_manager"] is shared
+
+
+class TestSharedManagerLifecycle:
+    @pytest.mark.asyncio
+    async def test_edited_servers_reconfigure_shared_pool(self) -> None:
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        import kiso.main as main_mod
+        from kiso.mcp.config import MCPServer
+
+        manager = MagicMock()
+        manager.reconfigure = AsyncMock(return_value=["s1"])
+        old = MagicMock(mcp_servers={})
+        new = MagicMock(mcp_servers={
+            "s1": MCPServer(name="s1", transport="stdio", command="x"),
+        })
+        with patch.object(main_mod, "_mcp_manager", manager), \
+             patch.object(main_mod, "_mcp_warmup", None), \
+             patch.object(main_mod.app.state, "config", old, create=True), \
+             patch("kiso.mcp.warmup.start_warmup", AsyncMock()) as warm:
+            main_mod._on_config_change(new)
+            await main_mod._mcp_warmup
+        manager.reconfigure.assert_awaited_once_with(new.mcp_servers)
+        warm.assert_awaited_once_with(manager, new)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_servers_leave_pool_alone(self) -> None:
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        import kiso.main as main_mod
+
+        manager = MagicMock()
+        manager.reconfigure = AsyncMock()
+        with patch.object(main_mod, "_mcp_manager", manager), \
+             patch.object(main_mod.app.state, "config", MagicMock(mcp_servers={}), create=True):
+            main_mod._on_config_change(MagicMock(mcp_servers={}))
+        manager.reconfigure.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_warmup(self) -> None:
+        import asyncio
+        from unittest.mock import patch
+
+        import kiso.main as main_mod
+
+        task = asyncio.create_task(asyncio.sleep(3600))
+        with patch.object(main_mod, "_mcp_warmup", task):
+            await main_mod._cancel_mcp_warmup()
+            assert main_mod._mcp_warmup is None
+        assert task.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_pool_is_built_without_servers(self) -> None:
+        from unittest.mock import patch
+
+        import kiso.main as main_mod
+        from tests.conftest import make_config
+
+        # Workers capture the pool when they start, so it must exist
+        # before a reload adds the first server.
+        with patch.object(main_mod, "_mcp_warmup", None):
+            manager = main_mod._init_mcp_manager(make_config())
+            try:
+                assert manager is not None
+                assert main_mod._mcp_warmup is None
+            finally:
+                await manager.shutdown_all()
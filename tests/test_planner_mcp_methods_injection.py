@@ -29,7 +29,7 @@ from kiso.store import create_session, init_db
 from tests.conftest import full_models, full_settings
 
 
-def _config(briefer_enabled: bool = True) -> Config:
+def _config(briefer_enabled: bool = True, **settings) -> Config:
     return Config(
         tokens={"cli": "tok"},
         providers={
@@ -38,7 +38,7 @@ def _config(briefer_enabled: bool = True) -> Config:
         users={},
         models=full_models(),
         settings=full_settings(
-            context_messages=3, briefer_enabled=briefer_enabled
+            context_messages=3, briefer_enabled=briefer_enabled, **settings
         ),
         raw={},
     )
@@ -166,3 +166,49 @@ class TestMcpMethodsInjectedIntoPlannerContext:
 
         user_content = msgs[1]["content"]
         assert "## MCP Methods" not in user_content
+
+
+class TestCatalogCutToRelevantMethods:
+    """Catalogs larger than `mcp_catalog_top_k` reach the planner cut down."""
+
+    async def test_only_relevant_methods_reach_planner(self, db):
+        msgs = await build_planner_messages(
+            db,
+            _config(briefer_enabled=False, mcp_catalog_top_k=1),
+            "sess1",
+            "admin",
+            "open an issue about the crash",
+            mcp_catalog_text=_CATALOG_TEXT,
+        )
+
+        user_content = msgs[1]["content"]
+        assert "github:create_issue" in user_content
+        assert "filesystem:read_file" not in user_content
+
+    async def test_miss_keeps_full_catalog(self, db):
+        msgs = await build_planner_messages(
+            db,
+            _config(briefer_enabled=False, mcp_catalog_top_k=1),
+            "sess1",
+            "admin",
+            "hello",
+            mcp_catalog_text=_CATALOG_TEXT,
+        )
+
+        user_content = msgs[1]["content"]
+        assert "filesystem:read_file" in user_content
+        assert "github:create_issue" in user_content
+
+    async def test_replan_keeps_full_catalog(self, db):
+        msgs = await build_planner_messages(
+            db,
+            _config(briefer_enabled=False, mcp_catalog_top_k=1),
+            "sess1",
+            "admin",
+            "open an issue about the crash",
+            is_replan=True,
+            mcp_catalog_text=_CATALOG_TEXT,
+        )
+
+        user_content = msgs[1]["content"]
+        assert "filesystem:read_file" in user_content
@@ -11,11 +11,13 @@ import pytest
 from kiso.config import Config, Provider, User
 from kiso.security import (
     PermissionResult,
+    StreamRedactor,
     build_secret_variants,
     check_command_deny_list,
     collect_deploy_secrets,
     escape_fence_delimiters,
     fence_content,
+    get_redactor,
     revalidate_permissions,
     sanitize_output,
     sanitize_value,
@@ -234,22 +236,45 @@ class TestSanitizeOutput:
         assert result == "normal output"
 
     def test_cache_reused_on_same_secrets(self):
-        """compiled pattern is cached across calls with same secrets."""
-        import kiso.security as sec
+        """compiled redactor is cached across calls with same secrets."""
         secrets = {"KEY": "sk-abc123xyz"}
-        sanitize_output("first call", secrets, {})
-        cached_pattern = sec._sanitize_cache[1]
-        assert cached_pattern is not None
-        sanitize_output("second call", secrets, {})
-        assert sec._sanitize_cache[1] is cached_pattern  # same object
-
-    def test_cache_invalidated_on_new_secrets(self):
-        """cache is rebuilt when secret values change."""
-        import kiso.security as sec
-        sanitize_output("call 1", {"A": "secret-one-val"}, {})
-        old_pattern = sec._sanitize_cache[1]
-        sanitize_output("call 2", {"A": "secret-two-val"}, {})
-        assert sec._sanitize_cache[1] is not old_pattern
+        first = get_redactor(secrets, {})
+        assert first is not None
+        assert get_redactor(dict(secrets), {}) is first
+
+    def test_sessions_do_not_evict_each_other(self):
+        """one cached redactor per (deploy, session) secret set."""
+        deploy = {"A": "deploy-secret-val"}
+        s1 = get_redactor(deploy, {"T": "session-one-val"})
+        s2 = get_redactor(deploy, {"T": "session-two-val"})
+        assert s1 is not s2
+        assert get_redactor(deploy, {"T": "session-one-val"}) is s1
+        assert sanitize_output("session-two-val", deploy, {"T": "session-one-val"}) == "session-two-val"
+
+
+class TestStreamRedactor:
+    def test_secret_split_across_chunks(self):
+        redactor = get_redactor({"KEY": "sk-abc123xyz"}, {})
+        stream = StreamRedactor(redactor)
+        out = stream.feed("token: sk-ab") + stream.feed("c123") + stream.feed("xyz done\n")
+        out += stream.flush()
+        assert out == "token: [REDACTED] done\n"
+
+    def test_matches_whole_text_redaction(self):
+        redactor = get_redactor({"A": "supersecretkey", "B": "secret"}, {"C": "abab"})
+        text = "xx supersecretkey secret ababab super secre t supersecret" * 3
+        for size in (1, 2, 5, 13):
+            stream = StreamRedactor(redactor)
+            out = "".join(stream.feed(text[i:i + size]) for i in range(0, len(text), size))
+            assert out + stream.flush() == redactor.redact(text)
+
+    def test_holds_back_less_than_a_secret(self):
+        redactor = get_redactor({"KEY": "sk-abc123xyz"}, {})
+        stream = StreamRedactor(redactor)
+        emitted = stream.feed("plain output line\n")
+        # base64 of the secret is the longest variant: 16 chars
+        assert emitted == "pla"
+        assert emitted + stream.flush() == "plain output line\n"
 
 
 class TestSanitizeValue:
@@ -117,6 +117,29 @@ class TestPackSession:
         assert "learnings.jsonl" in names
         assert any(n.startswith("workspace/") for n in names)
 
+    def test_task_output_dumps_are_not_exported(
+        self, tmp_path: Path,
+        fixture_db: sqlite3.Connection,
+        fixture_workspace: Path,
+    ) -> None:
+        from kiso.session_export import pack_session
+
+        outputs = fixture_workspace / "dev" / ".kiso" / "task_outputs"
+        outputs.mkdir(parents=True)
+        (outputs / "exec_1.stdout").write_text("full command output\n")
+        out = tmp_path / "dev.kiso.tar.gz"
+        pack_session(
+            conn=fixture_db,
+            session_id="dev",
+            workspace_parent=fixture_workspace,
+            output_path=out,
+        )
+
+        with tarfile.open(out, "r:gz") as tf:
+            names = set(tf.getnames())
+        assert "workspace/notes.md" in names
+        assert not any("task_outputs" in n for n in names)
+
     def test_manifest_has_version_and_counts(
         self, tmp_path: Path,
         fixture_db: sqlite3.Connection,
@@ -122,6 +122,14 @@ class TestAggregate:
         assert gf["input_tokens"] == 300
         assert gf["output_tokens"] == 130
 
+    def test_sums_cached_tokens(self) -> None:
+        entries = [
+            _entry(input_tokens=100, cached_tokens=64),
+            _entry(input_tokens=100),  # entries written before cached_tokens existed
+        ]
+        (row,) = aggregate(entries, "model")
+        assert row["cached_tokens"] == 64
+
     def test_sorted_by_total_tokens_descending(self) -> None:
         entries = [
             _entry(model="small", input_tokens=10, output_tokens=5),
@@ -187,6 +195,13 @@ class TestEstimateCost:
         assert cost is not None
         assert abs(cost - (0.075 + 0.30)) < 0.001
 
+    def test_cached_tokens_priced_at_cache_read_rate(self) -> None:
+        # gemini: cache reads cost 25% of the 0.075 $/MTok input price
+        row = {"key": "gemini-flash", "input_tokens": 1_000_000, "output_tokens": 0,
+               "cached_tokens": 800_000}
+        cost = estimate_cost(row)
+        assert cost == pytest.approx(0.075 * 0.2 + 0.075 * 0.8 * 0.25)
+
 
 # ---------------------------------------------------------------------------
 # GET /admin/stats — endpoint tests
@@ -292,6 +307,18 @@ class TestPrintStats:
         out = capsys.readouterr().out
         assert "est. cost" in out
 
+    def test_cached_column_only_when_reported(self, capsys) -> None:
+        rows = [{"key": "gemini-flash", "calls": 1, "errors": 0, "input_tokens": 4000,
+                 "output_tokens": 50, "cached_tokens": 3000}]
+        print_stats(self._data(rows, total={"calls": 1, "errors": 0, "input_tokens": 4000,
+                                            "output_tokens": 50, "cached_tokens": 3000}))
+        out = capsys.readouterr().out
+        assert "cached" in out
+        assert "3 k" in out
+        rows[0]["cached_tokens"] = 0
+        print_stats(self._data(rows))
+        assert "cached" not in capsys.readouterr().out
+
     def test_single_row_renders_correctly(self, capsys) -> None:
         rows = [{"key": "gemini-flash", "calls": 3, "errors": 0, "input_tokens": 500, "output_tokens": 200}]
         print_stats(self._data(rows))
@@ -424,6 +451,12 @@ class TestFindPriceOrdering:
         """compute_cost returns None for unknown model."""
         assert compute_cost("unknown-model-xyz", 1000, 500) is None
 
+    def test_compute_cost_discounts_cached_tokens(self) -> None:
+        """Cached prompt tokens cost less; unlisted models pay full price."""
+        full = compute_cost("deepseek/deepseek-v3.2", 1_000_000, 0)
+        assert compute_cost("deepseek/deepseek-v3.2", 1_000_000, 0, 1_000_000) == pytest.approx(full * 0.1)
+        assert compute_cost("mistral-small", 1_000_000, 0, 1_000_000) == compute_cost("mistral-small", 1_000_000, 0)
+
     def test_compute_cost_zero_tokens(self) -> None:
         """compute_cost returns 0 for known model with zero tokens."""
         assert compute_cost("deepseek/deepseek-v3.2", 0, 0) == 0.0
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import httpx
 
@@ -159,3 +159,189 @@ async def test_status_inflight_strips_messages_when_not_verbose(client: httpx.As
         assert "messages" not in inflight
     finally:
         llm_mod._inflight_calls.pop("strip-sess", None)
+
+
+async def test_status_inflight_reports_stream_progress(client: httpx.AsyncClient):
+    """Streamed output shows as counts, and as text in verbose mode."""
+    import kiso.llm as llm_mod
+
+    llm_mod._inflight_calls["progress-sess"] = {"role": "planner", "model": "gpt-4"}
+    progress = llm_mod.StreamProgress()
+    progress.content.append('{"goal": ')
+    progress.reasoning.append("thinking")
+    llm_mod._inflight_progress["progress-sess"] = progress
+    try:
+        resp = await client.get(
+            "/status/progress-sess", params={"user": "testadmin"}, headers=AUTH_HEADER,
+        )
+        inflight = resp.json()["inflight_call"]
+        assert inflight["content_chars"] == 9
+        assert inflight["reasoning_chars"] == 8
+        assert "partial_content" not in inflight
+        assert "partial_reasoning" not in inflight
+
+        resp = await client.get(
+            "/status/progress-sess",
+            params={"user": "testadmin", "verbose": True},
+            headers=AUTH_HEADER,
+        )
+        inflight = resp.json()["inflight_call"]
+        assert inflight["partial_content"] == '{"goal": '
+        assert inflight["partial_reasoning"] == "thinking"
+    finally:
+        llm_mod._inflight_calls.pop("progress-sess", None)
+        llm_mod._inflight_progress.pop("progress-sess", None)
+
+
+async def test_status_includes_running_exec_tail(client: httpx.AsyncClient):
+    """A running exec task shows up as active_task with its output tail."""
+    from kiso.worker.output_capture import OutputCapture, track_exec
+
+    out, err = OutputCapture(), OutputCapture()
+    with track_exec("tail-sess", 7, "make test", out, err):
+        out.feed(b"compiling...\nrunning 3 tests\n")
+        resp = await client.get(
+            "/status/tail-sess", params={"user": "testadmin"}, headers=AUTH_HEADER,
+        )
+    active = resp.json()["active_task"]
+    assert active["id"] == 7
+    assert active["command"] == "make test"
+    assert active["stdout_tail"].endswith("running 3 tests\n")
+    assert active["stdout_bytes"] == len(b"compiling...\nrunning 3 tests\n")
+
+    resp = await client.get(
+        "/status/tail-sess", params={"user": "testadmin"}, headers=AUTH_HEADER,
+    )
+    assert resp.json()["active_task"] is None
+
+
+async def test_status_reports_every_running_exec(client: httpx.AsyncClient):
+    """Parallel exec tasks each keep their own tail; active_task clears after the last."""
+    from kiso.worker.output_capture import OutputCapture, track_exec
+
+    published = []
+    with patch.object(main_mod._events, "publish",
+                      side_effect=lambda s, kind, data: published.append((kind, data))):
+        a_out, b_out = OutputCapture(), OutputCapture()
+        with track_exec("par-sess", 1, "fetch a", a_out, OutputCapture()):
+            with track_exec("par-sess", 2, "fetch b", b_out, OutputCapture()):
+                a_out.feed(b"from a\n")
+                b_out.feed(b"from b\n")
+                resp = await client.get(
+                    "/status/par-sess", params={"user": "testadmin"}, headers=AUTH_HEADER,
+                )
+                running = resp.json()["active_tasks"]
+                assert [t["id"] for t in running] == [1, 2]
+                assert [t["stdout_tail"] for t in running] == ["from a\n", "from b\n"]
+                assert resp.json()["active_task"]["id"] == 2
+            assert published[-1][1]["id"] == 1  # task 1 is still running
+        assert published[-1] == ("active_task", None)
+
+    resp = await client.get(
+        "/status/par-sess", params={"user": "testadmin"}, headers=AUTH_HEADER,
+    )
+    assert resp.json()["active_tasks"] == []
+
+
+# ── push stream ───────────────────────────────────────────────────────────────
+
+
+class _FakeRequest:
+    def __init__(self, db):
+        self.app = MagicMock()
+        self.app.state.db = db
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def _parse_sse(chunk: str) -> tuple[str, dict]:
+    import json
+
+    lines = chunk.strip().splitlines()
+    return lines[0].removeprefix("event: "), json.loads(lines[1].removeprefix("data: "))
+
+
+async def test_status_stream_forbidden_on_unowned_session(client: httpx.AsyncClient):
+    resp = await client.get(
+        "/status/stranger-sess/stream",
+        params={"user": "testuser"},
+        headers=AUTH_HEADER,
+    )
+    assert resp.status_code == 403
+
+
+async def test_status_stream_snapshot_then_task_deltas(client: httpx.AsyncClient):
+    from kiso.api.sessions import _status_event_stream
+    from kiso.store import create_plan, create_task, update_task
+
+    db = app.state.db
+    await create_session(db, "stream-sess")
+    plan_id = await create_plan(db, "stream-sess", 1, "Goal")
+    first = await create_task(db, plan_id, "stream-sess", "msg", "one")
+
+    gen = _status_event_stream(_FakeRequest(db), "stream-sess", 0, False)
+    try:
+        kind, data = _parse_sse(await asyncio.wait_for(gen.__anext__(), 2))
+        assert kind == "snapshot"
+        assert [t["id"] for t in data["tasks"]] == [first]
+        assert data["plan"]["goal"] == "Goal"
+
+        second = await create_task(db, plan_id, "stream-sess", "msg", "two")
+        await update_task(db, first, "done", output="ok")
+        kind, data = _parse_sse(await asyncio.wait_for(gen.__anext__(), 2))
+        assert kind == "tasks"
+        # Only changed rows are pushed: the updated one and the new one.
+        assert sorted(t["id"] for t in data["tasks"]) == [first, second]
+        assert {t["id"]: t["status"] for t in data["tasks"]}[first] == "done"
+    finally:
+        await gen.aclose()
+    assert main_mod._events.bus.subscriber_count("stream-sess") == 0
+
+
+async def test_status_stream_subscribes_only_once_iterated(client: httpx.AsyncClient):
+    from kiso.api.sessions import _status_event_stream
+
+    gen = _status_event_stream(_FakeRequest(app.state.db), "early-gone", 0, False)
+    assert main_mod._events.bus.subscriber_count("early-gone") == 0
+    await gen.aclose()  # client left before the response started
+    assert main_mod._events.bus.subscriber_count("early-gone") == 0
+
+
+async def test_status_stream_pushes_worker_phase(client: httpx.AsyncClient):
+    from kiso.api.sessions import _status_event_stream
+
+    db = app.state.db
+    gen = _status_event_stream(_FakeRequest(db), "phase-sess", 0, False)
+    fake_task = MagicMock()
+    fake_task.done.return_value = False
+    main_mod._workers["phase-sess"] = WorkerEntry(
+        queue=asyncio.Queue(), task=fake_task, cancel_event=asyncio.Event(),
+    )
+    try:
+        await asyncio.wait_for(gen.__anext__(), 2)  # snapshot
+        main_mod._set_worker_phase("phase-sess", "planning")
+        kind, data = _parse_sse(await asyncio.wait_for(gen.__anext__(), 2))
+        assert kind == "worker"
+        assert data == {"queue_length": 0, "worker_running": True, "worker_phase": "planning"}
+    finally:
+        await gen.aclose()
+        main_mod._workers.pop("phase-sess", None)
+        main_mod._worker_phases.pop("phase-sess", None)
+
+
+async def test_status_stream_merges_partial_chunks(client: httpx.AsyncClient):
+    from kiso.api.sessions import _status_event_stream
+
+    db = app.state.db
+    gen = _status_event_stream(_FakeRequest(db), "partial-sess", 0, True)
+    try:
+        await asyncio.wait_for(gen.__anext__(), 2)  # snapshot
+        main_mod._events.publish("partial-sess", "partial", {"text": "Hel"})
+        main_mod._events.publish("partial-sess", "partial", {"reasoning": "hmm"})
+        main_mod._events.publish("partial-sess", "partial", {"text": "lo"})
+        kind, data = _parse_sse(await asyncio.wait_for(gen.__anext__(), 2))
+        assert kind == "partial"
+        assert data == {"text": "Hello", "reasoning": "hmm"}
+    finally:
+        await gen.aclose()
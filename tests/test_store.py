@@ -30,6 +30,7 @@ from kiso.store import (
     get_session,
     get_sessions_for_user,
     get_tasks_for_plan,
+    get_llm_calls,
     get_tasks_for_session,
     get_untrusted_messages,
     mark_message_processed,
@@ -72,8 +73,8 @@ async def test_init_creates_tables(db: aiosqlite.Connection):
         if not r[0].startswith("sqlite_") and not r[0].startswith("kiso_facts_fts_")
     )
     expected = [
-        "cron_jobs", "entities", "fact_tags", "facts", "facts_archive", "kiso_facts_fts",
-        "kv", "learnings", "messages", "pending", "plans", "project_members", "projects",
+        "cron_jobs", "entities", "fact_changes", "fact_rev_seq", "fact_tags", "facts", "facts_archive", "kiso_facts_fts",
+        "kv", "learnings", "llm_calls", "messages", "pending", "plans", "project_members", "projects",
         "sessions", "tasks",
     ]
     assert tables == expected
@@ -1104,6 +1105,64 @@ async def test_append_task_llm_call_atomic_no_data_loss(db: aiosqlite.Connection
     assert {c["i"] for c in stored} == set(range(10))
 
 
+async def test_llm_call_transcripts_kept_out_of_rows(db: aiosqlite.Connection):
+    """Task rows carry call summaries; prompts/responses load on demand."""
+    import json
+    await create_session(db, "sess1")
+    plan_id = await create_plan(db, "sess1", message_id=1, goal="Test")
+    task_id = await create_task(db, plan_id, "sess1", type="exec", detail="echo ok", expect="ok")
+    call = {
+        "role": "reviewer", "model": "m", "input_tokens": 10, "output_tokens": 5,
+        "thinking": "hmm", "messages": [{"role": "user", "content": "p"}], "response": "r",
+    }
+    await append_task_llm_call(db, task_id, call)
+
+    tasks = await get_tasks_for_plan(db, plan_id)
+    stored = json.loads(tasks[0]["llm_calls"])
+    assert stored == [{"role": "reviewer", "model": "m", "input_tokens": 10,
+                       "output_tokens": 5, "thinking": "hmm"}]
+
+    verbose = await get_tasks_for_session(db, "sess1", transcripts=True)
+    assert json.loads(verbose[0]["llm_calls"])[0]["response"] == "r"
+
+    calls = await get_llm_calls(db, "sess1", plan_id, task_id)
+    assert calls == [{**call, "seq": 0}]
+    assert await get_llm_calls(db, "other", plan_id, task_id) == []
+
+    cur = await db.execute("SELECT llm_calls FROM tasks WHERE id = ?", (task_id,))
+    assert (await cur.fetchone())[0] is None
+
+
+async def test_inline_llm_calls_migrated_on_init(tmp_path):
+    """init_db moves legacy inline llm_calls JSON into the llm_calls table."""
+    import json
+    from kiso.store import init_db
+    db_path = tmp_path / "legacy.db"
+    conn = await init_db(db_path)
+    await create_session(conn, "sess1")
+    plan_id = await create_plan(conn, "sess1", message_id=1, goal="Test")
+    task_id = await create_task(conn, plan_id, "sess1", type="exec", detail="x")
+    legacy = [{"role": "translator", "messages": [], "response": "ls"}]
+    await conn.execute("UPDATE tasks SET llm_calls = ? WHERE id = ?", (json.dumps(legacy), task_id))
+    await conn.execute("UPDATE plans SET llm_calls = 'NOT_JSON' WHERE id = ?", (plan_id,))
+    await conn.commit()
+    await conn.close()
+
+    conn = await init_db(db_path)
+    try:
+        tasks = await get_tasks_for_plan(conn, plan_id)
+        assert json.loads(tasks[0]["llm_calls"]) == [{"role": "translator"}]
+        assert (await get_llm_calls(conn, "sess1", plan_id, task_id))[0]["response"] == "ls"
+        assert (await get_plan_for_session(conn, "sess1"))["llm_calls"] is None
+        cur = await conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE llm_calls IS NOT NULL "
+            "UNION ALL SELECT COUNT(*) FROM plans WHERE llm_calls IS NOT NULL"
+        )
+        assert [r[0] for r in await cur.fetchall()] == [0, 0]
+    finally:
+        await conn.close()
+
+
 # --- retry_count column ---
 
 
@@ -1312,6 +1371,54 @@ async def test_archive_exact_threshold_not_archived(db: aiosqlite.Connection):
     assert facts[0]["confidence"] == 0.3
 
 
+async def test_decay_and_archive_in_batches(db: aiosqlite.Connection):
+    """batch_size splits the work into id ranges without changing the result."""
+    for i in range(7):
+        await save_fact(db, f"fact {i}", "curator", confidence=0.35)
+    await save_fact(db, "fresh fact", "curator", confidence=0.35)
+    await db.execute(
+        "UPDATE facts SET created_at = datetime('now', '-10 days') WHERE content != 'fresh fact'"
+    )
+    await db.commit()
+    assert await decay_facts(db, decay_days=7, decay_rate=0.1, batch_size=3) == 7
+    assert await archive_low_confidence_facts(db, threshold=0.3, batch_size=3) == 7
+    facts = await get_facts(db)
+    assert [f["content"] for f in facts] == ["fresh fact"]
+    cur = await db.execute("SELECT COUNT(*) FROM facts_archive")
+    assert (await cur.fetchone())[0] == 7
+
+
+async def test_init_db_narrows_old_fts_update_trigger(tmp_path):
+    """Older databases reindexed facts on any UPDATE; init_db limits it to content."""
+    from kiso.store import init_db
+
+    conn = await init_db(tmp_path / "old.db")
+    await conn.execute("DROP TRIGGER facts_fts_update")
+    await conn.execute(
+        "CREATE TRIGGER facts_fts_update AFTER UPDATE ON facts BEGIN "
+        "INSERT INTO kiso_facts_fts(kiso_facts_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); "
+        "INSERT INTO kiso_facts_fts(rowid, content) VALUES (new.id, new.content); END"
+    )
+    await conn.commit()
+    await conn.close()
+
+    conn = await init_db(tmp_path / "old.db")
+    try:
+        cur = await conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'facts_fts_update'"
+        )
+        assert "UPDATE OF content" in (await cur.fetchone())[0]
+        await save_fact(conn, "Searchable fact", "curator")
+        await conn.execute("UPDATE facts SET confidence = 0.5")
+        await conn.commit()
+        assert [f["content"] for f in await search_facts(conn, "Searchable")] == [
+            "Searchable fact",
+        ]
+    finally:
+        await conn.close()
+
+
 async def test_save_fact_null_confidence_gets_default(db: aiosqlite.Connection):
     """Schema DEFAULT 1.0 applies when no confidence is explicitly set."""
     # Insert directly without the category/confidence params to test schema default
@@ -2540,6 +2647,41 @@ async def test_backfill_word_boundary_exact_match(db: aiosqlite.Connection):
     assert (await cur.fetchone())[0] == eid
 
 
+async def test_backfill_links_many_facts_in_one_pass(db: aiosqlite.Connection):
+    """Each orphan gets the first entity (by name) it mentions as a whole word."""
+    from kiso.store import backfill_fact_entities
+
+    f1 = await save_fact(db, "Flask and Redis run in docker", "curator")
+    f2 = await save_fact(db, "Redis is the cache", "curator")
+    f3 = await save_fact(db, "Nothing to see here", "curator")
+    flask = await find_or_create_entity(db, "flask", "framework")
+    redis = await find_or_create_entity(db, "redis", "service")
+
+    assert await backfill_fact_entities(db) == 2
+    cur = await db.execute("SELECT id, entity_id FROM facts ORDER BY id")
+    assert [tuple(r) for r in await cur.fetchall()] == [(f1, flask), (f2, redis), (f3, None)]
+
+
+async def test_entity_index_rebuilt_only_on_change(db: aiosqlite.Connection):
+    from kiso.store import get_entity_index
+
+    await find_or_create_entity(db, "flask", "framework")
+    first = await get_entity_index(db)
+    assert await get_entity_index(db) is first
+    assert first.lookup("Flask")["kind"] == "framework"
+    assert first.lookup("django") is None
+
+    await find_or_create_entity(db, "django", "framework")
+    second = await get_entity_index(db)
+    assert second is not first
+    assert [e["name"] for e in second.find("Django beats FLASK")] == ["django", "flask"]
+
+    # Writes from elsewhere are picked up through the table fingerprint.
+    await db.execute("INSERT INTO entities (name, kind) VALUES ('redis', 'service')")
+    await db.commit()
+    assert (await get_entity_index(db)).lookup("redis") is not None
+
+
 # --- entity: tag migration ---
 
 
@@ -2963,3 +3105,195 @@ async def test_init_db_adds_awaits_input_to_existing_plans(tmp_path):
         assert row[1] == 0
     finally:
         await db.close()
+
+
+async def test_read_pool_serves_reads_off_the_writer(tmp_path):
+    from kiso.store import (
+        close_read_pool, db_stats, init_db, open_read_pool, reader,
+    )
+    db = await init_db(tmp_path / "pool.db")
+    try:
+        await open_read_pool(db, tmp_path / "pool.db", 2)
+        async with reader(db) as conn:
+            assert conn is not db
+            with pytest.raises(aiosqlite.OperationalError):
+                await conn.execute("INSERT INTO kv (key, value) VALUES ('a', 'b')")
+
+        # Committed writes are visible to pooled reads.
+        await create_session(db, "sess1")
+        await save_message(db, "sess1", "alice", "user", "hello")
+        assert [s["session"] for s in await get_all_sessions(db)] == ["sess1"]
+        msgs = await get_recent_messages(db, "sess1")
+        assert [m["content"] for m in msgs] == ["hello"]
+
+        stats = db_stats(db)
+        assert stats["read_pool"]["size"] == 2
+        assert stats["read_pool"]["idle"] == 2
+        assert sum(r["acquired"] for r in stats["read_pool"]["readers"]) >= 3
+    finally:
+        await close_read_pool(db)
+        await db.close()
+    # Without a pool, reads use the writer itself.
+    async with reader(db) as conn:
+        assert conn is db
+
+
+async def test_read_pool_waits_for_a_free_reader(tmp_path):
+    import asyncio
+
+    from kiso.store import close_read_pool, init_db, open_read_pool
+
+    db = await init_db(tmp_path / "pool.db")
+    pool = await open_read_pool(db, tmp_path / "pool.db", 1)
+    try:
+        async with pool.acquire():
+            waiter = asyncio.create_task(get_all_sessions(db))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            assert pool.stats()["waiting"] == 1
+        assert await waiter == []
+        assert pool.stats()["readers"][0]["wait_ms_max"] >= 40
+    finally:
+        await close_read_pool(db)
+        await db.close()
+
+
+async def test_transaction_commits_once_and_rolls_back_on_error(tmp_path):
+    from kiso.store import commit_stats, get_kv, init_db, set_kv, transaction
+
+    db = await init_db(tmp_path / "tx.db")
+    try:
+        async with transaction(db):
+            await set_kv(db, "a", "1")
+            await set_kv(db, "b", "2")
+        assert commit_stats(db)["commits"] == 1
+        assert commit_stats(db)["commit_requests"] == 0  # helpers deferred
+
+        with pytest.raises(RuntimeError):
+            async with transaction(db):
+                await set_kv(db, "a", "changed")
+                async with transaction(db):  # nested blocks join the outer one
+                    await set_kv(db, "c", "3")
+                raise RuntimeError("boom")
+        assert await get_kv(db, "a") == "1"
+        assert await get_kv(db, "c") is None
+    finally:
+        await db.close()
+
+
+async def test_group_commit_coalesces_concurrent_writers(tmp_path):
+    import asyncio
+
+    from kiso.store import commit_stats, configure_group_commit, init_db, set_kv
+
+    db = await init_db(tmp_path / "gc.db")
+    other = await aiosqlite.connect(tmp_path / "gc.db")
+    try:
+        configure_group_commit(db, 0.05)
+        writes = [asyncio.create_task(set_kv(db, f"k{i}", str(i))) for i in range(5)]
+        await asyncio.sleep(0.01)
+        # Nobody is acknowledged before the shared commit.
+        assert not any(w.done() for w in writes)
+        cur = await other.execute("SELECT COUNT(*) FROM kv")
+        assert (await cur.fetchone())[0] == 0
+        await asyncio.gather(*writes)
+        cur = await other.execute("SELECT COUNT(*) FROM kv")
+        assert (await cur.fetchone())[0] == 5
+        stats = commit_stats(db)
+        assert stats["commit_requests"] == 5
+        assert stats["commits"] == 1
+    finally:
+        await other.close()
+        await db.close()
+
+
+async def test_rollback_keeps_concurrent_writers_out(tmp_path):
+    import asyncio
+
+    from kiso.store import get_kv, init_db, set_kv, transaction
+
+    db = await init_db(tmp_path / "rb.db")
+    try:
+        unit_open = asyncio.Event()
+
+        async def other_session():
+            await unit_open.wait()
+            await set_kv(db, "theirs", "y")
+
+        # Created outside the unit of work, like a write from another session.
+        bystander = asyncio.create_task(other_session())
+        with pytest.raises(ValueError):
+            async with transaction(db):
+                await set_kv(db, "mine", "x")
+                unit_open.set()
+                await asyncio.sleep(0.02)
+                # The other session's write waits for the unit to finish.
+                assert not bystander.done()
+                raise ValueError("bad step")
+        await bystander
+        assert await get_kv(db, "theirs") == "y"
+        assert await get_kv(db, "mine") is None
+    finally:
+        await db.close()
+
+
+async def test_transaction_commits_writes_issued_before_it(tmp_path):
+    from kiso.store import get_kv, init_db, set_kv, transaction
+
+    db = await init_db(tmp_path / "early.db")
+    try:
+        # Not committed yet when the unit of work opens.
+        await db.execute("INSERT INTO kv (key, value) VALUES ('theirs', 'y')")
+        with pytest.raises(ValueError):
+            async with transaction(db):
+                await set_kv(db, "mine", "x")
+                raise ValueError("bad step")
+        assert await get_kv(db, "theirs") == "y"
+        assert await get_kv(db, "mine") is None
+    finally:
+        await db.close()
+
+
+async def test_hybrid_search_matches_word_forms_and_is_bounded(db: aiosqlite.Connection):
+    from kiso.store import disable_fact_index, enable_fact_index
+
+    deploy = await save_fact(db, "The deployment pipeline runs on GitHub Actions", "curator")
+    await save_fact(db, "User prefers tabs over spaces", "curator")
+    await save_fact(db, "Alice likes deploying on fridays", "curator", session="s2", category="user")
+    enable_fact_index(db)
+    try:
+        results = await search_facts(db, "how is deploys done?", session="s1")
+        # word forms match; the other session's user fact stays hidden
+        assert [f["id"] for f in results] == [deploy]
+        # no similar fact: nothing, not the whole knowledge base
+        assert await search_facts(db, "xyzzy quux", session="s1") == []
+        for i in range(10):
+            await save_fact(db, f"Deploy step {i} is documented", "curator")
+        assert len(await search_facts(db, "deploy", is_admin=True, limit=3)) == 3
+    finally:
+        disable_fact_index(db)
+
+
+async def test_fact_index_follows_change_log(db: aiosqlite.Connection):
+    from kiso.store import delete_facts, enable_fact_index, update_fact_content
+
+    a = await save_fact(db, "Backups run nightly", "curator")
+    b = await save_fact(db, "Redis caches sessions", "curator")
+    index = enable_fact_index(db)
+    await index.sync(db)
+    assert len(index) == 2 and index.rebuilds == 1
+
+    await update_fact_content(db, a, "Snapshots run hourly")
+    await delete_facts(db, [b])
+    c = await save_fact(db, "Memcached caches pages", "curator")
+    await index.sync(db)
+    assert index.rebuilds == 1  # incremental
+    assert [fid for fid, _ in index.search("hourly snapshots", 5)] == [a]
+    assert [fid for fid, _ in index.search("caches", 5)] == [c]
+
+    # An index that fell behind the trimmed log is rebuilt.
+    await db.execute("DELETE FROM fact_changes")
+    await db.execute("INSERT INTO fact_changes (seq, fact_id) VALUES (?, ?)", (index.seq + 50, c))
+    await db.commit()
+    await index.sync(db)
+    assert index.rebuilds == 2 and len(index) == 2
@@ -870,10 +870,14 @@ class TestGetResourceLimits:
         assert result["pids_limit"] == 512
 
     def test_disk_usage_from_kiso_dir(self, tmp_path):
-        """Disk used_gb is actual KISO_DIR size via _kiso_dir_bytes, total_gb from filesystem."""
+        """Disk used_gb is the cached KISO_DIR size from the accountant, total_gb from filesystem."""
+        from kiso.worker.disk_usage import DiskUsageAccountant
+
+        acct = DiskUsageAccountant(lambda: 3_400_000_000)
+        acct.rescan()
         with (
             patch("kiso.sysenv.KISO_DIR", tmp_path),
-            patch("kiso.worker.utils._kiso_dir_bytes", return_value=3_400_000_000),
+            patch("kiso.worker.utils._disk_accountant", acct),
             patch("kiso.sysenv.shutil.disk_usage") as mock_du,
         ):
             mock_du.return_value = MagicMock(total=34_000_000_000)
@@ -0,0 +1,41 @@
+"""Tests for kiso.text — shared text utilities."""
+
+from __future__ import annotations
+
+import re
+
+from kiso.text import AhoCorasick
+
+
+def _regex_hits(patterns: list[str], text: str, whole_words: bool) -> list[tuple]:
+    hits = []
+    for idx, p in enumerate(patterns):
+        body = re.escape(p)
+        rx = rf"(?=(\b{body}\b))" if whole_words else rf"(?=({body}))"
+        hits.extend((m.start(1), m.end(1), idx) for m in re.finditer(rx, text))
+    return sorted(hits)
+
+
+def test_finds_overlapping_patterns():
+    ac = AhoCorasick(["he", "she", "his", "hers"])
+    hits = sorted(ac.finditer("ushers"))
+    assert hits == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+
+
+def test_whole_words_matches_regex_boundaries():
+    patterns = ["java", "javascript", "sql", "c++", ".net", "node js"]
+    ac = AhoCorasick(patterns)
+    for text in [
+        "javascript and java",
+        "sqlite is not sql.",
+        "c++ vs c++17, .net and a.net",
+        "node js or node jsx",
+    ]:
+        assert sorted(ac.finditer(text, whole_words=True)) == _regex_hits(patterns, text, True)
+        assert sorted(ac.finditer(text)) == _regex_hits(patterns, text, False)
+
+
+def test_empty_patterns_never_match():
+    ac = AhoCorasick(["", "a"])
+    assert list(ac.finditer("aa")) == [(0, 1, 1), (1, 2, 1)]
+    assert list(AhoCorasick([]).finditer("anything")) == []
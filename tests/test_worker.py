@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -123,6 +124,18 @@ def _patch_translator():
 from tests.conftest import make_config
 
 
+def _fake_proc(stdout: bytes = b"ok\n", stderr: bytes = b"", returncode: int = 0):
+    """Mock subprocess whose stdout/stderr pipes yield *stdout*/*stderr*."""
+    proc = AsyncMock()
+    for name, data in (("stdout", stdout), ("stderr", stderr)):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        setattr(proc, name, reader)
+    proc.returncode = returncode
+    return proc
+
+
 # --- _run_subprocess ---
 
 _EXIT_CODE_CASES = [
@@ -2270,7 +2283,7 @@ class TestExecutePlanAudit:
         plan_id = await create_plan(db, "sess1", 1, "Test")
         await create_task(db, plan_id, "sess1", type="exec", detail="echo hi", expect="ok")
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              _patch_translator(), \
              _patch_kiso_dir(tmp_path), \
              patch("kiso.worker.loop.audit") as mock_audit:
@@ -2294,7 +2307,7 @@ class TestExecutePlanAudit:
         cancel_event = asyncio.Event()
         cancel_event.set()
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              _patch_translator(), \
              _patch_kiso_dir(tmp_path), \
              patch("kiso.worker.loop.audit") as mock_audit:
@@ -3728,7 +3741,7 @@ class TestPermissionRevalidation:
         # Reload returns config without alice
         config_without_alice = make_config(users={"bob": User(role="admin")})
 
-        with patch("kiso.worker.loop.reload_config", return_value=config_without_alice), \
+        with patch("kiso.worker.loop.current_config", return_value=config_without_alice), \
              _patch_translator(), \
              _patch_kiso_dir(tmp_path):
             success, reason, _stuck, completed, remaining, _po = await _execute_plan(
@@ -3748,7 +3761,7 @@ class TestPermissionRevalidation:
         plan_id = await create_plan(db, "sess1", 1, "Test")
         await create_task(db, plan_id, "sess1", type="msg", detail="hello")
 
-        with patch("kiso.worker.loop.reload_config", side_effect=ConfigError("bad toml")), \
+        with patch("kiso.worker.loop.current_config", side_effect=ConfigError("bad toml")), \
              patch("kiso.worker.loop.run_messenger", new_callable=AsyncMock, return_value="Hi"), \
              _patch_kiso_dir(tmp_path):
             success, reason, _stuck, completed, remaining, _po = await _execute_plan(
@@ -3838,10 +3851,7 @@ class TestPerSessionSandbox:
 
         async def _mock_subprocess(*args, **kwargs):
             captured_kwargs.update(kwargs)
-            proc = AsyncMock()
-            proc.communicate = AsyncMock(return_value=(b"ok\n", b""))
-            proc.returncode = 0
-            return proc
+            return _fake_proc()
 
         with _patch_kiso_dir(tmp_path), \
              patch("asyncio.create_subprocess_exec", side_effect=_mock_subprocess):
@@ -3855,10 +3865,7 @@ class TestPerSessionSandbox:
 
         async def _mock_subprocess(*args, **kwargs):
             captured_kwargs.update(kwargs)
-            proc = AsyncMock()
-            proc.communicate = AsyncMock(return_value=(b"ok\n", b""))
-            proc.returncode = 0
-            return proc
+            return _fake_proc()
 
         with _patch_kiso_dir(tmp_path), \
              patch("asyncio.create_subprocess_exec", side_effect=_mock_subprocess):
@@ -3882,7 +3889,7 @@ class TestPermissionRevalidationEdgeCases:
         await create_task(db, plan_id, "sess1", type="exec", detail="echo ok", expect="ok")
         await create_task(db, plan_id, "sess1", type="msg", detail="done")
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              patch("kiso.worker.loop.run_reviewer", new_callable=AsyncMock, return_value=REVIEW_OK), \
              patch("kiso.worker.loop.run_messenger", new_callable=AsyncMock, return_value="done"), \
              _patch_translator(), \
@@ -3914,7 +3921,7 @@ class TestPermissionRevalidationEdgeCases:
                 return config_with_alice
             return config_without_alice
 
-        with patch("kiso.worker.loop.reload_config", side_effect=_reload_side_effect), \
+        with patch("kiso.worker.loop.current_config", side_effect=_reload_side_effect), \
              patch("kiso.worker.loop.run_reviewer", new_callable=AsyncMock, return_value=REVIEW_OK), \
              _patch_translator(), \
              _patch_kiso_dir(tmp_path):
@@ -3944,12 +3951,9 @@ class TestPermissionRevalidationEdgeCases:
 
         async def _mock_subprocess(*args, **kwargs):
             captured_kwargs.update(kwargs)
-            proc = AsyncMock()
-            proc.communicate = AsyncMock(return_value=(b"ok\n", b""))
-            proc.returncode = 0
-            return proc
+            return _fake_proc()
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              patch("kiso.worker.loop.run_reviewer", new_callable=AsyncMock, return_value=REVIEW_OK), \
              patch("kiso.worker.loop.run_messenger", new_callable=AsyncMock, return_value="done"), \
              _patch_translator(), \
@@ -3969,7 +3973,7 @@ class TestPermissionRevalidationEdgeCases:
         plan_id = await create_plan(db, "sess1", 1, "Test")
         await create_task(db, plan_id, "sess1", type="msg", detail="hello")
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              patch("kiso.worker.loop.run_messenger", new_callable=AsyncMock, return_value="Hi"), \
              _patch_kiso_dir(tmp_path):
             success, _, _, completed, _, _po = await _execute_plan(
@@ -4028,7 +4032,7 @@ class TestCancelMechanism:
         cancel_event = asyncio.Event()
         cancel_event.set()  # already cancelled
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              _patch_translator(), \
              _patch_kiso_dir(tmp_path):
             success, reason, _stuck, completed, remaining, _po = await _execute_plan(
@@ -4061,7 +4065,7 @@ class TestCancelMechanism:
             cancel_event.set()
             return REVIEW_OK
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              patch("kiso.worker.loop.run_reviewer", new_callable=AsyncMock,
                    side_effect=_review_then_cancel), \
              _patch_translator(), \
@@ -4291,6 +4295,115 @@ class TestOutputTruncation:
         assert len(stdout) <= 100
         assert stdout.endswith("[truncated]")
 
+    async def test_exec_output_spilled_to_file(self, tmp_path):
+        """The full output of a truncated exec stream is kept on disk."""
+        cmd = "printf '%0200000d' 0"
+        with _patch_kiso_dir(tmp_path):
+            stdout, _, success, _ = await _exec_task(
+                "test-sess", cmd, max_output_size=1000, task_id=42,
+            )
+            spill = _session_workspace("test-sess") / ".kiso" / "task_outputs" / "exec_42.stdout"
+            assert spill.read_bytes() == b"0" * 200000
+        assert len(stdout) <= 1000
+        assert str(spill) in stdout
+        assert stdout.endswith("[truncated]")
+
+    async def test_output_between_one_and_four_limits_is_spilled(self, tmp_path):
+        """ASCII output 1x-4x max_output_size is truncated, so it must be spilled."""
+        with _patch_kiso_dir(tmp_path):
+            stdout, _, _, _ = await _exec_task(
+                "test-sess", "printf '%03000d' 0", max_output_size=1000, task_id=44,
+            )
+            spill = _session_workspace("test-sess") / ".kiso" / "task_outputs" / "exec_44.stdout"
+            assert spill.read_bytes() == b"0" * 3000
+        assert len(stdout) <= 1000
+        assert str(spill) in stdout
+
+    async def test_small_output_not_spilled(self, tmp_path):
+        with _patch_kiso_dir(tmp_path):
+            stdout, _, _, _ = await _exec_task(
+                "test-sess", "echo hi", max_output_size=1000, task_id=43,
+            )
+            out_dir = _session_workspace("test-sess") / ".kiso" / "task_outputs"
+            assert not out_dir.exists() or not any(out_dir.iterdir())
+        assert stdout == "hi\n"
+
+
+class TestOutputCapture:
+    def test_head_is_bounded_and_tail_is_kept(self):
+        from kiso.worker.output_capture import OutputCapture
+
+        cap = OutputCapture(10, tail_limit=8)
+        for i in range(100):
+            cap.feed(f"line{i:03d}\n".encode())
+        assert cap.total == 800
+        assert cap.truncated
+        assert cap.text() == "line000\nli"
+        assert cap.tail() == "line099\n"
+        assert not cap.spilled
+
+    def test_spill_holds_full_stream(self, tmp_path):
+        from kiso.worker.output_capture import OutputCapture
+
+        cap = OutputCapture(4, spill_path=tmp_path / "out.stdout")
+        for chunk in (b"ab", b"cdef", b"gh"):
+            cap.feed(chunk)
+        cap.close()
+        assert cap.spilled
+        assert cap.text() == "abcd"
+        assert (tmp_path / "out.stdout").read_bytes() == b"abcdefgh"
+
+    def test_spill_starts_at_spill_after(self, tmp_path):
+        from kiso.worker.output_capture import OutputCapture
+
+        cap = OutputCapture(16, spill_after=4, spill_path=tmp_path / "out.stdout")
+        for chunk in (b"abc", b"def", b"gh"):
+            cap.feed(chunk)
+        cap.close()
+        assert cap.spilled and not cap.truncated
+        assert cap.text() == "abcdefgh"
+        assert (tmp_path / "out.stdout").read_bytes() == b"abcdefgh"
+
+    def test_unlimited_keeps_everything(self):
+        from kiso.worker.output_capture import OutputCapture
+
+        cap = OutputCapture(0)
+        cap.feed(b"x" * 100_000)
+        assert not cap.truncated
+        assert len(cap.text()) == 100_000
+
+    def test_redacted_tail_masks_secret_split_across_reads(self):
+        from kiso.security import get_redactor
+        from kiso.worker.output_capture import OutputCapture
+
+        cap = OutputCapture(0, redactor=get_redactor({"KEY": "sk-abc123xyz"}, {}))
+        for chunk in (b"token=sk-ab", b"c123", b"xyz ok\n"):
+            cap.feed(chunk)
+            assert "sk-ab" not in cap.tail()
+        cap.close()
+        assert cap.tail() == "token=[REDACTED] ok\n"
+        assert cap.text() == "token=sk-abc123xyz ok\n"  # raw, sanitized by the caller
+
+    def test_spill_is_redacted_across_reads(self, tmp_path):
+        from kiso.security import get_redactor
+        from kiso.worker.output_capture import OutputCapture
+
+        spill = tmp_path / "out.stdout"
+        cap = OutputCapture(
+            8, spill_path=spill, redactor=get_redactor({"KEY": "sk-abc123xyz"}, {}),
+        )
+        for chunk in (b"head sk-ab", b"c123", b"xyz and sk-abc1", b"23xyz\n"):
+            cap.feed(chunk)
+        cap.close()
+        assert cap.spilled
+        assert spill.read_text() == "head [REDACTED] and [REDACTED]\n"
+
+    def test_truncate_output_note_before_marker(self):
+        result = _truncate_output("x" * 500, 100, note="\n[see file]")
+        assert len(result) == 100
+        assert result.endswith("\n[see file]\n[truncated]")
+
+
 class TestTruncateOutputUnit:
     """Direct unit tests for _truncate_output respecting the limit."""
 
@@ -4669,14 +4782,11 @@ class TestSandboxWorkspaceInExecutePlan:
             return original_workspace(session)
 
         async def _mock_subprocess(*args, **kwargs):
-            proc = AsyncMock()
-            proc.communicate = AsyncMock(return_value=(b"ok\n", b""))
-            proc.returncode = 0
-            return proc
+            return _fake_proc()
 
         from kiso.security import PermissionResult
 
-        with patch("kiso.worker.loop.reload_config", return_value=config), \
+        with patch("kiso.worker.loop.current_config", return_value=config), \
              patch("kiso.worker.loop.revalidate_permissions",
                    return_value=PermissionResult(allowed=True, role="user")), \
              patch("kiso.worker.loop._ensure_sandbox_user", return_value=42), \
@@ -4725,18 +4835,18 @@ class TestFactUsageTracking:
         assert facts[0]["last_used"] is not None
 
 
-# --- Fact decay and archive in post-plan ---
+# --- Fact decay and archive are not part of post-plan ---
 
 
-class TestFactDecayInPostPlan:
+class TestNoFactDecayInPostPlan:
     @pytest.fixture()
     async def db(self, tmp_path):
         conn = await init_db(tmp_path / "test.db")
         yield conn
         await conn.close()
 
-    async def test_stale_facts_decayed_after_plan(self, db, tmp_path):
-        """Stale facts get their confidence reduced via _post_plan_knowledge."""
+    async def test_post_plan_leaves_stale_and_low_confidence_facts(self, db, tmp_path):
+        """Decay and archive run on the maintenance schedule (kiso/maintenance.py)."""
         config = make_config(settings={
             "worker_idle_timeout": 1,
             "llm_timeout": 5,
@@ -4748,47 +4858,18 @@ class TestFactDecayInPostPlan:
             "fact_archive_threshold": 0.3,
         })
         await create_session(db, "sess1")
-        fid = await save_fact(db, "Old stale fact", "curator")
-        # Backdate to 10 days ago (no usage bump — simulates a fact not used)
+        stale = await save_fact(db, "Old stale fact", "curator")
         await db.execute(
             "UPDATE facts SET created_at = datetime('now', '-10 days') WHERE id = ?",
-            (fid,),
+            (stale,),
         )
         await db.commit()
-
-        # Call _post_plan_knowledge directly (bypasses success handler usage bump)
-        await _post_plan_knowledge(db, config, "sess1", None, llm_timeout=5)
-
-        facts = await get_facts(db)
-        assert len(facts) == 1
-        assert facts[0]["confidence"] < 1.0
-
-    async def test_low_confidence_facts_archived(self, db, tmp_path):
-        """Facts with low confidence are archived via _post_plan_knowledge."""
-        config = make_config(settings={
-            "worker_idle_timeout": 1,
-            "llm_timeout": 5,
-            "max_validation_retries": 1,
-            "context_messages": 5,
-            "max_replan_depth": 3,
-            "fact_decay_days": 7,
-            "fact_decay_rate": 0.1,
-            "fact_archive_threshold": 0.3,
-        })
-        await create_session(db, "sess1")
-        # Create a fact with very low confidence
         await save_fact(db, "Barely alive fact", "curator", confidence=0.1)
 
-        # Call _post_plan_knowledge directly
         await _post_plan_knowledge(db, config, "sess1", None, llm_timeout=5)
 
-        # Fact should be archived (confidence 0.1 < threshold 0.3)
-        facts = await get_facts(db)
-        assert len(facts) == 0
-        # Check facts_archive
-        cur = await db.execute("SELECT * FROM facts_archive")
-        archived = await cur.fetchall()
-        assert len(archived) == 1
+        facts = {f["content"]: f["confidence"] for f in await get_facts(db)}
+        assert facts == {"Old stale fact": 1.0, "Barely alive fact": 0.1}
 
 
 # --- 21d: Planning failure notifies user ---
@@ -6346,6 +6427,93 @@ class TestFastPathIntegration:
 
         mock_paraphraser.assert_not_called()
 
+    async def test_planner_context_prepared_while_classifying(self, db, tmp_path):
+        """Paraphraser and planner context run during the classifier call."""
+        conn, msg_id = db
+        config = make_config(settings={**make_config().settings, "fast_path_enabled": True})
+        msg = self._make_msg(msg_id)
+        prepared_started = asyncio.Event()
+        prepared = object()
+
+        async def _prepare(*args, **kwargs):
+            prepared_started.set()
+            return prepared
+
+        async def _classify(*args, **kwargs):
+            await asyncio.wait_for(prepared_started.wait(), timeout=2)
+            return ("plan", "en")
+
+        mock_planner = AsyncMock(return_value=CHAT_PLAN)
+        with patch("kiso.worker.loop.run_classifier", side_effect=_classify), \
+             patch("kiso.worker.loop.prepare_planner", side_effect=_prepare) as mock_prepare, \
+             patch("kiso.worker.loop.run_planner", mock_planner), \
+             patch("kiso.worker.loop._run_planning_loop", AsyncMock(return_value=1)), \
+             patch("kiso.worker.loop.get_untrusted_messages", new_callable=AsyncMock,
+                   return_value=[{"content": "x"}]), \
+             patch("kiso.worker.loop.run_paraphraser", AsyncMock(return_value="para")), \
+             _patch_kiso_dir(tmp_path):
+            from kiso.worker.loop import _process_message
+            await _process_message(
+                conn, config, "sess1", msg, None, 5, 60, 3,
+            )
+
+        assert mock_prepare.call_args.kwargs["paraphrased_context"] == "para"
+        kwargs = mock_planner.call_args.kwargs
+        assert kwargs["prepared"] is prepared
+        assert kwargs["paraphrased_context"] == "para"
+
+    async def test_chat_verdict_cancels_speculative_work(self, db, tmp_path):
+        conn, msg_id = db
+        config = make_config(settings={**make_config().settings, "fast_path_enabled": True})
+        msg = self._make_msg(msg_id)
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def _prepare(*args, **kwargs):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def _classify(*args, **kwargs):
+            await started.wait()
+            return ("chat", "en")
+
+        with patch("kiso.worker.loop.run_classifier", side_effect=_classify), \
+             patch("kiso.worker.loop.prepare_planner", side_effect=_prepare), \
+             patch("kiso.worker.loop.run_messenger", AsyncMock(return_value="Hi")), \
+             patch("kiso.worker.loop.get_untrusted_messages", new_callable=AsyncMock, return_value=[]), \
+             _patch_kiso_dir(tmp_path):
+            from kiso.worker.loop import _process_message
+            await _process_message(
+                conn, config, "sess1", msg, None, 5, 60, 3,
+            )
+            await asyncio.wait_for(cancelled.wait(), timeout=2)
+
+    async def test_speculative_planning_disabled(self, db, tmp_path):
+        conn, msg_id = db
+        config = make_config(settings={
+            **make_config().settings, "fast_path_enabled": True, "speculative_planning": False,
+        })
+        msg = self._make_msg(msg_id)
+        mock_planner = AsyncMock(return_value=CHAT_PLAN)
+        mock_prepare = AsyncMock()
+        with patch("kiso.worker.loop.run_classifier", AsyncMock(return_value=("plan", "en"))), \
+             patch("kiso.worker.loop.prepare_planner", mock_prepare), \
+             patch("kiso.worker.loop.run_planner", mock_planner), \
+             patch("kiso.worker.loop._run_planning_loop", AsyncMock(return_value=1)), \
+             patch("kiso.worker.loop.get_untrusted_messages", new_callable=AsyncMock, return_value=[]), \
+             _patch_kiso_dir(tmp_path):
+            from kiso.worker.loop import _process_message
+            await _process_message(
+                conn, config, "sess1", msg, None, 5, 60, 3,
+            )
+
+        mock_prepare.assert_not_called()
+        assert mock_planner.call_args.kwargs["prepared"] is None
+
 
 # --- _fast_path_chat edge cases ---
 
@@ -8380,34 +8548,6 @@ class TestPostPlanKnowledgeParallel:
 
         assert curator_called, "Curator must run even if Summarizer fails"
 
-    async def test_decay_error_does_not_prevent_archive(self, db, tmp_path):
-        """Exception in decay must not prevent archive from running."""
-        config = self._cfg(summarize_threshold=99999)
-        archive_called = []
-
-        with patch("kiso.worker.loop.decay_facts",
-                   new_callable=AsyncMock, side_effect=RuntimeError("disk full")), \
-             patch("kiso.worker.loop.archive_low_confidence_facts",
-                   new_callable=AsyncMock,
-                   side_effect=lambda *a, **kw: archive_called.append(True) or 0):
-            await _post_plan_knowledge(db, config, "sess1", None, llm_timeout=5)
-
-        assert archive_called, "Archive must run even if decay fails"
-
-    async def test_archive_error_does_not_prevent_decay(self, db, tmp_path):
-        """Exception in archive must not prevent decay from running."""
-        config = self._cfg(summarize_threshold=99999)
-        decay_called = []
-
-        with patch("kiso.worker.loop.decay_facts",
-                   new_callable=AsyncMock,
-                   side_effect=lambda *a, **kw: decay_called.append(True) or 0), \
-             patch("kiso.worker.loop.archive_low_confidence_facts",
-                   new_callable=AsyncMock, side_effect=RuntimeError("oom")):
-            await _post_plan_knowledge(db, config, "sess1", None, llm_timeout=5)
-
-        assert decay_called, "Decay must run even if archive fails"
-
     async def test_curator_timeout_does_not_prevent_summarizer(self, db, tmp_path):
         """Curator timeout (phase-1) must not block summarizer from running."""
         await save_learning(db, "slow learning", "sess1")
@@ -8559,19 +8699,6 @@ class TestCancelledErrorPropagation:
         yield conn
         await conn.close()
 
-    async def test_cancelled_error_propagates_from_decay(self, db):
-        """CancelledError raised by decay_facts must propagate out of _post_plan_knowledge."""
-        with patch("kiso.worker.loop.decay_facts", side_effect=asyncio.CancelledError):
-            with pytest.raises(asyncio.CancelledError):
-                await _post_plan_knowledge(db, make_config(), "sess1", None, llm_timeout=5)
-
-    async def test_cancelled_error_propagates_from_archive(self, db):
-        """CancelledError raised by archive_low_confidence_facts must propagate."""
-        with patch("kiso.worker.loop.archive_low_confidence_facts",
-                   side_effect=asyncio.CancelledError):
-            with pytest.raises(asyncio.CancelledError):
-                await _post_plan_knowledge(db, make_config(), "sess1", None, llm_timeout=5)
-
     async def test_cancelled_error_propagates_from_curator(self, db):
         """CancelledError raised by run_curator must propagate, not be swallowed.
 
@@ -9350,13 +9477,21 @@ class TestKisoDirBytes:
 
 
 class TestCheckDiskLimit:
+    @staticmethod
+    def _accountant(total):
+        from kiso.worker.disk_usage import DiskUsageAccountant
+
+        acct = DiskUsageAccountant(lambda: total)
+        acct.rescan()
+        return acct
+
     def test_under_limit_returns_none(self):
         """When KISO_DIR size is under the limit, returns None."""
         from kiso.worker.utils import _check_disk_limit
 
         config = MagicMock()
         config.settings = {"max_disk_gb": 32}
-        with patch("kiso.worker.utils._kiso_dir_bytes", return_value=10 * 1024**3):
+        with patch("kiso.worker.utils._disk_accountant", self._accountant(10 * 1024**3)):
             result = _check_disk_limit(config)
         assert result is None
 
@@ -9366,23 +9501,163 @@ class TestCheckDiskLimit:
 
         config = MagicMock()
         config.settings = {"max_disk_gb": 32}
-        with patch("kiso.worker.utils._kiso_dir_bytes", return_value=40 * 1024**3):
+        acct = self._accountant(40 * 1024**3)
+        with patch("kiso.worker.utils._disk_accountant", acct):
             result = _check_disk_limit(config)
+        acct.wait()
         assert result is not None
         assert "Disk limit exceeded" in result
         assert "40.0" in result
         assert "32" in result
+        # Over the limit → a fresh rescan was requested
+        assert acct.scans == 2
 
     def test_error_returns_none(self):
-        """When _kiso_dir_bytes returns None, returns None (graceful degradation)."""
+        """When the scan fails, returns None (graceful degradation)."""
         from kiso.worker.utils import _check_disk_limit
 
         config = MagicMock()
         config.settings = {"max_disk_gb": 32}
-        with patch("kiso.worker.utils._kiso_dir_bytes", return_value=None):
+        with patch("kiso.worker.utils._disk_accountant", self._accountant(None)):
             result = _check_disk_limit(config)
         assert result is None
 
+    def test_cold_check_does_not_scan_inline(self):
+        """Before the first scan, the check passes and scanning happens off-thread."""
+        import threading
+        from kiso.worker.disk_usage import DiskUsageAccountant
+        from kiso.worker.utils import _check_disk_limit
+
+        release = threading.Event()
+        acct = DiskUsageAccountant(lambda: release.wait(5) and 40 * 1024**3)
+        config = MagicMock()
+        config.settings = {"max_disk_gb": 32}
+        with patch("kiso.worker.utils._disk_accountant", acct):
+            assert _check_disk_limit(config) is None
+            release.set()
+            acct.wait(5)
+            assert "Disk limit exceeded" in _check_disk_limit(config)
+        acct.wait(5)
+
+
+class TestDiskUsageAccountant:
+    def test_total_is_cached_between_rescans(self):
+        from kiso.worker.disk_usage import DiskUsageAccountant
+
+        calls = []
+        acct = DiskUsageAccountant(lambda: calls.append(1) or 100, rescan_interval=3600)
+        acct.rescan()
+        assert acct.total() == 100
+        assert acct.total() == 100
+        assert len(calls) == 1
+
+    def test_stale_total_triggers_background_rescan(self):
+        from kiso.worker.disk_usage import DiskUsageAccountant
+
+        sizes = iter([100, 250])
+        acct = DiskUsageAccountant(lambda: next(sizes), rescan_interval=3600)
+        acct.rescan()
+        assert acct.total(max_age=0) == 100  # returns cached value immediately
+        acct.wait(5)
+        assert acct.total() == 250
+
+    def test_note_files_adds_sizes(self, tmp_path):
+        from kiso.worker.disk_usage import DiskUsageAccountant
+
+        acct = DiskUsageAccountant(lambda: 1000, rescan_interval=3600)
+        acct.rescan()
+        (tmp_path / "a.bin").write_bytes(b"x" * 24)
+        added = acct.note_files([tmp_path / "a.bin", tmp_path / "missing", tmp_path])
+        assert added == 24
+        assert acct.total() == 1024
+
+    def test_add_before_first_scan_is_ignored(self):
+        from kiso.worker.disk_usage import DiskUsageAccountant
+
+        acct = DiskUsageAccountant(lambda: None, rescan_interval=3600)
+        acct.add(500)
+        acct.rescan()
+        assert acct.total() is None
+
+    def test_auto_publish_accounts_new_files(self, tmp_path):
+        from kiso.worker.disk_usage import DiskUsageAccountant
+        from kiso.worker.utils import _auto_publish_skill_files, _snapshot_workspace
+
+        acct = DiskUsageAccountant(lambda: 0, rescan_interval=3600)
+        acct.rescan()
+        with _patch_kiso_dir(tmp_path), \
+             patch("kiso.worker.utils._disk_accountant", acct):
+            ws = _session_workspace("test-session")
+            pre = _snapshot_workspace("test-session")
+            (ws / "report.txt").write_text("0123456789")
+            _auto_publish_skill_files("test-session", pre)
+        # original + pub/ copy
+        assert acct.total() == 20
+
+
+class TestWorkspaceIndex:
+    def test_indexes_visible_files_only(self, tmp_path):
+        from kiso.worker.workspace_index import WorkspaceIndex
+
+        (tmp_path / "a.txt").write_text("abc")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.py").write_text("x = 1")
+        (tmp_path / ".hidden").write_text("no")
+        (tmp_path / ".kiso").mkdir()
+        (tmp_path / ".kiso" / "plan.json").write_text("{}")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("")
+
+        files = WorkspaceIndex(tmp_path, frozenset({"node_modules"})).files()
+        assert set(files) == {"a.txt", "sub/b.py"}
+        assert files["a.txt"].size == 3
+
+    def test_unchanged_dirs_are_not_relisted(self, tmp_path):
+        from kiso.worker import workspace_index as wi
+
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "a.txt").write_text("a")
+        old = time.time() - 60
+        os.utime(tmp_path / "sub", (old, old))
+        os.utime(tmp_path, (old, old))
+
+        index = wi.WorkspaceIndex(tmp_path)
+        index.files()
+        first = index.listings
+        index.files()
+        assert index.listings == first
+
+    def test_detects_created_and_removed_files(self, tmp_path):
+        from kiso.worker.workspace_index import WorkspaceIndex
+
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "old.txt").write_text("a")
+        index = WorkspaceIndex(tmp_path)
+        pre = index.snapshot()
+
+        (tmp_path / "sub" / "new.txt").write_text("b")
+        (tmp_path / "sub" / "old.txt").unlink()
+        assert index.snapshot() - pre == {tmp_path / "sub" / "new.txt"}
+        assert set(index.files()) == {"sub/new.txt"}
+
+    def test_removed_directory_drops_its_files(self, tmp_path):
+        import shutil
+
+        from kiso.worker.workspace_index import WorkspaceIndex
+
+        (tmp_path / "d" / "e").mkdir(parents=True)
+        (tmp_path / "d" / "e" / "f.txt").write_text("x")
+        index = WorkspaceIndex(tmp_path)
+        assert set(index.files()) == {"d/e/f.txt"}
+        shutil.rmtree(tmp_path / "d")
+        assert index.files() == {}
+
+    def test_shared_index_per_root(self, tmp_path):
+        from kiso.worker.workspace_index import workspace_index
+
+        assert workspace_index(tmp_path) is workspace_index(tmp_path)
+        assert workspace_index(tmp_path) is not workspace_index(tmp_path / "other")
+
 
 
 # -- integration: disk limit blocks exec in _execute_plan ---